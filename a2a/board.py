@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from pathlib import Path
 from .schema import Backlog
+from .storage import defer_write
 
 
 def write_board(backlog: Backlog) -> str:
@@ -9,18 +10,24 @@ def write_board(backlog: Backlog) -> str:
 
     Returns the path to the board file.
     """
-    out_dir = Path("docs/status"); out_dir.mkdir(parents=True, exist_ok=True)
-    out = out_dir / "board.md"
+    out = Path("docs/status") / "board.md"
     lines = ["# Status Board", "", "| Epic | Story | Title | Phase | Owner | Next | Gate |", "|---|---:|---|---|---|---|---|"]
     for e in backlog.epics:
         for s in e.stories:
             lines.append(
                 f"| {e.id} — {e.title} | {s.id} | {s.title} | {s.phase or '-'} | {s.owner or '-'} | {s.next_owner or '-'} | {s.gate or '-'} |"
             )
-    out.write_text("\n".join(lines) + "\n")
+    text = "\n".join(lines) + "\n"
+    if not defer_write(out, text, lambda t: _write_text(out, t)):
+        _write_text(out, text)
     return str(out)
 
 
+def _write_text(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+
+
 def update_story_fields(backlog: Backlog, story_id: int, *, phase: str | None = None, owner: str | None = None, next_owner: str | None = None, gate: str | None = None) -> bool:
     """Update status fields on a story in the backlog. Returns True if updated."""
     idx = {s.id: s for e in backlog.epics for s in e.stories}
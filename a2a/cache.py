@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+CACHE_DIR = Path(".a2dev/cache")
+
+
+def cache_dir(root: str | Path = ".") -> Path:
+    """Return (and create) the local cache directory; it is git-ignored on creation."""
+    d = Path(root) / CACHE_DIR
+    if not d.exists():
+        d.mkdir(parents=True, exist_ok=True)
+        (d / ".gitignore").write_text("*\n")
+    return d
+
+
+def read_json(name: str, root: str | Path = ".") -> Optional[Any]:
+    p = Path(root) / CACHE_DIR / name
+    if not p.exists():
+        return None
+    try:
+        return json.loads(p.read_text())
+    except Exception:
+        return None
+
+
+def write_json(name: str, data: Any, root: str | Path = ".") -> Path:
+    p = cache_dir(root) / name
+    tmp = p.with_suffix(p.suffix + ".tmp")
+    tmp.write_text(json.dumps(data))
+    try:
+        tmp.replace(p)
+    except OSError:
+        # e.g., --dry-run stubs out writes; do not leave a stray temp file behind
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+    return p
+
+
+def file_digest(path: str | Path) -> Optional[str]:
+    p = Path(path)
+    if not p.is_file():
+        return None
+    h = hashlib.sha256()
+    with p.open("rb") as fh:
+        for block in iter(lambda: fh.read(1 << 16), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def tree_fingerprint(root: str | Path = ".", exclude: Iterable[str] = (), ignored: bool = False) -> str:
+    """Cheap content fingerprint of a working tree.
+
+    In a git work tree this is HEAD's tree id plus the size/mtime of every dirty or
+    untracked path (as reported by `git status`); elsewhere it falls back to a
+    size/mtime walk. Paths in `exclude` (relative to root, e.g. a report the caller
+    writes itself) are ignored so producing output does not invalidate the input key.
+    With `ignored`, git-ignored files (.env, node_modules) count too, for tools
+    that read the directory rather than the index; A2Dev's own .a2dev state never does.
+    """
+    root_path = Path(root)
+    skip = {Path(p).as_posix() for p in exclude}
+    h = hashlib.sha256()
+    try:
+        # --show-prefix: root's path inside the work tree; `git status` paths are relative to the top.
+        tree = subprocess.run(["git", "rev-parse", "--show-prefix", "HEAD^{tree}"], cwd=root_path,
+                              capture_output=True, text=True, timeout=30)
+        status = subprocess.run(
+            ["git", "status", "--porcelain=v1", "-z", "--untracked-files=all", "--no-renames"]
+            + (["--ignored"] if ignored else []) + ["."],
+            cwd=root_path, capture_output=True, timeout=60,
+        )
+        git_ok = tree.returncode == 0 and status.returncode == 0
+    except Exception:
+        git_ok = False
+    if git_ok:
+        prefix, _, tree_id = tree.stdout.partition("\n")
+        h.update(tree_id.strip().encode())
+        for entry in status.stdout.split(b"\0"):
+            if len(entry) < 4:
+                continue
+            rel = entry[3:].decode("utf-8", "replace")
+            if prefix and rel.startswith(prefix):
+                rel = rel[len(prefix):]  # `status .` only lists paths below root
+            if rel in skip or (ignored and rel.startswith(CACHE_DIR.parts[0] + "/")):
+                continue
+            h.update(entry)
+            try:
+                st = (root_path / rel).stat()
+                h.update(f"{st.st_size}:{st.st_mtime_ns}".encode())
+            except OSError:
+                h.update(b"-")
+        return "git:" + h.hexdigest()[:32]
+    from .inventory import SKIP_DIRS, walk_tree
+
+    for dirpath, dirnames, filenames in walk_tree(root_path, (".git", CACHE_DIR.parts[0]) if ignored else SKIP_DIRS):
+        dirnames.sort()
+        for f in sorted(filenames):
+            p = Path(dirpath) / f
+            rel = str(p.relative_to(root_path))
+            if rel in skip:
+                continue
+            try:
+                st = p.stat()
+            except OSError:
+                continue
+            h.update(f"{rel}:{st.st_size}:{st.st_mtime_ns}\n".encode())
+    return "walk:" + h.hexdigest()[:32]
+
+
+_VERSION_ARGS = {"gitleaks": ["version"]}
+
+
+def tool_version(name: str, root: str | Path = ".") -> Optional[str]:
+    """Version string of an installed tool, probed once per binary (path, size, mtime)."""
+    exe = shutil.which(name)
+    if not exe:
+        return None
+    try:
+        st = os.stat(exe)
+    except OSError:
+        return None
+    probe_key = f"{exe}:{st.st_size}:{st.st_mtime_ns}"
+    known = read_json("tools.json", root) or {}
+    if name in known and known[name].get("key") == probe_key:
+        return known[name].get("version")
+    try:
+        proc = subprocess.run([exe, *_VERSION_ARGS.get(name, ["--version"])], capture_output=True, text=True, timeout=30)
+        out = (proc.stdout or proc.stderr).strip().splitlines()
+        version = out[0].strip() if out else "unknown"
+    except Exception:
+        version = "unknown"
+    known[name] = {"key": probe_key, "version": version}
+    write_json("tools.json", known, root)
+    return version
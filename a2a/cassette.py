@@ -0,0 +1,252 @@
+from __future__ import annotations
+
+import atexit
+import gzip
+import hashlib
+import json
+import math
+import os
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+MODES = ("record", "replay")
+_CHUNK_CHARS = 48  # replayed streams are cut into chunks of about this size
+
+
+class CassetteMiss(LookupError):
+    """Raised in replay mode when a request was not recorded (and misses are not passed through)."""
+
+
+def request_key(task: str, system: Optional[str], prompt: str, max_tokens: int,
+                prefer: Optional[str], tier: Optional[str]) -> str:
+    """Key over what the caller asked for, not the model routing picked, so replays
+    survive routing and provider changes."""
+    parts = [task, system or "", prompt, int(max_tokens), prefer or "", tier or ""]
+    return hashlib.sha256(json.dumps(parts).encode("utf-8", "surrogatepass")).hexdigest()
+
+
+class LatencyModel:
+    """Simulated model latency for replayed responses, from `A2DEV_CASSETTE_LATENCY`:
+
+    recorded (default; the latency seen while recording), none, fixed:<s>,
+    scale:<factor> (recorded x factor), uniform:<lo>,<hi>, lognormal:<median>,<sigma>.
+    Random draws are seeded (`A2DEV_CASSETTE_SEED`, default 0), so runs repeat exactly.
+    """
+
+    def __init__(self, spec: str = "recorded", seed: int = 0):
+        self.spec = spec.strip().lower() or "recorded"
+        kind, _, args = self.spec.partition(":")
+        try:
+            self.params = [float(a) for a in args.split(",") if a.strip()]
+        except ValueError:
+            raise ValueError(f"bad latency spec {spec!r}") from None
+        need = {"recorded": 0, "none": 0, "fixed": 1, "scale": 1, "uniform": 2, "lognormal": 2}
+        if kind not in need or len(self.params) != need[kind]:
+            raise ValueError(f"bad latency spec {spec!r}; expected one of recorded, none, fixed:S, scale:F, "
+                             "uniform:LO,HI, lognormal:MEDIAN,SIGMA")
+        self.kind = kind
+        self.rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def sample(self, recorded: Optional[float]) -> float:
+        base = recorded or 0.0
+        if self.kind == "recorded":
+            return base
+        if self.kind == "none":
+            return 0.0
+        if self.kind == "fixed":
+            return self.params[0]
+        if self.kind == "scale":
+            return base * self.params[0]
+        with self._lock:
+            if self.kind == "uniform":
+                return self.rng.uniform(*self.params)
+            return self.params[0] * math.exp(self.rng.gauss(0.0, self.params[1]))
+
+
+def read_entries(path: str | Path) -> List[Dict[str, Any]]:
+    """Entries of a cassette; a truncated tail (process killed mid-write) is ignored."""
+    entries: List[Dict[str, Any]] = []
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as fh:
+            for line in fh:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    continue
+    except FileNotFoundError:
+        pass
+    except (EOFError, OSError):
+        pass  # keep what was readable before the damaged/unfinished gzip member
+    return entries
+
+
+class Cassette:
+    """Request -> response pairs in a gzip-compressed JSONL file.
+
+    Record mode appends one line per completed call (a new gzip member per session,
+    flushed after each line). Replay mode serves responses in recorded order for
+    repeated requests and sleeps a simulated latency, while counting the model time
+    that was simulated, so wall time minus simulated time is orchestrator overhead.
+    """
+
+    def __init__(self, path: str | Path, mode: str = "replay", latency: Optional[LatencyModel] = None,
+                 passthrough: bool = False):
+        if mode not in MODES:
+            raise ValueError(f"cassette mode must be one of {MODES}, not {mode!r}")
+        self.path = Path(path)
+        self.mode = mode
+        self.latency = latency or LatencyModel()
+        self.passthrough = passthrough
+        self.started = time.monotonic()
+        self.calls = 0
+        self.misses = 0
+        self.model_seconds = 0.0      # latency as recorded
+        self.simulated_seconds = 0.0  # delay actually applied while replaying
+        self._lock = threading.Lock()
+        self._fh: Any = None
+        self._entries: Dict[str, List[Dict[str, Any]]] = {}
+        self._next: Dict[str, int] = {}
+        self.live = False  # replay: whether the recording came from live providers
+        if mode == "replay":
+            if not self.path.exists():
+                raise FileNotFoundError(f"cassette not found: {self.path}")
+            for entry in read_entries(self.path):
+                self._entries.setdefault(entry["key"], []).append(entry)
+                self.live = self.live or bool(entry.get("live"))
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    def record(self, key: str, task: str, prompt: str, text: str, latency: Optional[float], live: bool = False) -> None:
+        line = json.dumps({"key": key, "task": task, "prompt_head": prompt[:120], "text": text, "live": live,
+                           "latency": None if latency is None else round(latency, 4), "ts": time.time()})
+        with self._lock:
+            if self._fh is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._fh = gzip.open(self.path, "at", encoding="utf-8")
+            self._fh.write(line + "\n")
+            self._fh.flush()
+            self.calls += 1
+            self.model_seconds += latency or 0.0
+
+    def _take(self, key: str, task: str, prompt: str) -> Optional[Tuple[str, float]]:
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                self.misses += 1
+                if self.passthrough:
+                    return None
+                raise CassetteMiss(f"no recorded response for task={task} prompt={prompt[:60]!r} ({self.path})")
+            i = self._next.get(key, 0)
+            self._next[key] = i + 1
+            entry = entries[i % len(entries)]
+            self.calls += 1
+            self.model_seconds += entry.get("latency") or 0.0
+            delay = self.latency.sample(entry.get("latency"))
+            self.simulated_seconds += delay
+        return entry["text"], delay
+
+    def replay(self, key: str, task: str, prompt: str) -> Optional[str]:
+        """The recorded response after the simulated delay; None on a passed-through miss."""
+        hit = self._take(key, task, prompt)
+        if hit is None:
+            return None
+        text, delay = hit
+        if delay > 0:
+            time.sleep(delay)
+        return text
+
+    def replay_stream(self, key: str, task: str, prompt: str) -> Optional[Iterator[str]]:
+        """Recorded text in chunks, the simulated delay spread across them."""
+        hit = self._take(key, task, prompt)
+        if hit is None:
+            return None
+        text, delay = hit
+        chunks = [text[i:i + _CHUNK_CHARS] for i in range(0, len(text), _CHUNK_CHARS)] or [""]
+
+        def gen() -> Iterator[str]:
+            for chunk in chunks:
+                if delay > 0:
+                    time.sleep(delay / len(chunks))
+                yield chunk
+
+        return gen()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+
+    def report(self) -> str:
+        wall = time.monotonic() - self.started
+        if not self.replaying:
+            return (f"[A2Dev] cassette {self.path}: {self.calls} call(s) recorded, model time "
+                    f"{self.model_seconds:.2f}s, wall {wall:.2f}s")
+        return (f"[A2Dev] cassette {self.path}: {self.calls} call(s) replayed ({self.misses} missed), "
+                f"recorded model time {self.model_seconds:.2f}s, simulated {self.simulated_seconds:.2f}s "
+                f"(latency={self.latency.spec}), wall {wall:.2f}s, overhead {wall - self.simulated_seconds:.2f}s")
+
+
+_ACTIVE: Optional[Cassette] = None
+_ACTIVE_LOCK = threading.Lock()
+_EXIT_HOOKED = False
+
+
+def _at_exit() -> None:
+    if _ACTIVE is None:
+        return
+    _ACTIVE.close()
+    if os.getenv("A2DEV_CASSETTE_REPORT", "").lower() in ("1", "true", "yes", "on"):
+        print(_ACTIVE.report(), file=sys.stderr)
+
+
+def active_cassette() -> Optional[Cassette]:
+    """The process-wide cassette configured by `A2DEV_CASSETTE=<path.jsonl.gz>`, if any.
+
+    `A2DEV_CASSETTE_MODE` is record or replay (default); `A2DEV_CASSETTE_MISS=passthrough`
+    lets unrecorded requests fall through to the normal (stubbed or live) path.
+    """
+    global _ACTIVE, _EXIT_HOOKED
+    path = os.getenv("A2DEV_CASSETTE", "").strip()
+    if not path:
+        return None
+    with _ACTIVE_LOCK:
+        if _ACTIVE is None or _ACTIVE.path != Path(path):
+            if not _EXIT_HOOKED:
+                atexit.register(_at_exit)
+                _EXIT_HOOKED = True
+            if _ACTIVE is not None:
+                _ACTIVE.close()
+            try:
+                seed = int(os.getenv("A2DEV_CASSETTE_SEED", "0") or 0)
+            except ValueError:
+                seed = 0
+            _ACTIVE = Cassette(
+                path,
+                mode=os.getenv("A2DEV_CASSETTE_MODE", "replay").strip().lower(),
+                latency=LatencyModel(os.getenv("A2DEV_CASSETTE_LATENCY", "recorded"), seed),
+                passthrough=os.getenv("A2DEV_CASSETTE_MISS", "").lower() == "passthrough",
+            )
+        return _ACTIVE
+
+
+def summarize_file(path: str | Path) -> Dict[str, Any]:
+    """Counts and recorded latency figures for `a2dev cassette info`."""
+    entries = read_entries(path)
+    latencies = sorted(e["latency"] for e in entries if e.get("latency") is not None)
+    tasks: Dict[str, int] = {}
+    for e in entries:
+        tasks[e.get("task") or "?"] = tasks.get(e.get("task") or "?", 0) + 1
+
+    def q(p: float) -> Optional[float]:
+        return latencies[min(len(latencies) - 1, int(p * len(latencies)))] if latencies else None
+
+    return {"path": str(path), "entries": len(entries), "requests": len({e["key"] for e in entries}),
+            "tasks": tasks, "model_seconds": sum(latencies), "p50": q(0.5), "p95": q(0.95)}
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import json
+import math
+import shutil
+import subprocess
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .cache import read_json, write_json
+
+CACHE_NAME = "churn.json"
+MAX_AUTHORS_PER_FILE = 32
+HOTSPOTS_PATH = Path("docs/analyst/hotspots.json")
+LOG_TIMEOUT = 300.0
+
+
+def _git(args: List[str], cwd: str) -> Optional[str]:
+    try:
+        proc = subprocess.run(["git", *args], cwd=cwd, capture_output=True, text=True, timeout=30)
+    except Exception:
+        return None
+    return proc.stdout.strip() if proc.returncode == 0 else None
+
+
+def _accumulate(files: Dict[str, Dict[str, Any]], cwd: str, rev_range: str) -> Optional[int]:
+    """Stream `git log --numstat` for rev_range into files; returns commits seen.
+
+    Output is consumed line by line, so memory is bounded by the number of tracked
+    paths rather than the size of the history. Returns None when git fails or is
+    killed after LOG_TIMEOUT seconds: `files` then holds only part of the range.
+    """
+    cmd = ["git", "log", "--no-renames", "--numstat", "--relative", "--format=%x00%H%x00%aN", rev_range]
+    proc = subprocess.Popen(cmd, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, errors="replace")
+    watchdog = threading.Timer(LOG_TIMEOUT, proc.kill)
+    watchdog.daemon = True
+    watchdog.start()
+    commits = 0
+    author = ""
+    assert proc.stdout is not None
+    try:
+        for line in proc.stdout:
+            if line.startswith("\x00"):
+                _, _sha, author = line.rstrip("\n").split("\x00", 2)
+                commits += 1
+                continue
+            parts = line.rstrip("\n").split("\t", 2)
+            if len(parts) != 3:
+                continue
+            added, deleted, path = parts
+            rec = files.get(path)
+            if rec is None:
+                rec = files[path] = {"commits": 0, "added": 0, "deleted": 0, "authors": []}
+            rec["commits"] += 1
+            rec["added"] += int(added) if added.isdigit() else 0
+            rec["deleted"] += int(deleted) if deleted.isdigit() else 0
+            authors = rec["authors"]
+            if author not in authors and len(authors) < MAX_AUTHORS_PER_FILE:
+                authors.append(author)
+    finally:
+        proc.stdout.close()
+        code = proc.wait()
+        watchdog.cancel()
+    return commits if code == 0 else None
+
+
+def _merge(files: Dict[str, Dict[str, Any]], delta: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    out = {path: dict(rec, authors=list(rec.get("authors", []))) for path, rec in files.items()}
+    for path, d in delta.items():
+        rec = out.get(path)
+        if rec is None:
+            out[path] = d
+            continue
+        for k in ("commits", "added", "deleted"):
+            rec[k] = rec.get(k, 0) + d[k]
+        for a in d["authors"]:
+            if a not in rec["authors"] and len(rec["authors"]) < MAX_AUTHORS_PER_FILE:
+                rec["authors"].append(a)
+    return out
+
+
+def collect_churn(root: str = ".", refresh: bool = False) -> Dict[str, Dict[str, Any]]:
+    """Per-file change counts and authors from git history, updated incrementally.
+
+    The last processed commit is cached under .a2dev/cache; later runs only read
+    commits after it. A rewritten history (cached head no longer an ancestor)
+    triggers a full rebuild. Returns {} outside a git work tree.
+    """
+    if not shutil.which("git"):
+        return {}
+    head = _git(["rev-parse", "HEAD"], root)
+    if not head:
+        return {}
+    cached = None if refresh else read_json(CACHE_NAME, root)
+    files: Dict[str, Dict[str, Any]] = {}
+    rev_range = head
+    if cached and cached.get("head"):
+        if cached["head"] == head:
+            return cached.get("files", {})
+        if _git(["merge-base", "--is-ancestor", cached["head"], head], root) is not None:
+            files = cached.get("files", {})
+            rev_range = f"{cached['head']}..{head}"
+    delta: Dict[str, Dict[str, Any]] = {}
+    ok = _accumulate(delta, root, rev_range) is not None
+    files = _merge(files, delta)
+    if ok:
+        write_json(CACHE_NAME, {"head": head, "files": files}, root)
+    # else: a failed/partial log is used for this run only; the cache keeps its old head
+    return files
+
+
+def hotspot_scores(
+    churn: Dict[str, Dict[str, Any]],
+    metrics: Dict[str, Dict[str, Any]],
+    top: int = 20,
+) -> List[Dict[str, Any]]:
+    """Rank current source files by churn x size x complexity.
+
+    Each signal is normalised to [0, 1] against the repo maximum; size uses a log
+    scale so a single generated file does not dominate. Without git history every
+    file counts as one change, which degrades to a size/complexity ranking.
+    """
+    if not metrics:
+        return []
+    max_commits = max((churn.get(p, {}).get("commits", 0) for p in metrics), default=0) or 1
+    max_size = max((math.log1p(m.get("code", 0)) for m in metrics.values()), default=0) or 1
+    max_cx = max((m.get("complexity", 0) or 0 for m in metrics.values()), default=0)
+    rows: List[Dict[str, Any]] = []
+    for path, m in metrics.items():
+        c = churn.get(path, {})
+        commits = c.get("commits", 0) if churn else 1
+        size_n = math.log1p(m.get("code", 0)) / max_size
+        if max_cx and m.get("lang") == "python":
+            weight = 0.5 * size_n + 0.5 * ((m.get("complexity", 0) or 0) / max_cx)
+        else:
+            weight = size_n
+        score = (commits / max_commits) * weight
+        if score <= 0:
+            continue
+        rows.append({
+            "path": path,
+            "score": round(score, 4),
+            "commits": commits,
+            "authors": len(c.get("authors", [])),
+            "added": c.get("added", 0),
+            "deleted": c.get("deleted", 0),
+            "code": m.get("code", 0),
+            "complexity": m.get("complexity", 0) or 0,
+        })
+    rows.sort(key=lambda r: (-r["score"], r["path"]))
+    return rows[:top]
+
+
+def compute_hotspots(root: str = ".", top: int = 20, refresh: bool = False) -> Dict[str, Any]:
+    from .inventory import iter_source_files
+    from .metrics import collect_metrics
+
+    metrics = collect_metrics(root, iter_source_files(root))
+    churn = collect_churn(root, refresh=refresh)
+    return {
+        "source": "git" if churn else "size",
+        "files": hotspot_scores(churn, metrics, top=top),
+    }
+
+
+def write_hotspots(data: Dict[str, Any], path: Path = HOTSPOTS_PATH) -> str:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, indent=2))
+    return str(path)
+
+
+def read_hotspots(path: Path = HOTSPOTS_PATH) -> List[Dict[str, Any]]:
+    if not path.exists():
+        return []
+    try:
+        return json.loads(path.read_text()).get("files", [])
+    except Exception:
+        return []
@@ -0,0 +1,126 @@
+"""Thin client for the `a2dev serve` daemon.
+
+Kept to the standard library and free of other `a2a` imports: the CLI shims call
+`run_via_daemon` before importing the CLI, so a warm daemon answers without the
+import and argparse cost of a fresh process.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import sys
+from typing import Any, Dict, List, Optional
+
+RUN_DIR = os.path.join(".a2dev", "run")
+SOCKET_NAME = "a2dev.sock"
+CONNECT_TIMEOUT = 0.5
+
+# Commands that prompt, install, manage the daemon itself or must not share a
+# process with others; bin/a2dev.js keeps the same list.
+NOT_SERVED = frozenset({"serve", "batch", "install", "init", "uninstall", "setup", "quickstart", "bootstrap"})
+LOCAL_FLAGS = frozenset({"--dry-run", "--fix"})
+
+# Client environment forwarded with each request (the daemon's own env is the base).
+ENV_PREFIXES = ("A2DEV_", "A2A_", "CODEX_", "OPENAI_", "ANTHROPIC_", "OLLAMA_")
+ENV_KEYS = frozenset({"MODEL_TIER"})
+
+
+class DaemonError(RuntimeError):
+    """The daemon did not run the request (refused it, or it could not be sent)."""
+
+
+def socket_path(root: str = ".") -> str:
+    # Relative to the project root: absolute socket paths can exceed the ~108 byte limit.
+    return os.path.join(root, RUN_DIR, SOCKET_NAME)
+
+
+def forwarded(key: str) -> bool:
+    return key.startswith(ENV_PREFIXES) or key in ENV_KEYS
+
+
+def forwarded_env() -> Dict[str, str]:
+    return {k: v for k, v in os.environ.items() if forwarded(k)}
+
+
+def served(argv: List[str]) -> bool:
+    """Whether the daemon may run `argv` (otherwise the caller runs it in-process)."""
+    if os.getenv("A2DEV_DAEMON", "1").lower() in ("0", "false", "no", "off"):
+        return False
+    cmd = next((a for a in argv if not a.startswith("-")), None)
+    return cmd is not None and cmd not in NOT_SERVED and not LOCAL_FLAGS.intersection(argv)
+
+
+def _timeout() -> float:
+    try:
+        return float(os.getenv("A2DEV_DAEMON_TIMEOUT", "600"))
+    except ValueError:
+        return 600.0
+
+
+def connect(root: str = ".") -> socket.socket:
+    """Connected socket; raises OSError when no daemon listens."""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(CONNECT_TIMEOUT)
+        sock.connect(socket_path(root))
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def call(sock: socket.socket, method: str, params: Optional[Dict[str, Any]] = None,
+         timeout: Optional[float] = None) -> Any:
+    """Send one JSON-RPC request on `sock` and return its result; DaemonError on an error reply."""
+    sock.settimeout(_timeout() if timeout is None else timeout)
+    payload = {"jsonrpc": "2.0", "id": 1, "method": method, "params": params or {}}
+    try:
+        sock.sendall(json.dumps(payload).encode() + b"\n")
+    except OSError as e:
+        raise DaemonError(f"could not send request: {e}") from None
+    buf = b""
+    while not buf.endswith(b"\n"):
+        chunk = sock.recv(65536)
+        if not chunk:
+            raise OSError("daemon closed the connection")
+        buf += chunk
+    reply = json.loads(buf)
+    if "error" in reply:
+        raise DaemonError(reply["error"].get("message", "daemon error"))
+    return reply.get("result")
+
+
+def request(method: str, params: Optional[Dict[str, Any]] = None, root: str = ".",
+            timeout: Optional[float] = None) -> Any:
+    with connect(root) as sock:
+        return call(sock, method, params, timeout)
+
+
+def run_via_daemon(argv: List[str], root: str = ".") -> Optional[int]:
+    """Run a CLI command in the daemon and relay its output.
+
+    Returns the exit code, or None when the command has to run in-process: no
+    daemon, a command it does not serve, or a request the daemon refused (stale
+    code, other project). A connection lost mid-command is reported, not retried
+    locally, since the command may already have written files.
+    """
+    if not served(argv) or not os.path.exists(socket_path(root)):
+        return None
+    try:
+        sock = connect(root)
+    except OSError:
+        return None
+    with sock:
+        try:
+            result = call(sock, "run", {"argv": list(argv), "cwd": os.getcwd(), "env": forwarded_env()})
+        except DaemonError:
+            return None
+        except (OSError, ValueError) as e:
+            sys.stderr.write(f"[A2Dev] daemon request failed: {e}\n")
+            return 1
+    sys.stdout.write(result.get("stdout", ""))
+    sys.stderr.write(result.get("stderr", ""))
+    sys.stdout.flush()
+    return int(result.get("code", 0))
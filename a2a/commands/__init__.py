@@ -0,0 +1,98 @@
+"""Subcommand registry for the `a2dev` CLI.
+
+Each subcommand lives in its own module, `a2a.commands.<name>` (dashes become
+underscores), which defines `add_arguments(parser)` and `run(args)`. The CLI
+lists every command from `COMMANDS` but imports a module, and adds its
+arguments, only for the command being dispatched, so `a2dev route ...` does not
+pay for the orchestrator, the roles or the scanners.
+"""
+
+from __future__ import annotations
+
+import importlib
+from types import ModuleType
+from typing import Dict, NamedTuple, Optional, Sequence
+
+
+class Command(NamedTuple):
+    name: str
+    help: str
+    module: Optional[str] = None  # default: the name with dashes as underscores
+
+    @property
+    def module_name(self) -> str:
+        return self.module or self.name.replace("-", "_")
+
+
+# In `a2dev --help` order.
+COMMANDS = (
+    Command("plan", "Generate backlog from PRD"),
+    Command("ux", "Generate UX doc(s) for story id(s)"),
+    Command("start", "Scaffold implementation for story id"),
+    Command("arch", "Generate ADR for story id"),
+    Command("arch-global", "Generate long-form architecture doc from PRD"),
+    Command("fe-spec", "Generate front-end spec document"),
+    Command("arch-brownfield", "Generate brownfield architecture doc"),
+    Command("assess-brownfield", "Generate brownfield assessment template"),
+    Command("brownfield-inventory", "Scan repo and write brownfield inventory summary"),
+    Command("plan-deep", "Generate deep implementation plan for story id"),
+    Command("qa-plan", "Generate QA test plan for story id"),
+    Command("threat", "Generate threat model for story id"),
+    Command("devops-plan", "Generate DevOps plan for story id"),
+    Command("data-plan", "Generate analytics spec for story id"),
+    Command("shard", "Create a story shard file linking artifacts"),
+    Command("gate", "Check required artifacts/gates for story id"),
+    Command("trace", "Generate requirements traceability matrix for story id"),
+    Command("prepare-story", "Generate all planning artifacts and gate for story id"),
+    Command("sm-prepare", "ScrumMaster: prepare artifacts, scaffold, and gate for story id"),
+    Command("analyst-brief", "Create analyst brief from PRD"),
+    Command("analyst-research", "Create analyst research doc"),
+    Command("analyst-competitors", "Create competitor analysis doc"),
+    Command("analyst-pack", "Generate analyst questions/assumptions/metrics/stakeholders/links"),
+    Command("prd-init", "Create PRD template if missing"),
+    Command("assess-viability", "Generate internal/external viability assessment"),
+    Command("phase", "Set or show the active phase"),
+    Command("assess", "Run assess-phase basics (analyst brief + backlog plan)"),
+    Command("develop", "Run develop-phase prep for story id"),
+    Command("sustain", "Run sustain-phase checks for story id"),
+    Command("pm-sprints", "PM: plan sprints from backlog"),
+    Command("story-proposals", "Generate or refine story proposals"),
+    Command("route", "Conversational router for @role and *commands"),
+    Command("timeline", "Show timeline for assess or a story"),
+    Command("smoke", "Run minimal smoke test"),
+    Command("pm", "PM: guide and run next steps"),
+    Command("bootstrap", "Check environment and suggest setup steps"),
+    Command("plans", "Show plan file locations and optionally open them"),
+    Command("init", "Initialize A2Dev files into a project"),
+    Command("install", "Install (init + optional bootstrap; setup menu is now opt-in)"),
+    Command("brownfield", "One-shot brownfield wizard: inventory, architecture snapshot, assessment, and optional assess/PRD update"),
+    Command("setup", "Run interactive setup menu (greenfield/brownfield/audit)"),
+    Command("quickstart", "Alias for setup (interactive menu)", module="setup"),
+    Command("audit", "Run code quality audit (semgrep + gitleaks) and summarize"),
+    Command("doctor", "Run environment + project readiness checks and summarize"),
+    Command("precommit", "Scan staged blobs with local rules + secrets scanner (used by the pre-commit hook)"),
+    Command("cache", "Inspect or clear the cached external tool results (.a2dev/cache)"),
+    Command("models", "Model routing telemetry (latency, tokens, cost per model and task)"),
+    Command("cassette", "Inspect LLM record/replay cassettes (A2DEV_CASSETTE)"),
+    Command("search", "Search code (trigram index when built, else rg/grep) with bounded output"),
+    Command("symbols", "Query the native symbol index (definitions/references)"),
+    Command("code-index", "Build or update the trigram code search index (.a2dev/cache)"),
+    Command("serve", "Run the warm daemon (JSON-RPC on .a2dev/run/a2dev.sock) that thin clients use first"),
+    Command("batch", "Run JSONL commands from stdin or a file in one process (one JSON result per line)"),
+    Command("uninstall", "Uninstall A2Dev scaffolding from a project (conservative)"),
+    Command("risk", "Set or show story risk level"),
+    Command("qa-design", "Generate QA design review for story id"),
+    Command("sm-cycle", "SM: prepare, branch, scaffold, and create PR draft for story"),
+)
+
+BY_NAME: Dict[str, Command] = {c.name: c for c in COMMANDS}
+
+
+def load(name: str) -> ModuleType:
+    """Import the module implementing command `name` (KeyError for unknown commands)."""
+    return importlib.import_module(f"{__name__}.{BY_NAME[name].module_name}")
+
+
+def command_in(argv: Sequence[str]) -> Optional[str]:
+    """The subcommand named in a CLI argv, if any (top-level options take no values)."""
+    return next((a for a in argv if not a.startswith("-")), None)
@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+import argparse
+
+from ..roles.analyst import AnalystRole
+
+
+def add_arguments(p: argparse.ArgumentParser) -> None:
+    p.add_argument("prd", type=str)
+
+
+def run(args: argparse.Namespace) -> None:
+    role = AnalystRole()
+    out = role.write("brief", role.brief_from_prd(args.prd))
+    print(f"Analyst brief written: {out}")
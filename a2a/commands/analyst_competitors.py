@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+import argparse
+
+from ..roles.analyst import AnalystRole
+
+
+def add_arguments(p: argparse.ArgumentParser) -> None:
+    p.add_argument("topic", type=str)
+
+
+def run(args: argparse.Namespace) -> None:
+    role = AnalystRole()
+    out = role.write("competitors", role.competitors(args.topic))
+    print(f"Competitor analysis written: {out}")
@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+import argparse
+
+from ..roles.analyst import AnalystRole
+
+
+def add_arguments(p: argparse.ArgumentParser) -> None:
+    pass
+
+
+def run(args: argparse.Namespace) -> None:
+    role = AnalystRole()
+    paths = [
+        role.write("questions", role.questions()),
+        role.write("assumptions", role.assumptions()),
+        role.write("success-metrics", role.success_metrics()),
+        role.write("stakeholders", role.stakeholders()),
+        role.write("links", role.links()),
+    ]
+    print("Analyst pack written:\n- " + "\n- ".join(paths))
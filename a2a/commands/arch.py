@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from ..roles.architecture import ArchitectureRole
+from .common import require_backlog
+
+
+def add_arguments(p: argparse.ArgumentParser) -> None:
+    p.add_argument("id", type=int)
+
+
+def cmd_arch(story_id: int) -> None:
+    backlog = require_backlog()
+    role = ArchitectureRole()
+    text = role.adr_for_story(backlog, story_id)
+    out_dir = Path("docs/architecture")
+    out_dir.mkdir(parents=True, exist_ok=True)
+    out = out_dir / f"ADR-story-{story_id}.md"
+    out.write_text(text)
+    print(f"ADR written: {out}")
+
+
+def run(args: argparse.Namespace) -> None:
+    cmd_arch(args.id)
@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from ..roles.architecture import ArchitectureRole
+
+
+def add_arguments(p: argparse.ArgumentParser) -> None:
+    p.add_argument("--name", type=str, default="Brownfield System")
+
+
+def run(args: argparse.Namespace) -> None:
+    role = ArchitectureRole()
+    text = role.generate_brownfield_arch(args.name)
+    out_dir = Path("docs/architecture")
+    out_dir.mkdir(parents=True, exist_ok=True)
+    out = out_dir / "brownfield-architecture.md"
+    out.write_text(text)
+    print(f"Brownfield architecture doc written: {out}")
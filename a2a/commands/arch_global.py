@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from ..roles.architecture import ArchitectureRole
+
+
+def add_arguments(p: argparse.ArgumentParser) -> None:
+    p.add_argument("prd", type=str)
+
+
+def run(args: argparse.Namespace) -> None:
+    role = ArchitectureRole()
+    text = role.generate_architecture_doc(args.prd)
+    out_dir = Path("docs/architecture")
+    out_dir.mkdir(parents=True, exist_ok=True)
+    out = out_dir / "architecture.md"
+    out.write_text(text)
+    print(f"Architecture doc written: {out}")
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import argparse
+
+from ..personas import analyst_assess_guidance
+from ..roles.analyst import AnalystRole
+from ..status import format_status_line
+from ..storage import read_state, write_state
+from .common import print_codex_handoff
+from .plan import cmd_plan
+
+
+def add_arguments(p: argparse.ArgumentParser) -> None:
+    p.add_argument("prd", help="Path to PRD markdown")
+
+
+def run(args: argparse.Namespace) -> None:
+    # Analyst brief + plan backlog
+    role = AnalystRole()
+    print(analyst_assess_guidance(args.prd))
+    out = role.write("brief", role.brief_from_prd(args.prd))
+    print(f"Analyst brief written: {out}")
+    cmd_plan(args.prd)
+    state = read_state()
+    state.phase = "develop"
+    write_state(state)
+    print("Phase advanced to: develop")
+    print(format_status_line(state.phase, "Analyst", ["Analyst", "PM"], [out, "docs/backlog.json", "docs/epics.md"], [args.prd]))
+    print_codex_handoff()
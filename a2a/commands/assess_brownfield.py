@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+ASSESSMENT_TEMPLATE = """# Brownfield Assessment — {name}
+
+## Inventory
+- Components/services/modules and owners.
+
+## Integrations
+- External/internal systems and contracts.
+
+## Risks & Tech Debt
+- Hotspots and deprecations.
+
+## Migration Candidates
+- Opportunities, quick wins, long-term refactors.
+"""
+
+
+def add_arguments(p: argparse.ArgumentParser) -> None:
+    p.add_argument("--name", type=str, default="Brownfield System")
+
+
+def run(args: argparse.Namespace) -> None:
+    out_dir = Path("docs/analyst")
+    out_dir.mkdir(parents=True, exist_ok=True)
+    out = out_dir / "brownfield-assessment.md"
+    out.write_text(ASSESSMENT_TEMPLATE.format(name=args.name))
+    print(f"Brownfield assessment written: {out}")
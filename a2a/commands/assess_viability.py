@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+import argparse
+
+from ..roles.analyst import AnalystRole
+
+
+def add_arguments(p: argparse.ArgumentParser) -> None:
+    p.add_argument("prd", type=str)
+    p.add_argument("--audience", choices=["internal", "external", "both"], default="both")
+
+
+def run(args: argparse.Namespace) -> None:
+    role = AnalystRole()
+    text = role.viability_assessment(args.prd, args.audience)
+    out = role.write("viability", text)
+    print(f"Viability assessment written: {out}\nAudience: {args.audience}")
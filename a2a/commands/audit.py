@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import argparse
+import os
+from pathlib import Path
+
+from ..mcp import GitleaksAdapter, SemgrepAdapter
+from ..inventory import walk_tree
+
+AUDIT_MD = Path("docs/analyst/quality-audit.md")
+AUDIT_JSON = Path("docs/analyst/quality-audit.json")
+AUDIT_OUTPUTS = (str(AUDIT_MD), str(AUDIT_JSON), "docs/analyst/hotspots.json")
+
+
+def _audit_rules_config() -> str:
+    rules = Path('.a2dev/semgrep/rules.yml')
+    return str(rules) if rules.exists() else 'auto'
+
+
+def _audit_key(dest: Path) -> dict:
+    """Inputs that determine audit results: tree contents, rule set, and tool versions."""
+    from ..cache import file_digest, tool_version, tree_fingerprint
+    from ..rules import ENGINE_VERSION as RULES_ENGINE
+    from ..secretscan import ENGINE_VERSION as SECRETS_ENGINE
+    config = _audit_rules_config()
+    return {
+        "tree": tree_fingerprint(dest, exclude=AUDIT_OUTPUTS),
+        "rules": file_digest(config) if config != 'auto' else 'auto',
+        "tools": {**{t: tool_version(t) for t in ("semgrep", "gitleaks", "git")}, "builtin-rules": RULES_ENGINE, "builtin-secrets": SECRETS_ENGINE},
+    }
+
+
+def _audit_ttl() -> float:
+    try:
+        return float(os.getenv("A2DEV_AUDIT_TTL", "86400"))
+    except ValueError:
+        return 86400.0
+
+
+def _load_cached_audit(key: dict) -> dict | None:
+    """Return the stored audit when its inputs match `key` and it is within the TTL (<=0 disables expiry)."""
+    if not (AUDIT_JSON.exists() and AUDIT_MD.exists()):
+        return None
+    try:
+        import json as _json
+        import time as _time
+        data = _json.loads(AUDIT_JSON.read_text())
+    except Exception:
+        return None
+    if data.get("key") != key:
+        return None
+    ttl = _audit_ttl()
+    if ttl > 0 and _time.time() - float(data.get("created_at", 0)) > ttl:
+        return None
+    return data
+
+
+def _print_audit_summary(data: dict, cached: bool = False) -> None:
+    sem, leaks = data["semgrep"], data["gitleaks"]
+    print(f"- Semgrep status: {sem['status']}")
+    print(f"- Gitleaks status: {leaks['status']}")
+    print(f"- Summary: high={sem['high']}, medium={sem['medium']}, low={sem['low']}, secrets={leaks['findings']}" + (" (cached)" if cached else ""))
+
+
+def run_quality_audit(dest: Path, refresh: bool = False) -> str:
+    """Run (or reuse) the code quality audit and return the Markdown report path.
+
+    Results are stored as structured JSON next to the report and reused while the
+    tree fingerprint, rules hash and tool versions are unchanged; `refresh` forces
+    a rescan.
+    """
+    key = _audit_key(dest)
+    if not refresh:
+        cached = _load_cached_audit(key)
+        if cached:
+            _print_audit_summary(cached, cached=True)
+            return str(AUDIT_MD)
+    else:
+        from ..runcache import invalidate
+
+        invalidate(dest, "semgrep", "gitleaks")
+    # Semgrep
+    sem = SemgrepAdapter().scan(root=str(dest), config=_audit_rules_config())
+    # Gitleaks
+    leaks = GitleaksAdapter().scan(root=str(dest))
+    # Summarize (and record the run in the findings store for dedup/trends)
+    from ..findings import record_scan
+    sem_counts = {"high": 0, "medium": 0, "low": 0}
+    if isinstance(sem, dict) and sem.get('status') not in {'skipped', 'error'}:
+        sem_counts = record_scan("semgrep", "audit", sem, root=dest)
+    leak_counts = {"total": 0}
+    if isinstance(leaks, dict) and leaks.get('status') not in {'skipped', 'error'}:
+        leak_counts = record_scan("gitleaks", "audit", leaks, root=dest)
+    # Hotspots: top directories by code file count and total bytes
+    by_count: dict[str, int] = {}
+    by_bytes: dict[str, int] = {}
+    try:
+        for dirpath, dirnames, filenames in walk_tree(dest, [".git", "node_modules", ".venv", "venv", ".a2dev", ".idea", ".vscode"]):
+            rel = str(Path(dirpath).resolve().relative_to(dest.resolve())) or "."
+            c = 0; b = 0
+            for f in filenames:
+                p = Path(dirpath) / f
+                try:
+                    sz = p.stat().st_size
+                except Exception:
+                    sz = 0
+                c += 1; b += int(sz)
+            by_count[rel] = by_count.get(rel, 0) + c
+            by_bytes[rel] = by_bytes.get(rel, 0) + b
+    except Exception:
+        pass
+    top_count = sorted(by_count.items(), key=lambda kv: (-kv[1], kv[0]))[:10]
+    top_bytes = sorted(by_bytes.items(), key=lambda kv: (-kv[1], kv[0]))[:10]
+    # Hotspots: source files ranked by git churn x size x complexity
+    hot: list[dict] = []
+    try:
+        from ..churn import compute_hotspots, write_hotspots
+        hot_data = compute_hotspots(str(dest))
+        write_hotspots(hot_data)
+        hot = hot_data.get("files", [])
+    except Exception:
+        pass
+
+    import json as _json
+    import time as _time
+    data = {
+        "key": key,
+        "created_at": _time.time(),
+        "semgrep": {
+            "status": sem.get("status", "ok"),
+            **{k: sem_counts.get(k, 0) for k in ("high", "medium", "low", "new", "resolved")},
+        },
+        "gitleaks": {
+            "status": leaks.get("status", "ok"),
+            "findings": leak_counts.get("total", 0),
+            **{k: leak_counts.get(k, 0) for k in ("new", "resolved")},
+        },
+        "hotspots": hot,
+        "by_count": top_count,
+        "by_bytes": top_bytes,
+    }
+    AUDIT_MD.parent.mkdir(parents=True, exist_ok=True)
+    AUDIT_MD.write_text(_render_quality_audit(data))
+    AUDIT_JSON.write_text(_json.dumps(data, indent=2))
+    _print_audit_summary(data)
+    return str(AUDIT_MD)
+
+
+def _render_quality_audit(data: dict) -> str:
+    sem, leaks = data["semgrep"], data["gitleaks"]
+    lines = [
+        '# Code Quality Audit', '',
+        f'- Semgrep: high={sem["high"]}, medium={sem["medium"]}, low={sem["low"]} ({"skipped" if sem["status"]=="skipped" else "ok"})',
+        f'- Gitleaks: findings={leaks["findings"]} ({"skipped" if leaks["status"]=="skipped" else "ok"})',
+        f'- Since previous audit: semgrep +{sem.get("new", 0)}/-{sem.get("resolved", 0)}, '
+        f'gitleaks +{leaks.get("new", 0)}/-{leaks.get("resolved", 0)}',
+        '',
+        '## Hotspots (churn x size x complexity)',
+    ]
+    lines += [
+        f'- {h["path"]}: score={h["score"]}, commits={h["commits"]}, authors={h["authors"]}, code={h["code"]}, complexity={h["complexity"]}'
+        for h in data["hotspots"][:10]
+    ] or ['- None']
+    lines += ['', '## Hotspots (by file count)']
+    lines += [f'- {d}: {n} files' for d, n in data["by_count"]] or ['- None']
+    lines += ['', '## Hotspots (by total bytes)']
+    lines += [f'- {d}: {n} bytes' for d, n in data["by_bytes"]] or ['- None']
+    lines += [
+        '',
+        '## Recommendations',
+        '- Address high-severity findings before new feature work.',
+        '- Rotate and remove any detected secrets immediately.',
+        '- Consider stabilization epics for hotspots with significant findings or size.',
+        '- Right-size large stories touching hotspots or break them into smaller slices.',
+        '',
+    ]
+    return "\n".join(lines)
+
+
+def add_arguments(p: argparse.ArgumentParser) -> None:
+    p.add_argument("--refresh", action="store_true", help="Ignore the stored audit and rescan")
+
+
+def run(args: argparse.Namespace) -> None:
+    out = run_quality_audit(Path(".").resolve(), refresh=args.refresh)
+    print(f"Quality audit written: {out}")
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from contextlib import redirect_stdout
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from ..client import forwarded_env
+from ..daemon import run_captured
+from ..llm import request_priority
+from ..storage import deferred_writes, reload_held
+
+# Commands that cannot run inside a batch: they manage processes or read stdin themselves.
+NOT_BATCHED = frozenset({"batch", "serve"})
+
+
+def add_arguments(p: argparse.ArgumentParser) -> None:
+    p.add_argument("file", nargs="?", default="-", help="JSONL commands (default: stdin)")
+    p.add_argument("--fail-fast", action="store_true", help="Stop at the first command that exits non-zero")
+
+
+def _parse(line: str) -> Tuple[Optional[List[str]], Dict[str, Any], Any]:
+    """(argv, env, id) from one input line: `["gate", "1"]` or `{"argv": [...], "env": {...}, "id": ...}`."""
+    obj = json.loads(line)
+    if isinstance(obj, list):
+        obj = {"argv": obj}
+    if not isinstance(obj, dict):
+        raise ValueError("expected a JSON array or object")
+    argv, env = obj.get("argv"), obj.get("env") or {}
+    if not isinstance(argv, list) or not argv or not all(isinstance(a, str) for a in argv):
+        raise ValueError("argv must be a non-empty list of strings")
+    if not isinstance(env, dict):
+        raise ValueError("env must be an object")
+    return argv, env, obj.get("id")
+
+
+def _refusal(argv: List[str]) -> Optional[str]:
+    cmd = next((a for a in argv if not a.startswith("-")), None)
+    if cmd in NOT_BATCHED:
+        return f"not available in a batch: {cmd}"
+    if "--dry-run" in argv and os.getenv("A2DEV_DRY_RUN") != "1":
+        return "--dry-run applies to the whole process; use `a2dev --dry-run batch`"
+    return None
+
+
+def run_batch(lines: Iterable[str], out=None, fail_fast: bool = False) -> Tuple[int, int]:
+    """Run JSONL command lines in this process, writing one JSON result per line to `out`.
+
+    Backlog/state reads are shared in memory across the commands and backlog,
+    state and board are written once, when the batch ends; existence checks see the
+    held writes (`storage.exists`). A command that exits non-zero leaves no unwritten
+    in-memory changes behind. Returns (run, failed).
+    """
+    out = out or sys.stdout
+    cwd = os.getcwd()
+    base_env = forwarded_env()
+    ran = failed = 0
+    # Anything printed outside a command (e.g. dry-run notes from the final flush) goes to
+    # stderr, so `out` stays pure JSONL.
+    with request_priority("batch"), redirect_stdout(sys.stderr), deferred_writes():
+        for n, line in enumerate(lines, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            t0 = time.perf_counter()
+            try:
+                argv, env, rid = _parse(line)
+            except ValueError as e:
+                argv, rid = None, None
+                result: Dict[str, Any] = {"code": 2, "stdout": "", "stderr": f"line {n}: {e}\n"}
+            else:
+                refusal = _refusal(argv)
+                if refusal:
+                    result = {"code": 2, "stdout": "", "stderr": refusal + "\n"}
+                else:
+                    try:
+                        result = run_captured(argv, {**base_env, **{k: str(v) for k, v in env.items()}})
+                    finally:
+                        os.chdir(cwd)
+                    if result["code"] != 0:
+                        reload_held()  # drop what it changed in memory but never wrote
+            ran += 1
+            failed += result["code"] != 0
+            out.write(json.dumps({"id": rid if rid is not None else n, "argv": argv, **result,
+                                  "ms": round((time.perf_counter() - t0) * 1000, 1)}) + "\n")
+            out.flush()
+            if fail_fast and result["code"] != 0:
+                break
+    return ran, failed
+
+
+def run(args: argparse.Namespace) -> None:
+    t0 = time.perf_counter()
+    if args.file == "-":
+        ran, failed = run_batch(sys.stdin, fail_fast=args.fail_fast)
+    else:
+        try:
+            fh = open(args.file, encoding="utf-8")
+        except OSError as e:
+            raise SystemExit(f"Cannot read batch file: {e}")
+        with fh:
+            ran, failed = run_batch(fh, fail_fast=args.fail_fast)
+    print(f"[A2Dev] batch: {ran} command(s), {failed} failed, {(time.perf_counter() - t0) * 1000:.0f} ms", file=sys.stderr)
+    if failed:
+        raise SystemExit(1)
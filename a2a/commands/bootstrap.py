@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+import argparse
+
+from .doctor import detect_missing_tools
+
+
+def add_arguments(p: argparse.ArgumentParser) -> None:
+    pass
+
+
+def run(args: argparse.Namespace) -> None:
+    # Environment checks
+    missing = detect_missing_tools()
+    print("A2Dev Bootstrap Check")
+    print(f"Python: OK")
+    print(f"Missing tools: {', '.join(missing) if missing else 'none'}")
+    print("Suggestions:")
+    print("- macOS: brew install ripgrep universal-ctags semgrep gitleaks")
+    print("- Debian/Ubuntu: apt install ripgrep universal-ctags && pipx install semgrep gitleaks")
+    print("- Optional: set A2A_MODEL_TIER=high|medium|low for Codex tiering")
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from ..roles.architecture import ArchitectureRole
+from .assess_brownfield import ASSESSMENT_TEMPLATE
+from .common import print_codex_handoff
+from .plan import cmd_plan
+
+
+def add_arguments(p: argparse.ArgumentParser) -> None:
+    p.add_argument("--name", type=str, default="Your App")
+    p.add_argument("--assess", action="store_true", help="Run assess after updating PRD")
+    p.add_argument("--prd", type=str, default="docs/PRD.md", help="PRD path to update (default: docs/PRD.md)")
+    p.add_argument("--append-prd", action="store_true", help="Append a Current System section based on inventory to the PRD")
+
+
+def run(args: argparse.Namespace) -> None:
+    dest = Path(".").resolve()
+    # Inventory
+    inv_paths = {}
+    try:
+        from ..inventory import write_inventory
+        inv_paths = write_inventory(str(dest))
+        print("Inventory written:\n- " + "\n- ".join(inv_paths.values()))
+    except Exception as e:
+        print(f"Inventory failed: {e}")
+    # Architecture snapshot
+    try:
+        role = ArchitectureRole()
+        out_dir = Path("docs/architecture"); out_dir.mkdir(parents=True, exist_ok=True)
+        out = out_dir / "brownfield-architecture.md"
+        out.write_text(role.generate_brownfield_arch(args.name))
+        print(f"Brownfield architecture doc written: {out}")
+    except Exception as e:
+        print(f"Brownfield architecture failed: {e}")
+    # Assessment template
+    try:
+        out_dir = Path("docs/analyst"); out_dir.mkdir(parents=True, exist_ok=True)
+        out = out_dir / "brownfield-assessment.md"
+        out.write_text(ASSESSMENT_TEMPLATE.format(name=args.name))
+        print(f"Brownfield assessment written: {out}")
+    except Exception as e:
+        print(f"Brownfield assessment failed: {e}")
+    # Append PRD with Current System section (optional)
+    prd_path = Path(args.prd)
+    if args.append_prd:
+        try:
+            prd_path.parent.mkdir(parents=True, exist_ok=True)
+            if not prd_path.exists():
+                from ..roles.analyst import AnalystRole
+                prd_path.write_text(AnalystRole().prd_template(args.name))
+            inv_json = inv_paths.get("json")
+            summary_lines = []
+            if inv_json and Path(inv_json).exists():
+                import json as _json
+                inv = _json.loads(Path(inv_json).read_text())
+                langs = inv.get("languages", {})
+                manifests = inv.get("manifests", [])
+                summary_lines.append("## Current System\n")
+                if langs:
+                    summary_lines.append("### Languages")
+                    for k, v in sorted(langs.items(), key=lambda kv: (-kv[1], kv[0])):
+                        summary_lines.append(f"- {k}: {v} files")
+                if manifests:
+                    summary_lines.append("\n### Manifests & Key Files")
+                    for m in manifests[:50]:
+                        summary_lines.append(f"- {m}")
+                summary_lines.append("")
+            else:
+                summary_lines = ["## Current System\n", "- Inventory pending", ""]
+            with prd_path.open("a", encoding="utf-8") as f:
+                f.write("\n" + "\n".join(summary_lines))
+            print(f"PRD updated with Current System: {prd_path}")
+        except Exception as e:
+            print(f"PRD update failed: {e}")
+    # Assess if requested
+    if args.assess:
+        try:
+            cmd_plan(str(prd_path))
+        except Exception as e:
+            print(f"Assess failed: {e}")
+    print("Brownfield wizard complete.")
+    print_codex_handoff()
@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+import argparse
+
+
+def add_arguments(p: argparse.ArgumentParser) -> None:
+    pass
+
+
+def run(args: argparse.Namespace) -> None:
+    from ..inventory import write_inventory
+    paths = write_inventory(".")
+    print("Brownfield inventory written:\n- " + "\n- ".join(paths.values()))
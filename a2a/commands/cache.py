@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import argparse
+
+from ..llmcache import ResponseCache
+from ..runcache import RunCache, invalidate
+
+
+def add_arguments(p: argparse.ArgumentParser) -> None:
+    cache_sub = p.add_subparsers(dest="cache_cmd", required=True)
+    cache_sub.add_parser("stats", help="Show entries and size per tool")
+    cache_sub.add_parser("clear", help="Drop cached results").add_argument("--tool", type=str, default=None, help="Only this tool (e.g. semgrep; 'llm' for LLM responses)")
+
+
+def run(args: argparse.Namespace) -> None:
+    if args.cache_cmd == "clear":
+        if args.tool == "llm":
+            with ResponseCache(".", mode="on") as llm_store:
+                n = llm_store.clear()
+        else:
+            n = invalidate(".", *([args.tool] if args.tool else []))
+        print(f"Removed {n} cached result(s)" + (f" for {args.tool}" if args.tool else ""))
+    else:
+        with RunCache(".") as store:
+            st = store.stats()
+        print(f"Run cache: {st['entries']} entries, {st['bytes'] / 1024:.1f} KiB of {st['limit'] / 1048576:.0f} MiB -> {st['path']}")
+        for tool, t in st["tools"].items():
+            print(f"- {tool}: {t['entries']} entries, {t['bytes'] / 1024:.1f} KiB, {t['hits']} hits")
+        with ResponseCache(".") as llm_store:
+            lt = llm_store.stats()
+        print(f"LLM cache ({lt['mode']}): {lt['entries']} responses, {lt['bytes'] / 1024:.1f} KiB of {lt['limit'] / 1048576:.0f} MiB, {lt['hits']} hits -> {lt['path']}")
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from ..cassette import summarize_file
+
+
+def add_arguments(p: argparse.ArgumentParser) -> None:
+    cas_sub = p.add_subparsers(dest="cassette_cmd", required=True)
+    cas_sub.add_parser("info", help="Entries, tasks and recorded latency of a cassette").add_argument("path")
+
+
+def run(args: argparse.Namespace) -> None:
+    if not Path(args.path).exists():
+        raise SystemExit(f"[A2Dev] cassette not found: {args.path}")
+    info = summarize_file(args.path)
+    print(f"Cassette {info['path']}: {info['entries']} responses for {info['requests']} distinct requests")
+    if info["p50"] is not None:
+        print(f"Recorded model time {info['model_seconds']:.2f}s (p50 {info['p50']:.2f}s, p95 {info['p95']:.2f}s)")
+    for task, n in sorted(info["tasks"].items()):
+        print(f"- {task}: {n}")
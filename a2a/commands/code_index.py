@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+import argparse
+
+from ..trigram import TrigramIndex
+
+
+def add_arguments(p: argparse.ArgumentParser) -> None:
+    p.add_argument("--rebuild", action="store_true", help="Discard the existing index and rebuild")
+    p.add_argument("--query", type=str, default=None, help="Search the index after updating it")
+
+
+def run(args: argparse.Namespace) -> None:
+    idx = TrigramIndex(".")
+    stats = idx.update(rebuild=args.rebuild)
+    print(f"Code index: {stats['files']} files, {stats['trigrams']} trigrams "
+          f"({stats['updated']} updated, {stats['removed']} removed) -> {idx.path}")
+    if args.query:
+        for path, lno, text in idx.search(args.query):
+            print(f"{path}:{lno}:{text.strip()}")
+    idx.close()
@@ -0,0 +1,111 @@
+"""Helpers shared by several subcommands (greeting/next-step output, startup scaffold)."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from ..schema import Backlog
+from ..storage import exists, read_backlog, read_state
+
+REPO_ROOT = Path(__file__).resolve().parents[2]  # the A2Dev checkout/package (templates, a2dev_cli.py)
+
+
+def require_backlog() -> Backlog:
+    backlog = read_backlog()
+    if not backlog:
+        raise SystemExit("No backlog found. Run plan first.")
+    return backlog
+
+
+def print_welcome() -> None:
+    art = r"""
+      ___   ____   ____
+     / _ | / __ \ / __ \  _   _  __
+    / __ |/ /_/ // /_/ / | | / |/ /
+   /_/ |_|\____/ \____/  |_|/__/__/  A2Dev — Agile ADDIE Dev Framework
+    """
+    print(art)
+
+
+def print_next_steps(dest: Path) -> None:
+    print("\nNext steps:")
+    print("- Copy sample env: cp .env.example .env.local")
+    print("- Bootstrap checks: a2dev bootstrap")
+    print("- Meet the Analyst: a2dev route '@analyst' (or type @analyst in Codex chat)")
+    print("- Prepare a story: a2dev pm story 1")
+    print("- Optional pre-commit: cp .a2dev/hooks/pre-commit.sample .git/hooks/pre-commit && chmod +x .git/hooks/pre-commit")
+    readme = dest / "README_A2Dev.md"
+    if readme.exists():
+        print(f"- Read the guide: {readme}")
+
+
+def print_codex_handoff() -> None:
+    try:
+        bl = read_backlog()
+        first_id = None
+        if bl:
+            for e in bl.epics:
+                if e.stories:
+                    first_id = e.stories[0].id
+                    break
+    except Exception:
+        first_id = None
+    print("\nHandoff to Codex:")
+    print("- Start your Codex IDE/Web harness and enable the router (see tools/codex_router_example.py).")
+    print("- In chat, type: @pm develop {id}  (or @pm next)".format(id=(first_id or 1)))
+    print("- Or from CLI: a2dev route '@pm develop {id}'".format(id=(first_id or 1)))
+
+
+def read_autogen_plan() -> dict:
+    from json import loads
+    p = Path('.a2dev/autogen_on_startup.json')
+    if p.exists():
+        try:
+            return loads(p.read_text())
+        except Exception:
+            return {}
+    return {}
+
+
+def write_autogen_plan(obj: dict) -> None:
+    from json import dumps
+    Path('.a2dev').mkdir(parents=True, exist_ok=True)
+    Path('.a2dev/autogen_on_startup.json').write_text(dumps(obj, indent=2))
+
+
+def ensure_startup_scaffold() -> None:
+    plan = read_autogen_plan()
+    st = read_state()
+    changed = False
+    # PRD
+    if plan.get('prd', False):
+        prd = Path(getattr(st, 'prd_path', 'docs/PRD.md'))
+        if not prd.exists():
+            prd.parent.mkdir(parents=True, exist_ok=True)
+            tpl = Path('.a2dev/templates/prd.md')
+            if tpl.exists():
+                prd.write_text(tpl.read_text().replace('{{project_name}}', 'Project'))
+                changed = True
+        plan.pop('prd', None)
+    # Backlog
+    if plan.get('backlog', False):
+        bl = Path(getattr(st, 'backlog_path', 'docs/backlog.json'))
+        if not exists(bl):
+            bl.parent.mkdir(parents=True, exist_ok=True)
+            tpl = Path('.a2dev/templates/backlog.json')
+            if tpl.exists():
+                bl.write_text(tpl.read_text())
+                changed = True
+        plan.pop('backlog', None)
+    # Board
+    if plan.get('board', False):
+        bd = Path(getattr(st, 'board_path', 'docs/status/board.md'))
+        if not exists(bd):
+            bd.parent.mkdir(parents=True, exist_ok=True)
+            tpl = Path('.a2dev/templates/status/board.md')
+            if tpl.exists():
+                bd.write_text(tpl.read_text())
+                changed = True
+        plan.pop('board', None)
+    if changed or plan:
+        write_autogen_plan(plan)
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+import argparse
+
+from ..roles.data import DataRole
+from .common import require_backlog
+
+
+def add_arguments(p: argparse.ArgumentParser) -> None:
+    p.add_argument("id", type=int)
+
+
+def cmd_data_plan(story_id: int) -> None:
+    backlog = require_backlog()
+    role = DataRole()
+    text = role.analytics_spec_for_story(backlog, story_id)
+    out = role.write_spec(text, story_id)
+    print(f"Analytics spec written: {out}")
+
+
+def run(args: argparse.Namespace) -> None:
+    cmd_data_plan(args.id)
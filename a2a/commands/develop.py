@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+import argparse
+
+from ..orchestrator import Orchestrator
+from ..personas import pm_develop_guidance, pm_gate_feedback
+from ..status import format_status_line
+from ..storage import read_state
+
+
+def add_arguments(p: argparse.ArgumentParser) -> None:
+    p.add_argument("id", type=int)
+
+
+def run(args: argparse.Namespace) -> None:
+    orch = Orchestrator()
+    print(pm_develop_guidance(args.id))
+    result = orch.prepare_story(args.id, also_scaffold=False)
+    print(pm_gate_feedback(result.get("gate", False), result.get("issues", [])))
+    state = read_state()
+    print(format_status_line(state.phase, "PM", result.get("agents", []), result.get("artifacts", {}).get("created", []), result.get("referenced", []), gate=("PASS" if result.get("gate") else "FAIL")))
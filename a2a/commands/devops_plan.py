@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+import argparse
+
+from ..roles.devops import DevOpsRole
+from .common import require_backlog
+
+
+def add_arguments(p: argparse.ArgumentParser) -> None:
+    p.add_argument("id", type=int)
+
+
+def cmd_devops_plan(story_id: int) -> None:
+    backlog = require_backlog()
+    role = DevOpsRole()
+    text = role.plan_for_story(backlog, story_id)
+    out = role.write_plan(text, story_id)
+    print(f"DevOps plan written: {out}")
+
+
+def run(args: argparse.Namespace) -> None:
+    cmd_devops_plan(args.id)
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import argparse
+import os
+from pathlib import Path
+
+from ..storage import exists
+
+
+def detect_missing_tools() -> list[str]:
+    missing: list[str] = []
+    from shutil import which
+    for tool in ("rg", "ctags", "semgrep", "gitleaks"):
+        if which(tool) is None:
+            missing.append(tool)
+    return missing
+
+
+def install_tools(missing: list[str]) -> None:
+    if not missing:
+        print("- All recommended tools are installed.")
+        return
+    import platform
+    os_name = platform.system().lower()
+    print(f"- Attempting install for: {', '.join(missing)}")
+    cmds: list[list[str]] = []
+    # Build commands per platform and tool availability
+    from shutil import which
+    if os_name == "darwin" and which("brew"):
+        # Homebrew: install each formula if missing
+        formula_map = {"rg": "ripgrep", "ctags": "universal-ctags", "semgrep": "semgrep", "gitleaks": "gitleaks"}
+        to_install = [formula_map[t] for t in missing if t in formula_map]
+        if to_install:
+            cmds.append(["brew", "install", *to_install])
+    elif os_name == "linux":
+        # Debian/Ubuntu apt for rg/ctags; pipx for semgrep/gitleaks if available
+        aptables = [t for t in missing if t in ("rg", "ctags")]
+        if aptables and which("apt"):
+            # Map rg->ripgrep, ctags->universal-ctags
+            apt_pkgs = ["ripgrep" if t == "rg" else "universal-ctags" for t in aptables]
+            cmds.append(["sudo", "apt", "update"])
+            cmds.append(["sudo", "apt", "install", "-y", *apt_pkgs])
+        pipxables = [t for t in missing if t in ("semgrep", "gitleaks")]
+        if pipxables and which("pipx"):
+            for t in pipxables:
+                cmds.append(["pipx", "install", t])
+    elif os_name == "windows":
+        if which("choco"):
+            # Best-effort chocolatey install
+            choco_map = {"rg": "ripgrep", "ctags": "universal-ctags", "semgrep": "semgrep", "gitleaks": "gitleaks"}
+            pkgs = [choco_map[t] for t in missing if t in choco_map]
+            if pkgs:
+                cmds.append(["choco", "install", "-y", *pkgs])
+        elif which("winget"):
+            # Winget per package (names may vary across sources)
+            winget_map = {"rg": "BurntSushi.ripgrep", "semgrep": "Semgrep.semgrep"}
+            for t in missing:
+                if t in winget_map:
+                    cmds.append(["winget", "install", "--silent", winget_map[t]])
+
+    if not cmds:
+        print("- Could not determine an automatic install path for your platform or package manager. Please install manually.")
+        return
+    # Confirm
+    try:
+        ans = input("Run the following commands? (y/N)\n- " + "\n- ".join(" ".join(c) for c in cmds) + "\n> ").strip().lower()
+    except EOFError:
+        ans = "n"
+    if ans != "y":
+        print("- Skipping automatic install.")
+        return
+    import subprocess
+    for c in cmds:
+        try:
+            print("$", " ".join(c))
+            if os.getenv("A2DEV_DRY_RUN") == "1":
+                print("[DRY-RUN] Would run:", " ".join(c))
+            else:
+                subprocess.run(c, check=False)
+        except Exception as e:
+            print(f"- Command failed: {' '.join(c)} — {e}")
+
+
+def install_missing_tools_interactive(dest: Path) -> None:
+    missing = detect_missing_tools()
+    if not missing:
+        print("- All recommended tools are present.")
+        return
+    install_tools(missing)
+    # Re-check
+    remaining = detect_missing_tools()
+    print(f"- Remaining missing tools: {', '.join(remaining) if remaining else 'none'}")
+
+
+def add_arguments(p: argparse.ArgumentParser) -> None:
+    p.add_argument("--fix", action="store_true", help="Attempt to install missing recommended tools")
+    p.add_argument("--refresh", action="store_true", help="Ignore the stored audit and rescan")
+
+
+def run(args: argparse.Namespace) -> None:
+    from .audit import run_quality_audit
+
+    print("A2Dev Doctor — Checking your environment and project readiness…")
+    dest = Path(".").resolve()
+    # Tooling
+    missing = detect_missing_tools()
+    if args.fix and missing:
+        install_tools(missing)
+        # refresh
+        missing = detect_missing_tools()
+    # PRD/backlog
+    prd = dest / "docs" / "PRD.md"
+    bl_ok = exists("docs/backlog.json")
+    prd_ok = prd.exists()
+    # Audit summary
+    qa_out = run_quality_audit(dest, refresh=args.refresh)
+    # Guidance
+    print("\nDoctor Summary:")
+    print(f"- Tools missing: {', '.join(missing) if missing else 'none'}")
+    print(f"- PRD present: {'yes' if prd_ok else 'no'}")
+    print(f"- Backlog present: {'yes' if bl_ok else 'no'}")
+    print(f"- Quality audit: {qa_out}")
+    print("\nNext steps:")
+    if not prd_ok:
+        print("- Run: a2dev quickstart → choose 'Start Fresh' or 'I come prepared'")
+    elif not bl_ok:
+        print("- Run: a2dev assess docs/PRD.md")
+    else:
+        print("- Run: a2dev pm next (or a2dev setup for menu)")
+    if missing:
+        print("- Install tools: ripgrep, universal-ctags, semgrep, gitleaks (tip: a2dev doctor --fix)")
+    print("- Optional: install pre-commit (gitleaks+semgrep) from .a2dev/hooks/")
@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from ..roles import UXRole
+
+
+def add_arguments(p: argparse.ArgumentParser) -> None:
+    p.add_argument("--name", type=str, default="Project")
+
+
+def run(args: argparse.Namespace) -> None:
+    role = UXRole()
+    text = role.frontend_spec(args.name)
+    out_dir = Path("docs/architecture")
+    out_dir.mkdir(parents=True, exist_ok=True)
+    out = out_dir / "front-end-spec.md"
+    out.write_text(text)
+    print(f"Front-end spec written: {out}")
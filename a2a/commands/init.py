@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import argparse
+import shutil
+from pathlib import Path
+
+from .common import REPO_ROOT, print_next_steps, print_welcome
+
+
+def append_agents_addendum(dest: Path) -> None:
+    """Append a non-destructive A2Dev addendum to AGENTS.md if present.
+
+    Idempotent: checks for a marker header before appending.
+    """
+    path = dest / "AGENTS.md"
+    if not path.exists():
+        return
+    try:
+        text = path.read_text(encoding="utf-8")
+    except Exception:
+        return
+    marker = "## A2Dev Addendum"
+    if marker in text:
+        return
+    addendum = "\n\n" + marker + "\n\n" + "\n".join([
+        "- Auto‑Greeting: on bare @analyst/@pm/@spm, show persona greeting + numbered options; do not start work until a choice is made.",
+        "- No‑Tool Mode: use the Inline Artifact Protocol to produce files inline:",
+        "  - >>> BEGIN: <relative/file/path>",
+        "  - …file content…",
+        "  - >>> END",
+        "- Templates (paths under .a2dev/templates/**): prd.md, backlog.json, status/board.md, story.md, ux/story.md, architecture/ADR.md, qa/plan.md, security/threat.md, devops/plan.md, data/analytics.md, security/privacy.md.",
+        "- Conversation Rules: do not break character; be explicit with numbered steps; always end replies with a one-line status: [phase] Role | Agents: … | Docs +: … | Ref: … | Gate: PASS/FAIL.",
+        "- Phase Handoffs: Assess→PM; Develop FAIL→Analyst/PM; Develop PASS→QA; QA PASS→sPM; Sustain PASS→PM.",
+        "- Privacy: if Analytics PII != none, also create docs/security/privacy/story-<id>.md (inline).",
+    ]) + "\n"
+    try:
+        path.write_text(text + addendum, encoding="utf-8")
+    except Exception:
+        pass
+
+
+def write_codex_assets(dest: Path) -> None:
+    """Write Codex harness assets (system prompt + tool definitions) under .a2dev/codex.
+    Non-destructive: only creates files if missing.
+    """
+    codex_dir = dest / ".a2dev" / "codex"
+    codex_dir.mkdir(parents=True, exist_ok=True)
+    # System prompt
+    sys_prompt = (
+        "You are the A2Dev PM/Analyst/sPM assistant. Tools are available. Routing policy:\n"
+        "- If a user message starts with @analyst/@pm/@spm/@dev or with *, ALWAYS call the route tool with the full text unchanged.\n"
+        "- If the message is not prefixed and an active role exists in .a2dev/state.json, prepend @<active_role> and call route.\n"
+        "- If no active role exists, call route with '@analyst' to begin assessment.\n"
+        "Keep responses concise, include next‑step options, and never simulate tool behavior.\n"
+        "Always print one short status line and persist artifacts under docs/* and docs/timeline/.\n"
+    )
+    sp_path = codex_dir / "system-prompt.txt"
+    if not sp_path.exists():
+        sp_path.write_text(sys_prompt)
+    # Tools (Node)
+    node_tools = {
+        "route": {
+            "name": "route",
+            "description": "Conversational router for @role and *commands",
+            "parameters": {"type": "object", "properties": {"text": {"type": "string"}}, "required": ["text"]},
+            "run": "node node_modules/a2dev/bin/a2dev.js route \"{{text}}\"",
+            "env": {"A2DEV_OUTPUT": "json"}
+        },
+        "pm_next": {
+            "name": "pm_next",
+            "description": "PM picks the next story and prepares it",
+            "parameters": {"type": "object", "properties": {"scaffold": {"type": "boolean", "default": False}}},
+            "run": "node node_modules/a2dev/bin/a2dev.js pm next {{#if scaffold}}--scaffold{{/if}}"
+        },
+        "pm_continue": {
+            "name": "pm_continue",
+            "description": "PM continues the current story or picks next",
+            "parameters": {"type": "object", "properties": {"scaffold": {"type": "boolean", "default": False}}},
+            "run": "node node_modules/a2dev/bin/a2dev.js pm continue {{#if scaffold}}--scaffold{{/if}}"
+        },
+        "pm_story": {
+            "name": "pm_story",
+            "description": "PM prepares a specific story id",
+            "parameters": {"type": "object", "properties": {"id": {"type": "integer"}, "scaffold": {"type": "boolean", "default": False}}, "required": ["id"]},
+            "run": "node node_modules/a2dev/bin/a2dev.js pm story {{id}} {{#if scaffold}}--scaffold{{/if}}"
+        },
+        "assess": {
+            "name": "assess",
+            "description": "Analyst produces brief + backlog; advances phase",
+            "parameters": {"type": "object", "properties": {"prd_path": {"type": "string"}}, "required": ["prd_path"]},
+            "run": "node node_modules/a2dev/bin/a2dev.js assess {{prd_path}}"
+        },
+        "develop": {
+            "name": "develop",
+            "description": "PM runs full develop pipeline for a story",
+            "parameters": {"type": "object", "properties": {"story_id": {"type": "integer"}}, "required": ["story_id"]},
+            "run": "node node_modules/a2dev/bin/a2dev.js develop {{story_id}}"
+        },
+        "sustain": {
+            "name": "sustain",
+            "description": "sPM runs sustainment gate",
+            "parameters": {"type": "object", "properties": {"story_id": {"type": "integer"}}, "required": ["story_id"]},
+            "run": "node node_modules/a2dev/bin/a2dev.js sustain {{story_id}}"
+        },
+        "gate_check": {
+            "name": "gate_check",
+            "description": "Check gates and return issues",
+            "parameters": {"type": "object", "properties": {"story_id": {"type": "integer"}}, "required": ["story_id"]},
+            "run": "node node_modules/a2dev/bin/a2dev.js gate {{story_id}}"
+        },
+        "timeline": {
+            "name": "timeline",
+            "description": "Show assess or story timeline",
+            "parameters": {"type": "object", "properties": {"target": {"type": "string"}}, "required": ["target"]},
+            "run": "node node_modules/a2dev/bin/a2dev.js timeline {{target}}"
+        },
+        "pm_sprints": {
+            "name": "pm_sprints",
+            "description": "Plan sprints from the backlog",
+            "parameters": {"type": "object", "properties": {"capacity": {"type": "number", "default": 20}, "weeks": {"type": "integer", "default": 2}}},
+            "run": "node node_modules/a2dev/bin/a2dev.js pm-sprints --capacity {{capacity}} --weeks {{weeks}}"
+        }
+    }
+    import json as _json
+    node_path = codex_dir / "tools.node.json"
+    if not node_path.exists():
+        node_path.write_text(_json.dumps(node_tools, indent=2))
+    # Tools (Python)
+    py_tools = node_tools.copy()
+    # Replace run strings for Python CLI
+    for k, v in list(py_tools.items()):
+        cmd = v.get("run", "")
+        py_tools[k] = {**v, "run": cmd.replace("node node_modules/a2dev/bin/a2dev.js", "python3 a2dev_cli.py")}
+    py_path = codex_dir / "tools.python.json"
+    if not py_path.exists():
+        py_path.write_text(_json.dumps(py_tools, indent=2))
+    # README with setup steps
+    readme = (
+        "# Codex Integration (A2Dev)\n\n"
+        "This project is preconfigured for Codex (CLI/Web). Import these once, then just chat with `@analyst`, `@pm`, `@spm`.\n\n"
+        "## System Prompt\n"
+        "Use: `.a2dev/codex/system-prompt.txt` as your system message.\n\n"
+        "## Tools\n"
+        "Prefer Node tools: `.a2dev/codex/tools.node.json` (runs `node node_modules/a2dev/bin/a2dev.js ...`).\n\n"
+        "Alternative Python tools: `.a2dev/codex/tools.python.json` (runs `python3 a2dev_cli.py ...`).\n\n"
+        "Required tool: `route` — forward any message starting with `@analyst/@pm/@spm/@dev` or `*` to this tool with the full text.\n\n"
+        "## Behavior\n"
+        "- The router persists the active role in `.a2dev/state.json`.\n"
+        "- Unprefixed messages should be forwarded to `@<active_role>` via the route tool.\n"
+        "- After setup, users simply type `@analyst` to get the greeting and options.\n"
+    )
+    readme_path = codex_dir / "README.md"
+    if not readme_path.exists():
+        readme_path.write_text(readme)
+
+
+def copy_project_files(dest: Path) -> None:
+    """Lightweight installer: copy policies, templates and guidance into `dest` (never overwrites)."""
+    dest.mkdir(parents=True, exist_ok=True)
+    repo_root = REPO_ROOT
+
+    def ensure_dir(p: Path):
+        p.mkdir(parents=True, exist_ok=True)
+
+    def copy_if_absent(src: Path, dst: Path):
+        if not dst.exists():
+            ensure_dir(dst.parent)
+            if src.is_dir():
+                shutil.copytree(src, dst)
+            else:
+                shutil.copy2(src, dst)
+
+    # Core dirs
+    ensure_dir(dest / ".a2dev")
+    ensure_dir(dest / "docs")
+    ensure_dir(dest / "docs/ux")
+
+    # Policies & semgrep
+    for subdir in ["policies", "semgrep", "templates"]:
+        src_dir = repo_root / ".a2dev" / subdir
+        if src_dir.exists():
+            for item in src_dir.iterdir():
+                copy_if_absent(item, dest / ".a2dev" / subdir / item.name)
+
+    # PR template
+    pr_src = repo_root / ".github" / "pull_request_template.md"
+    if pr_src.exists():
+        copy_if_absent(pr_src, dest / ".github" / "pull_request_template.md")
+
+    # Sample PRD -> PRD.md (if missing)
+    prd_dst = dest / "docs" / "PRD.md"
+    if not prd_dst.exists():
+        copy_if_absent(repo_root / "docs" / "PRD_SAMPLE.md", prd_dst)
+
+    # Guidance only (no Python shims copied into project)
+    # AGENTS.md and no-tool guide
+    copy_if_absent(repo_root / "AGENTS.md", dest / "AGENTS.md")
+    ntg = repo_root / "docs" / "no-tool" / "README.md"
+    if ntg.exists():
+        copy_if_absent(ntg, dest / "docs" / "no-tool" / "README.md")
+    append_agents_addendum(dest)
+    # Codex harness assets (system prompt + tools JSON)
+    write_codex_assets(dest)
+
+
+def add_arguments(p: argparse.ArgumentParser) -> None:
+    p.add_argument("--dest", default=".", help="Destination project root (default: .)")
+
+
+def run(args: argparse.Namespace) -> None:
+    dest = Path(args.dest).resolve()
+    copy_project_files(dest)
+    print(f"A2Dev initialized in {dest}")
+    print_welcome()
+    print_next_steps(dest)
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+from ..storage import read_state, write_state
+from .common import REPO_ROOT, ensure_startup_scaffold, print_next_steps, print_welcome, read_autogen_plan, write_autogen_plan
+from .init import copy_project_files
+
+
+def add_arguments(p: argparse.ArgumentParser) -> None:
+    p.add_argument("--dest", default=".", help="Destination project root (default: .)")
+    p.add_argument("--no-bootstrap", action="store_true", help="Skip bootstrap checks")
+    # Default: do NOT run interactive setup during install to keep installation uniform.
+    # Use --setup or run `a2dev quickstart` if you want the legacy interactive menu.
+    p.add_argument("--setup", action="store_true", help="Run interactive setup menu after install")
+    p.add_argument("--no-setup", action="store_true", help="Force-skip interactive setup menu (overrides --setup)")
+
+
+def run(args: argparse.Namespace) -> None:
+    # Install = init + (optional) bootstrap
+    dest = Path(args.dest).resolve()
+    copy_project_files(dest)
+    # Ask for existing PRD/backlog/board paths; otherwise schedule autogeneration on first use
+    if sys.stdin.isatty() and sys.stdout.isatty():
+        plan = read_autogen_plan()
+        st = read_state()
+        try:
+            prd_in = input("Existing PRD path (Enter to generate later): ").strip()
+        except EOFError:
+            prd_in = ""
+        if prd_in:
+            st.prd_path = prd_in
+        else:
+            plan['prd'] = True
+        try:
+            bl_in = input("Existing backlog.json path (Enter to generate later): ").strip()
+        except EOFError:
+            bl_in = ""
+        if bl_in:
+            st.backlog_path = bl_in
+        else:
+            plan['backlog'] = True
+        try:
+            board_in = input("Existing board path (Enter to generate later): ").strip()
+        except EOFError:
+            board_in = ""
+        if board_in:
+            st.board_path = board_in
+        else:
+            plan['board'] = True
+        write_state(st)
+        write_autogen_plan(plan)
+    print(f"A2Dev installed into {dest}")
+    print_welcome()
+    # Generate scheduled scaffolds immediately so no route/tool is required later
+    try:
+        ensure_startup_scaffold()
+    except Exception:
+        pass
+    if not args.no_bootstrap:
+        print("Running bootstrap checks...")
+        # Call bootstrap in the destination
+        try:
+            import subprocess
+            py = sys.executable or "python3"
+            # Use packaged CLI to avoid missing local deps during first-time install
+            subprocess.run([py, str(REPO_ROOT / "a2dev_cli.py"), "bootstrap"], check=False, cwd=str(dest))
+        except Exception:
+            pass
+    # Only run setup menu when explicitly requested with --setup and we are in an interactive TTY
+    if args.setup and not args.no_setup and os.getenv("A2DEV_IN_CODEX") != "1" and sys.stdin.isatty() and sys.stdout.isatty():
+        try:
+            from .setup import run_setup_menu
+
+            run_setup_menu(dest)
+        except Exception:
+            # Non-fatal; still show next steps
+            pass
+    else:
+        print_next_steps(dest)
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import argparse
+
+from ..models import TASK_STRENGTHS, candidate_models, routing_policy
+from ..telemetry import TelemetryStore
+
+
+def add_arguments(p: argparse.ArgumentParser) -> None:
+    models_sub = p.add_subparsers(dest="models_cmd", required=True)
+    p_mstats = models_sub.add_parser("stats", help="Per model/task calls, error rate, latency, tokens and cost")
+    p_mstats.add_argument("--days", type=float, default=14.0, help="History window in days (default: 14)")
+    p_mstats.add_argument("--task", type=str, default=None, help="Only this task")
+    models_sub.add_parser("clear", help="Drop recorded telemetry")
+
+
+def run(args: argparse.Namespace) -> None:
+    with TelemetryStore(".") as tstore:
+        if args.models_cmd == "clear":
+            print(f"Removed {tstore.clear()} recorded call(s)")
+            return
+        summary = tstore.summary(days=args.days, fresh=True)
+        rows = sorted((st for (m, t), st in summary.items() if t != "*" and (not args.task or t == args.task)),
+                      key=lambda st: (st.task, st.model))
+        print(f"LLM calls, last {args.days:g} days -> {tstore.path}")
+        if not rows:
+            print("- no live calls recorded yet (set A2DEV_LLM_LIVE=1)")
+        for st in rows:
+            p50 = tstore.latency_quantile(st.model, st.task, 0.5, args.days)
+            p95 = tstore.latency_quantile(st.model, st.task, 0.95, args.days)
+            lat = f"p50 {p50:.2f}s p95 {p95:.2f}s" if p50 is not None and p95 is not None else "latency n/a"
+            print(f"- {st.task:<12} {st.model:<18} {st.calls:>5} calls  {st.error_rate:>5.1%} errors  {lat}  "
+                  f"~{st.mean_prompt_tokens or 0:.0f} in / {st.mean_output_tokens or 0:.0f} out tokens  ${st.cost:.4f}")
+    policy = routing_policy()
+    print(f"Routing policy: {policy} (A2DEV_ROUTING=static|latency|cost)")
+    for task in sorted(TASK_STRENGTHS):
+        if args.task and task != args.task:
+            continue
+        order = candidate_models(task, policy=policy, stats=summary)
+        first = order[0]
+        print(f"- {task:<12} -> {first.name} ({first.quality}, ${first.input_cost:g}/${first.output_cost:g} per 1M)"
+              + (f"; then {', '.join(m.name for m in order[1:])}" if order[1:] else ""))
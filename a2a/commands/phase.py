@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+import argparse
+
+from ..phases import PHASES, RECOMMENDED_ROLES
+from ..storage import read_state, write_state
+
+
+def add_arguments(p: argparse.ArgumentParser) -> None:
+    p_sub = p.add_subparsers(dest="phase_cmd", required=True)
+    p_set = p_sub.add_parser("set", help="Set phase: assess|develop|sustain")
+    p_set.add_argument("phase", choices=PHASES)
+    p_sub.add_parser("status", help="Show current phase and recommended roles")
+
+
+def run(args: argparse.Namespace) -> None:
+    state = read_state()
+    if args.phase_cmd == "set":
+        state.phase = args.phase
+        write_state(state)
+        print(f"Phase set to: {state.phase}. Recommended roles: {', '.join(RECOMMENDED_ROLES[state.phase])}")
+    elif args.phase_cmd == "status":
+        print(f"Phase: {state.phase}. Recommended roles: {', '.join(RECOMMENDED_ROLES.get(state.phase, []))}")
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+import argparse
+
+from ..pm import PMCoordinator
+from ..storage import ensure_dirs, read_state, write_backlog, write_epics_md, write_state
+
+
+def add_arguments(p: argparse.ArgumentParser) -> None:
+    p.add_argument("prd", help="Path to PRD markdown")
+
+
+def cmd_plan(prd_path: str) -> None:
+    ensure_dirs()
+    pm = PMCoordinator()
+    backlog = pm.generate_backlog_from_prd(prd_path)
+    write_backlog(backlog)
+    write_epics_md(backlog)
+    state = read_state()
+    write_state(state)
+    print("Backlog generated: docs/backlog.json, docs/epics.md")
+
+
+def run(args: argparse.Namespace) -> None:
+    cmd_plan(args.prd)
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from ..roles.planning import DeepPlanningRole
+from .common import require_backlog
+
+
+def add_arguments(p: argparse.ArgumentParser) -> None:
+    p.add_argument("id", type=int)
+
+
+def cmd_plan_deep(story_id: int) -> None:
+    backlog = require_backlog()
+    role = DeepPlanningRole()
+    text = role.plan_for_story(backlog, story_id)
+    out_dir = Path("docs/planning")
+    out_dir.mkdir(parents=True, exist_ok=True)
+    out = out_dir / f"story-{story_id}.md"
+    out.write_text(text)
+    print(f"Deep plan written: {out}")
+
+
+def run(args: argparse.Namespace) -> None:
+    cmd_plan_deep(args.id)
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+
+def add_arguments(p: argparse.ArgumentParser) -> None:
+    p.add_argument("type", choices=["proposals", "sprints"], help="Which plan to show")
+    p.add_argument("--open", action="store_true", help="Attempt to open the plan index in default viewer")
+
+
+def run(args: argparse.Namespace) -> None:
+    if args.type == "proposals":
+        path = Path("docs/proposals/plan.md")
+    else:
+        path = Path("docs/sprints/plan.md")
+    if path.exists():
+        print(f"Plan: {path}")
+        if args.open:
+            try:
+                import subprocess
+                if sys.platform == "darwin":
+                    subprocess.run(["open", str(path)], check=False)
+                elif sys.platform.startswith("linux"):
+                    subprocess.run(["xdg-open", str(path)], check=False)
+                elif sys.platform.startswith("win"):
+                    os.startfile(str(path))  # type: ignore
+            except Exception:
+                pass
+    else:
+        print(f"Plan not found: {path}. Generate it first (story-proposals gen/refine or pm-sprints).")
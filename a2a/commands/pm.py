@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import argparse
+
+from ..orchestrator import Orchestrator
+from ..personas import pm_develop_guidance, pm_gate_feedback
+from ..pm import PMCoordinator
+from ..status import format_status_line
+from ..storage import read_backlog, read_state
+
+
+def add_arguments(p: argparse.ArgumentParser) -> None:
+    pm_sub = p.add_subparsers(dest="pm_cmd", required=True)
+    pm_next = pm_sub.add_parser("next", help="Pick and prepare the next story")
+    pm_next.add_argument("--scaffold", action="store_true")
+    pm_cont = pm_sub.add_parser("continue", help="Continue current story or pick next")
+    pm_cont.add_argument("--scaffold", action="store_true")
+    pm_story = pm_sub.add_parser("story", help="Prepare a specific story id")
+    pm_story.add_argument("id", type=int)
+    pm_story.add_argument("--scaffold", action="store_true")
+
+
+def run(args: argparse.Namespace) -> None:
+    state = read_state()
+    orch = Orchestrator()
+    backlog = read_backlog()
+    if not backlog:
+        print("No backlog found; running assess is recommended (analyst).")
+        raise SystemExit(1)
+    def run_for(story_id: int, scaffold: bool):
+        print(pm_develop_guidance(story_id))
+        result = orch.prepare_story(story_id, also_scaffold=scaffold)
+        print(pm_gate_feedback(result.get("gate", False), result.get("issues", [])))
+        print(format_status_line(state.phase, "PM", result.get("agents", []), result.get("artifacts", {}).get("created", []), result.get("referenced", []), gate=("PASS" if result.get("gate") else "FAIL")))
+    if args.pm_cmd == "story":
+        run_for(args.id, args.scaffold)
+    else:
+        # continue or next
+        sid = state.current_story_id
+        if args.pm_cmd == "next" or not sid:
+            # pick next by heuristic
+            pm = PMCoordinator()
+            next_story = pm.select_next_story(backlog)
+            if not next_story:
+                raise SystemExit("No available stories found.")
+            sid = next_story.id
+        run_for(sid, getattr(args, 'scaffold', False))
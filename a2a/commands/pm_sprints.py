@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+import argparse
+
+from ..sprints import write_sprints
+from .common import require_backlog
+
+
+def add_arguments(p: argparse.ArgumentParser) -> None:
+    p.add_argument("--capacity", type=float, default=20.0)
+    p.add_argument("--weeks", type=int, default=2)
+
+
+def run(args: argparse.Namespace) -> None:
+    backlog = require_backlog()
+    plan_path = write_sprints(backlog, capacity=args.capacity, weeks=args.weeks)
+    print(f"Sprint plan written: {plan_path}")
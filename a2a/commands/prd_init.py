@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from ..roles.analyst import AnalystRole
+
+
+def add_arguments(p: argparse.ArgumentParser) -> None:
+    p.add_argument("--name", type=str, default="Project")
+    p.add_argument("--path", type=str, default="docs/PRD.md")
+
+
+def run(args: argparse.Namespace) -> None:
+    role = AnalystRole()
+    prd_path = Path(args.path)
+    if prd_path.exists():
+        print(f"PRD already exists: {prd_path}")
+    else:
+        prd_path.parent.mkdir(parents=True, exist_ok=True)
+        prd_path.write_text(role.prd_template(args.name))
+        print(f"PRD template written: {prd_path}")
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+import argparse
+import subprocess
+from pathlib import Path
+
+from ..precommit import format_report, run_precommit
+
+
+def add_arguments(p: argparse.ArgumentParser) -> None:
+    p.add_argument("--no-cache", action="store_true", help="Rescan every staged blob")
+    p.add_argument("--rules", type=str, default=".a2dev/semgrep/rules.yml", help="Rules file (default: .a2dev/semgrep/rules.yml)")
+
+
+def run(args: argparse.Namespace) -> None:
+    try:
+        report = run_precommit(".", rules_path=Path(args.rules), use_cache=not args.no_cache)
+    except (OSError, RuntimeError, subprocess.SubprocessError) as e:
+        raise SystemExit(f"[A2Dev] precommit: {e}")
+    print("[A2Dev] pre-commit checks: local rules + secrets (staged blobs)")
+    for line in format_report(report):
+        print(line)
+    if not report["ok"]:
+        raise SystemExit("[A2Dev] pre-commit found blocking issues. Commit aborted.")
+    print("[A2Dev] pre-commit checks: OK")
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from ..gate import gate_story
+from .arch import cmd_arch
+from .common import require_backlog
+from .data_plan import cmd_data_plan
+from .devops_plan import cmd_devops_plan
+from .plan_deep import cmd_plan_deep
+from .qa_plan import cmd_qa_plan
+from .shard import cmd_shard
+from .threat import cmd_threat
+from .trace import cmd_trace
+from .ux import cmd_ux
+
+
+def add_arguments(p: argparse.ArgumentParser) -> None:
+    p.add_argument("id", type=int)
+
+
+def cmd_prepare_story(story_id: int) -> None:
+    backlog = require_backlog()
+    idx = {s.id: s for e in backlog.epics for s in e.stories}
+    if story_id not in idx:
+        raise SystemExit(f"Story {story_id} not found.")
+
+    # Generate artifacts if missing
+    def ensure(path: str, gen_fn):
+        p = Path(path)
+        if p.exists():
+            print(f"Exists: {p}")
+            return
+        gen_fn()
+
+    ensure(f"docs/ux/story-{story_id}.md", lambda: cmd_ux([story_id]))
+    ensure(f"docs/architecture/ADR-story-{story_id}.md", lambda: cmd_arch(story_id))
+    ensure(f"docs/planning/story-{story_id}.md", lambda: cmd_plan_deep(story_id))
+    ensure(f"docs/qa/plans/story-{story_id}.md", lambda: cmd_qa_plan(story_id))
+    ensure(f"docs/security/threats/story-{story_id}.md", lambda: cmd_threat(story_id))
+    ensure(f"docs/devops/story-{story_id}.md", lambda: cmd_devops_plan(story_id))
+    ensure(f"docs/data/analytics/story-{story_id}.md", lambda: cmd_data_plan(story_id))
+    ensure(f"docs/qa/trace/story-{story_id}.md", lambda: cmd_trace(story_id))
+    ensure(f"docs/stories/story-{story_id}.md", lambda: cmd_shard(story_id))
+
+    ok, issues = gate_story(backlog, story_id)[:2]
+    if ok:
+        print("Gate: PASS")
+    else:
+        print("Gate: FAIL\n- " + "\n- ".join(issues))
+
+
+def run(args: argparse.Namespace) -> None:
+    cmd_prepare_story(args.id)
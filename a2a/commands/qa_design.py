@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+import argparse
+
+from ..roles.qa import QAPlanRole
+from .common import require_backlog
+
+
+def add_arguments(p: argparse.ArgumentParser) -> None:
+    p.add_argument("id", type=int)
+
+
+def run(args: argparse.Namespace) -> None:
+    backlog = require_backlog()
+    role = QAPlanRole()
+    text = role.design_review(backlog, args.id)
+    out = role.write_design_review(text, args.id)
+    print(f"QA design review written: {out}")
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+import argparse
+
+from ..roles.qa import QAPlanRole
+from .common import require_backlog
+
+
+def add_arguments(p: argparse.ArgumentParser) -> None:
+    p.add_argument("id", type=int)
+
+
+def cmd_qa_plan(story_id: int) -> None:
+    backlog = require_backlog()
+    role = QAPlanRole()
+    text = role.plan_for_story(backlog, story_id)
+    out = role.write_plan(text, story_id)
+    print(f"QA plan written: {out}")
+
+
+def run(args: argparse.Namespace) -> None:
+    cmd_qa_plan(args.id)
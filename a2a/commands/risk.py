@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import argparse
+from json import dumps, loads
+from pathlib import Path
+
+
+def add_arguments(p: argparse.ArgumentParser) -> None:
+    risk_sub = p.add_subparsers(dest="risk_cmd", required=True)
+    pr_set = risk_sub.add_parser("set")
+    pr_set.add_argument("id", type=int)
+    pr_set.add_argument("level", choices=["low", "medium", "high"])
+    risk_sub.add_parser("status").add_argument("id", type=int)
+
+
+def run(args: argparse.Namespace) -> None:
+    if args.risk_cmd == "set":
+        out_dir = Path("docs/qa/risk")
+        out_dir.mkdir(parents=True, exist_ok=True)
+        out = out_dir / f"story-{args.id}.json"
+        out.write_text(dumps({"level": args.level}, indent=2))
+        print(f"Risk set: story {args.id} -> {args.level}")
+    elif args.risk_cmd == "status":
+        path = Path(f"docs/qa/risk/story-{args.id}.json")
+        if not path.exists():
+            print("Risk: not set")
+        else:
+            level = loads(path.read_text()).get("level", "low")
+            print(f"Risk: {level}")
@@ -0,0 +1,563 @@
+from __future__ import annotations
+
+import argparse
+import os
+from pathlib import Path
+
+from ..llm import set_priority
+from ..personas import analyst_assess_guidance, pm_develop_guidance, pm_gate_feedback, spm_sustain_guidance
+from ..router import PRIMARY_ROLE, parse_route
+from ..status import format_status_line
+from ..storage import read_backlog, read_state, write_backlog, write_epics_md, write_state
+from .common import ensure_startup_scaffold, print_codex_handoff
+
+
+def _spm_generate_maintenance_plan(dest: Path) -> str:
+    # Ensure audit is current (reuses the stored audit while inputs are unchanged)
+    from .audit import run_quality_audit
+
+    run_quality_audit(dest)
+    # Create maintenance plan
+    out_dir = Path("docs/qa/maintenance"); out_dir.mkdir(parents=True, exist_ok=True)
+    out = out_dir / "plan.md"
+    lines = [
+        "# Maintenance & Stabilization Plan", "",
+        "This plan aggregates code quality hotspots and proposes small, high-impact changes.", "",
+        "## Sources", "- docs/analyst/quality-audit.md", "- docs/analyst/hotspots.json",
+        "",
+        "## Recommendations",
+        "- Fix high-severity Semgrep findings before new feature work.",
+        "- Rotate and remove any detected secrets immediately.",
+        "- Target top churn x size x complexity hotspots (docs/analyst/hotspots.json) for refactors (naming, dead code, split large files).",
+        "- Add/repair tests in hotspot modules; aim for smoke coverage first.",
+        "- Upgrade critical dependencies with known vulnerabilities.",
+        "",
+        "## Candidate Small Tasks",
+        "- Create lint/format scripts for steady hygiene.",
+        "- Add CI checks (semgrep, gitleaks) on PRs.",
+        "- Add README sections for setup/troubleshooting in hotspot modules.",
+        "- Add monitoring/logging where missing in critical code paths.",
+    ]
+    out.write_text("\n".join(lines))
+    return str(out)
+
+
+def _spm_propose_stabilization() -> list[int]:
+    """Propose stabilization stories under a new epic from the quality audit's hotspots.
+
+    Reads the top churn x size x complexity hotspots from docs/analyst/hotspots.json.
+
+    Returns a list of created/updated story IDs. Non-destructive: appends if absent.
+    """
+    bl = read_backlog()
+    if not bl:
+        raise SystemExit("No backlog found. Run assess first.")
+    # Determine next IDs
+    max_epic = max((e.id for e in bl.epics), default=0)
+    max_story = max((s.id for e in bl.epics for s in e.stories), default=0)
+    # Hotspots (churn x size x complexity) recorded by the quality audit
+    from ..churn import read_hotspots
+    hotspots = read_hotspots()[:3]
+    candidates: list[tuple[str, str]] = [
+        (
+            f"Stabilize hotspot: {h['path']}",
+            f"Refactor and add tests in hotspot '{h['path']}' (changed in {h['commits']} commits by {h['authors']} authors; "
+            f"{h['code']} code lines, complexity {h['complexity']}). Address high/medium findings, improve structure, and add runbook items if relevant.",
+        )
+        for h in hotspots
+    ] or [(
+        "Stabilize hotspot: repo",
+        "Refactor and add tests in hotspot directory 'repo'. Address high/medium findings, improve structure, and add runbook items if relevant.",
+    )]
+    candidates += _structural_candidates()
+    # Find or create maintenance epic
+    from ..schema import Epic, Priority, Story
+    maint = next((e for e in bl.epics if e.title.lower().startswith("maintenance")), None)
+    if not maint:
+        max_epic += 1
+        maint = Epic(id=max_epic, title="Maintenance and Stabilization", description="Stabilize hotspots and address audit findings.")
+        bl.epics.append(maint)
+    existing_titles = {s.title for s in maint.stories}
+    created_ids: list[int] = []
+    for title, description in candidates:
+        if title in existing_titles:
+            continue
+        max_story += 1
+        s = Story(
+            id=max_story,
+            epic_id=maint.id,
+            title=title,
+            description=description,
+            acceptance_criteria=[
+                "High-severity issues fixed (Semgrep)",
+                "No secrets detected (Gitleaks)",
+                "Add/repair tests for critical paths",
+                "Right-size large modules (split/rename/dead code removal)",
+            ],
+            estimate=2.0,
+            priority=Priority.should,
+        )
+        maint.stories.append(s)
+        created_ids.append(s.id)
+    write_backlog(bl)
+    return created_ids
+
+
+def _structural_candidates(max_items: int = 3) -> list[tuple[str, str]]:
+    """Stabilization candidates from the brownfield import graph (cycles, high fan-out modules)."""
+    inv = Path("docs/analyst/brownfield-inventory.json")
+    if not inv.exists():
+        return []
+    try:
+        import json as _json
+        graph = _json.loads(inv.read_text()).get("imports") or {}
+    except Exception:
+        return []
+    out: list[tuple[str, str]] = []
+    for cyc in graph.get("cycles", [])[:2]:
+        out.append((
+            f"Break import cycle: {cyc[0]} (+{len(cyc) - 1})",
+            f"Modules {', '.join(cyc)} import each other. Extract shared types/interfaces or invert a dependency so the cycle is removed; add tests around the seams.",
+        ))
+    for row in graph.get("top_fan_out", [])[:1]:
+        if row.get("fan_out", 0) >= 15:
+            out.append((
+                f"Split high fan-out module: {row['module']}",
+                f"Module '{row['module']}' imports {row['fan_out']} internal modules (fan-in {row['fan_in']}). Split by responsibility and lazy-load rarely used dependencies.",
+            ))
+    return out[:max_items]
+
+
+def _collect_quick_status() -> dict:
+    st = read_state()
+    bl = read_backlog()
+    story_count = sum(len(e.stories) for e in bl.epics) if bl else 0
+    current_id = st.current_story_id
+    semgrep = None; leaks = None
+    if current_id:
+        from ..findings import report_counts
+        scope = f"story-{current_id}"
+        counts = report_counts("semgrep", Path(f"docs/security/semgrep/story-{current_id}.json"), scope)
+        if counts:
+            semgrep = {"high": counts["high"], "medium": counts["medium"], "low": counts["low"]}
+        counts = report_counts("gitleaks", Path(f"docs/security/secrets/story-{current_id}.json"), scope)
+        leaks = counts["total"] if counts else None
+    proposals = Path("docs/proposals/proposed-backlog.json").exists()
+    return {
+        "phase": st.phase,
+        "active_role": getattr(st, 'active_role', 'pm'),
+        "backlog_present": bool(bl),
+        "stories": story_count,
+        "current_story_id": current_id,
+        "proposals_present": proposals,
+        "semgrep": semgrep,
+        "secrets_findings": leaks,
+    }
+
+
+def add_arguments(p: argparse.ArgumentParser) -> None:
+    p.add_argument("text", nargs='+', help="Freeform text like '@analyst assess docs/PRD.md' or '*develop 2'")
+
+
+def run(args: argparse.Namespace) -> None:
+    set_priority("interactive")  # routed calls go ahead of queued batch generation
+    text = " ".join(args.text)
+    route = parse_route(text)
+    if not route:
+        raise SystemExit("Could not parse route. Try '@analyst assess docs/PRD.md' or '*develop 2'.")
+    # Ensure any scheduled autogeneration happens on first use
+    try:
+        ensure_startup_scaffold()
+    except Exception:
+        pass
+    json_mode = os.getenv("A2DEV_OUTPUT", "").lower() == "json"
+    def _emit(obj: dict, fallback: str | None = None):
+        if json_mode:
+            import json as _json
+            print(_json.dumps(obj))
+        elif fallback is not None:
+            print(fallback)
+    # Guidance messaging
+    if route.role == "analyst" and route.cmd == "assess":
+        arg = (route.arg or "").strip()
+        if not arg:
+            # Just show options without running assess
+            msg = analyst_assess_guidance("docs/PRD.md")
+            st = read_state(); st.active_role = "analyst"; write_state(st)
+            _emit({
+                "role": "analyst",
+                "cmd": "assess",
+                "arg": "",
+                "active_role": "analyst",
+                "status": "ready",
+                "options": ["fresh", "prepared <path>", "codebase"],
+                "shortcuts": {"1": "fresh", "2": "prepared [path]", "3": "codebase"}
+            }, msg)
+            return
+        # Modes: fresh|greenfield|start, prepared [<path>], brownfield|codebase|existing
+        lower = arg.lower()
+        if lower in {"fresh", "greenfield", "start"}:
+            if not json_mode:
+                print(analyst_assess_guidance("docs/PRD.md"))
+            from .setup import flow_start_fresh
+
+            flow_start_fresh(Path("."))
+            st = read_state(); st.active_role = "analyst"; write_state(st)
+            _emit({
+                "role": "analyst",
+                "cmd": "assess",
+                "arg": "fresh",
+                "active_role": "analyst",
+                "status": "assessed",
+                "phase": read_state().phase
+            })
+            return
+        elif lower.startswith("prepared"):
+            # Allow: "prepared" or "prepared path/to/PRD.md"
+            parts = arg.split(maxsplit=1)
+            prd = parts[1] if len(parts) > 1 else "docs/PRD.md"
+            print(analyst_assess_guidance(prd))
+            from ..roles.analyst import AnalystRole
+            from .plan import cmd_plan
+
+            # Assess existing PRD path
+            try:
+                role = AnalystRole(); out = role.write("brief", role.brief_from_prd(prd)); print(f"Analyst brief written: {out}")
+                cmd_plan(prd)
+                state = read_state(); state.phase = "develop"; write_state(state)
+                print("Phase advanced to: develop")
+                print(format_status_line(state.phase, "Analyst", ["Analyst", "PM"], [out, "docs/backlog.json", "docs/epics.md"], [prd]))
+            finally:
+                print_codex_handoff()
+            st = read_state(); st.active_role = "analyst"; write_state(st)
+            return
+        elif lower in {"brownfield", "codebase", "existing"}:
+            if not json_mode:
+                print(analyst_assess_guidance("docs/PRD.md"))
+            from .setup import flow_brownfield_assess
+
+            flow_brownfield_assess(Path("."))
+            st = read_state(); st.active_role = "analyst"; write_state(st)
+            _emit({
+                "role": "analyst",
+                "cmd": "assess",
+                "arg": "codebase",
+                "active_role": "analyst",
+                "status": "assessed",
+                "phase": read_state().phase,
+                "brownfield": True
+            })
+            return
+        else:
+            # Default: treat arg as PRD path (existing behavior)
+            if not json_mode:
+                print(analyst_assess_guidance(arg or "docs/PRD.md"))
+            from ..roles.analyst import AnalystRole
+            from .plan import cmd_plan
+
+            role = AnalystRole()
+            out = role.write("brief", role.brief_from_prd(arg or "docs/PRD.md"))
+            if not json_mode:
+                print(f"Analyst brief written: {out}")
+            cmd_plan(arg or "docs/PRD.md")
+            state = read_state()
+            state.phase = "develop"
+            write_state(state)
+            if not json_mode:
+                print("Phase advanced to: develop")
+                print(format_status_line(state.phase, "Analyst", ["Analyst", "PM"], [out, "docs/backlog.json", "docs/epics.md"], [arg or 'docs/PRD.md']))
+                print_codex_handoff()
+            st = read_state(); st.active_role = "analyst"; write_state(st)
+            _emit({
+                "role": "analyst",
+                "cmd": "assess",
+                "arg": arg or "docs/PRD.md",
+                "active_role": "analyst",
+                "status": "assessed",
+                "phase": read_state().phase
+            })
+            return
+    elif route.role == "analyst" and route.cmd == "help":
+        qs = _collect_quick_status()
+        msg = analyst_assess_guidance("docs/PRD.md") + "\n\nQuick Status: phase={phase}, backlog={backlog}, stories={stories}, current={current}".format(
+            phase=qs.get('phase'), backlog=('yes' if qs.get('backlog_present') else 'no'), stories=qs.get('stories'), current=(qs.get('current_story_id') or 'none')
+        )
+        st = read_state(); st.active_role = "analyst"; write_state(st)
+        if not json_mode:
+            print(msg)
+            # Always end with a standard status line
+            print(format_status_line(st.phase, "Analyst", [], [], []))
+        _emit({"role": "analyst", "cmd": "help", "active_role": "analyst", "status": "ready"})
+        return
+    elif route.role == "analyst" and route.cmd == "exit":
+        st = read_state(); st.active_role = PRIMARY_ROLE.get(st.phase, "pm"); write_state(st)
+        _emit({"role": "analyst", "cmd": "exit", "active_role": st.active_role, "status": "ok"}, f"Leaving Analyst mode. Active role: {st.active_role}")
+        return
+    elif route.role in ("pm", "sm"):
+        if route.cmd == "help":
+            st = read_state(); st.active_role = "pm"; write_state(st)
+            try:
+                sid = int(route.arg)
+            except Exception:
+                sid = 1
+            qs = _collect_quick_status()
+            intro = pm_develop_guidance(sid) + "\n\nQuick Status: phase={phase}, backlog={backlog}, stories={stories}, current={current}, proposals={props}".format(
+                phase=qs.get('phase'), backlog=('yes' if qs.get('backlog_present') else 'no'), stories=qs.get('stories'), current=(qs.get('current_story_id') or 'none'), props=('yes' if qs.get('proposals_present') else 'no')
+            )
+            if not json_mode:
+                print(intro)
+                print(format_status_line(st.phase, "PM", [], [], []))
+            _emit({"role": "pm", "cmd": "help", "story_id": sid, "active_role": "pm", "status": "ready"})
+            return
+        if route.cmd == "exit":
+            st = read_state(); st.active_role = PRIMARY_ROLE.get(st.phase, "pm"); write_state(st)
+            _emit({"role": "pm", "cmd": "exit", "active_role": st.active_role, "status": "ok"}, f"Leaving PM mode. Active role: {st.active_role}")
+            return
+        if route.cmd == "accept-proposals":
+            # Accept merge proposals into backlog.json (optionally filtered by ids in arg)
+            from ..board import write_board
+            from ..schema import Backlog
+            from ..sprints import write_sprints
+
+            out_dir = Path("docs/proposals")
+            pj = out_dir / "proposed-backlog.json"
+            if not pj.exists():
+                raise SystemExit("No proposed-backlog.json found. Run '@pm proposals' first.")
+            enriched = Backlog.from_json(pj.read_text())
+            prop_map = {s.id: s for e in enriched.epics for s in e.stories}
+            # Parse accept ids if provided
+            accept_ids = set()
+            if route.arg:
+                for tok in route.arg.replace(" ", "").split(","):
+                    if tok.isdigit():
+                        accept_ids.add(int(tok))
+            cur = read_backlog()
+            if not cur:
+                raise SystemExit("No backlog found.")
+            previous = cur.to_json()  # backup the backlog as it was before this merge
+            updated = []
+            for e in cur.epics:
+                for s in e.stories:
+                    if s.id in prop_map and (not accept_ids or s.id in accept_ids):
+                        ps = prop_map[s.id]
+                        s.estimate = ps.estimate
+                        s.priority = ps.priority
+                        updated.append(s.id)
+            backup = Path("docs/backlog.backup.json"); backup.write_text(previous); write_backlog(cur)
+            # Keep epics, sprints, and board up to date after backlog changes
+            try:
+                write_epics_md(cur)
+            except Exception:
+                pass
+            try:
+                write_sprints(cur)
+            except Exception:
+                pass
+            try:
+                write_board(cur)
+            except Exception:
+                pass
+            st = read_state(); st.active_role = "pm"; write_state(st)
+            _emit({
+                "role": "pm", "cmd": "accept-proposals", "active_role": "pm", "status": "ok",
+                "updated": sorted(updated), "backup": str(backup),
+                "suggestions": [
+                    {"label": "PM Proposals", "command": "@pm proposals"},
+                    {"label": "PM Next", "command": "@pm next"}
+                ]
+            }, f"Merged proposals into docs/backlog.json (backup: {backup}); updated: {sorted(updated)}\nSuggestions: @pm proposals | @pm next")
+            return
+        if route.cmd in ("develop", "prepare"):
+            from ..orchestrator import Orchestrator
+            from ..pm import PMCoordinator
+
+            # Resolve 'next' or 'continue' intents
+            backlog = read_backlog()
+            state = read_state()
+            sid_raw = route.arg
+            sid: int | None = None
+            if isinstance(sid_raw, str) and sid_raw.lower() in {"next", "continue", "cont"}:
+                if sid_raw.lower().startswith("cont") and state.current_story_id:
+                    sid = state.current_story_id
+                elif backlog:
+                    pmc = PMCoordinator()
+                    nxt = pmc.select_next_story(backlog)
+                    sid = nxt.id if nxt else None
+            else:
+                try:
+                    sid = int(route.arg)
+                except Exception:
+                    sid = None
+            if sid is None and backlog:
+                pmc = PMCoordinator(); nxt = pmc.select_next_story(backlog); sid = nxt.id if nxt else 1
+
+            if not json_mode:
+                print(pm_develop_guidance(int(sid or 1)))
+            if route.cmd == "prepare":
+                from .prepare_story import cmd_prepare_story
+
+                cmd_prepare_story(int(sid or 1))
+                summary = {"role": "pm", "cmd": "prepare", "story_id": int(sid or 1), "active_role": "pm", "status": "ok",
+                           "suggestions": [
+                               {"label": "Develop Story", "command": f"@pm develop {int(sid or 1)}"},
+                               {"label": "PM Next", "command": "@pm next"}
+                           ]}
+            else:
+                orch = Orchestrator()
+                result = orch.prepare_story(int(sid or 1), also_scaffold=False)
+                if not json_mode:
+                    print(pm_gate_feedback(result.get("gate", False), result.get("issues", [])))
+                    print(format_status_line(state.phase, "PM", result.get("agents", []), result.get("artifacts", {}).get("created", []), result.get("referenced", []), gate=("PASS" if result.get("gate") else "FAIL")))
+                # Dynamic suggestions based on gate result
+                suggestions = (
+                    [
+                        {"label": "Sustain Story", "command": f"@spm sustain {int(sid or 1)}"},
+                        {"label": "PM Next", "command": "@pm next"},
+                        {"label": "PM Proposals", "command": "@pm proposals"}
+                    ] if result.get("gate") else [
+                        {"label": "Analyst Help", "command": "@analyst help"},
+                        {"label": "PM Help", "command": "@pm help"}
+                    ]
+                )
+                summary = {
+                    "role": "pm",
+                    "cmd": "develop",
+                    "story_id": int(sid or 1),
+                    "active_role": "pm",
+                    "status": "ok",
+                    "gate": bool(result.get("gate")),
+                    "issues": result.get("issues", []),
+                    "agents": result.get("agents", []),
+                    "artifacts": result.get("artifacts", {}),
+                    "referenced": result.get("referenced", []),
+                    "suggestions": suggestions
+                }
+            st = read_state(); st.active_role = "pm"; write_state(st)
+            _emit(summary)
+            return
+    elif route.role == "dev" and route.cmd in ("develop", "prepare"):
+        from ..orchestrator import Orchestrator
+
+        if not json_mode:
+            print("Dev: Preparing artifacts and scaffolding code (PM guides, Dev implements).")
+        orch = Orchestrator()
+        result = orch.prepare_story(int(route.arg), also_scaffold=True)
+        if not json_mode:
+            if result.get("gate"):
+                print("Develop: Gate PASS")
+            else:
+                print("Develop: Gate FAIL\n- " + "\n- ".join(result.get("issues", [])))
+            state = read_state()
+            print(format_status_line(state.phase, "Dev", result.get("agents", []), result.get("artifacts", {}).get("created", []), result.get("referenced", []), gate=("PASS" if result.get("gate") else "FAIL")))
+        _emit({
+            "role": "dev",
+            "cmd": route.cmd,
+            "story_id": int(route.arg),
+            "active_role": "dev",
+            "status": "ok",
+            "gate": bool(result.get("gate")),
+            "issues": result.get("issues", []),
+            "agents": result.get("agents", []),
+            "artifacts": result.get("artifacts", {}),
+            "referenced": result.get("referenced", [])
+        })
+        return
+    elif route.role == "spm":
+        if route.cmd == "help":
+            st = read_state(); st.active_role = "spm"; write_state(st)
+            qs = _collect_quick_status()
+            intro = spm_sustain_guidance(int(route.arg or "1")) + "\n\nQuick Status: phase={phase}, backlog={backlog}, current={current}, semgrep={sem}, secrets={sec}".format(
+                phase=qs.get('phase'), backlog=('yes' if qs.get('backlog_present') else 'no'), current=(qs.get('current_story_id') or 'none'), sem=(qs.get('semgrep') or {}), sec=(qs.get('secrets_findings') if qs.get('secrets_findings') is not None else 'n/a')
+            )
+            if not json_mode:
+                print(intro)
+                print(format_status_line(st.phase, "sPM", [], [], []))
+            _emit({"role": "spm", "cmd": "help", "active_role": "spm", "status": "ready"})
+            return
+        if route.cmd == "exit":
+            st = read_state(); st.active_role = PRIMARY_ROLE.get(st.phase, "pm"); write_state(st)
+            _emit({"role": "spm", "cmd": "exit", "active_role": st.active_role, "status": "ok"}, f"Leaving sPM mode. Active role: {st.active_role}")
+            return
+        if route.cmd == "audit":
+            dest = Path(".").resolve()
+            from .audit import run_quality_audit
+
+            out = run_quality_audit(dest, refresh=(route.arg or "").strip().lower() == "refresh")
+            st = read_state(); st.active_role = "spm"; write_state(st)
+            _emit({
+                "role": "spm", "cmd": "audit", "active_role": "spm", "status": "ok", "report": out,
+                "suggestions": [
+                    {"label": "Stabilize", "command": "@spm stabilize"},
+                    {"label": "Propose Stabilization", "command": "@spm propose"},
+                    {"label": "PM Proposals", "command": "@pm proposals"}
+                ]
+            }, f"Quality audit written: {out}\nSuggestions: @spm stabilize | @spm propose | @pm proposals")
+            return
+        if route.cmd == "stabilize":
+            dest = Path(".").resolve()
+            out = _spm_generate_maintenance_plan(dest)
+            st = read_state(); st.active_role = "spm"; write_state(st)
+            _emit({
+                "role": "spm", "cmd": "stabilize", "active_role": "spm", "status": "ok", "plan": out,
+                "suggestions": [
+                    {"label": "Propose Stabilization Stories", "command": "@spm propose"},
+                    {"label": "PM Proposals", "command": "@pm proposals"}
+                ]
+            }, f"Maintenance plan written: {out}\nSuggestions: @spm propose | @pm proposals")
+            return
+        if route.cmd == "propose":
+            updated = _spm_propose_stabilization()
+            st = read_state(); st.active_role = "spm"; write_state(st)
+            _emit({
+                "role": "spm", "cmd": "propose", "active_role": "spm", "status": "ok", "stories": updated,
+                "suggestions": [
+                    {"label": "PM Proposals", "command": "@pm proposals"},
+                    {"label": "PM Accept Proposals", "command": "@pm accept"}
+                ]
+            }, f"Stabilization stories proposed/updated: {updated}\nSuggestions: @pm proposals | @pm accept")
+            return
+        if route.cmd == "sustain":
+            from ..gate import gate_story
+
+            if not json_mode:
+                print(spm_sustain_guidance(int(route.arg)))
+            backlog = read_backlog()
+            if not backlog:
+                raise SystemExit("No backlog found. Run plan first.")
+            ok, issues, checked = gate_story(backlog, int(route.arg))
+            # Update story Status & Ownership for sustain phase
+            try:
+                from ..shard import update_story_status
+                owner = "sPM"
+                next_owner = "PM" if ok else "PM/Analyst"
+                update_story_status(int(route.arg), phase="sustain", owner=owner, next_owner=next_owner, gate=("PASS" if ok else "FAIL"))
+            except Exception:
+                pass
+            if not json_mode:
+                print("Sustain: Gate PASS" if ok else "Sustain: Gate FAIL\n- " + "\n- ".join(issues))
+                state = read_state()
+                print(format_status_line(state.phase, "sPM", [], [], checked, gate=("PASS" if ok else "FAIL")))
+            suggestions = (
+                [
+                    {"label": "PM Next", "command": "@pm next"},
+                    {"label": "PM Proposals", "command": "@pm proposals"}
+                ] if ok else [
+                    {"label": "Stabilize", "command": "@spm stabilize"},
+                    {"label": "Propose Stabilization", "command": "@spm propose"}
+                ]
+            )
+            _emit({
+                "role": "spm",
+                "cmd": "sustain",
+                "story_id": int(route.arg),
+                "active_role": "spm",
+                "status": "ok",
+                "gate": bool(ok),
+                "issues": issues,
+                "referenced": checked,
+                "suggestions": suggestions
+            })
+            st = read_state(); st.active_role = "spm"; write_state(st)
+            return
+    else:
+        raise SystemExit(f"Unsupported route: role={route.role} cmd={route.cmd}")
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+import argparse
+
+from ..mcp import CodeSearchAdapter
+
+
+def add_arguments(p: argparse.ArgumentParser) -> None:
+    p.add_argument("query", help="Regular expression to search for")
+    p.add_argument("--max", type=int, default=200, help="Stop after this many matches (default: 200)")
+    p.add_argument("--per-file", type=int, default=None, help="At most this many matches per file")
+    p.add_argument("--glob", action="append", default=[], help="Path glob to include (repeatable; prefix ! to exclude)")
+    p.add_argument("--timeout", type=float, default=30.0, help="Give up after this many seconds (default: 30)")
+    p.add_argument("--no-index", action="store_true", help="Always scan with rg/grep")
+
+
+def run(args: argparse.Namespace) -> None:
+    hits = CodeSearchAdapter().iter_search(
+        args.query, ".", max_results=args.max, per_file=args.per_file, globs=args.glob,
+        timeout=args.timeout, use_index=False if args.no_index else None,
+    )
+    for r in hits:
+        print(f"{r.path}:{r.line}:{r.snippet}")
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import argparse
+
+from ..daemon import daemon_status, serve, serve_stdio, start_detached, stop_daemon
+
+
+def add_arguments(p: argparse.ArgumentParser) -> None:
+    p.add_argument("--idle-timeout", type=float, default=1800.0, help="Exit after this many idle seconds (0 = never; default: 1800)")
+    p.add_argument("--detach", action="store_true", help="Start in the background (log: .a2dev/run/serve.log)")
+    p.add_argument("--stop", action="store_true", help="Stop the running daemon")
+    p.add_argument("--status", action="store_true", help="Show whether a daemon is running")
+    p.add_argument("--stdio", action="store_true", help="Serve JSON-RPC on stdin/stdout instead of the socket (Node worker pool)")
+
+
+def run(args: argparse.Namespace) -> None:
+    if args.stop:
+        print("[A2Dev] daemon stopped" if stop_daemon(".") else "[A2Dev] no daemon running")
+    elif args.status:
+        st = daemon_status(".")
+        if not st:
+            raise SystemExit("[A2Dev] no daemon running")
+        print(f"[A2Dev] daemon pid {st['pid']} up {st['uptime']:.0f}s, {st['requests']} request(s) served -> {st['socket']}")
+    elif args.stdio:
+        serve_stdio(".")
+    elif args.detach:
+        pid = start_detached(".", args.idle_timeout)
+        print(f"[A2Dev] daemon started (pid {pid})")
+    else:
+        serve(".", idle_timeout=args.idle_timeout)
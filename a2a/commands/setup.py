@@ -0,0 +1,297 @@
+from __future__ import annotations
+
+import argparse
+import os
+import shutil
+import stat
+import sys
+from pathlib import Path
+
+from ..orchestrator import Orchestrator
+from ..personas import pm_gate_feedback
+from ..pm import PMCoordinator
+from ..roles.architecture import ArchitectureRole
+from ..storage import read_backlog
+from .assess_brownfield import ASSESSMENT_TEMPLATE
+from .audit import run_quality_audit
+from .common import REPO_ROOT, print_codex_handoff, print_next_steps, print_welcome
+from .doctor import install_missing_tools_interactive
+from .plan import cmd_plan
+
+
+def run_setup_menu(dest: Path) -> None:
+    while True:
+        print("\nSetup Menu — choose an option:")
+        print("  1) Start Fresh: create PRD and assess (Greenfield)")
+        print("  2) I come prepared: assess an existing PRD")
+        print("  3) I already started: assess an existing codebase (Brownfield)")
+        print("  4) More options… (audit, proposals, env, hooks)")
+        print("  5) Exit")
+        try:
+            choice = input("> ").strip()
+        except EOFError:
+            print()
+            break
+        if choice == "1":
+            flow_start_fresh(dest)
+        elif choice == "2":
+            _flow_have_prd(dest)
+        elif choice == "3":
+            flow_brownfield_assess(dest)
+        elif choice == "4":
+            _more_options_menu(dest)
+        elif choice == "5":
+            print_next_steps(dest)
+            break
+        else:
+            print("- Invalid choice; enter 1-5")
+
+
+def _ensure_prd(dest: Path) -> Path:
+    prd = dest / "docs" / "PRD.md"
+    if not prd.exists():
+        try:
+            # Try sample template first
+            sample = dest / "docs" / "PRD_SAMPLE.md"
+            if sample.exists():
+                shutil.copy2(sample, prd)
+            else:
+                from ..roles.analyst import AnalystRole
+                prd.parent.mkdir(parents=True, exist_ok=True)
+                prd.write_text(AnalystRole().prd_template("Project"))
+        except Exception:
+            pass
+    return prd
+
+
+def flow_start_fresh(dest: Path) -> None:
+    try:
+        name = input("Project name (default 'Project'): ").strip() or "Project"
+    except EOFError:
+        name = "Project"
+    prd = dest / "docs" / "PRD.md"
+    from ..roles.analyst import AnalystRole
+    if prd.exists():
+        try:
+            ans = input(f"PRD exists at {prd}. Overwrite with fresh template? (y/N) ").strip().lower()
+        except EOFError:
+            ans = "n"
+        if ans == "y":
+            prd.write_text(AnalystRole().prd_template(name))
+            print(f"- Overwrote PRD with fresh template: {prd}")
+        else:
+            print(f"- Keeping existing PRD: {prd}")
+    else:
+        prd.parent.mkdir(parents=True, exist_ok=True)
+        prd.write_text(AnalystRole().prd_template(name))
+        print(f"- Created PRD: {prd}")
+    try:
+        cmd_plan(str(prd))
+    except Exception as e:
+        print(f"- Assess failed: {e}")
+        return
+    # Offer to prepare next story
+    try:
+        ans = input("Prepare next story now? (y/N) ").strip().lower()
+    except EOFError:
+        ans = "n"
+    if ans == "y":
+        bl = read_backlog()
+        if bl:
+            pm = PMCoordinator()
+            s = pm.select_next_story(bl)
+            if s:
+                try:
+                    sc = input("Scaffold code? (y/N) ").strip().lower() == "y"
+                except EOFError:
+                    sc = False
+                orch = Orchestrator()
+                result = orch.prepare_story(s.id, also_scaffold=sc)
+                print(pm_gate_feedback(result.get("gate", False), result.get("issues", [])))
+    print("- Start Fresh flow complete.")
+    print_codex_handoff()
+
+
+def flow_brownfield_assess(dest: Path) -> None:
+    # Inventory
+    try:
+        from ..inventory import write_inventory
+        paths = write_inventory(str(dest))
+        print("- Inventory written:\n  - " + "\n  - ".join(paths.values()))
+    except Exception as e:
+        print(f"- Inventory failed: {e}")
+    # Code quality audit (part of assessment)
+    try:
+        run_quality_audit(dest)
+    except Exception as e:
+        print(f"- Quality audit failed: {e}")
+    # Architecture snapshot
+    try:
+        role = ArchitectureRole()
+        out_dir = Path("docs/architecture"); out_dir.mkdir(parents=True, exist_ok=True)
+        out = out_dir / "brownfield-architecture.md"
+        out.write_text(role.generate_brownfield_arch("Brownfield System"))
+        print(f"- Brownfield architecture: {out}")
+    except Exception as e:
+        print(f"- Brownfield architecture failed: {e}")
+    # Assessment template
+    try:
+        out_dir = Path("docs/analyst"); out_dir.mkdir(parents=True, exist_ok=True)
+        out = out_dir / "brownfield-assessment.md"
+        out.write_text(ASSESSMENT_TEMPLATE.format(name="Your App"))
+        print(f"- Brownfield assessment: {out}")
+    except Exception as e:
+        print(f"- Brownfield assessment failed: {e}")
+    # Offer assess now
+    try:
+        ans = input("Run assess now to update backlog from PRD? (y/N) ").strip().lower()
+    except EOFError:
+        ans = "n"
+    if ans == "y":
+        prd = _ensure_prd(dest)
+        try:
+            cmd_plan(str(prd))
+        except Exception as e:
+            print(f"- Assess failed: {e}")
+    print("- Brownfield assessment complete.")
+    print_codex_handoff()
+
+
+def _flow_have_prd(dest: Path) -> None:
+    try:
+        path = input("Path to PRD (default docs/PRD.md): ").strip() or "docs/PRD.md"
+    except EOFError:
+        path = "docs/PRD.md"
+    prd = Path(path)
+    if not prd.exists():
+        print(f"- PRD not found at {prd}; creating from template.")
+        try:
+            from ..roles.analyst import AnalystRole
+            prd.parent.mkdir(parents=True, exist_ok=True)
+            prd.write_text(AnalystRole().prd_template("Project"))
+        except Exception:
+            pass
+    try:
+        cmd_plan(str(prd))
+    except Exception as e:
+        print(f"- Assess failed: {e}")
+        return
+    try:
+        ans = input("Prepare next story now? (y/N) ").strip().lower()
+    except EOFError:
+        ans = "n"
+    if ans == "y":
+        bl = read_backlog()
+        if bl:
+            pm = PMCoordinator()
+            s = pm.select_next_story(bl)
+            if s:
+                try:
+                    sc = input("Scaffold code? (y/N) ").strip().lower() == "y"
+                except EOFError:
+                    sc = False
+                orch = Orchestrator()
+                result = orch.prepare_story(s.id, also_scaffold=sc)
+                print(pm_gate_feedback(result.get("gate", False), result.get("issues", [])))
+    print("- Prepared flow complete.")
+    print_codex_handoff()
+
+
+def _more_options_menu(dest: Path) -> None:
+    while True:
+        print("\nMore Options:")
+        print("  1) Code Quality Audit")
+        print("  2) Plan Proposals/Sprints")
+        print("  3) Copy .env.example → .env.local")
+        print("  4) Run bootstrap checks")
+        print("  5) Install missing tools (one-button)")
+        print("  6) Install pre-commit hook")
+        print("  7) Back")
+        try:
+            c = input("> ").strip()
+        except EOFError:
+            break
+        if c == "1":
+            run_quality_audit(dest)
+        elif c == "2":
+            _flow_plan_proposals(dest)
+        elif c == "3":
+            src = dest / ".env.example"; dst = dest / ".env.local"
+            if dst.exists():
+                print("- .env.local already exists; skipping")
+            elif src.exists():
+                shutil.copy2(src, dst); print("- Created .env.local from template")
+            else:
+                print("- .env.example not found; skipping")
+        elif c == "4":
+            try:
+                import subprocess
+                py = sys.executable or "python3"
+                subprocess.run([py, str(REPO_ROOT / "a2dev_cli.py"), "bootstrap"], check=False, cwd=str(dest))
+            except Exception as e:
+                print(f"- Bootstrap failed: {e}")
+        elif c == "5":
+            install_missing_tools_interactive(dest)
+        elif c == "6":
+            hook_src = dest / ".a2dev" / "hooks" / "pre-commit.sample"; hooks_dir = dest / ".git" / "hooks"; hook_dst = hooks_dir / "pre-commit"
+            try:
+                hooks_dir.mkdir(parents=True, exist_ok=True)
+                if hook_src.exists():
+                    shutil.copy2(hook_src, hook_dst)
+                    mode = os.stat(hook_dst).st_mode; os.chmod(hook_dst, mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+                    print(f"- Installed pre-commit hook at {hook_dst}")
+                else:
+                    print("- Sample hook not found; ensure A2Dev files are present")
+            except Exception as e:
+                print(f"- Failed to install pre-commit hook: {e}")
+        elif c == "7":
+            break
+
+
+
+
+def _flow_plan_proposals(dest: Path) -> None:
+    bl = read_backlog()
+    if not bl:
+        print("- No backlog found. Run assess first.")
+        return
+    try:
+        cap_in = input("Capacity (default 20): ").strip()
+    except EOFError:
+        cap_in = ""
+    try:
+        cap = float(cap_in) if cap_in else 20.0
+    except ValueError:
+        cap = 20.0
+    from ..sprints import plan_sprints
+    pmc = PMCoordinator()
+    enr = pmc.enrich_backlog(bl)
+    out_dir = Path('docs/proposals'); out_dir.mkdir(parents=True, exist_ok=True)
+    (out_dir/'proposed-backlog.json').write_text(enr.to_json())
+    sprints = plan_sprints(enr, capacity=cap)
+    for idx, sp in enumerate(sprints, start=1):
+        md = [f"# Proposed Sprint {idx}", "", f"Capacity: {cap}", "", "## Stories", ""]
+        pts = 0.0
+        for s in sp:
+            pts += float(s.estimate or 1)
+            md.append(f"- Story {s.id}: {s.title} (pts={s.estimate})")
+        md.append("")
+        md.append(f"Total points: {pts}")
+        (out_dir/f'sprint-{idx}.md').write_text("\n".join(md))
+    print(f"- Proposals written to {out_dir}")
+
+
+def add_arguments(p: argparse.ArgumentParser) -> None:
+    pass
+
+
+def run(args: argparse.Namespace) -> None:
+    dest = Path(".").resolve()
+    print_welcome()
+    if sys.stdin.isatty() and sys.stdout.isatty():
+        try:
+            run_setup_menu(dest)
+        except Exception:
+            print_next_steps(dest)
+    else:
+        print_next_steps(dest)
@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+import argparse
+
+from ..shard import shard_story
+from .common import require_backlog
+
+
+def add_arguments(p: argparse.ArgumentParser) -> None:
+    p.add_argument("id", type=int)
+
+
+def cmd_shard(story_id: int) -> None:
+    backlog = require_backlog()
+    out = shard_story(backlog, story_id)
+    print(f"Story shard written: {out}")
+
+
+def run(args: argparse.Namespace) -> None:
+    cmd_shard(args.id)
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from ..orchestrator import Orchestrator
+
+
+def add_arguments(p: argparse.ArgumentParser) -> None:
+    p.add_argument("id", type=int)
+    p.add_argument("--branch", action="store_true")
+
+
+def run(args: argparse.Namespace) -> None:
+    orch = Orchestrator()
+    sid = args.id
+    if args.branch:
+        try:
+            import subprocess
+            subprocess.run(["git", "checkout", "-b", f"story/{sid}"], check=False)
+        except Exception:
+            pass
+    result = orch.prepare_story(sid, also_scaffold=True)
+    out_dir = Path("docs/pr_drafts")
+    out_dir.mkdir(parents=True, exist_ok=True)
+    pr = out_dir / f"story-{sid}.md"
+    pr.write_text(
+        f"""# Draft PR — Story {sid}
+
+## Summary
+- Implement Story {sid}. See linked artifacts in docs/stories/story-{sid}.md
+
+## Checklist
+- [ ] All gates PASS
+- [ ] Tests updated
+- [ ] Docs updated
+
+## Notes
+- Issues: {', '.join(result.get('issues', [])) or 'None'}
+"""
+    )
+    print(f"Draft PR written: {pr}")
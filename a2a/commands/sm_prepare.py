@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import argparse
+
+from ..orchestrator import Orchestrator
+from ..status import format_status_line
+from ..storage import read_state
+
+
+def add_arguments(p: argparse.ArgumentParser) -> None:
+    p.add_argument("id", type=int)
+    p.add_argument("--branch", action="store_true", help="Create a git branch story/<id>")
+    p.add_argument("--no-scaffold", action="store_true", help="Skip scaffolding code")
+
+
+def run(args: argparse.Namespace) -> None:
+    orch = Orchestrator()
+    if args.branch:
+        # best-effort branch create
+        try:
+            import subprocess
+
+            subprocess.run(["git", "checkout", "-b", f"story/{args.id}"], check=False)
+        except Exception:
+            pass
+    result = orch.prepare_story(args.id, also_scaffold=not args.no_scaffold)
+    if result.get("gate"):
+        print("SM: Gate PASS")
+    else:
+        print("SM: Gate FAIL\n- " + "\n- ".join(result.get("issues", [])))
+    state = read_state()
+    print(format_status_line(state.phase, "PM", result.get("agents", []), result.get("artifacts", {}).get("created", []), result.get("referenced", []), gate=("PASS" if result.get("gate") else "FAIL")))
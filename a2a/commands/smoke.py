@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from ..orchestrator import Orchestrator
+from ..pm import PMCoordinator
+from ..roles import UXRole
+from ..roles.analyst import AnalystRole
+from ..roles.architecture import ArchitectureRole
+from ..storage import exists, read_backlog
+from .plan import cmd_plan
+
+
+def add_arguments(p: argparse.ArgumentParser) -> None:
+    pass
+
+
+def run(args: argparse.Namespace) -> None:
+    # Minimal smoke test: assess -> arch-global -> fe-spec -> proposals -> develop first story
+    issues = []
+    # Ensure PRD
+    prd = Path("docs/PRD.md")
+    if not prd.exists():
+        role = AnalystRole()
+        prd.parent.mkdir(parents=True, exist_ok=True)
+        prd.write_text(role.prd_template("Demo"))
+    # Assess
+    try:
+        cmd_plan(str(prd))
+    except Exception as e:
+        issues.append(f"assess-failed: {e}")
+    # Arch + FE spec
+    try:
+        rolea = ArchitectureRole()
+        Path("docs/architecture").mkdir(parents=True, exist_ok=True)
+        (Path("docs/architecture")/"architecture.md").write_text(rolea.generate_architecture_doc(str(prd)))
+    except Exception as e:
+        issues.append(f"arch-failed: {e}")
+    try:
+        roleu = UXRole()
+        (Path("docs/architecture")/"front-end-spec.md").write_text(roleu.frontend_spec("Demo"))
+    except Exception as e:
+        issues.append(f"fe-spec-failed: {e}")
+    # Proposals
+    try:
+        pmc = PMCoordinator()
+        bl = read_backlog()
+        if not bl:
+            issues.append("no-backlog-after-assess")
+        else:
+            enr = pmc.enrich_backlog(bl)
+            out_dir = Path("docs/proposals"); out_dir.mkdir(parents=True, exist_ok=True)
+            (out_dir/"proposed-backlog.json").write_text(enr.to_json())
+    except Exception as e:
+        issues.append(f"proposals-failed: {e}")
+    # Develop first story
+    try:
+        bl2 = read_backlog()
+        sid = None
+        if bl2:
+            for e in bl2.epics:
+                if e.stories:
+                    sid = e.stories[0].id; break
+        if sid is None:
+            issues.append("no-story-found")
+        else:
+            orch = Orchestrator(); orch.prepare_story(sid, also_scaffold=False)
+    except Exception as e:
+        issues.append(f"develop-failed: {e}")
+    # Check core artifacts
+    required = [
+        Path("docs/backlog.json"),
+        Path("docs/architecture/architecture.md"),
+        Path("docs/architecture/front-end-spec.md"),
+        Path("docs/proposals/proposed-backlog.json"),
+    ]
+    missing = [str(p) for p in required if not exists(p)]
+    if missing:
+        issues.append("missing: " + ", ".join(missing))
+    if issues:
+        print("SMOKE FAIL\n- " + "\n- ".join(issues))
+    else:
+        print("SMOKE PASS")
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+import argparse
+
+from ..roles import EngRole
+from ..storage import read_state, write_state
+from .common import require_backlog
+
+
+def add_arguments(p: argparse.ArgumentParser) -> None:
+    p.add_argument("id", type=int)
+
+
+def run(args: argparse.Namespace) -> None:
+    backlog = require_backlog()
+    idx = {s.id: s for e in backlog.epics for s in e.stories}
+    story = idx.get(args.id)
+    if not story:
+        raise SystemExit(f"Story {args.id} not found.")
+    eng = EngRole()
+    path = eng.scaffold_story(story)
+    state = read_state()
+    state.current_story_id = story.id
+    write_state(state)
+    print(f"Scaffold created: {path}")
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from ..pm import PMCoordinator
+from ..schema import Backlog
+from ..storage import read_backlog, write_backlog
+from .common import require_backlog
+
+
+def add_arguments(p: argparse.ArgumentParser) -> None:
+    props_sub = p.add_subparsers(dest="props_cmd", required=True)
+    p_props_gen = props_sub.add_parser("gen", help="Generate enriched backlog + proposed sprint plan")
+    p_props_gen.add_argument("--capacity", type=float, default=20.0)
+    p_props_gen.add_argument("--sprints", type=str, default="1", help="Number of sprints to emit or 'all'")
+    p_props_ref = props_sub.add_parser("refine", help="Refine proposals: accept/reject/estimate/priority")
+    p_props_ref.add_argument("--capacity", type=float, default=20.0)
+    p_props_ref.add_argument("--sprints", type=str, default="1", help="Number of sprints to emit or 'all'")
+    p_props_ref.add_argument("--accept", type=str, default="", help="Comma-separated story ids to accept")
+    p_props_ref.add_argument("--reject", type=str, default="", help="Comma-separated story ids to reject")
+    p_props_ref.add_argument("--estimate", type=str, default="", help="Comma-separated id=pts pairs")
+    p_props_ref.add_argument("--priority", type=str, default="", help="Comma-separated id=must|should|could pairs")
+    p_props_accept = props_sub.add_parser("accept", help="Merge proposed estimates/priorities into backlog.json")
+    p_props_accept.add_argument("--accept", type=str, default="", help="Comma-separated story ids to accept (optional; default: all in proposals)")
+
+
+def run(args: argparse.Namespace) -> None:
+    backlog = require_backlog()
+    pmc = PMCoordinator()
+    out_dir = Path("docs/proposals")
+    out_dir.mkdir(parents=True, exist_ok=True)
+    if args.props_cmd == "gen":
+        enriched = pmc.enrich_backlog(backlog)
+    else:
+        # refine mode: load existing, fallback to enrich if missing
+        pj = out_dir / "proposed-backlog.json"
+        if pj.exists():
+            enriched = Backlog.from_json(pj.read_text())
+        else:
+            enriched = pmc.enrich_backlog(backlog)
+        # apply accept/reject/estimate/priority
+        accept_ids = {int(i) for i in args.accept.split(',') if i.strip().isdigit()} if hasattr(args, 'accept') else set()
+        reject_ids = {int(i) for i in args.reject.split(',') if i.strip().isdigit()} if hasattr(args, 'reject') else set()
+        est_pairs = {}
+        pri_pairs = {}
+        if hasattr(args, 'estimate') and args.estimate:
+            for part in args.estimate.split(','):
+                if '=' in part:
+                    i, v = part.split('=', 1)
+                    if i.strip().isdigit():
+                        try:
+                            est_pairs[int(i.strip())] = float(v)
+                        except ValueError:
+                            pass
+        if hasattr(args, 'priority') and args.priority:
+            for part in args.priority.split(','):
+                if '=' in part:
+                    i, v = part.split('=', 1)
+                    if i.strip().isdigit():
+                        pri_pairs[int(i.strip())] = v.strip().lower()
+        # mutate
+        for e in enriched.epics:
+            kept = []
+            for s in e.stories:
+                if s.id in reject_ids:
+                    continue
+                if s.id in est_pairs:
+                    s.estimate = est_pairs[s.id]
+                if s.id in pri_pairs:
+                    from ..schema import Priority as _Priority
+                    try:
+                        s.priority = _Priority(pri_pairs[s.id])
+                    except Exception:
+                        pass
+                kept.append(s)
+            e.stories = kept
+        # track accepted set by filtering (if provided)
+        if accept_ids:
+            for e in enriched.epics:
+                e.stories = [s for s in e.stories if s.id in accept_ids]
+
+    # Accept merge: write back into backlog.json from enriched
+    if args.props_cmd == "accept":
+        prop_map = {s.id: s for e in enriched.epics for s in e.stories}
+        # Optional filter of IDs to accept
+        accept_ids = set()
+        if hasattr(args, 'accept') and args.accept:
+            accept_ids = {int(i) for i in args.accept.split(',') if i.strip().isdigit()}
+        cur = read_backlog()
+        if not cur:
+            raise SystemExit("No backlog found.")
+        previous = cur.to_json()  # backup the backlog as it was before this merge
+        updated = []
+        for e in cur.epics:
+            for s in e.stories:
+                if s.id in prop_map and (not accept_ids or s.id in accept_ids):
+                    ps = prop_map[s.id]
+                    s.estimate = ps.estimate
+                    s.priority = ps.priority
+                    updated.append(s.id)
+        backup = Path("docs/backlog.backup.json")
+        backup.write_text(previous)
+        write_backlog(cur)
+        print(f"Merged proposals into docs/backlog.json (backup: {backup}); updated stories: {sorted(updated)}")
+    # Write enriched backlog
+    (out_dir / "proposed-backlog.json").write_text(enriched.to_json())
+    # Write a simple markdown summary
+    lines = ["# Proposed Backlog (Enriched)", ""]
+    for e in enriched.epics:
+        lines.append(f"## {e.id}. {e.title}")
+        for s in e.stories:
+            lines.append(f"- Story {s.id}: {s.title} (priority={s.priority}, pts={s.estimate})")
+    (out_dir / "proposed-backlog.md").write_text("\n".join(lines))
+    # Plan sprint 1 from enriched using capacity (gen or refine uses capacity if provided)
+    from ..sprints import plan_sprints
+    cap = getattr(args, 'capacity', 20.0)
+    sprints = plan_sprints(enriched, capacity=cap)
+    # Determine how many sprints to write
+    sp_arg = getattr(args, 'sprints', '1')
+    max_sprints = len(sprints) if sp_arg == 'all' else max(1, int(str(sp_arg)))
+    wrote = 0
+    sprint_summaries = []
+    for idx, sp in enumerate(sprints, start=1):
+        if wrote >= max_sprints:
+            break
+        md = [f"# Proposed Sprint {idx}", "", f"Capacity: {cap}", "", "## Stories", ""]
+        pts = 0.0
+        for s in sp:
+            pts += float(s.estimate or 1)
+            md.append(f"- Story {s.id}: {s.title} (pts={s.estimate})")
+        md.append("")
+        md.append(f"Total points: {pts}")
+        (out_dir / f"sprint-{idx}.md").write_text("\n".join(md))
+        wrote += 1
+        sprint_summaries.append((idx, pts))
+    # Write proposals plan index
+    if sprint_summaries:
+        plan_lines = [f"# Proposals Sprint Plan (capacity={cap})", ""]
+        for (idx, pts) in sprint_summaries:
+            plan_lines.append(f"- Sprint {idx}: {pts}/{cap} -> {out_dir / f'sprint-{idx}.md'}")
+        (out_dir / "plan.md").write_text("\n".join(plan_lines))
+    # Console summary
+    pri_counts = {"must": 0, "should": 0, "could": 0}
+    total_pts = 0.0
+    for e in enriched.epics:
+        for s in e.stories:
+            key = getattr(s.priority, 'value', str(s.priority)).lower()
+            pri_counts[key] = pri_counts.get(key, 0) + 1
+            total_pts += float(s.estimate or 1)
+    summary = [
+        "Story proposals written:",
+        f"- {out_dir / 'proposed-backlog.json'}",
+        f"- {out_dir / 'proposed-backlog.md'}",
+    ]
+    if sprints:
+        # list written sprints
+        sp_arg = getattr(args, 'sprints', '1')
+        max_sprints = len(sprints) if sp_arg == 'all' else max(1, int(str(sp_arg)))
+        for i in range(1, min(max_sprints, len(sprints)) + 1):
+            summary.append(f"- {out_dir / f'sprint-{i}.md'}")
+    print("\n".join(summary))
+    print(f"Summary: must={pri_counts.get('must',0)}, should={pri_counts.get('should',0)}, could={pri_counts.get('could',0)}, total_pts={total_pts}")
+    # Write a summary.md
+    smd = [
+        "# Proposals Summary",
+        "",
+        f"Must: {pri_counts.get('must',0)}",
+        f"Should: {pri_counts.get('should',0)}",
+        f"Could: {pri_counts.get('could',0)}",
+        f"Total points: {total_pts}",
+    ]
+    if sprints:
+        smd.append("")
+        smd.append(f"Sprint 1 capacity: {cap}")
+    (out_dir / "summary.md").write_text("\n".join(smd))
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+import argparse
+
+from ..gate import gate_story
+from ..personas import spm_sustain_guidance
+from ..status import format_status_line
+from ..storage import read_state
+from .common import require_backlog
+
+
+def add_arguments(p: argparse.ArgumentParser) -> None:
+    p.add_argument("id", type=int)
+
+
+def run(args: argparse.Namespace) -> None:
+    backlog = require_backlog()
+    print(spm_sustain_guidance(args.id))
+    ok, issues, checked = gate_story(backlog, args.id)
+    print("Sustain: Gate PASS" if ok else "Sustain: Gate FAIL\n- " + "\n- ".join(issues))
+    state = read_state()
+    print(format_status_line(state.phase, "sPM", [], [], checked, gate=("PASS" if ok else "FAIL")))
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import argparse
+
+from ..symbols import SymbolIndex
+
+
+def add_arguments(p: argparse.ArgumentParser) -> None:
+    sym_sub = p.add_subparsers(dest="sym_cmd", required=True)
+    sym_sub.add_parser("build", help="Build or update the index").add_argument("--rebuild", action="store_true")
+    sym_sub.add_parser("def", help="Find definitions of a name (Class.method allowed)").add_argument("name")
+    sym_sub.add_parser("refs", help="Find references to a name").add_argument("name")
+    sym_sub.add_parser("in", help="List symbols defined in a file").add_argument("path")
+
+
+def run(args: argparse.Namespace) -> None:
+    idx = SymbolIndex(".")
+    stats = idx.update(rebuild=getattr(args, "rebuild", False))
+    if args.sym_cmd == "build":
+        print(f"Symbol index: {stats['files']} files, {stats['symbols']} symbols ({stats['parsed']} parsed) -> {idx.path}")
+    elif args.sym_cmd == "def":
+        for r in idx.find_definition(args.name):
+            scope = f"{r['scope']}." if r["scope"] else ""
+            print(f"{r['path']}:{r['line']}: {r['kind']} {scope}{r['name']}")
+    elif args.sym_cmd == "refs":
+        for r in idx.find_references(args.name):
+            print(f"{r['path']}:{r['line']}")
+    else:
+        for r in idx.symbols_in(args.path):
+            scope = f"{r['scope']}." if r["scope"] else ""
+            print(f"{r['line']}: {r['kind']} {scope}{r['name']}")
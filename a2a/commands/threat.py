@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+import argparse
+
+from ..roles.security import SecurityRole
+from .common import require_backlog
+
+
+def add_arguments(p: argparse.ArgumentParser) -> None:
+    p.add_argument("id", type=int)
+
+
+def cmd_threat(story_id: int) -> None:
+    backlog = require_backlog()
+    role = SecurityRole()
+    text = role.threat_model_for_story(backlog, story_id)
+    out = role.write_threat_model(text, story_id)
+    print(f"Threat model written: {out}")
+
+
+def run(args: argparse.Namespace) -> None:
+    cmd_threat(args.id)
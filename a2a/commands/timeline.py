@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+
+def add_arguments(p: argparse.ArgumentParser) -> None:
+    p.add_argument("target", help="'assess' or a story id", type=str)
+
+
+def run(args: argparse.Namespace) -> None:
+    target = args.target.strip().lower()
+    if target == "assess":
+        path = Path("docs/timeline/assess.md")
+        print(path.read_text() if path.exists() else "<no timeline>")
+    else:
+        try:
+            sid = int(target)
+        except ValueError:
+            raise SystemExit("timeline target must be 'assess' or a numeric story id")
+        path = Path(f"docs/timeline/story-{sid}.md")
+        print(path.read_text() if path.exists() else "<no timeline>")
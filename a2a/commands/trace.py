@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+import argparse
+
+from ..trace import generate_trace
+from .common import require_backlog
+
+
+def add_arguments(p: argparse.ArgumentParser) -> None:
+    p.add_argument("id", type=int)
+
+
+def cmd_trace(story_id: int) -> None:
+    backlog = require_backlog()
+    out = generate_trace(backlog, story_id)
+    print(f"Trace written: {out}")
+
+
+def run(args: argparse.Namespace) -> None:
+    cmd_trace(args.id)
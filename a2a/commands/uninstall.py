@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+
+def add_arguments(p: argparse.ArgumentParser) -> None:
+    p.add_argument("--dest", default=".", help="Target project root (default: .)")
+    p.add_argument("--force", action="store_true", help="Actually delete files (default: dry-run)")
+
+
+def run(args: argparse.Namespace) -> None:
+    target = Path(args.dest).resolve()
+    # Conservative list of files/dirs to remove
+    candidates = [
+        target / ".a2dev",
+        target / "a2dev_cli.py",
+        target / "a2a_cli.py",
+        target / "AGENTS.md",
+        target / "scripts" / "startup.sh",
+        target / "scripts" / "install_a2dev.py",
+        target / "scripts" / "postinstall.js",
+        target / "scripts" / "build_pyz.py",
+        target / "tools" / "codex_router_example.py",
+        target / "examples" / "codex-tools.ts",
+        target / "examples" / "harness.ts",
+    ]
+    existing = [p for p in candidates if p.exists()]
+    if not existing:
+        print(f"No A2Dev files found under {target}")
+        return
+    print("A2Dev uninstall (dry-run) — would remove:")
+    for p in existing:
+        print(f"- {p}")
+    if args.force:
+        import shutil
+        for p in existing:
+            try:
+                if p.is_dir():
+                    shutil.rmtree(p)
+                else:
+                    p.unlink()
+            except Exception:
+                pass
+        print("A2Dev files removed.")
+    else:
+        print("Re-run with --force to actually delete these files.")
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import argparse
+from typing import List
+
+from ..roles import UXRole
+from ..storage import write_ux_doc
+from .common import require_backlog
+
+
+def add_arguments(p: argparse.ArgumentParser) -> None:
+    p.add_argument("ids", nargs="+", type=int)
+
+
+def cmd_ux(ids: List[int]) -> None:
+    backlog = require_backlog()
+    ux = UXRole()
+    idx = {s.id: s for e in backlog.epics for s in e.stories}
+    for sid in ids:
+        story = idx.get(sid)
+        if not story:
+            print(f"Story {sid} not found; skipping")
+            continue
+        doc = ux.create_ux_doc(story)
+        path = write_ux_doc(doc)
+        print(f"UX doc written: {path}")
+
+
+def run(args: argparse.Namespace) -> None:
+    cmd_ux(args.ids)
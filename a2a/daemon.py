@@ -0,0 +1,288 @@
+from __future__ import annotations
+
+import io
+import json
+import os
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+import traceback
+from contextlib import redirect_stderr, redirect_stdout
+from contextvars import copy_context
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .client import NOT_SERVED, LOCAL_FLAGS, RUN_DIR, DaemonError, forwarded, request, socket_path
+
+PID_NAME = "a2dev.pid"
+LOG_NAME = "serve.log"
+PACKAGE_DIR = Path(__file__).resolve().parent
+
+# JSON-RPC error codes: the standard ones plus "refused" (not run; the client runs it locally).
+PARSE_ERROR = -32700
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+REFUSED = -32001
+
+
+def run_captured(argv: List[str], env: Dict[str, str]) -> Dict[str, Any]:
+    """Run one CLI command in this process and return its exit code and captured output.
+
+    `env` replaces the forwarded (`A2DEV_*`, provider) variables for the duration
+    of the command; stdin is empty, so prompts see EOF. Used by the daemon and by
+    `a2dev batch`.
+    """
+    from .cli import main
+
+    saved = {k: v for k, v in os.environ.items() if forwarded(k)}
+    for k in saved:
+        del os.environ[k]
+    os.environ.update({k: str(v) for k, v in env.items() if forwarded(k)})
+    out, err = io.StringIO(), io.StringIO()
+    code = 0
+    stdin = sys.stdin
+    try:
+        sys.stdin = io.StringIO("")  # nothing to prompt: input() gets EOF, isatty() is False
+        with redirect_stdout(out), redirect_stderr(err):
+            # A fresh context per command, so e.g. set_priority() does not leak.
+            copy_context().run(main, argv)
+    except SystemExit as e:
+        if isinstance(e.code, int) or e.code is None:
+            code = e.code or 0
+        else:
+            err.write(f"{e.code}\n")
+            code = 1
+    except BaseException:
+        err.write(traceback.format_exc())
+        code = 1
+    finally:
+        sys.stdin = stdin
+        for k in [k for k in os.environ if forwarded(k)]:
+            del os.environ[k]
+        os.environ.update(saved)
+    return {"code": code, "stdout": out.getvalue(), "stderr": err.getvalue()}
+
+
+class _Server(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+
+def _source_stamp() -> float:
+    """Newest mtime under the `a2a` package: a daemon must not serve code older than the tree."""
+    return max((p.stat().st_mtime for p in PACKAGE_DIR.rglob("*.py")), default=0.0)
+
+
+class Daemon:
+    """Runs CLI commands in one warm process.
+
+    Imports, the argparse tree, LLM schedulers/health, token counts and other
+    in-process memos survive between requests; artifacts (backlog, state) are
+    re-read from disk by each command as usual, so other writers stay visible.
+    Commands run one at a time: they share stdout, the environment and the cwd.
+    """
+
+    def __init__(self, root: str | Path = ".", idle_timeout: float = 1800.0):
+        self.root = Path(root).resolve()
+        self.idle_timeout = idle_timeout
+        self.started = time.time()
+        self.last_active = time.monotonic()
+        self.requests = 0
+        self.stamp = _source_stamp()
+        self.server: Optional[_Server] = None
+        self.stopped = threading.Event()
+        self._lock = threading.Lock()
+
+    def status(self) -> Dict[str, Any]:
+        return {"pid": os.getpid(), "root": str(self.root), "uptime": time.time() - self.started,
+                "requests": self.requests, "socket": socket_path(".")}
+
+    def handle(self, req: Dict[str, Any]) -> Dict[str, Any]:
+        method, params = req.get("method"), req.get("params") or {}
+        reply: Dict[str, Any] = {"jsonrpc": "2.0", "id": req.get("id")}
+        self.last_active = time.monotonic()
+        if method == "ping":
+            reply["result"] = self.status()
+        elif method == "shutdown":
+            reply["result"] = {"ok": True}
+            self._request_stop()
+        elif method == "run":
+            argv = params.get("argv")
+            if not isinstance(argv, list) or not all(isinstance(a, str) for a in argv):
+                reply["error"] = {"code": INVALID_PARAMS, "message": "argv must be a list of strings"}
+            elif refusal := self._refusal(argv, params.get("cwd")):
+                reply["error"] = {"code": REFUSED, "message": refusal}
+            else:
+                reply["result"] = self.run(argv, params.get("env") or {})
+        else:
+            reply["error"] = {"code": METHOD_NOT_FOUND, "message": f"unknown method: {method}"}
+        return reply
+
+    def _refusal(self, argv: List[str], cwd: Optional[str]) -> Optional[str]:
+        cmd = next((a for a in argv if not a.startswith("-")), None)
+        if cmd in NOT_SERVED or LOCAL_FLAGS.intersection(argv):
+            return f"not served by the daemon: {' '.join(argv)}"
+        if not cwd or Path(cwd).resolve() != self.root:
+            return f"daemon serves {self.root}, not {cwd}"
+        if _source_stamp() != self.stamp:
+            self._request_stop()
+            return "a2a sources changed since the daemon started; shutting down"
+        return None
+
+    def run(self, argv: List[str], env: Dict[str, str]) -> Dict[str, Any]:
+        with self._lock:
+            self.requests += 1
+            try:
+                return run_captured(argv, env)
+            finally:
+                os.chdir(self.root)
+                self.last_active = time.monotonic()
+
+    def _watch_idle(self) -> None:
+        while self.server is not None:
+            time.sleep(min(30.0, max(1.0, self.idle_timeout / 10)))
+            if not self._lock.locked() and time.monotonic() - self.last_active > self.idle_timeout:
+                self.stop()
+                return
+
+    def _request_stop(self) -> None:
+        # From a request handler: server.shutdown() waits for serve_forever, so stop from another thread.
+        self.stopped.set()
+        threading.Thread(target=self.stop, daemon=True).start()
+
+    def stop(self) -> None:
+        self.stopped.set()
+        server, self.server = self.server, None
+        if server is not None:
+            server.shutdown()
+
+    def serve_forever(self) -> None:
+        daemon = self
+        run_dir = self.root / RUN_DIR
+        run_dir.mkdir(parents=True, exist_ok=True)
+        os.chdir(self.root)
+        sock = socket_path(".")
+        if os.path.exists(sock):
+            try:
+                request("ping", root=".", timeout=2)
+            except (OSError, ValueError, DaemonError):
+                os.unlink(sock)  # stale socket from a crashed daemon
+            else:
+                raise SystemExit(f"[A2Dev] a daemon is already running on {sock}")
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self) -> None:
+                for line in self.rfile:
+                    try:
+                        req = json.loads(line)
+                    except ValueError:
+                        reply = {"jsonrpc": "2.0", "id": None, "error": {"code": PARSE_ERROR, "message": "invalid JSON"}}
+                    else:
+                        reply = daemon.handle(req if isinstance(req, dict) else {})
+                    self.wfile.write(json.dumps(reply).encode() + b"\n")
+                    self.wfile.flush()
+
+        old_umask = os.umask(0o177)  # socket usable by this user only
+        try:
+            self.server = _Server(sock, Handler)
+        finally:
+            os.umask(old_umask)
+        (run_dir / PID_NAME).write_text(str(os.getpid()))
+        if self.idle_timeout > 0:
+            threading.Thread(target=self._watch_idle, name="a2dev-idle", daemon=True).start()
+        print(f"[A2Dev] serving {self.root} on {sock} (pid {os.getpid()})", flush=True)
+        server = self.server
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            for name in (sock, os.path.join(RUN_DIR, PID_NAME)):
+                try:
+                    os.unlink(name)
+                except OSError:
+                    pass
+
+
+def serve(root: str | Path = ".", idle_timeout: float = 1800.0) -> None:
+    # Warm the expensive imports before the first request arrives.
+    from .cli import build_parser
+
+    build_parser(full=True)
+    Daemon(root, idle_timeout).serve_forever()
+
+
+def serve_stdio(root: str | Path = ".") -> None:
+    """Answer JSON-RPC lines on stdin, one at a time, until EOF (a worker of `bin/pool.js`).
+
+    Replies go to the original stdout; fd 1 is pointed at stderr so that output from
+    commands and their subprocesses cannot corrupt the reply stream. A `ready`
+    notification is written once the parser is warm.
+    """
+    from .cli import build_parser
+
+    build_parser(full=True)
+    daemon = Daemon(root, idle_timeout=0)
+    os.chdir(daemon.root)
+    stdin = sys.stdin
+    replies = os.fdopen(os.dup(1), "w", encoding="utf-8")
+    os.dup2(2, 1)
+
+    def send(obj: Dict[str, Any]) -> None:
+        replies.write(json.dumps(obj) + "\n")
+        replies.flush()
+
+    send({"jsonrpc": "2.0", "method": "ready", "params": {"pid": os.getpid()}})
+    for line in stdin:
+        try:
+            req = json.loads(line)
+        except ValueError:
+            send({"jsonrpc": "2.0", "id": None, "error": {"code": PARSE_ERROR, "message": "invalid JSON"}})
+            continue
+        send(daemon.handle(req if isinstance(req, dict) else {}))
+        if daemon.stopped.is_set():
+            break
+
+
+def daemon_status(root: str | Path = ".") -> Optional[Dict[str, Any]]:
+    try:
+        return request("ping", root=str(root), timeout=2)
+    except (OSError, ValueError, DaemonError):
+        return None
+
+
+def stop_daemon(root: str | Path = ".") -> bool:
+    try:
+        request("shutdown", root=str(root), timeout=5)
+    except (OSError, ValueError, DaemonError):
+        return False
+    sock = socket_path(str(root))
+    for _ in range(50):
+        if not os.path.exists(sock):
+            break
+        time.sleep(0.05)
+    return True
+
+
+def start_detached(root: str | Path = ".", idle_timeout: float = 1800.0, wait: float = 10.0) -> int:
+    """Start `a2dev serve` in a new session and wait until it answers."""
+    root = Path(root).resolve()
+    run_dir = root / RUN_DIR
+    run_dir.mkdir(parents=True, exist_ok=True)
+    cli = PACKAGE_DIR.parent / "a2dev_cli.py"
+    cmd = [sys.executable, str(cli)] if cli.exists() else [sys.executable, "-m", "a2a.cli"]
+    with open(run_dir / LOG_NAME, "ab") as log:
+        proc = subprocess.Popen(
+            cmd + ["serve", "--idle-timeout", str(idle_timeout)], cwd=str(root),
+            stdin=subprocess.DEVNULL, stdout=log, stderr=subprocess.STDOUT, start_new_session=True,
+        )
+    deadline = time.monotonic() + wait
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise SystemExit(f"[A2Dev] daemon exited early (code {proc.returncode}); see {run_dir / LOG_NAME}")
+        if daemon_status(os.path.relpath(root)):
+            return proc.pid
+        time.sleep(0.05)
+    return proc.pid
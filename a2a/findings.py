@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .cache import cache_dir, CACHE_DIR
+
+DB_NAME = "findings.sqlite3"
+SEVERITIES = ("high", "medium", "low")
+_SEMGREP_SEVERITY = {
+    "ERROR": "high", "HIGH": "high", "CRITICAL": "high",
+    "WARNING": "medium", "MEDIUM": "medium",
+    "INFO": "low", "LOW": "low",
+}
+UNKNOWN_SEVERITY = "unknown"  # stored, but not part of the high/medium/low counts
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    tool TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    source TEXT,
+    source_mtime INTEGER,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS findings (
+    id INTEGER PRIMARY KEY,
+    tool TEXT NOT NULL,
+    rule TEXT,
+    severity TEXT,
+    path TEXT,
+    line INTEGER,
+    fingerprint TEXT NOT NULL,
+    message TEXT,
+    first_seen REAL,
+    last_seen REAL,
+    UNIQUE (tool, fingerprint)
+);
+CREATE TABLE IF NOT EXISTS run_findings (
+    run_id INTEGER NOT NULL,
+    finding_id INTEGER NOT NULL,
+    PRIMARY KEY (run_id, finding_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_runs_scope ON runs (tool, scope, id);
+CREATE INDEX IF NOT EXISTS idx_findings_severity ON findings (tool, severity);
+CREATE INDEX IF NOT EXISTS idx_findings_location ON findings (path, line);
+"""
+
+# (rule, severity, path, line, fingerprint, message)
+Row = Tuple[str, str, str, int, str, str]
+
+
+def _fingerprint(*parts: Any) -> str:
+    return hashlib.sha1("\x1f".join(str(p) for p in parts).encode("utf-8", "replace")).hexdigest()
+
+
+def semgrep_rows(results: Iterable[Dict[str, Any]]) -> Iterator[Row]:
+    for r in results:
+        extra = r.get("extra", {}) or {}
+        rule = r.get("check_id", "")
+        path = r.get("path", "")
+        line = int((r.get("start") or {}).get("line", 0) or 0)
+        severity = _SEMGREP_SEVERITY.get(str(extra.get("severity", "")).upper(), UNKNOWN_SEVERITY)
+        # Semgrep's own fingerprint is often a placeholder ("requires login"), so key on the match.
+        fp = _fingerprint(rule, path, line, (extra.get("lines") or "").strip())
+        yield rule, severity, path, line, fp, str(extra.get("message", ""))[:500]
+
+
+def gitleaks_rows(findings: Iterable[Dict[str, Any]]) -> Iterator[Row]:
+    for f in findings:
+        rule = f.get("RuleID", "")
+        path = f.get("File", "")
+        line = int(f.get("StartLine", 0) or 0)
+        fp = f.get("Fingerprint") or _fingerprint(rule, path, line, f.get("Match", ""))
+        yield rule, "high", path, line, fp, str(f.get("Description", ""))[:500]
+
+
+def report_items(tool: str, data: Any) -> Iterable[Dict[str, Any]]:
+    """The finding records inside a parsed Semgrep or Gitleaks report."""
+    if tool == "semgrep":
+        return data.get("results", []) if isinstance(data, dict) else []
+    items = data if isinstance(data, list) else (data.get("findings", []) if isinstance(data, dict) else [])
+    return items if isinstance(items, list) else []
+
+
+def rows_for(tool: str, data: Any) -> Iterator[Row]:
+    items = report_items(tool, data)
+    return semgrep_rows(items) if tool == "semgrep" else gitleaks_rows(items)
+
+
+def report_rows(tool: str, path: Path) -> Iterator[Row]:
+    """Normalised rows streamed from a report file (Semgrep JSON/SARIF or Gitleaks JSON)."""
+    from .quality import iter_gitleaks_findings, iter_semgrep_results
+
+    if tool == "semgrep":
+        return semgrep_rows(iter_semgrep_results(path))
+    return gitleaks_rows(iter_gitleaks_findings(path))
+
+
+def _count_rows(rows: Iterable[Row]) -> Dict[str, int]:
+    counts = {s: 0 for s in SEVERITIES}
+    for row in rows:
+        if row[1] in counts:
+            counts[row[1]] += 1
+    counts["total"] = sum(counts[s] for s in SEVERITIES)
+    return counts
+
+
+class FindingsStore:
+    """SQLite store of normalised Semgrep/Gitleaks findings, one run per ingested report.
+
+    Findings are deduplicated on (tool, fingerprint); `run_findings` links each run
+    to the findings it reported, which gives per-run counts and new/resolved diffs.
+    """
+
+    def __init__(self, root: str | Path = "."):
+        self.root = Path(root)
+        self.path = self.root / CACHE_DIR / DB_NAME
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def __enter__(self) -> "FindingsStore":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            cache_dir(self.root)
+            self._conn = sqlite3.connect(str(self.path), timeout=10)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+        return self._conn
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def ingest(self, tool: str, scope: str, rows: Iterable[Row],
+               source: Optional[str] = None, source_mtime: Optional[int] = None) -> int:
+        """Record a run for (tool, scope) from normalised rows; returns the run id."""
+        now = time.time()
+        c = self.conn
+        with c:
+            run_id = c.execute(
+                "INSERT INTO runs (tool, scope, source, source_mtime, created_at) VALUES (?, ?, ?, ?, ?)",
+                (tool, scope, source, source_mtime, now),
+            ).lastrowid
+            for rule, severity, path, line, fp, message in rows:
+                c.execute(
+                    "INSERT INTO findings (tool, rule, severity, path, line, fingerprint, message, first_seen, last_seen)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+                    " ON CONFLICT (tool, fingerprint) DO UPDATE SET last_seen = excluded.last_seen,"
+                    " severity = excluded.severity, message = excluded.message",
+                    (tool, rule, severity, path, line, fp, message, now, now),
+                )
+                fid = c.execute("SELECT id FROM findings WHERE tool = ? AND fingerprint = ?", (tool, fp)).fetchone()[0]
+                c.execute("INSERT OR IGNORE INTO run_findings (run_id, finding_id) VALUES (?, ?)", (run_id, fid))
+        return int(run_id)
+
+    def latest_run(self, tool: str, scope: str) -> Optional[Tuple[int, Optional[str], Optional[int]]]:
+        return self.conn.execute(
+            "SELECT id, source, source_mtime FROM runs WHERE tool = ? AND scope = ? ORDER BY id DESC LIMIT 1",
+            (tool, scope),
+        ).fetchone()
+
+    def ingest_report(self, tool: str, scope: str, path: Path) -> Optional[int]:
+        """Ingest a JSON report file unless the latest run for scope already read this version."""
+        try:
+            mtime = path.stat().st_mtime_ns
+        except OSError:
+            return None
+        last = self.latest_run(tool, scope)
+        if last and last[1] == str(path) and last[2] == mtime:
+            return last[0]
+        try:
+            return self.ingest(tool, scope, report_rows(tool, path), source=str(path), source_mtime=mtime)
+        except (OSError, ValueError):
+            return None  # unreadable/truncated report; the transaction was rolled back
+
+    def counts(self, run_id: int) -> Dict[str, int]:
+        counts = {s: 0 for s in SEVERITIES}
+        for severity, n in self.conn.execute(
+            "SELECT f.severity, COUNT(*) FROM run_findings rf JOIN findings f ON f.id = rf.finding_id"
+            " WHERE rf.run_id = ? GROUP BY f.severity",
+            (run_id,),
+        ):
+            if severity in counts:
+                counts[severity] = n
+        counts["total"] = sum(counts[s] for s in SEVERITIES)
+        return counts
+
+    def diff(self, tool: str, scope: str) -> Dict[str, int]:
+        """New/resolved finding counts between the last two runs of (tool, scope)."""
+        runs = [r[0] for r in self.conn.execute(
+            "SELECT id FROM runs WHERE tool = ? AND scope = ? ORDER BY id DESC LIMIT 2", (tool, scope))]
+        if len(runs) < 2:
+            return {"new": 0, "resolved": 0}
+        q = ("SELECT COUNT(*) FROM run_findings a WHERE a.run_id = ? AND NOT EXISTS"
+             " (SELECT 1 FROM run_findings b WHERE b.run_id = ? AND b.finding_id = a.finding_id)")
+        new = self.conn.execute(q, (runs[0], runs[1])).fetchone()[0]
+        resolved = self.conn.execute(q, (runs[1], runs[0])).fetchone()[0]
+        return {"new": new, "resolved": resolved}
+
+    def trend(self, tool: str, scope: str, limit: int = 10) -> List[Dict[str, Any]]:
+        rows = self.conn.execute(
+            "SELECT r.id, r.created_at, COUNT(rf.finding_id) FROM runs r"
+            " LEFT JOIN run_findings rf ON rf.run_id = r.id WHERE r.tool = ? AND r.scope = ?"
+            " GROUP BY r.id ORDER BY r.id DESC LIMIT ?",
+            (tool, scope, limit),
+        ).fetchall()
+        return [{"run": i, "created_at": t, "findings": n} for i, t, n in reversed(rows)]
+
+
+def report_counts(tool: str, path: Path, scope: str, root: str | Path = ".") -> Optional[Dict[str, int]]:
+    """Severity counts (high/medium/low/total) for a report file, via the findings store.
+
+    Falls back to counting the parsed report directly if the database is unusable.
+    Returns None when the report is missing or unreadable.
+    """
+    if not path.exists():
+        return None
+    try:
+        with FindingsStore(root) as store:
+            run_id = store.ingest_report(tool, scope, path)
+            return store.counts(run_id) if run_id is not None else None
+    except (sqlite3.Error, OSError):
+        try:
+            return _count_rows(report_rows(tool, path))
+        except (OSError, ValueError):
+            return None
+
+
+def record_scan(tool: str, scope: str, data: Any, root: str | Path = ".") -> Dict[str, int]:
+    """Store an in-memory scan result as a run; returns counts plus new/resolved vs the previous run."""
+    try:
+        with FindingsStore(root) as store:
+            run_id = store.ingest(tool, scope, rows_for(tool, data))
+            return {**store.counts(run_id), **store.diff(tool, scope)}
+    except (sqlite3.Error, OSError):
+        return _count_rows(rows_for(tool, data))
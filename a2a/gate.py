@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from pathlib import Path
 from .schema import Backlog
-from .quality import semgrep_summary
+from .findings import report_counts
 
 
 def gate_story(backlog: Backlog, story_id: int) -> tuple[bool, list[str], list[str]]:
@@ -34,21 +34,15 @@ def gate_story(backlog: Backlog, story_id: int) -> tuple[bool, list[str], list[s
 
     # Semgrep high severity must be zero if report exists
     semgrep_json = Path(f"docs/security/semgrep/story-{story_id}.json")
-    if semgrep_json.exists():
-        high, med, low = semgrep_summary(semgrep_json)
-        if high > 0:
-            missing.append(f"Semgrep high-severity findings: {high}")
+    sem = report_counts("semgrep", semgrep_json, scope=f"story-{story_id}")
+    if sem and sem["high"] > 0:
+        missing.append(f"Semgrep high-severity findings: {sem['high']}")
 
     # Secrets scan must be empty if report exists
     secrets_json = Path(f"docs/security/secrets/story-{story_id}.json")
-    if secrets_json.exists():
-        try:
-            data = __import__("json").loads(secrets_json.read_text())
-            findings = data.get("findings", data if isinstance(data, list) else [])
-            if isinstance(findings, list) and len(findings) > 0:
-                missing.append(f"Secrets findings detected: {len(findings)}")
-        except Exception:
-            pass
+    leaks = report_counts("gitleaks", secrets_json, scope=f"story-{story_id}")
+    if leaks and leaks["total"] > 0:
+        missing.append(f"Secrets findings detected: {leaks['total']}")
 
     # Privacy check from Analytics spec
     _analytics_privacy_check(story_id, checked_paths, missing)
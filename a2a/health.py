@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import bisect
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+# Log-spaced latency buckets: 50ms growing by 25% per bucket up to ~5 minutes.
+BUCKETS: List[float] = [0.05 * 1.25 ** i for i in range(40)]
+WINDOW = 500          # counts are halved past this many samples, so old behaviour fades out
+ERROR_ALPHA = 0.1     # weight of the latest outcome in the error-rate EWMA
+
+HEDGE_QUANTILE = 0.95
+HEDGE_DELAY = 10.0      # seconds: used until HEDGE_MIN_SAMPLES latencies are known, and the ceiling after
+HEDGE_MIN_DELAY = 0.1
+HEDGE_MIN_SAMPLES = 20
+
+BREAKER_FAILURES = 5
+BREAKER_COOLDOWN = 30.0
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, ""))
+    except ValueError:
+        return default
+
+
+class LatencyHistogram:
+    """Decaying histogram over fixed log buckets; quantiles are bucket upper bounds (±25%)."""
+
+    def __init__(self, window: int = WINDOW):
+        self.window = window
+        self.counts = [0.0] * (len(BUCKETS) + 1)
+        self.total = 0.0
+        self.samples = 0
+
+    def record(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.total += 1
+        self.samples += 1
+        if self.total >= self.window:
+            self.counts = [c / 2 for c in self.counts]
+            self.total /= 2
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.total:
+            return None
+        target = q * self.total
+        seen = 0.0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= target and c:
+                return BUCKETS[i] if i < len(BUCKETS) else BUCKETS[-1] * 1.25
+        return BUCKETS[-1] * 1.25
+
+
+class ModelHealth:
+    """Latency histogram and error rate of one model's live calls."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.latency = LatencyHistogram()
+        self.error_rate = 0.0
+        self.calls = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def record(self, ok: bool, seconds: Optional[float] = None) -> None:
+        with self._lock:
+            self.calls += 1
+            self.errors += 0 if ok else 1
+            self.error_rate += ERROR_ALPHA * ((0.0 if ok else 1.0) - self.error_rate)
+            if ok and seconds is not None:
+                self.latency.record(seconds)
+
+    def quantile(self, q: float) -> Optional[float]:
+        with self._lock:
+            return self.latency.quantile(q)
+
+    def samples(self) -> int:
+        with self._lock:
+            return self.latency.samples
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"model": self.name, "calls": self.calls, "errors": self.errors,
+                    "error_rate": round(self.error_rate, 3), "samples": self.latency.samples,
+                    "p50": self.latency.quantile(0.5), "p95": self.latency.quantile(0.95)}
+
+
+class CircuitBreaker:
+    """Per-provider breaker: `failures` consecutive errors open it for `cooldown` seconds.
+
+    After the cooldown one probe request is let through (half-open); its success
+    closes the breaker, its failure re-opens it. A probe that never reports back
+    (abandoned stream) is replaced after another cooldown.
+    """
+
+    def __init__(self, provider: str, failures: Optional[int] = None, cooldown: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.provider = provider
+        self.failures = failures or max(1, int(_env_float("A2DEV_LLM_BREAKER_FAILURES", BREAKER_FAILURES)))
+        self.cooldown = _env_float("A2DEV_LLM_BREAKER_COOLDOWN", BREAKER_COOLDOWN) if cooldown is None else cooldown
+        self.clock = clock
+        self.consecutive = 0
+        self.opened_at: Optional[float] = None
+        self.probe_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        return "open" if self.clock() - self.opened_at < self.cooldown else "half-open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self._state()
+            if state == "closed":
+                return True
+            if state == "open":
+                return False
+            now = self.clock()
+            if self.probe_at is None or now - self.probe_at >= self.cooldown:
+                self.probe_at = now
+                return True
+            return False
+
+    def record(self, ok: bool) -> None:
+        with self._lock:
+            if ok:
+                self.consecutive = 0
+                self.opened_at = self.probe_at = None
+                return
+            self.consecutive += 1
+            if self.probe_at is not None or self.consecutive >= self.failures:
+                self.opened_at = self.clock()
+                self.probe_at = None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"provider": self.provider, "state": self._state(), "consecutive_failures": self.consecutive}
+
+
+_MODELS: Dict[str, ModelHealth] = {}
+_BREAKERS: Dict[str, CircuitBreaker] = {}
+_LOCK = threading.Lock()
+
+
+def model_health(name: str) -> ModelHealth:
+    """Process-wide health record for a model, shared by every LLMClient."""
+    with _LOCK:
+        if name not in _MODELS:
+            _MODELS[name] = ModelHealth(name)
+        return _MODELS[name]
+
+
+def breaker_for(provider: str) -> CircuitBreaker:
+    with _LOCK:
+        if provider not in _BREAKERS:
+            _BREAKERS[provider] = CircuitBreaker(provider)
+        return _BREAKERS[provider]
+
+
+def hedge_delay(name: str) -> float:
+    """Seconds to wait on `name` before hedging: its recent `A2DEV_LLM_HEDGE_QUANTILE` (p95)
+    latency, capped by `A2DEV_LLM_HEDGE_DELAY`, which also applies until enough calls are seen."""
+    ceiling = _env_float("A2DEV_LLM_HEDGE_DELAY", HEDGE_DELAY)
+    health = model_health(name)
+    if health.samples() < HEDGE_MIN_SAMPLES:
+        return ceiling
+    q = health.quantile(min(0.999, max(0.5, _env_float("A2DEV_LLM_HEDGE_QUANTILE", HEDGE_QUANTILE))))
+    return max(HEDGE_MIN_DELAY, min(ceiling, q if q is not None else ceiling))
+
+
+def snapshot() -> Dict[str, Any]:
+    with _LOCK:
+        models, breakers = list(_MODELS.values()), list(_BREAKERS.values())
+    return {"models": [m.stats() for m in models], "providers": [b.stats() for b in breakers]}
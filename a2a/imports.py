@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import ast
+from array import array
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .parallel import map_chunked
+
+
+def module_names(py_files: Sequence[str]) -> Dict[str, Tuple[str, bool]]:
+    """Map relative .py paths to (dotted module name, is_package).
+
+    Package roots are found by walking up while `__init__.py` exists, so both flat
+    and `src/` layouts resolve to their importable names. A standalone file outside
+    the root directory whose name is claimed more than once (`scripts/run.py` and
+    `tools/run.py`) is qualified by its directory, e.g. "scripts/run".
+    """
+    present = set(py_files)
+    is_pkg_dir: Dict[str, bool] = {}
+
+    def pkg(d: Path) -> bool:
+        key = str(d)
+        if key not in is_pkg_dir:
+            is_pkg_dir[key] = key != "." and str(d / "__init__.py") in present
+        return is_pkg_dir[key]
+
+    out: Dict[str, Tuple[str, bool]] = {}
+    claims: Dict[str, int] = {}
+    for rel in py_files:
+        p = Path(rel)
+        is_init = p.name == "__init__.py"
+        parts: List[str] = [] if is_init else [p.stem]
+        d = p.parent
+        while pkg(d):
+            parts.append(d.name)
+            d = d.parent
+        if parts:
+            name = ".".join(reversed(parts))
+            out[rel] = (name, is_init)
+            claims[name] = claims.get(name, 0) + 1
+    for rel, (name, is_init) in out.items():
+        d = Path(rel).parent
+        if claims[name] > 1 and not is_init and "." not in name and str(d) != ".":
+            out[rel] = (f"{d.as_posix()}/{name}", False)
+    return out
+
+
+def _script_dir(rel: str, name: str, is_pkg: bool) -> str:
+    """Directory a standalone file imports its siblings from ("" for package modules and the root)."""
+    d = Path(rel).parent
+    if is_pkg or ("." in name and "/" not in name) or str(d) == ".":
+        return ""
+    return d.as_posix()
+
+
+def _top_level_imports(tree: ast.Module) -> List[Tuple[str, int, List[str]]]:
+    """(module, level, names) for imports at module scope, including top-level if/try blocks."""
+    found: List[Tuple[str, int, List[str]]] = []
+    stack: List[ast.stmt] = list(tree.body)
+    while stack:
+        node = stack.pop()
+        if isinstance(node, ast.Import):
+            found.extend((a.name, 0, []) for a in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            found.append((node.module or "", node.level, [a.name for a in node.names]))
+        elif isinstance(node, (ast.If, ast.Try)):
+            stack.extend(node.body)
+            stack.extend(node.orelse)
+            if isinstance(node, ast.Try):
+                stack.extend(node.finalbody)
+                for h in node.handlers:
+                    stack.extend(h.body)
+    return found
+
+
+def _resolve(mod: str, is_pkg: bool, name: str, level: int) -> str:
+    if not level:
+        return name
+    base = mod.split(".")
+    # A package's __init__ is its own anchor; a module's anchor is its parent package.
+    drop = level - 1 if is_pkg else level
+    base = base[: len(base) - drop] if drop else base
+    return ".".join([*base, name] if name else base)
+
+
+def _imports_chunk(items: List[Tuple[str, str, bool]]) -> List[Tuple[str, List[Tuple[int, List[str]]]]]:
+    out: List[Tuple[str, List[Tuple[int, List[str]]]]] = []
+    for abs_path, mod, is_pkg in items:
+        try:
+            tree = ast.parse(Path(abs_path).read_bytes())
+        except (OSError, SyntaxError, ValueError):
+            out.append((mod, []))
+            continue
+        groups: List[Tuple[int, List[str]]] = []
+        for name, level, names in _top_level_imports(tree):
+            base = _resolve(mod, is_pkg, name, level)
+            # `from pkg import sub` may name a submodule; the resolver keeps whichever exists.
+            subs = [f"{base}.{n}" if base else n for n in names if n != "*"]
+            groups.append((level, [base, *subs]))
+        out.append((mod, groups))
+    return out
+
+
+@dataclass
+class ImportGraph:
+    """Module import graph in compressed sparse row form (integer-indexed)."""
+
+    names: List[str]
+    offsets: array  # len(names) + 1 entries into `targets`
+    targets: array
+    external: Dict[str, int] = field(default_factory=dict)
+
+    def successors(self, i: int) -> array:
+        return self.targets[self.offsets[i]:self.offsets[i + 1]]
+
+    def fan_out(self) -> List[int]:
+        o = self.offsets
+        return [o[i + 1] - o[i] for i in range(len(self.names))]
+
+    def fan_in(self) -> List[int]:
+        counts = [0] * len(self.names)
+        for t in self.targets:
+            counts[t] += 1
+        return counts
+
+    def sccs(self) -> List[List[int]]:
+        """Strongly connected components (iterative Tarjan)."""
+        n = len(self.names)
+        index = [-1] * n
+        low = [0] * n
+        on_stack = [False] * n
+        stack: List[int] = []
+        comps: List[List[int]] = []
+        counter = 0
+        for root in range(n):
+            if index[root] != -1:
+                continue
+            work = [(root, self.offsets[root])]
+            index[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = True
+            while work:
+                v, pos = work[-1]
+                if pos < self.offsets[v + 1]:
+                    work[-1] = (v, pos + 1)
+                    w = self.targets[pos]
+                    if index[w] == -1:
+                        index[w] = low[w] = counter
+                        counter += 1
+                        stack.append(w)
+                        on_stack[w] = True
+                        work.append((w, self.offsets[w]))
+                    elif on_stack[w]:
+                        low[v] = min(low[v], index[w])
+                    continue
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[v])
+                if low[v] == index[v]:
+                    comp: List[int] = []
+                    while True:
+                        w = stack.pop()
+                        on_stack[w] = False
+                        comp.append(w)
+                        if w == v:
+                            break
+                    comps.append(comp)
+        return comps
+
+    def cycles(self) -> List[List[str]]:
+        cyc = [sorted(self.names[i] for i in c) for c in self.sccs() if len(c) > 1]
+        return sorted(cyc, key=lambda c: (-len(c), c))
+
+    def summary(self, top: int = 15) -> Dict[str, Any]:
+        fin, fout = self.fan_in(), self.fan_out()
+        rows = [{"module": m, "fan_in": fin[i], "fan_out": fout[i]} for i, m in enumerate(self.names)]
+        cycles = self.cycles()
+        return {
+            "modules": len(self.names),
+            "edges": len(self.targets),
+            "top_fan_in": sorted(rows, key=lambda r: (-r["fan_in"], r["module"]))[:top],
+            "top_fan_out": sorted(rows, key=lambda r: (-r["fan_out"], r["module"]))[:top],
+            "cycles": cycles[:20],
+            "cycle_count": len(cycles),
+            "external": dict(sorted(self.external.items(), key=lambda kv: (-kv[1], kv[0]))[:top]),
+        }
+
+
+def _internal(name: str, idx: Dict[str, int]) -> str:
+    """Longest internal prefix of name: `a.b.func` resolves to module `a.b`; "" if none."""
+    while name and name not in idx:
+        name = name.rpartition(".")[0]
+    return name
+
+
+def build_import_graph(root: str | Path, py_files: Sequence[str], workers: Optional[int] = None) -> ImportGraph:
+    """Parse top-level imports of the given relative .py paths (in parallel) into an ImportGraph."""
+    root_path = Path(root)
+    mods = module_names(py_files)
+    names = sorted({m for m, _ in mods.values()})
+    idx = {m: i for i, m in enumerate(names)}
+    local = {m: _script_dir(rel, m, is_pkg) for rel, (m, is_pkg) in mods.items()}
+    items = [(str(root_path / rel), m, is_pkg) for rel, (m, is_pkg) in mods.items()]
+    parsed = map_chunked(_imports_chunk, items, workers=workers)
+
+    adjacency: List[set] = [set() for _ in names]
+    external: Dict[str, int] = {}
+    for mod, groups in parsed:
+        src = idx[mod]
+        here = local[mod]
+        for level, cands in groups:
+            internal = False
+            for t in cands:
+                # A standalone script sees its own directory first (it is sys.path[0]).
+                cand = _internal(f"{here}/{t}", idx) if here and not level else ""
+                cand = cand or _internal(t, idx)
+                if cand:
+                    internal = True
+                    if idx[cand] != src:
+                        adjacency[src].add(idx[cand])
+            if not internal and not level and cands[0]:
+                top = cands[0].split(".")[0]
+                external[top] = external.get(top, 0) + 1
+    offsets = array("i", [0])
+    targets = array("i")
+    for succ in adjacency:
+        targets.extend(sorted(succ))
+        offsets.append(len(targets))
+    return ImportGraph(names=names, offsets=offsets, targets=targets, external=external)
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import os
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
 import json
 
 
@@ -184,16 +184,49 @@ def _parse_pipfile(path: Path) -> Dict[str, Any]:
     return data
 
 
-def scan_repository(root: str = ".") -> Dict:
+SKIP_DIRS = [".git", "node_modules", ".venv", "venv", "dist", "build", ".a2dev", ".a2a", ".idea", ".vscode"]
+
+
+def walk_tree(root: str | Path, skip: Iterable[str] = SKIP_DIRS) -> Iterator[Tuple[str, List[str], List[str]]]:
+    """`os.walk(root)` without directories named in `skip` below root.
+
+    Matches whole directory names under the root, never the root's own path, so a
+    checkout at e.g. /srv/build/app is still walked.
+    """
+    skip = frozenset(skip)
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d not in skip]
+        yield dirpath, dirnames, filenames
+
+
+def _lang_for(name: str) -> str | None:
+    ext = os.path.splitext(name)[1].lower()
+    for lang, exts in LANG_EXTS.items():
+        if ext in exts:
+            return lang
+    return None
+
+
+def iter_source_files(root: str = ".") -> List[tuple[str, str]]:
+    """(relative path, language) for source files, using the inventory's skip rules."""
+    root_path = Path(root)
+    out: List[tuple[str, str]] = []
+    for dirpath, dirnames, filenames in walk_tree(root):
+        for f in filenames:
+            lang = _lang_for(f)
+            if lang:
+                out.append((str((Path(dirpath) / f).relative_to(root_path)), lang))
+    return out
+
+
+def scan_repository(root: str = ".", metrics: bool = True) -> Dict:
     root_path = Path(root)
     langs: Dict[str, int] = {}
+    sources: List[tuple[str, str]] = []
     manifests: List[str] = []
     infra: List[str] = []
     dep_details: Dict[str, Any] = {"npm": [], "python": []}
-    for dirpath, dirnames, filenames in os.walk(root):
-        # skip .git and node_modules, venvs
-        if any(skip in dirpath for skip in [".git", "node_modules", ".venv", "venv", "dist", "build", ".a2dev", ".a2a", ".idea", ".vscode"]):
-            continue
+    for dirpath, dirnames, filenames in walk_tree(root):
         for f in filenames:
             p = Path(dirpath) / f
             lower = f.lower()
@@ -219,15 +252,26 @@ def scan_repository(root: str = ".") -> Dict:
             for lang, exts in LANG_EXTS.items():
                 if ext in exts:
                     langs[lang] = langs.get(lang, 0) + 1
+                    sources.append((str(p.relative_to(root_path)), lang))
             # infra detection (k8s/helm/terraform)
             if ext == ".tf" or lower in ("dockerfile", "chart.yaml") or lower.endswith(('.yaml', '.yml')):
                 infra.append(str(p.relative_to(root_path)))
-    return {
+    data = {
         "languages": langs,
         "manifests": sorted(set(manifests)),
         "infra": sorted(set(infra)),
         "dependencies": dep_details,
     }
+    if metrics:
+        from .metrics import collect_metrics, aggregate_by_directory
+
+        data["metrics"] = aggregate_by_directory(collect_metrics(root_path, sources))
+    py_files = [rel for rel, lang in sources if lang == "python"]
+    if py_files:
+        from .imports import build_import_graph
+
+        data["imports"] = build_import_graph(root_path, py_files).summary()
+    return data
 
 
 def write_inventory(root: str = ".") -> Dict[str, str]:
@@ -245,5 +289,37 @@ def write_inventory(root: str = ".") -> Dict[str, str]:
     lines += [f"- {m}" for m in data["manifests"]] or ["- None"]
     lines += ["", "## Infrastructure Candidates"]
     lines += [f"- {i}" for i in data["infra"]] or ["- None"]
+    metrics = data.get("metrics")
+    if metrics:
+        t = metrics["totals"]
+        lines += [
+            "",
+            "## Size & Complexity",
+            f"- Source files: {t['files']}, lines: {t['lines']} (code={t['code']}, comment={t['comment']}, blank={t['blank']})",
+            f"- Python functions: {t['functions']}, total cyclomatic complexity: {t['complexity']}",
+            "",
+            "### Largest Directories (code lines)",
+        ]
+        top_dirs = sorted(metrics["directories"].items(), key=lambda kv: (-kv[1]["code"], kv[0]))[:10]
+        lines += [f"- {d}: {m['code']} code lines, {m['files']} files, complexity {m['complexity']}" for d, m in top_dirs] or ["- None"]
+        lines += ["", "### Most Complex Files"]
+        lines += [
+            f"- {f['path']}: complexity {f['complexity']} (max {f.get('max_complexity', 0)}), {f.get('functions', 0)} functions"
+            for f in metrics["top_complex_files"][:10]
+        ] or ["- None"]
+    graph = data.get("imports")
+    if graph:
+        lines += [
+            "",
+            "## Python Module Structure",
+            f"- Modules: {graph['modules']}, internal import edges: {graph['edges']}, import cycles: {graph['cycle_count']}",
+            "",
+            "### Highest Fan-in (most depended upon)",
+        ]
+        lines += [f"- {r['module']}: fan-in {r['fan_in']}, fan-out {r['fan_out']}" for r in graph["top_fan_in"][:10] if r["fan_in"]] or ["- None"]
+        lines += ["", "### Highest Fan-out (most dependencies)"]
+        lines += [f"- {r['module']}: fan-out {r['fan_out']}, fan-in {r['fan_in']}" for r in graph["top_fan_out"][:10] if r["fan_out"]] or ["- None"]
+        lines += ["", "### Import Cycles"]
+        lines += [f"- {len(c)} modules: {', '.join(c)}" for c in graph["cycles"][:10]] or ["- None"]
     md_path.write_text("\n".join(lines))
     return {"json": str(json_path), "markdown": str(md_path)}
@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import json
+import re
+from json.decoder import scanstring
+from typing import Any, Iterator, Sequence, TextIO, Tuple
+
+CHUNK = 1 << 16
+_WS = re.compile(r"[ \t\n\r]*")
+_STRUCT = re.compile(r'["\[\]{}]')
+_STRING_TAIL = re.compile(r'(?:[^"\\]|\\.)*"', re.S)
+_NUMBER_TAIL = re.compile(r"[-+0-9.eE]*")
+_DECODER = json.JSONDecoder()
+
+# A key path: object keys, with "*" stepping into every element of an array.
+# The items yielded are the elements of the array found at the end of the path.
+Path_ = Tuple[str, ...]
+
+
+class _Reader:
+    """Sliding text buffer over a file; consumed input is discarded as parsing advances."""
+
+    def __init__(self, fh: TextIO):
+        self.fh = fh
+        self.buf = ""
+        self.pos = 0
+        self.base = 0  # absolute offset of buf[0]
+        self.eof = False
+
+    def tell(self) -> int:
+        return self.base + self.pos
+
+    def fill(self, size: int = 0) -> bool:
+        if self.eof:
+            return False
+        data = self.fh.read(size or CHUNK)
+        if not data:
+            self.eof = True
+            return False
+        self.base += self.pos
+        self.buf = self.buf[self.pos:] + data
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        while True:
+            self.pos = _WS.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.fill():
+                raise ValueError("unexpected end of JSON input")
+
+    def expect(self, ch: str) -> None:
+        if self.peek() != ch:
+            raise ValueError(f"expected {ch!r} at offset {self.pos}")
+        self.pos += 1
+
+    def read_string(self) -> str:
+        self.expect('"')
+        while True:
+            try:
+                s, end = scanstring(self.buf, self.pos)
+                self.pos = end
+                return s
+            except json.JSONDecodeError:
+                if not self.fill():
+                    raise
+
+    def read_value(self) -> Any:
+        """Decode one complete value at C speed, pulling more input until it fits."""
+        self.peek()
+        size = 0
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buf, self.pos)
+                # A number (or literal) touching the buffer end may continue in the next chunk;
+                # so may one cut inside its fraction/exponent ("34116." decodes as 34116).
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    end_ok = _NUMBER_TAIL.match(self.buf, end).end() < len(self.buf)
+                else:
+                    end_ok = end < len(self.buf)
+                if end_ok or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self.fill(size)
+            size = min((size or CHUNK) * 2, 1 << 24)
+
+    def skip_value(self) -> None:
+        """Skip a value without materialising it (containers are scanned, not decoded)."""
+        c = self.peek()
+        if c not in "[{":
+            self.read_value()
+            return
+        depth = 0
+        while True:
+            m = _STRUCT.search(self.buf, self.pos)
+            if not m:
+                self.pos = len(self.buf)
+                if not self.fill():
+                    raise ValueError("unexpected end of JSON input")
+                continue
+            ch = m.group()
+            self.pos = m.end()
+            if ch == '"':
+                while True:
+                    t = _STRING_TAIL.match(self.buf, self.pos)
+                    if t:
+                        self.pos = t.end()
+                        break
+                    if not self.fill():
+                        raise ValueError("unterminated string")
+            elif ch in "[{":
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    return
+
+    def elements(self) -> Iterator[None]:
+        """Position the reader at each element of the array that starts here."""
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            start = self.tell()
+            yield
+            if self.tell() == start:
+                self.skip_value()  # consumer did not read the element
+            c = self.peek()
+            self.pos += 1
+            if c == "]":
+                return
+            if c != ",":
+                raise ValueError(f"expected ',' or ']' at offset {self.pos - 1}")
+
+    def members(self) -> Iterator[str]:
+        """Yield each key of the object that starts here, positioned at its value."""
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.read_string()
+            self.expect(":")
+            start = self.tell()
+            yield key
+            if self.tell() == start:
+                self.skip_value()
+            c = self.peek()
+            self.pos += 1
+            if c == "}":
+                return
+            if c != ",":
+                raise ValueError(f"expected ',' or '}}' at offset {self.pos - 1}")
+
+
+def _walk(r: _Reader, paths: Sequence[Path_], depth: int) -> Iterator[Tuple[Path_, Any]]:
+    c = r.peek()
+    done = [p for p in paths if len(p) == depth]
+    if done and c == "[":
+        for _ in r.elements():
+            yield done[0], r.read_value()
+        return
+    if c == "[":
+        deeper = [p for p in paths if len(p) > depth and p[depth] == "*"]
+        if deeper:
+            for _ in r.elements():
+                yield from _walk(r, deeper, depth + 1)
+            return
+    elif c == "{":
+        keyed = {p[depth] for p in paths if len(p) > depth and p[depth] != "*"}
+        if keyed:
+            for key in r.members():
+                if key in keyed:
+                    yield from _walk(r, [p for p in paths if len(p) > depth and p[depth] == key], depth + 1)
+            return
+    r.skip_value()
+
+
+def iter_items(fh: TextIO, *paths: Path_) -> Iterator[Tuple[Path_, Any]]:
+    """Stream (path, element) for every element of the arrays at the given key paths.
+
+    Only one element is materialised at a time, so memory stays bounded by the
+    largest element rather than the document. `()` addresses a top-level array;
+    `("runs", "*", "results")` walks every run of a SARIF log.
+    """
+    r = _Reader(fh)
+    yield from _walk(r, paths, 0)
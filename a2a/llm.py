@@ -1,21 +1,609 @@
 from __future__ import annotations
 
+import heapq
+import itertools
+import json
 import os
-from typing import Optional
+import queue
+import random
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
-from .models import ModelProfile, select_model
+from .cassette import active_cassette, request_key
+from .health import breaker_for, hedge_delay, model_health
+from .llmcache import LLMCacheMiss, ResponseCache, response_key
+from .models import ModelProfile, candidate_models, routing_policy, select_model
+from .telemetry import TelemetryStore
+from .telemetry import enabled as telemetry_enabled
+from .tokens import count_tokens, prompt_budget
+
+# Lower runs first. Interactive `route` calls jump ahead of batch generation.
+PRIORITIES = {"interactive": 0, "normal": 5, "batch": 10}
+_PRIORITY: ContextVar[str] = ContextVar("a2dev_llm_priority", default="normal")
+
+MAX_RETRIES = 5
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 60.0
+RETRY_STATUS = {429, 500, 502, 503, 504, 529}
+
+
+@contextmanager
+def request_priority(name: str) -> Iterator[None]:
+    """Run LLM calls made in this context at the given priority (interactive|normal|batch)."""
+    token = _PRIORITY.set(name if name in PRIORITIES else "normal")
+    try:
+        yield
+    finally:
+        _PRIORITY.reset(token)
+
+
+def set_priority(name: str) -> None:
+    """Set the priority for the rest of the current context (e.g. a whole CLI command)."""
+    _PRIORITY.set(name if name in PRIORITIES else "normal")
+
+
+@dataclass
+class ProviderLimits:
+    concurrency: int
+    rpm: float  # requests per minute; 0 = unlimited
+    tpm: float  # tokens per minute (prompt + completion); 0 = unlimited
+
+
+DEFAULT_LIMITS: Dict[str, ProviderLimits] = {
+    "openai": ProviderLimits(concurrency=8, rpm=500, tpm=30000),
+    "anthropic": ProviderLimits(concurrency=4, rpm=50, tpm=40000),
+    "ollama": ProviderLimits(concurrency=1, rpm=0, tpm=0),
+}
+
+
+def provider_limits(provider: str) -> ProviderLimits:
+    """Defaults overridden by `A2DEV_LLM_LIMITS_<PROVIDER>="concurrency=4,rpm=60,tpm=20000"`."""
+    base = DEFAULT_LIMITS.get(provider, ProviderLimits(concurrency=2, rpm=60, tpm=0))
+    limits = ProviderLimits(base.concurrency, base.rpm, base.tpm)
+    for part in os.getenv(f"A2DEV_LLM_LIMITS_{provider.upper()}", "").split(","):
+        name, _, value = part.partition("=")
+        name = name.strip().lower()
+        try:
+            if name == "concurrency":
+                limits.concurrency = max(1, int(value))
+            elif name in ("rpm", "tpm"):
+                setattr(limits, name, max(0.0, float(value)))
+        except ValueError:
+            continue
+    return limits
+
+
+class TokenBucket:
+    """Classic token bucket refilled continuously at `per_minute / 60` per second.
+
+    Not thread-safe on its own; ProviderScheduler guards it with its condition.
+    """
+
+    def __init__(self, per_minute: float, clock: Callable[[], float] = time.monotonic):
+        self.rate = per_minute / 60.0
+        self.capacity = float(per_minute)
+        self.level = self.capacity
+        self.clock = clock
+        self.stamp = clock()
+
+    def _refill(self) -> None:
+        now = self.clock()
+        self.level = min(self.capacity, self.level + (now - self.stamp) * self.rate)
+        self.stamp = now
+
+    def delay(self, n: float) -> float:
+        """Seconds until `n` tokens are available (requests above capacity wait for a full bucket)."""
+        if self.rate <= 0:
+            return 0.0
+        self._refill()
+        need = min(n, self.capacity) - self.level
+        return 0.0 if need <= 0 else need / self.rate
+
+    def take(self, n: float) -> None:
+        if self.rate > 0:
+            self._refill()
+            self.level -= min(n, self.capacity)
+
+    def refund(self, n: float) -> None:
+        if self.rate > 0 and n > 0:
+            self._refill()
+            self.level = min(self.capacity, self.level + n)
+
+
+class ProviderScheduler:
+    """Admission control for one provider: a concurrency cap, request and token
+    buckets, and a priority queue. Only the head of the queue may start, so
+    interactive requests are never stuck behind a backlog of batch work.
+    """
+
+    def __init__(self, provider: str, limits: ProviderLimits, clock: Callable[[], float] = time.monotonic):
+        self.provider = provider
+        self.limits = limits
+        self.clock = clock
+        self.requests = TokenBucket(limits.rpm, clock)
+        self.tokens = TokenBucket(limits.tpm, clock)
+        self.active = 0
+        self.paused_until = 0.0
+        self._cond = threading.Condition()
+        self._queue: List[Tuple[int, int]] = []
+        self._seq = itertools.count()
+
+    def acquire(self, tokens: int, priority: int = PRIORITIES["normal"], timeout: Optional[float] = None) -> None:
+        with self._cond:
+            ticket = (priority, next(self._seq))
+            heapq.heappush(self._queue, ticket)
+            deadline = None if timeout is None else self.clock() + timeout
+            try:
+                while True:
+                    wait: Optional[float] = None
+                    if self._queue[0] == ticket and self.active < self.limits.concurrency:
+                        wait = max(self.paused_until - self.clock(), self.requests.delay(1), self.tokens.delay(tokens))
+                        if wait <= 0:
+                            heapq.heappop(self._queue)
+                            self.requests.take(1)
+                            self.tokens.take(tokens)
+                            self.active += 1
+                            self._cond.notify_all()  # the next ticket becomes head
+                            return
+                    if deadline is not None:
+                        remaining = deadline - self.clock()
+                        if remaining <= 0:
+                            raise TimeoutError(f"{self.provider}: no capacity within {timeout}s")
+                        wait = remaining if wait is None else min(wait, remaining)
+                    self._cond.wait(wait)
+            except BaseException:
+                if ticket in self._queue:
+                    self._queue.remove(ticket)
+                    heapq.heapify(self._queue)
+                    self._cond.notify_all()
+                raise
+
+    def release(self, unused_tokens: int = 0) -> None:
+        with self._cond:
+            self.active -= 1
+            self.tokens.refund(unused_tokens)
+            self._cond.notify_all()
+
+    def backoff(self, seconds: float) -> None:
+        """Hold every queued request for this provider (after a 429/overload response)."""
+        with self._cond:
+            self.paused_until = max(self.paused_until, self.clock() + seconds)
+            self._cond.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {"provider": self.provider, "active": self.active, "queued": len(self._queue),
+                    "paused_for": max(0.0, self.paused_until - self.clock())}
+
+
+_SCHEDULERS: Dict[str, ProviderScheduler] = {}
+_SCHEDULERS_LOCK = threading.Lock()
+
+
+def scheduler_for(provider: str) -> ProviderScheduler:
+    """Process-wide scheduler per provider, shared by every LLMClient."""
+    with _SCHEDULERS_LOCK:
+        if provider not in _SCHEDULERS:
+            _SCHEDULERS[provider] = ProviderScheduler(provider, provider_limits(provider))
+        return _SCHEDULERS[provider]
+
+
+class LLMError(RuntimeError):
+    def __init__(self, message: str, status: int = 0, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+    @property
+    def retryable(self) -> bool:
+        return self.status in RETRY_STATUS
+
+    @property
+    def provider_fault(self) -> bool:
+        """Network errors, timeouts, throttling and 5xx count against the provider; other 4xx do not."""
+        return self.status == 0 or self.status in RETRY_STATUS or self.status >= 500
+
+
+class CircuitOpen(LLMError):
+    """The provider's circuit breaker is open; the call was not attempted."""
+
+
+def hedging_enabled() -> bool:
+    """`A2DEV_LLM_HEDGE`: interactive (default; only interactive-priority calls), all, or off."""
+    mode = os.getenv("A2DEV_LLM_HEDGE", "interactive").strip().lower()
+    if mode in ("0", "off", "false", "no"):
+        return False
+    return mode == "all" or _PRIORITY.get() == "interactive"
+
+
+def _open(url: str, payload: Dict[str, Any], headers: Dict[str, str], timeout: float) -> Any:
+    import urllib.error
+    import urllib.request  # deferred: http.client/ssl/email cost ~35ms at startup
+
+    req = urllib.request.Request(
+        url, data=json.dumps(payload).encode(), method="POST",
+        headers={"content-type": "application/json", **headers},
+    )
+    try:
+        return urllib.request.urlopen(req, timeout=timeout)
+    except urllib.error.HTTPError as e:
+        retry_after = None
+        try:
+            retry_after = float(e.headers.get("retry-after", ""))
+        except (TypeError, ValueError):
+            pass
+        body = e.read().decode("utf-8", "replace")[:300]
+        raise LLMError(f"HTTP {e.code} from {url}: {body}", status=e.code, retry_after=retry_after) from None
+    except (urllib.error.URLError, OSError, ValueError) as e:
+        raise LLMError(f"{url}: {e}") from None
+
+
+def _post_json(url: str, payload: Dict[str, Any], headers: Dict[str, str], timeout: float) -> Dict[str, Any]:
+    with _open(url, payload, headers, timeout) as resp:
+        try:
+            return json.loads(resp.read().decode("utf-8"))
+        except (OSError, ValueError) as e:
+            raise LLMError(f"{url}: {e}") from None
+
+
+def _post_events(url: str, payload: Dict[str, Any], headers: Dict[str, str], timeout: float) -> Iterator[Dict[str, Any]]:
+    """JSON events from a streaming response: SSE `data:` lines or NDJSON (Ollama)."""
+    with _open(url, payload, headers, timeout) as resp:
+        for raw in resp:
+            line = raw.decode("utf-8", "replace").strip()
+            if line.startswith("data:"):
+                line = line[5:].strip()
+            elif not line.startswith("{"):
+                continue  # SSE `event:`/comment lines, blank separators
+            if not line or line == "[DONE]":
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+
+def _all_failed(errors: List[Tuple[ModelProfile, LLMError]]) -> LLMError:
+    """One error naming every candidate's failure (the last one's status), not just the last."""
+    if not errors:
+        return LLMError("no model available")
+    if len(errors) == 1:
+        return errors[0][1]
+    last = errors[-1][1]
+    detail = "; ".join(f"{m.name} ({m.provider}): {e}" for m, e in errors)
+    return LLMError(f"all {len(errors)} candidate models failed: {detail}", status=last.status,
+                    retry_after=last.retry_after)
+
+
+_STUB_CHUNK = re.compile(r"\S+\s*|\s+")
 
 
 class LLMClient:
     """Thin abstraction with provider routing.
 
-    This is a placeholder: wire real SDKs where noted.
+    Calls are stubbed unless `A2DEV_LLM_LIVE=1` and the provider is configured; live
+    calls go over plain HTTP (urllib) through the per-provider scheduler, which caps
+    concurrency, meters requests/tokens per minute and retries 429s with backoff.
+    Live completions fail over along `candidate_models`: a provider whose circuit
+    breaker is open is skipped, and a call slower than the model's recent p95 is
+    hedged to the next candidate (see `a2a.health`). Every live attempt is logged to
+    `a2a.telemetry`, which the latency/cost routing policies rank models by.
+    Completions go through a disk-backed response cache (`a2a.llmcache`,
+    `A2DEV_LLM_CACHE=on|off|replay`), so regenerating artifacts only pays for
+    prompts that changed. `stream()` yields text chunks as the provider sends them.
+    With `A2DEV_CASSETTE` set, calls are recorded to or replayed from a cassette
+    (`a2a.cassette`) ahead of all of the above.
     """
 
-    def __init__(self):
+    def __init__(self, root: str = "."):
         self.openai_key = os.getenv("OPENAI_API_KEY")
         self.anthropic_key = os.getenv("ANTHROPIC_API_KEY")
         self.ollama_host = os.getenv("OLLAMA_HOST", "http://localhost:11434")
+        self.openai_base = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1").rstrip("/")
+        self.anthropic_base = os.getenv("ANTHROPIC_BASE_URL", "https://api.anthropic.com").rstrip("/")
+        self.timeout = float(os.getenv("A2DEV_LLM_TIMEOUT", "120") or 120)
+        self.cache = ResponseCache(root)
+        self.telemetry = TelemetryStore(root) if telemetry_enabled() else None
+        self.cassette = active_cassette()
+
+    def _live(self, model: ModelProfile) -> bool:
+        if os.getenv("A2DEV_LLM_LIVE", "").lower() not in ("1", "true", "yes", "on"):
+            return False
+        if model.provider == "openai":
+            return bool(self.openai_key)
+        if model.provider == "anthropic":
+            return bool(self.anthropic_key)
+        return model.provider == "ollama"
+
+    def is_live(self, task: str, prefer: Optional[str] = None, tier: Optional[str] = None) -> bool:
+        """Whether a call for `task` would reach a real provider (roles only augment templates then).
+
+        A replayed cassette answers as the recording did, so roles make the same calls.
+        """
+        if self.cassette is not None and self.cassette.replaying:
+            return self.cassette.live
+        return self._live(select_model(task=task, prefer=prefer, tier=tier))
+
+    def _candidates(self, prompt: str, task: str, system: Optional[str], prefer: Optional[str],
+                    max_tokens: int, tier: Optional[str]) -> List[ModelProfile]:
+        """Models to try, in order. Routing is on the estimated prompt size, so a prompt
+        that fits keeps the default model. When that model is live, only live fallbacks
+        follow; a stubbed call never fails over."""
+        prompt_tokens = count_tokens(prompt) + (count_tokens(system) if system else 0)
+        policy = routing_policy()
+        models = candidate_models(task=task, prefer=prefer, tier=tier, prompt_tokens=prompt_tokens,
+                                  output_tokens=max_tokens, policy=policy,
+                                  stats=None if policy == "static" else self._routing_stats())
+        if not self._live(models[0]):
+            return models[:1]
+        return [m for m in models if self._live(m)]
+
+    def prompt_budget(self, task: str, max_tokens: int = 2000, system: Optional[str] = None,
+                      prefer: Optional[str] = None, tier: Optional[str] = None, cap: Optional[int] = None) -> Tuple[ModelProfile, int]:
+        """(model, tokens available for the prompt) for packing context with `tokens.pack`."""
+        model = select_model(task=task, prefer=prefer, tier=tier)
+        return model, prompt_budget(model, max_tokens, system, cap)
+
+    def _routing_stats(self) -> Dict[Any, Any]:
+        if self.telemetry is None:
+            return {}
+        try:
+            return self.telemetry.summary()
+        except sqlite3.Error:
+            return {}
+
+    def _record(self, model: ModelProfile, task: str, ok: bool, latency: Optional[float],
+                prompt_tokens: int, output: str = "") -> None:
+        if self.telemetry is None:
+            return
+        output_tokens = count_tokens(output, model) if output else 0
+        try:
+            self.telemetry.record(model.name, model.provider, task, ok, latency, prompt_tokens, output_tokens,
+                                  model.cost(prompt_tokens, output_tokens) if ok else 0.0)
+        except sqlite3.Error:
+            pass  # telemetry is best-effort
+
+    def _backend(self, model: ModelProfile) -> str:
+        """Identifies what produces the text, so stubbed output never answers a live request."""
+        return f"live:{model.provider}" if self._live(model) else "stub"
+
+    def _provider_request(self, model: ModelProfile, prompt: str, system: Optional[str], max_tokens: int,
+                          stream: bool) -> Tuple[str, Dict[str, Any], Dict[str, str]]:
+        """(url, payload, headers) for one provider call."""
+        messages = ([{"role": "system", "content": system}] if system else []) + [{"role": "user", "content": prompt}]
+        if model.provider == "openai":
+            payload: Dict[str, Any] = {"model": model.name, "messages": messages, "max_tokens": max_tokens}
+            if stream:
+                payload.update(stream=True, stream_options={"include_usage": True})
+            return f"{self.openai_base}/chat/completions", payload, {"authorization": f"Bearer {self.openai_key}"}
+        if model.provider == "anthropic":
+            payload = {"model": model.name, "max_tokens": max_tokens, "messages": messages[-1:], "stream": stream}
+            if system:
+                payload["system"] = system
+            return (f"{self.anthropic_base}/v1/messages", payload,
+                    {"x-api-key": self.anthropic_key or "", "anthropic-version": "2023-06-01"})
+        if model.provider == "ollama":
+            payload = {"model": model.name, "messages": messages, "stream": stream, "options": {"num_predict": max_tokens}}
+            return f"{self.ollama_host.rstrip('/')}/api/chat", payload, {}
+        raise LLMError(f"unsupported provider: {model.provider}")
+
+    def _request(self, model: ModelProfile, prompt: str, system: Optional[str], max_tokens: int) -> Tuple[str, Optional[int]]:
+        """One provider round trip; returns (text, tokens used if reported)."""
+        data = _post_json(*self._provider_request(model, prompt, system, max_tokens, stream=False), self.timeout)
+        if model.provider == "openai":
+            usage = data.get("usage") or {}
+            return data["choices"][0]["message"]["content"] or "", usage.get("total_tokens")
+        if model.provider == "anthropic":
+            usage = data.get("usage") or {}
+            text = "".join(b.get("text", "") for b in data.get("content", []) if b.get("type") == "text")
+            used = (usage.get("input_tokens") or 0) + (usage.get("output_tokens") or 0)
+            return text, used or None
+        used = (data.get("prompt_eval_count") or 0) + (data.get("eval_count") or 0)
+        return (data.get("message") or {}).get("content", ""), used or None
+
+    def _stream_request(self, model: ModelProfile, prompt: str, system: Optional[str], max_tokens: int,
+                        usage: Dict[str, int]) -> Iterator[str]:
+        """Text deltas from a streaming provider call; token usage is recorded into `usage`."""
+        for ev in _post_events(*self._provider_request(model, prompt, system, max_tokens, stream=True), self.timeout):
+            if model.provider == "openai":
+                if ev.get("usage"):
+                    usage["used"] = ev["usage"].get("total_tokens") or 0
+                for choice in ev.get("choices") or []:
+                    text = (choice.get("delta") or {}).get("content")
+                    if text:
+                        yield text
+            elif model.provider == "anthropic":
+                kind = ev.get("type")
+                if kind == "content_block_delta" and (ev.get("delta") or {}).get("type") == "text_delta":
+                    yield ev["delta"].get("text", "")
+                elif kind == "message_start":
+                    usage["used"] = ((ev.get("message") or {}).get("usage") or {}).get("input_tokens") or 0
+                elif kind == "message_delta":
+                    usage["used"] = usage.get("used", 0) + ((ev.get("usage") or {}).get("output_tokens") or 0)
+                elif kind == "error":
+                    err = ev.get("error") or {}
+                    status = 529 if err.get("type") == "overloaded_error" else 0
+                    raise LLMError(f"anthropic stream error: {err.get('message', err)}", status=status)
+            else:
+                text = (ev.get("message") or {}).get("content")
+                if text:
+                    yield text
+                if ev.get("done"):
+                    usage["used"] = (ev.get("prompt_eval_count") or 0) + (ev.get("eval_count") or 0)
+
+    def _scheduled(self, model: ModelProfile, prompt: str, system: Optional[str], max_tokens: int,
+                   call: Callable[[Dict[str, int]], Iterator[str]], task: str = "", timed: bool = False) -> Iterator[str]:
+        """Run `call` under the provider scheduler, retrying retryable errors before the first chunk.
+
+        Outcomes feed the model's health record, the provider's circuit breaker and
+        the telemetry store; with `timed`, the time to the first chunk (the whole
+        response for non-streaming calls) is recorded as the call's latency.
+        """
+        sched = scheduler_for(model.provider)
+        breaker = breaker_for(model.provider)
+        health = model_health(model.name)
+        prompt_tokens = count_tokens(prompt, model) + count_tokens(system or "", model)
+        reserve = prompt_tokens + max_tokens
+        priority = PRIORITIES[_PRIORITY.get()]
+        last: Optional[LLMError] = None
+        for attempt in range(MAX_RETRIES + 1):
+            if not breaker.allow():
+                if last is not None:
+                    raise last  # our own failures opened it: report what the provider said
+                raise CircuitOpen(f"{model.provider}: circuit open after repeated failures")
+            sched.acquire(reserve, priority)
+            usage: Dict[str, int] = {}
+            started = False
+            t0 = time.monotonic()
+            latency: Optional[float] = None
+            out: List[str] = []
+            try:
+                for chunk in call(usage):
+                    if not started:
+                        started = True
+                        latency = time.monotonic() - t0 if timed else None
+                    out.append(chunk)
+                    yield chunk
+                health.record(True, latency)
+                breaker.record(True)
+                self._record(model, task, True, latency, prompt_tokens, "".join(out))
+                return
+            except LLMError as e:
+                health.record(False)
+                self._record(model, task, False, None, prompt_tokens)
+                if e.provider_fault:
+                    breaker.record(False)
+                # Text already handed to the caller cannot be taken back, so only retry clean failures.
+                if started or not e.retryable or attempt == MAX_RETRIES:
+                    raise
+                last = e
+                # Pause the whole provider queue, not just this caller, to avoid a 429 storm.
+                delay = e.retry_after if e.retry_after is not None else min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt)
+                sched.backoff(delay * (1.0 + random.random() * 0.25))
+            finally:
+                used = usage.get("used") or 0
+                sched.release(max(0, reserve - used) if used else 0)
+        raise LLMError("unreachable")
+
+    def _call_live(self, model: ModelProfile, prompt: str, system: Optional[str], max_tokens: int,
+                   task: str = "") -> str:
+        def call(usage: Dict[str, int]) -> Iterator[str]:
+            text, used = self._request(model, prompt, system, max_tokens)
+            usage["used"] = used or 0
+            yield text
+
+        return "".join(self._scheduled(model, prompt, system, max_tokens, call, task, timed=True))
+
+    def _failover(self, models: List[ModelProfile], prompt: str, system: Optional[str],
+                  max_tokens: int, task: str = "") -> Tuple[ModelProfile, str]:
+        """(model, text) of the first successful answer among `models`, tried in order.
+
+        The next model starts when the current one fails, or once early (a hedge) when
+        the first is still running after `hedge_delay` (its recent p95). The slower
+        call is not cancelled; its result is discarded but still recorded as health.
+        """
+        if len(models) == 1:
+            return models[0], self._call_live(models[0], prompt, system, max_tokens, task)
+        results: "queue.Queue[Tuple[ModelProfile, Optional[str], Optional[LLMError]]]" = queue.Queue()
+
+        def attempt(model: ModelProfile) -> None:
+            try:
+                results.put((model, self._call_live(model, prompt, system, max_tokens, task), None))
+            except LLMError as e:
+                results.put((model, None, e))
+            except Exception as e:  # never leave the caller waiting on a crashed attempt
+                results.put((model, None, LLMError(f"{model.name}: {e}")))
+
+        todo = list(models)
+        pending = 0
+
+        def launch() -> None:
+            nonlocal pending
+            model = todo.pop(0)
+            pending += 1
+            # copy_context carries the request priority into the worker thread.
+            threading.Thread(target=copy_context().run, args=(attempt, model),
+                             name=f"a2dev-llm-{model.name}", daemon=True).start()
+
+        hedge = hedge_delay(models[0].name) if hedging_enabled() else None
+        errors: List[Tuple[ModelProfile, LLMError]] = []
+        launch()
+        while pending:
+            try:
+                model, text, err = results.get(timeout=hedge if todo else None)
+            except queue.Empty:
+                hedge = None  # hedge once; later models only start on failure
+                launch()
+                continue
+            pending -= 1
+            if err is None:
+                return model, text or ""
+            errors.append((model, err))
+            if todo and not pending:
+                launch()
+        raise _all_failed(errors)
+
+    def _stream_live(self, models: List[ModelProfile], prompt: str, system: Optional[str], max_tokens: int,
+                     task: str, used: List[ModelProfile]) -> Iterator[str]:
+        """Stream from the first model that produces output; the one used is appended to `used`."""
+        errors: List[Tuple[ModelProfile, LLMError]] = []
+        for model in models:
+            started = False
+            try:
+                for chunk in self._scheduled(
+                    model, prompt, system, max_tokens,
+                    lambda usage, m=model: self._stream_request(m, prompt, system, max_tokens, usage), task,
+                ):
+                    if not started:
+                        started = True
+                        used.append(model)
+                    yield chunk
+                return
+            except LLMError as e:
+                if started:
+                    raise
+                errors.append((model, e))
+        raise _all_failed(errors)
+
+    def _stub(self, model: ModelProfile, prompt: str, task: str) -> str:
+        # Stubbed by default so nothing leaves the machine unless A2DEV_LLM_LIVE=1.
+        header = f"[model={model.name} provider={model.provider} task={task}]"
+        return f"{header}\n\n(Stubbed LLM output)\n\n{prompt[:500]}..."
+
+    def _cache_skipped(self) -> bool:
+        # --dry-run must not touch .a2dev/cache: a lookup bumps hit counters, a store inserts.
+        # Replay stays on, since it only reads and its misses must still fail.
+        return os.getenv("A2DEV_DRY_RUN") == "1" and self.cache.mode != "replay"
+
+    def _cached(self, keys: List[str], model: ModelProfile, task: str) -> Optional[str]:
+        """The first stored response among `keys` (one per candidate model)."""
+        if self._cache_skipped():
+            return None
+        cached = None
+        for key in keys:
+            try:
+                cached = self.cache.get(key)
+            except (sqlite3.Error, OSError):  # e.g. a read-only checkout: no .a2dev/cache
+                cached = None
+            if cached is not None:
+                break
+        if cached is None and self.cache.mode == "replay":
+            raise LLMCacheMiss(f"no cached response for model={model.name} task={task} (A2DEV_LLM_CACHE=replay)")
+        return cached
+
+    def _store(self, key: str, model: ModelProfile, prompt: str, text: str) -> None:
+        if self._cache_skipped():
+            return
+        try:
+            self.cache.put(key, model.name, prompt, text)
+        except (sqlite3.Error, OSError):
+            pass  # caching is best-effort
 
     def complete(
         self,
@@ -26,13 +614,83 @@ class LLMClient:
         max_tokens: int = 2000,
         tier: Optional[str] = None,
     ) -> str:
-        model: ModelProfile = select_model(
-            task=task,
-            need_long_context=len(prompt) > 20000,
-            prefer=prefer,
-            tier=tier,
-        )
-        # NOTE: Replace the mock return with real provider calls as needed.
-        # For safety, we keep this as a stub to avoid network calls by default.
-        header = f"[model={model.name} provider={model.provider} task={task}]"
-        return f"{header}\n\n(Stubbed LLM output)\n\n{prompt[:500]}..."
+        tape = self.cassette
+        if tape is None:
+            return self._complete(prompt, task, system, prefer, max_tokens, tier)
+        key = request_key(task, system, prompt, max_tokens, prefer, tier)
+        if tape.replaying:
+            text = tape.replay(key, task, prompt)
+            return text if text is not None else self._complete(prompt, task, system, prefer, max_tokens, tier)
+        t0 = time.monotonic()
+        text = self._complete(prompt, task, system, prefer, max_tokens, tier)
+        tape.record(key, task, prompt, text, time.monotonic() - t0, self.is_live(task, prefer, tier))
+        return text
+
+    def _complete(self, prompt: str, task: str, system: Optional[str], prefer: Optional[str],
+                  max_tokens: int, tier: Optional[str]) -> str:
+        models = self._candidates(prompt, task, system, prefer, max_tokens, tier)
+        keys = [response_key(m.name, self._backend(m), system, prompt, max_tokens, tier) for m in models]
+        cached = self._cached(keys, models[0], task)
+        if cached is not None:
+            return cached
+        if self._live(models[0]):
+            model, text = self._failover(models, prompt, system, max_tokens, task)
+        else:
+            model, text = models[0], self._stub(models[0], prompt, task)
+        self._store(keys[models.index(model)], model, prompt, text)
+        return text
+
+    def stream(
+        self,
+        prompt: str,
+        task: str,
+        system: Optional[str] = None,
+        prefer: Optional[str] = None,
+        max_tokens: int = 2000,
+        tier: Optional[str] = None,
+    ) -> Iterator[str]:
+        """Like `complete`, but yields text chunks as they arrive.
+
+        Cached responses are yielded whole. A streamed response is cached (or
+        recorded to a cassette) only when the caller consumed it to the end.
+        """
+        tape = self.cassette
+        if tape is None:
+            yield from self._stream(prompt, task, system, prefer, max_tokens, tier)
+            return
+        key = request_key(task, system, prompt, max_tokens, prefer, tier)
+        if tape.replaying:
+            replayed = tape.replay_stream(key, task, prompt)
+            if replayed is not None:
+                yield from replayed
+                return
+        keep: Optional[List[str]] = None if tape.replaying else []
+        t0 = time.monotonic()
+        for chunk in self._stream(prompt, task, system, prefer, max_tokens, tier):
+            if keep is not None:
+                keep.append(chunk)
+            yield chunk
+        if keep is not None:
+            tape.record(key, task, prompt, "".join(keep), time.monotonic() - t0, self.is_live(task, prefer, tier))
+
+    def _stream(self, prompt: str, task: str, system: Optional[str], prefer: Optional[str],
+                max_tokens: int, tier: Optional[str]) -> Iterator[str]:
+        models = self._candidates(prompt, task, system, prefer, max_tokens, tier)
+        keys = [response_key(m.name, self._backend(m), system, prompt, max_tokens, tier) for m in models]
+        cached = self._cached(keys, models[0], task)
+        if cached is not None:
+            yield cached
+            return
+        used: List[ModelProfile] = []
+        if self._live(models[0]):
+            chunks: Iterator[str] = self._stream_live(models, prompt, system, max_tokens, task, used)
+        else:
+            used.append(models[0])
+            chunks = (m.group() for m in _STUB_CHUNK.finditer(self._stub(models[0], prompt, task)))
+        keep: Optional[List[str]] = [] if self.cache.mode == "on" else None
+        for chunk in chunks:
+            if keep is not None:
+                keep.append(chunk)
+            yield chunk
+        if keep is not None and used:
+            self._store(keys[models.index(used[0])], used[0], prompt, "".join(keep))
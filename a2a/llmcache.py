@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .cache import CACHE_DIR, cache_dir
+
+DB_NAME = "llm.sqlite3"
+DEFAULT_TTL = 30 * 86400.0
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+MODES = ("on", "off", "replay")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    prompt_sha TEXT NOT NULL,
+    payload BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_responses_lru ON responses (last_used);
+"""
+
+
+class LLMCacheMiss(LookupError):
+    """Raised in replay mode when a prompt has no stored response."""
+
+
+def cache_mode() -> str:
+    """`A2DEV_LLM_CACHE`: on (read/write, default), off, or replay (read-only; misses raise)."""
+    mode = os.getenv("A2DEV_LLM_CACHE", "on").strip().lower()
+    if mode in ("0", "false", "no"):
+        return "off"
+    return mode if mode in MODES else "on"
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, ""))
+    except ValueError:
+        return default
+
+
+def response_key(model: str, backend: str, system: Optional[str], prompt: str,
+                 max_tokens: int, tier: Optional[str]) -> str:
+    """Content-hash key; `backend` separates stubbed from live output for the same model."""
+    prompt_sha = hashlib.sha256(prompt.encode("utf-8", "surrogatepass")).hexdigest()
+    parts = [model, backend, system or "", prompt_sha, int(max_tokens), tier or ""]
+    return hashlib.sha256(json.dumps(parts).encode()).hexdigest()
+
+
+class ResponseCache:
+    """SQLite store of LLM completions keyed by `response_key`.
+
+    Responses are zlib-compressed. Entries older than `ttl` seconds (<=0 disables
+    expiry) are treated as misses and purged; past `limit` bytes the least recently
+    used rows are evicted. In replay mode nothing is written.
+    """
+
+    def __init__(self, root: str | Path = ".", ttl: Optional[float] = None, limit: Optional[int] = None,
+                 mode: Optional[str] = None):
+        self.root = Path(root)
+        self.path = self.root / CACHE_DIR / DB_NAME
+        self.ttl = _env_float("A2DEV_LLM_CACHE_TTL", DEFAULT_TTL) if ttl is None else ttl
+        self.limit = int(_env_float("A2DEV_LLM_CACHE_MB", DEFAULT_MAX_BYTES / 1048576) * 1048576) if limit is None else limit
+        self.mode = cache_mode() if mode is None else mode
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def __enter__(self) -> "ResponseCache":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            cache_dir(self.root)
+            # Connections are shared by the worker threads of a client; sqlite3 serialises access.
+            self._conn = sqlite3.connect(str(self.path), timeout=10, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+        return self._conn
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _expired(self, created_at: float) -> bool:
+        return self.ttl > 0 and time.time() - created_at > self.ttl
+
+    def get(self, key: str) -> Optional[str]:
+        if self.mode == "off":
+            return None
+        row = self.conn.execute("SELECT payload, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        if self._expired(row[1]):
+            if self.mode != "replay":
+                with self.conn:
+                    self.conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            return None
+        if self.mode != "replay":
+            with self.conn:
+                self.conn.execute("UPDATE responses SET last_used = ?, hits = hits + 1 WHERE key = ?", (time.time(), key))
+        return zlib.decompress(row[0]).decode("utf-8")
+
+    def put(self, key: str, model: str, prompt: str, text: str) -> None:
+        if self.mode != "on":
+            return
+        payload = zlib.compress(text.encode("utf-8"), 6)
+        if len(payload) > self.limit:
+            return
+        now = time.time()
+        prompt_sha = hashlib.sha256(prompt.encode("utf-8", "surrogatepass")).hexdigest()
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses (key, model, prompt_sha, payload, size, created_at, last_used)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, model, prompt_sha, payload, len(payload), now, now),
+            )
+        self.evict()
+
+    def evict(self) -> int:
+        """Purge expired rows, then LRU rows until the store fits within `limit`."""
+        dropped = 0
+        with self.conn:
+            if self.ttl > 0:
+                dropped += self.conn.execute("DELETE FROM responses WHERE created_at < ?", (time.time() - self.ttl,)).rowcount
+            total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total > self.limit:
+                for key, size in self.conn.execute("SELECT key, size FROM responses ORDER BY last_used").fetchall():
+                    if total <= self.limit:
+                        break
+                    self.conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    total -= size
+                    dropped += 1
+        return dropped
+
+    def clear(self) -> int:
+        with self.conn:
+            return self.conn.execute("DELETE FROM responses").rowcount
+
+    def stats(self) -> Dict[str, Any]:
+        n, size, hits = self.conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(hits), 0) FROM responses").fetchone()
+        return {"path": str(self.path), "mode": self.mode, "entries": n, "bytes": size, "hits": hits,
+                "limit": self.limit, "ttl": self.ttl}
@@ -4,9 +4,15 @@ import json
 import os
 import shutil
 import subprocess
+import threading
+import time
 from dataclasses import dataclass
+from fnmatch import fnmatch
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, Generator, Iterator, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from .symbols import SymbolIndex
 
 
 def _run(cmd: List[str], cwd: Optional[str] = None, timeout: int = 120) -> tuple[int, str, str]:
@@ -17,6 +23,15 @@ def _run(cmd: List[str], cwd: Optional[str] = None, timeout: int = 120) -> tuple
         return 1, "", str(e)
 
 
+def _cached_run(cmd: List[str], cwd: Optional[str] = None, timeout: int = 120, tree_root: str = ".",
+                inputs: Sequence[str] = (), ok_codes: Sequence[int] = (0,), ignored: bool = False) -> tuple[int, str, str]:
+    """`_run` memoized on argv, tool version, tree fingerprint and env (see a2a.runcache)."""
+    from .runcache import cached_run
+
+    return cached_run(_run, cmd, cwd=cwd, timeout=timeout, tree_root=tree_root, inputs=inputs, ok_codes=ok_codes,
+                      ignored=ignored)
+
+
 @dataclass
 class CodeSearchResult:
     path: str
@@ -24,29 +39,158 @@ class CodeSearchResult:
     snippet: str
 
 
-class CodeSearchAdapter:
-    def search(self, query: str, root: str = ".") -> List[CodeSearchResult]:
-        if shutil.which("rg"):
-            code, out, _ = _run(["rg", "-n", "--no-heading", query], cwd=root)
-        else:
-            code, out, _ = _run(["grep", "-R", "-n", query, "."], cwd=root)
-        results: List[CodeSearchResult] = []
-        if code != 0:
-            return results
-        for line in out.splitlines():
+def _matches_globs(path: str, globs: Sequence[str]) -> bool:
+    """rg-style globs: a match on the path or its basename; `!glob` excludes."""
+    name = path.rsplit("/", 1)[-1]
+    include = [g for g in globs if not g.startswith("!")]
+    exclude = [g[1:] for g in globs if g.startswith("!")]
+
+    def hit(g: str) -> bool:
+        return fnmatch(path, g) or fnmatch(name, g) or (g.startswith("**/") and fnmatch(path, g[3:]))
+
+    if any(hit(g) for g in exclude):
+        return False
+    return not include or any(hit(g) for g in include)
+
+
+def _stream_matches(cmd: List[str], cwd: str, timeout: Optional[float]) -> Iterator[Tuple[str, int, str]]:
+    """Yield `path:line:text` records from a search tool as they are produced.
+
+    The process is killed when the consumer stops early (generator close) or when
+    `timeout` expires, so output nobody reads is never buffered.
+    """
+    try:
+        proc = subprocess.Popen(cmd, cwd=cwd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+                                stderr=subprocess.DEVNULL, text=True, errors="replace")
+    except OSError:
+        return
+    timer = threading.Timer(timeout, proc.kill) if timeout else None
+    if timer:
+        timer.daemon = True
+        timer.start()
+    try:
+        assert proc.stdout is not None
+        for line in proc.stdout:
             try:
-                path, lno, text = line.split(":", 2)
-                results.append(CodeSearchResult(path=path, line=int(lno), snippet=text.strip()))
-            except Exception:
+                path, lno, text = line.rstrip("\n").split(":", 2)
+                yield path[2:] if path.startswith("./") else path, int(lno), text
+            except ValueError:
                 continue
-        return results
+    finally:
+        if timer:
+            timer.cancel()
+        if proc.poll() is None:
+            proc.kill()
+        if proc.stdout:
+            proc.stdout.close()
+        proc.wait()
+
+
+class CodeSearchAdapter:
+    def iter_search(
+        self,
+        query: str,
+        root: str = ".",
+        max_results: Optional[int] = None,
+        per_file: Optional[int] = None,
+        globs: Optional[Sequence[str]] = None,
+        timeout: Optional[float] = None,
+        use_index: Optional[bool] = None,
+    ) -> Iterator[CodeSearchResult]:
+        """Stream matches for `query` (a regex) under root, stopping at the given limits.
+
+        Uses the trigram index when `use_index` is True, or (by default) when
+        A2DEV_CODE_INDEX=1 or an index was already built with `a2dev code-index`;
+        otherwise rg/grep is read incrementally and killed once a limit is hit.
+        """
+        deadline = time.monotonic() + timeout if timeout else None
+        globs = list(globs or [])
+        if use_index is None:
+            from .trigram import TrigramIndex
+
+            use_index = os.getenv("A2DEV_CODE_INDEX") == "1" or TrigramIndex(root).exists()
+        source = self._index_matches(query, root, deadline) if use_index else None
+        prefiltered = False
+        if source is None:
+            if shutil.which("rg"):
+                cmd = ["rg", "-n", "--no-heading", "--color", "never"]
+                for g in globs:
+                    cmd += ["-g", g]
+                prefiltered = True
+            else:
+                cmd = ["grep", "-R", "-n"]
+            if per_file:
+                cmd += ["-m", str(per_file)]
+            source = _stream_matches([*cmd, "-e", query, "."], root, timeout)
+        per_path: Dict[str, int] = {}
+        emitted = 0
+        try:
+            for path, lno, text in source:
+                if deadline and time.monotonic() > deadline:
+                    return
+                if globs and not prefiltered and not _matches_globs(path, globs):
+                    continue
+                if per_file:
+                    seen = per_path.get(path, 0)
+                    if seen >= per_file:
+                        continue
+                    per_path[path] = seen + 1
+                yield CodeSearchResult(path=path, line=lno, snippet=text.strip())
+                emitted += 1
+                if max_results and emitted >= max_results:
+                    return
+        finally:
+            source.close()
+
+    def search(self, query: str, root: str = ".", use_index: Optional[bool] = None, **limits: Any) -> List[CodeSearchResult]:
+        """List form of `iter_search` (accepts the same limits as keyword arguments)."""
+        return list(self.iter_search(query, root, use_index=use_index, **limits))
+
+    def _index_matches(
+        self, query: str, root: str, deadline: Optional[float] = None
+    ) -> Optional[Generator[Tuple[str, int, str], None, None]]:
+        """None means the query cannot be served by the index (e.g. non-Python regex syntax)."""
+        import re
+
+        from .trigram import TrigramIndex
+
+        try:
+            re.compile(query)
+        except re.error:
+            return None
+        idx = TrigramIndex(root)
+        try:
+            stats = idx.update()
+        except OSError:
+            idx.close()
+            return None
+        if not stats["files"]:
+            idx.close()
+            return None  # nothing indexed: let rg/grep look instead
+
+        def gen() -> Generator[Tuple[str, int, str], None, None]:
+            try:
+                yield from idx.search(query, deadline=deadline)
+            finally:
+                idx.close()
+
+        return gen()
 
 
 class SemgrepAdapter:
     def scan(self, root: str = ".", config: str = "auto") -> Dict[str, Any]:
         if not shutil.which("semgrep"):
+            # Local rule files still run through the built-in engine (a2a.rules).
+            if config != "auto" and Path(config).is_file():
+                from .rules import scan as builtin_scan
+
+                try:
+                    return builtin_scan(root, config)
+                except (OSError, ValueError) as e:
+                    return {"status": "error", "stderr": f"builtin rules: {e}"}
             return {"status": "skipped", "reason": "semgrep not installed"}
-        code, out, err = _run(["semgrep", "--config", config, "--json", root])
+        inputs = [config] if Path(config).is_file() else []
+        code, out, err = _cached_run(["semgrep", "--config", config, "--json", root], tree_root=root, inputs=inputs)
         if code != 0:
             return {"status": "error", "stderr": err}
         try:
@@ -77,28 +221,64 @@ class SupabaseAdapter:
 
 
 class RefAdapter:
-    """Lightweight code reference adapter (stand-in for code graph/ref tools)."""
+    """Lightweight code reference adapter (stand-in for code graph/ref tools).
+
+    Uses universal-ctags when installed; otherwise builds the native symbol index
+    (`a2a.symbols`). The definition/reference queries below always use the native
+    index, building it on first use when only ctags ran.
+    """
+
+    def _symbols(self, root: str) -> "SymbolIndex":
+        from .symbols import SymbolIndex
+
+        # update() loads the saved index and re-parses only files whose mtime/size
+        # changed since it was written, so edits are never answered from stale entries.
+        idx = SymbolIndex(root)
+        idx.update()
+        return idx
 
     def index_exists(self, root: str = ".") -> bool:
-        return Path(root, ".tags").exists()
+        from .symbols import SymbolIndex
+
+        return Path(root, ".tags").exists() or SymbolIndex(root).exists()
 
     def build_index(self, root: str = ".") -> str:
+        from .symbols import SymbolIndex
+
         # Try universal-ctags if available
         if not shutil.which("ctags"):
-            return "ctags not installed; skipped"
+            stats = SymbolIndex(root).update()
+            return f"built (native index: {stats['files']} files, {stats['symbols']} symbols)"
+        # Not cached: the product is the .tags file, not stdout.
         code, out, err = _run(["ctags", "-R"], cwd=root)
         if code == 0:
-            return "built"
+            return "built (ctags)"
         return f"error: {err}"
 
+    def find_definition(self, name: str, root: str = ".") -> List[Dict[str, Any]]:
+        return self._symbols(root).find_definition(name)
+
+    def find_references(self, name: str, root: str = ".") -> List[Dict[str, Any]]:
+        return self._symbols(root).find_references(name)
+
+    def symbols_in(self, path: str, root: str = ".") -> List[Dict[str, Any]]:
+        return self._symbols(root).symbols_in(path)
+
 
 class GitleaksAdapter:
     """Secrets scanning via gitleaks CLI if available."""
 
     def scan(self, root: str = ".") -> Dict[str, Any]:
         if not shutil.which("gitleaks"):
-            return {"status": "skipped", "reason": "gitleaks not installed"}
-        code, out, err = _run(["gitleaks", "detect", "--no-git", "--report-format", "json", "--source", root])
+            # Built-in pattern + entropy scanner keeps secrets gating on without the binary.
+            from .secretscan import scan as builtin_scan
+
+            return builtin_scan(root)
+        # --no-git scans the directory, so files git ignores (.env) must be part of the key.
+        code, out, err = _cached_run(
+            ["gitleaks", "detect", "--no-git", "--report-format", "json", "--source", root],
+            tree_root=root, ok_codes=(0, 1), ignored=True,
+        )
         if code not in (0, 1):  # gitleaks returns 1 when leaks found
             return {"status": "error", "stderr": err}
         try:
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import ast
+import mmap
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .parallel import map_chunked
+
+# Line-comment prefixes and block-comment delimiters per language (inventory keys).
+HASH = ("#",)
+SLASH = ("//",)
+C_BLOCK = ("/*", "*/")
+COMMENT_SYNTAX: Dict[str, Tuple[Tuple[str, ...], Optional[Tuple[str, str]]]] = {
+    "python": (HASH, None),
+    "shell": (HASH, None),
+    "ruby": (HASH, None),
+    "yaml": (HASH, None),
+    "terraform": (HASH + SLASH, C_BLOCK),
+    "php": (HASH + SLASH, C_BLOCK),
+    "typescript": (SLASH, C_BLOCK),
+    "javascript": (SLASH, C_BLOCK),
+    "go": (SLASH, C_BLOCK),
+    "rust": (SLASH, C_BLOCK),
+    "java": (SLASH, C_BLOCK),
+    "kotlin": (SLASH, C_BLOCK),
+    "csharp": (SLASH, C_BLOCK),
+    "swift": (SLASH, C_BLOCK),
+    "objc": (SLASH, C_BLOCK),
+    "cpp": (SLASH, C_BLOCK),
+    "c": (SLASH, C_BLOCK),
+}
+
+# Files larger than this (minified bundles, generated code) only get a newline count.
+MAX_CLASSIFY_BYTES = 2 * 1024 * 1024
+_COUNT_WINDOW = 1 << 20
+
+_DECISIONS = (
+    ast.If, ast.For, ast.AsyncFor, ast.While, ast.IfExp, ast.ExceptHandler,
+    ast.Assert, ast.comprehension,
+)
+_SCOPES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda, ast.ClassDef)
+
+
+def count_newlines(mm: mmap.mmap) -> int:
+    """Count newlines in an mmap'd buffer window by window (no full copy)."""
+    n = 0
+    size = len(mm)
+    for off in range(0, size, _COUNT_WINDOW):
+        n += mm[off:off + _COUNT_WINDOW].count(b"\n")
+    if size and mm[size - 1:size] != b"\n":
+        n += 1  # last line without trailing newline
+    return n
+
+
+def _classify(mm: mmap.mmap, lang: str) -> Tuple[int, int, int]:
+    prefixes, block = COMMENT_SYNTAX.get(lang, ((), None))
+    bprefixes = tuple(p.encode() for p in prefixes)
+    bstart, bend = (block[0].encode(), block[1].encode()) if block else (b"", b"")
+    code = comment = blank = 0
+    in_block = False
+    for raw in iter(mm.readline, b""):
+        s = raw.strip()
+        if not s:
+            blank += 1
+        elif in_block:
+            comment += 1
+            if bend in s:
+                in_block = False
+        elif bprefixes and s.startswith(bprefixes):
+            comment += 1
+        elif bstart and s.startswith(bstart):
+            comment += 1
+            in_block = bend not in s[len(bstart):]
+        else:
+            code += 1
+    return code, comment, blank
+
+
+def _complexity(node: ast.AST) -> int:
+    """McCabe-style complexity of a scope, excluding nested functions/classes."""
+    score = 1
+    stack = list(ast.iter_child_nodes(node))
+    while stack:
+        n = stack.pop()
+        if isinstance(n, _SCOPES):
+            continue
+        if isinstance(n, _DECISIONS):
+            score += 1
+            if isinstance(n, ast.comprehension):
+                score += len(n.ifs)
+        elif isinstance(n, ast.BoolOp):
+            score += len(n.values) - 1
+        elif isinstance(n, ast.Try):
+            score += 1 if n.orelse else 0
+        elif type(n).__name__ == "match_case":
+            score += 1
+        stack.extend(ast.iter_child_nodes(n))
+    return score
+
+
+def python_complexity(source: bytes) -> Dict[str, int]:
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return {"functions": 0, "complexity": 0, "max_complexity": 0, "parse_error": 1}
+    funcs = [n for n in ast.walk(tree) if isinstance(n, (ast.FunctionDef, ast.AsyncFunctionDef))]
+    scores = [_complexity(f) for f in funcs]
+    return {
+        "functions": len(funcs),
+        "complexity": sum(scores) + _complexity(tree) - 1,
+        "max_complexity": max(scores, default=0),
+    }
+
+
+def file_metrics(path: str, lang: str) -> Dict[str, Any]:
+    rec: Dict[str, Any] = {"lang": lang, "bytes": 0, "lines": 0, "code": 0, "comment": 0, "blank": 0}
+    try:
+        with open(path, "rb") as fh:
+            size = os.fstat(fh.fileno()).st_size
+            rec["bytes"] = size
+            if size == 0:
+                return rec
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                rec["lines"] = count_newlines(mm)
+                if size > MAX_CLASSIFY_BYTES:
+                    rec["code"] = rec["lines"]
+                    return rec
+                rec["code"], rec["comment"], rec["blank"] = _classify(mm, lang)
+                if lang == "python":
+                    rec.update(python_complexity(mm[:]))
+    except (OSError, ValueError):
+        rec["error"] = "unreadable"
+    return rec
+
+
+def _metrics_chunk(items: List[Tuple[str, str, str]]) -> List[Tuple[str, Dict[str, Any]]]:
+    return [(rel, file_metrics(abs_path, lang)) for abs_path, rel, lang in items]
+
+
+def collect_metrics(
+    root: str | Path,
+    files: Sequence[Tuple[str, str]],
+    workers: Optional[int] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """Compute per-file metrics for (relative path, language) pairs under root.
+
+    Work is split into chunks and fanned out to a process pool for large trees.
+    """
+    root_path = Path(root)
+    items = [(str(root_path / rel), rel, lang) for rel, lang in files]
+    return dict(map_chunked(_metrics_chunk, items, workers=workers))
+
+
+_SUM_KEYS = ("bytes", "lines", "code", "comment", "blank", "functions", "complexity")
+
+
+def aggregate_by_directory(per_file: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    dirs: Dict[str, Dict[str, int]] = {}
+    totals: Dict[str, int] = {"files": 0, **{k: 0 for k in _SUM_KEYS}}
+    for rel, rec in per_file.items():
+        d = str(Path(rel).parent)
+        agg = dirs.setdefault(d, {"files": 0, **{k: 0 for k in _SUM_KEYS}, "max_complexity": 0})
+        agg["files"] += 1
+        totals["files"] += 1
+        for k in _SUM_KEYS:
+            v = int(rec.get(k, 0) or 0)
+            agg[k] += v
+            totals[k] += v
+        agg["max_complexity"] = max(agg["max_complexity"], int(rec.get("max_complexity", 0) or 0))
+    top_files = sorted(
+        ({"path": rel, **rec} for rel, rec in per_file.items() if rec.get("complexity")),
+        key=lambda r: (-r["complexity"], r["path"]),
+    )[:20]
+    return {"totals": totals, "directories": dict(sorted(dirs.items())), "top_complex_files": top_files}
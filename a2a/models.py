@@ -1,9 +1,12 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, Optional
+from typing import TYPE_CHECKING, Dict, List, Mapping, Optional, Tuple
 import os
 
+if TYPE_CHECKING:
+    from .telemetry import CallStats
+
 
 @dataclass
 class ModelProfile:
@@ -12,6 +15,12 @@ class ModelProfile:
     family: str    # e.g., gpt-4o, claude-3.5, llama3.1
     strengths: list[str]  # tags: planning, code, ux, security, long_context
     max_tokens: int
+    input_cost: float = 0.0   # USD per 1M prompt tokens (0 for local models)
+    output_cost: float = 0.0  # USD per 1M completion tokens
+    quality: str = "high"     # high | medium | low: cost/latency routing stays within the requested tier
+
+    def cost(self, prompt_tokens: int, output_tokens: int) -> float:
+        return (prompt_tokens * self.input_cost + output_tokens * self.output_cost) / 1_000_000
 
 
 # Default registry (can be edited in-repo for your org)
@@ -22,6 +31,8 @@ REGISTRY: Dict[str, ModelProfile] = {
         family="gpt-4o",
         strengths=["planning", "code", "analysis", "long_context"],
         max_tokens=128000,
+        input_cost=2.50,
+        output_cost=10.00,
     ),
     "claude-3.5-sonnet": ModelProfile(
         name="claude-3.5-sonnet",
@@ -29,6 +40,8 @@ REGISTRY: Dict[str, ModelProfile] = {
         family="claude-3.5-sonnet",
         strengths=["planning", "ux", "analysis", "long_context"],
         max_tokens=200000,
+        input_cost=3.00,
+        output_cost=15.00,
     ),
     "llama3.1-70b": ModelProfile(
         name="llama3.1-70b",
@@ -36,10 +49,29 @@ REGISTRY: Dict[str, ModelProfile] = {
         family="llama3.1-70b",
         strengths=["code", "analysis"],
         max_tokens=32000,
+        quality="medium",
     ),
 }
 
 
+# Strength a model needs to be considered for a task by the cost/latency policies.
+TASK_STRENGTHS: Dict[str, str] = {
+    "planning": "planning", "backlog": "planning", "architecture": "planning",
+    "ux": "ux", "design": "ux",
+    "code": "code", "qa": "code", "devops": "code",
+    "security": "analysis", "docs": "analysis",
+}
+QUALITY_RANK = {"low": 0, "medium": 1, "high": 2}
+POLICIES = ("static", "latency", "cost")
+MIN_SAMPLES = 5  # calls before a model/task's telemetry is trusted over the per-model aggregate
+
+
+def routing_policy() -> str:
+    """`A2DEV_ROUTING`: static (default; the task lists below), latency or cost."""
+    policy = os.getenv("A2DEV_ROUTING", "static").strip().lower()
+    return policy if policy in POLICIES else "static"
+
+
 def _env_tier() -> Optional[str]:
     # Prefer A2A-specific var, fall back to Codex-like hints if present
     tier = os.getenv("A2A_MODEL_TIER") or os.getenv("CODEX_MODEL_TIER") or os.getenv("MODEL_TIER")
@@ -50,20 +82,28 @@ def _env_tier() -> Optional[str]:
     return None
 
 
-def select_model(
+def candidate_models(
     task: str,
     need_long_context: bool = False,
     prefer: Optional[str] = None,
     tier: Optional[str] = None,
-) -> ModelProfile:
-    """Heuristic model selection by task type.
+    prompt_tokens: Optional[int] = None,
+    output_tokens: int = 0,
+    policy: Optional[str] = None,
+    stats: Optional[Mapping[Tuple[str, str], "CallStats"]] = None,
+) -> List[ModelProfile]:
+    """Models for a task in routing order: the `select_model` choice first, then fallbacks.
 
-    task: one of {planning, backlog, ux, architecture, design, security, code, qa, devops, docs}
-    need_long_context: set True when passing large artifacts
-    prefer: optional model name hint
+    LLMClient fails over (and hedges slow requests) along this list. With the
+    latency or cost policy (see `routing_policy`), models are ranked from telemetry
+    instead (`stats`, loaded from `.a2dev/cache/telemetry.sqlite3` when omitted).
     """
     if prefer and prefer in REGISTRY:
-        return REGISTRY[prefer]
+        first = REGISTRY[prefer]
+        rest = [m for m in candidate_models(task, need_long_context, None, tier, prompt_tokens, output_tokens,
+                                            policy, stats)
+                if m.name != first.name]
+        return [first] + rest
 
     # Simple routing logic; edit for your org policy
     if task in {"planning", "backlog", "design", "architecture", "ux"}:
@@ -75,15 +115,100 @@ def select_model(
     else:
         cand = [REGISTRY["gpt-4o"]]
 
-    if need_long_context:
+    if prompt_tokens is not None:
+        fitting = [m for m in cand if m.max_tokens >= prompt_tokens + output_tokens]
+        # Nothing fits: the largest window truncates least.
+        cand = fitting or sorted(REGISTRY.values(), key=lambda m: m.max_tokens, reverse=True)[:1]
+    elif need_long_context:
         cand.sort(key=lambda m: m.max_tokens, reverse=True)
 
     # Tier routing: default to env when not provided
     tier = (tier or _env_tier() or "high").lower()
-    if tier == "high":
-        return cand[0]
     if tier == "medium":
-        return cand[min(1, len(cand) - 1)]
-    if tier == "low":
-        return cand[-1]
-    return cand[0]
+        first = cand[min(1, len(cand) - 1)]
+    elif tier == "low":
+        first = cand[-1]
+    else:
+        first = cand[0]
+    order = [first] + [m for m in cand if m is not first]
+
+    policy = policy or routing_policy()
+    if policy != "static":
+        return _ranked(task, policy, tier, prompt_tokens, output_tokens, stats, order) or order
+    return order
+
+
+def select_model(
+    task: str,
+    need_long_context: bool = False,
+    prefer: Optional[str] = None,
+    tier: Optional[str] = None,
+    prompt_tokens: Optional[int] = None,
+    output_tokens: int = 0,
+) -> ModelProfile:
+    """Heuristic model selection by task type.
+
+    task: one of {planning, backlog, ux, architecture, design, security, code, qa, devops, docs}
+    need_long_context: set True when passing large artifacts
+    prefer: optional model name hint
+    prompt_tokens/output_tokens: estimated request size (see a2a.tokens); models whose
+        window cannot hold it are skipped, so the usual (cheaper) choice stands whenever it fits
+    """
+    return candidate_models(task, need_long_context, prefer, tier, prompt_tokens, output_tokens)[0]
+
+
+def _ranked(
+    task: str,
+    policy: str,
+    tier: str,
+    prompt_tokens: Optional[int],
+    output_tokens: int,
+    stats: Optional[Mapping[Tuple[str, str], "CallStats"]],
+    static: List[ModelProfile],
+) -> List[ModelProfile]:
+    """Models with the task's strength, at or above `tier`, cheapest/fastest expected first
+    (ties keep the `static` order).
+
+    Expected latency is the mean of successful calls for the model and task (or the
+    model across tasks until MIN_SAMPLES are seen); models without telemetry rank
+    first so they get measured. Expected cost uses list prices, the prompt size and
+    the model's mean output length (else `output_tokens`). Empty when no model qualifies.
+    """
+    strength = TASK_STRENGTHS.get(task)
+    floor = QUALITY_RANK.get(tier, QUALITY_RANK["high"])
+    need = (prompt_tokens or 0) + output_tokens
+    eligible = [m for m in REGISTRY.values()
+                if (strength is None or strength in m.strengths)
+                and QUALITY_RANK.get(m.quality, 0) >= floor and m.max_tokens >= need]
+    if not eligible:
+        return []
+    if stats is None:
+        from .telemetry import TelemetryStore
+
+        try:
+            stats = TelemetryStore().summary()
+        except Exception:
+            stats = {}
+
+    def observed(m: ModelProfile) -> Optional["CallStats"]:
+        for key in ((m.name, task), (m.name, "*")):
+            st = stats.get(key) if stats else None
+            if st is not None and st.calls - st.errors >= MIN_SAMPLES:
+                return st
+        return None
+
+    def expected(m: ModelProfile) -> float:
+        st = observed(m)
+        if st is None:
+            return 0.0 if policy == "latency" else m.cost(prompt_tokens or 0, output_tokens)
+        if policy == "latency":
+            value = st.mean_latency or 0.0
+        else:
+            value = m.cost(prompt_tokens or 0, int(st.mean_output_tokens or output_tokens))
+        # Failed attempts cost time and money too, and are followed by a retry.
+        return value / max(0.05, 1.0 - st.error_rate)
+
+    def position(m: ModelProfile) -> int:
+        return static.index(m) if m in static else len(static)
+
+    return sorted(eligible, key=lambda m: (expected(m), position(m)))
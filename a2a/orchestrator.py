@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+import os
+import sys
 from pathlib import Path
 from typing import Callable
 
-from .storage import read_backlog
+from .storage import read_backlog, stream_to_file
 from .roles import UXRole, EngRole
 from .roles.architecture import ArchitectureRole
 from .roles.planning import DeepPlanningRole
@@ -20,6 +22,18 @@ from .board import write_board, update_story_fields
 from .journal import log_story_event
 
 
+def _stream_echo() -> Callable[[str], None] | None:
+    """With A2DEV_STREAM=1, generated artifact text is echoed to stdout as it is produced."""
+    if os.getenv("A2DEV_STREAM") != "1":
+        return None
+
+    def echo(chunk: str) -> None:
+        sys.stdout.write(chunk)
+        sys.stdout.flush()
+
+    return echo
+
+
 class Orchestrator:
     """Story-centric orchestrator: agents produce artifacts consumed by others.
 
@@ -216,16 +230,12 @@ Updated: {_dt.utcnow().isoformat()}Z
         write_ux_doc(doc)
 
     def _gen_arch(self, story_id: int, backlog):
-        text = self.arch.adr_for_story(backlog, story_id)
-        out_dir = Path("docs/architecture")
-        out_dir.mkdir(parents=True, exist_ok=True)
-        (out_dir / f"ADR-story-{story_id}.md").write_text(text)
+        chunks = self.arch.stream_adr_for_story(backlog, story_id)
+        stream_to_file(f"docs/architecture/ADR-story-{story_id}.md", chunks, echo=_stream_echo())
 
     def _gen_plan(self, story_id: int, backlog):
-        text = self.plan.plan_for_story(backlog, story_id)
-        out_dir = Path("docs/planning")
-        out_dir.mkdir(parents=True, exist_ok=True)
-        (out_dir / f"story-{story_id}.md").write_text(text)
+        chunks = self.plan.stream_plan_for_story(backlog, story_id)
+        stream_to_file(f"docs/planning/story-{story_id}.md", chunks, echo=_stream_echo())
 
     def _gen_qa(self, story_id: int, backlog):
         text = self.qa.plan_for_story(backlog, story_id)
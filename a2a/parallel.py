@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Iterator, List, Optional, Sequence, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Below this many items the pool start-up cost outweighs the speedup.
+SERIAL_THRESHOLD = 64
+DEFAULT_CHUNK = 256
+
+
+def chunked(items: Sequence[T], size: int) -> Iterator[List[T]]:
+    for i in range(0, len(items), max(1, size)):
+        yield list(items[i:i + size])
+
+
+def worker_count(requested: Optional[int] = None) -> int:
+    if requested:
+        return max(1, requested)
+    env = os.getenv("A2DEV_WORKERS")
+    if env and env.isdigit():
+        return max(1, int(env))
+    return max(1, min(8, (os.cpu_count() or 2)))
+
+
+def _pool_safe() -> bool:
+    # A zipapp (a2dev.pyz) has no __main__ guard; spawn-based pools would re-run the CLI.
+    main_file = getattr(sys.modules.get("__main__"), "__file__", "") or ""
+    if main_file.endswith(".pyz") or ".pyz" + os.sep in main_file:
+        return multiprocessing.get_start_method() == "fork"
+    return True
+
+
+def map_chunked(
+    fn: Callable[[List[T]], List[R]],
+    items: Sequence[T],
+    chunk_size: int = DEFAULT_CHUNK,
+    workers: Optional[int] = None,
+) -> List[R]:
+    """Apply a chunk-level function across items, in a process pool when it pays off.
+
+    `fn` must be a module-level function taking a list of items and returning a list
+    of results. Falls back to in-process execution for small inputs, single-worker
+    setups, or when the pool cannot be started (e.g., sandboxed environments) or
+    loses a worker process. Exceptions raised by `fn` itself propagate.
+    """
+    items = list(items)
+    n_workers = worker_count(workers)
+    if len(items) < SERIAL_THRESHOLD or n_workers == 1 or not _pool_safe():
+        return fn(items) if items else []
+    # Smaller chunks near the tail keep workers balanced on uneven inputs.
+    size = max(1, min(chunk_size, len(items) // (n_workers * 4) or 1))
+    try:
+        ex = ProcessPoolExecutor(max_workers=n_workers)
+    except (OSError, NotImplementedError, ImportError):  # no working semaphores/processes
+        return fn(items)
+    with ex:
+        try:
+            # Worker processes are spawned on submit; OSError here means they could not start.
+            futures = [ex.submit(fn, part) for part in chunked(items, size)]
+        except (OSError, BrokenProcessPool):
+            futures = None
+        if futures is not None:
+            out: List[R] = []
+            try:
+                for fut in futures:
+                    out.extend(fut.result())
+                return out
+            except BrokenProcessPool:
+                pass  # a worker died (killed, out of memory); redo the work in-process
+            except BaseException:
+                ex.shutdown(wait=False, cancel_futures=True)  # fn failed: do not run the rest
+                raise
+    return fn(items)
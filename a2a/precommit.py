@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import subprocess
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+
+from .cache import file_digest, read_json, write_json
+
+CACHE_NAME = "precommit.json"
+MAX_CACHE_ENTRIES = 5000
+RULES_PATH = Path(".a2dev/semgrep/rules.yml")
+BLOCKING_SEVERITIES = ("ERROR", "HIGH", "CRITICAL")
+
+
+def staged_paths(root: str = ".") -> List[str]:
+    """Added/copied/modified/renamed paths in the index (deletions need no scan)."""
+    proc = subprocess.run(
+        ["git", "diff", "--cached", "--name-only", "-z", "--diff-filter=ACMR"],
+        cwd=root, capture_output=True, timeout=30,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.decode("utf-8", "replace").strip() or "git diff failed")
+    return [p.decode("utf-8", "surrogateescape") for p in proc.stdout.split(b"\0") if p]
+
+
+def staged_blobs(paths: Sequence[str], root: str = ".") -> Dict[str, str]:
+    """path -> blob sha as recorded in the index (stage 0); submodules/symlinks are skipped."""
+    if not paths:
+        return {}
+    # The whole index, filtered here: thousands of pathspecs on argv can exceed ARG_MAX.
+    proc = subprocess.run(["git", "ls-files", "-s", "-z"], cwd=root, capture_output=True, timeout=30)
+    wanted = set(paths)
+    out: Dict[str, str] = {}
+    for entry in proc.stdout.split(b"\0"):
+        if not entry:
+            continue
+        meta, _, raw = entry.partition(b"\t")
+        mode, sha, stage = meta.decode().split()
+        path = raw.decode("utf-8", "surrogateescape")
+        if stage == "0" and mode.startswith("100") and path in wanted:
+            out[path] = sha
+    return out
+
+
+def read_blobs(shas: Sequence[str], root: str = ".") -> Iterator[Tuple[str, bytes]]:
+    """Stream (sha, content) pairs through a single `git cat-file --batch` process."""
+    if not shas:
+        return
+    proc = subprocess.Popen(["git", "cat-file", "--batch"], cwd=root, stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+    assert proc.stdin is not None and proc.stdout is not None
+    stdin = proc.stdin
+
+    # Requests are written from a thread: writing them all before reading deadlocks
+    # once both pipe buffers fill (a couple of thousand blobs).
+    def feed() -> None:
+        try:
+            for s in shas:
+                stdin.write(f"{s}\n".encode())
+        except (BrokenPipeError, ValueError):
+            pass  # reader stopped early
+        finally:
+            try:
+                stdin.close()
+            except OSError:
+                pass
+
+    writer = threading.Thread(target=feed, name="cat-file-feed", daemon=True)
+    writer.start()
+    try:
+        for _ in shas:
+            header = proc.stdout.readline().split()
+            if not header:
+                break  # git exited
+            if len(header) < 3 or header[1] != b"blob":
+                continue  # "<sha> missing"
+            data = proc.stdout.read(int(header[2]))
+            proc.stdout.read(1)  # trailing newline
+            yield header[0].decode(), data
+    finally:
+        proc.stdout.close()
+        writer.join(timeout=5)
+        proc.wait()
+
+
+def _rules_key(rules_path: Path) -> str:
+    from .rules import ENGINE_VERSION as RULES_ENGINE
+    from .secretscan import ENGINE_VERSION as SECRETS_ENGINE
+
+    return f"{file_digest(rules_path) or 'none'}:{RULES_ENGINE}:{SECRETS_ENGINE}"
+
+
+def _scan_blob(data: bytes, path: str, compiled: list) -> Dict[str, List[Dict[str, Any]]]:
+    from .rules import scan_source
+    from .secretscan import SAMPLE_BYTES, _allowed_path, is_binary, scan_buffer
+
+    if is_binary(data[:SAMPLE_BYTES]):
+        return {"rules": [], "secrets": []}
+    secrets = [] if _allowed_path(path) else scan_buffer(data, path)
+    results, _ = scan_source(data.decode("utf-8", "replace"), path, compiled) if compiled else ([], [])
+    return {"rules": results, "secrets": secrets}
+
+
+def run_precommit(root: str = ".", rules_path: Path = RULES_PATH, use_cache: bool = True) -> Dict[str, Any]:
+    """Scan staged blobs with the local rules and the secrets scanner.
+
+    Contents come from the index, so unstaged edits neither hide nor add findings.
+    Results are cached per (path, blob sha) and rules/engine version, so re-running
+    after a failed commit only rescans what changed.
+    """
+    from .rules import compile_rules, load_rules
+
+    paths = staged_paths(root)
+    blobs = staged_blobs(paths, root)
+    rules_file = Path(root) / rules_path
+    key = _rules_key(rules_file)
+    cache = (read_json(CACHE_NAME, root) or {}) if use_cache else {}
+    if cache.get("key") != key:
+        cache = {"key": key, "entries": {}}
+    entries: Dict[str, Any] = cache["entries"]
+
+    todo = {sha: path for path, sha in blobs.items() if f"{path}:{sha}" not in entries}
+    if todo:
+        compiled, _ = compile_rules(load_rules(rules_file)) if rules_file.exists() else ([], [])
+        # A blob staged under several paths is read once and scanned per path.
+        by_sha: Dict[str, List[str]] = {}
+        for path, sha in blobs.items():
+            if sha in todo:
+                by_sha.setdefault(sha, []).append(path)
+        for sha, data in read_blobs(list(by_sha), root):
+            for path in by_sha.get(sha, []):
+                entries[f"{path}:{sha}"] = _scan_blob(data, path, compiled)
+    rule_hits: List[Dict[str, Any]] = []
+    secret_hits: List[Dict[str, Any]] = []
+    for path, sha in sorted(blobs.items()):
+        rec = entries.get(f"{path}:{sha}", {})
+        rule_hits.extend(rec.get("rules", []))
+        secret_hits.extend(rec.get("secrets", []))
+    if todo:
+        # Keep the newest entries; dict order is insertion order.
+        if len(entries) > MAX_CACHE_ENTRIES:
+            cache["entries"] = dict(list(entries.items())[-MAX_CACHE_ENTRIES:])
+        write_json(CACHE_NAME, cache, root)
+    blocking = [r for r in rule_hits if str(r.get("extra", {}).get("severity", "")).upper() in BLOCKING_SEVERITIES]
+    return {
+        "files": len(blobs),
+        "scanned": len(todo),
+        "rules": rule_hits,
+        "secrets": secret_hits,
+        "ok": not blocking and not secret_hits,
+    }
+
+
+def format_report(report: Dict[str, Any]) -> List[str]:
+    lines = [f"- staged files: {report['files']} ({report['scanned']} scanned, {report['files'] - report['scanned']} cached)"]
+    for f in report["secrets"]:
+        lines.append(f"  [secret] {f['File']}:{f['StartLine']} {f['RuleID']}: {f['Match']}")
+    for r in report["rules"]:
+        sev = r.get("extra", {}).get("severity", "")
+        lines.append(f"  [{sev.lower()}] {r['path']}:{r['start']['line']} {r['check_id']}: {r['extra'].get('message', '')}")
+    return lines
@@ -1,20 +1,61 @@
 from __future__ import annotations
 
-import json
 from pathlib import Path
-from typing import Tuple
+from typing import Any, Dict, Iterator, Tuple
+
+from .jsonstream import iter_items
+
+# SARIF result levels mapped onto Semgrep severities.
+SARIF_LEVELS = {"error": "ERROR", "warning": "WARNING", "note": "INFO", "none": "INFO"}
+
+
+def _from_sarif(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Reshape a SARIF result like a Semgrep JSON result (check_id/path/start/extra)."""
+    locations = result.get("locations") or [{}]
+    loc = (locations[0] or {}).get("physicalLocation") or {}
+    region = loc.get("region") or {}
+    return {
+        "check_id": result.get("ruleId", ""),
+        "path": (loc.get("artifactLocation") or {}).get("uri", ""),
+        "start": {"line": region.get("startLine", 0)},
+        "extra": {
+            # SARIF's default level is "warning" when neither result nor rule sets one.
+            "severity": SARIF_LEVELS.get(str(result.get("level", "warning")).lower(), "WARNING"),
+            "message": (result.get("message") or {}).get("text", ""),
+            "lines": (region.get("snippet") or {}).get("text", ""),
+        },
+    }
+
+
+def iter_semgrep_results(path: Path) -> Iterator[Dict[str, Any]]:
+    """Stream results from a Semgrep JSON or SARIF report without loading it whole."""
+    with path.open("r", encoding="utf-8", errors="replace") as fh:
+        for key, item in iter_items(fh, ("results",), ("runs", "*", "results")):
+            if isinstance(item, dict):
+                yield item if key == ("results",) else _from_sarif(item)
+
+
+def iter_gitleaks_findings(path: Path) -> Iterator[Dict[str, Any]]:
+    """Stream findings from a Gitleaks report (a bare list or {"findings": [...]})."""
+    with path.open("r", encoding="utf-8", errors="replace") as fh:
+        for _, item in iter_items(fh, (), ("findings",)):
+            if isinstance(item, dict):
+                yield item
 
 
 def semgrep_summary(path: Path) -> Tuple[int, int, int]:
     if not path.exists():
         return 0, 0, 0
+    high = med = low = 0
     try:
-        data = json.loads(path.read_text())
-    except Exception:
+        for r in iter_semgrep_results(path):
+            sev = (r.get("extra", {}) or {}).get("severity")
+            if sev in ("ERROR", "HIGH"):
+                high += 1
+            elif sev in ("WARNING", "MEDIUM"):
+                med += 1
+            elif sev in ("INFO", "LOW"):
+                low += 1
+    except (OSError, ValueError):
         return 0, 0, 0
-    findings = data.get("results", [])
-    high = sum(1 for r in findings if r.get("extra", {}).get("severity") in ("ERROR", "HIGH"))
-    med = sum(1 for r in findings if r.get("extra", {}).get("severity") in ("WARNING", "MEDIUM"))
-    low = sum(1 for r in findings if r.get("extra", {}).get("severity") in ("INFO", "LOW"))
     return high, med, low
-
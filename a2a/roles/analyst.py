@@ -2,10 +2,12 @@ from __future__ import annotations
 
 from pathlib import Path
 
+from ..summarize import summarize_prd
+
 
 class AnalystRole:
     def brief_from_prd(self, prd_path: str) -> str:
-        text = Path(prd_path).read_text() if Path(prd_path).exists() else ""
+        text = summarize_prd(prd_path)
         return f"""# Project Brief
 
 ## Summary
@@ -18,7 +20,7 @@ class AnalystRole:
 - In scope / Out of scope.
 
 ## Context
-{text[:1000]}{'...' if len(text) > 1000 else ''}
+{text}
 """
 
     def research(self, topic: str) -> str:
@@ -133,8 +135,7 @@ class AnalystRole:
 """
 
     def viability_assessment(self, prd_path: str, audience: str = "both") -> str:
-        from pathlib import Path
-        prd_txt = Path(prd_path).read_text() if Path(prd_path).exists() else ""
+        prd_txt = summarize_prd(prd_path)
         lines = [f"# Viability Assessment", ""]
         if audience in ("internal", "both"):
             lines += [
@@ -161,7 +162,7 @@ class AnalystRole:
             "## Summary & Recommendation",
             "- Build / Not now / Explore further",
             "",
-            "## Appendix — PRD Excerpt",
-            prd_txt[:1000] + ("..." if len(prd_txt) > 1000 else ""),
+            "## Appendix — PRD Summary",
+            prd_txt,
         ]
         return "\n".join(lines)
@@ -2,8 +2,10 @@ from __future__ import annotations
 
 from pathlib import Path
 from datetime import datetime
+from typing import Iterator
 from ..schema import Backlog
 from ..llm import LLMClient
+from ..summarize import summarize_prd
 
 
 class ArchitectureRole:
@@ -11,12 +13,20 @@ class ArchitectureRole:
         self.llm = LLMClient()
 
     def generate_adr(self, title: str, context: str, decision_for: str, consequences: str, prefer_model: str | None = None) -> str:
-        # Use template + optional LLM augmentation
-        rendered = self._render_adr(title, context, decision_for, consequences)
-        # Could augment via LLM if keys exist
-        return rendered
-
-    def adr_for_story(self, backlog: Backlog, story_id: int, prefer_model: str | None = None) -> str:
+        return "".join(self.stream_adr(title, context, decision_for, consequences, prefer_model))
+
+    def stream_adr(self, title: str, context: str, decision_for: str, consequences: str, prefer_model: str | None = None) -> Iterator[str]:
+        # Template first; model notes are streamed after it when a live provider is configured
+        yield self._render_adr(title, context, decision_for, consequences)
+        if self.llm.is_live("architecture", prefer=prefer_model):
+            prompt = (f"Draft architecture options for: {title}\n\nContext:\n{context}\n\n"
+                      "List 2-3 options with trade-offs, a recommendation, and the main risks.")
+            yield "\n## Model Notes\n\n"
+            yield from self.llm.stream(prompt, task="architecture", system="You are a pragmatic software architect.",
+                                       prefer=prefer_model)
+            yield "\n"
+
+    def _story_adr_args(self, backlog: Backlog, story_id: int) -> tuple[str, str, str, str]:
         story = next((s for e in backlog.epics for s in e.stories if s.id == story_id), None)
         if not story:
             raise ValueError(f"Story {story_id} not found")
@@ -24,7 +34,13 @@ class ArchitectureRole:
         context = story.description or "See PRD/backlog for details."
         decision_for = "Proposed architecture options and rationale."
         consequences = "Operational and maintainability impacts."
-        return self.generate_adr(title, context, decision_for, consequences, prefer_model)
+        return title, context, decision_for, consequences
+
+    def adr_for_story(self, backlog: Backlog, story_id: int, prefer_model: str | None = None) -> str:
+        return self.generate_adr(*self._story_adr_args(backlog, story_id), prefer_model)
+
+    def stream_adr_for_story(self, backlog: Backlog, story_id: int, prefer_model: str | None = None) -> Iterator[str]:
+        return self.stream_adr(*self._story_adr_args(backlog, story_id), prefer_model)
 
     def _render_adr(self, title: str, context: str, decision_for: str, consequences: str) -> str:
         today = datetime.utcnow().strftime("%Y-%m-%d")
@@ -55,9 +71,8 @@ Status: Proposed
 """
 
     def generate_architecture_doc(self, prd_path: str, project_name: str | None = None) -> str:
-        from pathlib import Path
         name = project_name or Path(prd_path).stem
-        prd = Path(prd_path).read_text() if Path(prd_path).exists() else ""
+        prd = summarize_prd(prd_path, llm=self.llm)
         return f"""# Architecture — {name}
 
 ## Overview
@@ -91,7 +106,7 @@ Summarize system goals and constraints.
 - TBD
 
 ## Appendix — PRD Summary
-{prd[:1000]}{('...' if len(prd) > 1000 else '')}
+{prd}
 """
 
     def generate_brownfield_arch(self, project_name: str | None = None) -> str:
@@ -1,8 +1,18 @@
 from __future__ import annotations
 
 from pathlib import Path
+from typing import Iterator
 from ..schema import Backlog
 from ..llm import LLMClient
+from ..tokens import Artifact, count_tokens, pack
+
+# Upper bound on packed context per request, regardless of the model's window.
+PROMPT_TOKEN_CAP = 24000
+
+
+def _read(path: str) -> str:
+    p = Path(path)
+    return p.read_text(encoding="utf-8", errors="replace") if p.exists() else ""
 
 
 class DeepPlanningRole:
@@ -10,10 +20,29 @@ class DeepPlanningRole:
         self.llm = LLMClient()
 
     def plan_for_story(self, backlog: Backlog, story_id: int) -> str:
+        return "".join(self.stream_plan_for_story(backlog, story_id))
+
+    def stream_plan_for_story(self, backlog: Backlog, story_id: int) -> Iterator[str]:
         story = next((s for e in backlog.epics for s in e.stories if s.id == story_id), None)
         if not story:
             raise ValueError(f"Story {story_id} not found")
-        return self._render(story_id=story.id, title=story.title, ac=story.acceptance_criteria)
+        yield self._render(story_id=story.id, title=story.title, ac=story.acceptance_criteria)
+        if self.llm.is_live("planning"):
+            system = "You are a senior engineer writing an implementation plan."
+            ac = "\n".join(f"- {a}" for a in story.acceptance_criteria) or "- TBD"
+            ask = "Break this story into ordered implementation steps with the tests for each."
+            story_text = f"{story.title}\n\n{story.description or ''}\n\nAcceptance criteria:\n{ac}"
+            model, budget = self.llm.prompt_budget("planning", system=system, cap=PROMPT_TOKEN_CAP)
+            # Story first, then the artifacts other roles produced for it, then the PRD.
+            context = pack([
+                Artifact(f"Story {story.id}", story_text, 0),
+                Artifact("Architecture (ADR)", _read(f"docs/architecture/ADR-story-{story.id}.md"), 1),
+                Artifact("UX Spec", _read(f"docs/ux/story-{story.id}.md"), 2),
+                Artifact("PRD", _read("docs/PRD.md"), 3),
+            ], budget - count_tokens(ask, model), model)
+            yield "\n## Model Notes\n\n"
+            yield from self.llm.stream(f"{context.text}\n\n{ask}", task="planning", system=system)
+            yield "\n"
 
     def _render(self, story_id: int, title: str, ac: list[str]) -> str:
         ac_lines = "\n".join([f"- {a}" for a in ac]) or "- TBD"
@@ -0,0 +1,533 @@
+from __future__ import annotations
+
+import ast
+import json
+import re
+from fnmatch import fnmatch
+from functools import partial
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .parallel import map_chunked
+
+ENGINE_VERSION = "a2dev-rules 1"
+
+# Metavariables ($X) and `...` are rewritten into identifiers Python can parse.
+_MV = re.compile(r"\$([A-Z_][A-Z0-9_]*)")
+_MV_PREFIX = "__a2mv_"
+_DOTS = "__a2dots__"
+_IGNORED_FIELDS = {"ctx", "type_comment", "kind"}
+_PY_LANGS = {"python", "py", "python3"}
+_SUPPORTED_KEYS = {
+    "pattern", "pattern-either", "patterns", "pattern-regex", "pattern-not", "pattern-not-regex",
+    "pattern-inside", "pattern-not-inside", "metavariable-regex",
+}
+# Semgrep language names -> inventory language keys (for regex-only rules).
+_LANG_ALIASES = {"js": "javascript", "ts": "typescript", "golang": "go", "sh": "shell", "bash": "shell", "py": "python"}
+
+
+class RuleError(ValueError):
+    pass
+
+
+# --- YAML -----------------------------------------------------------------
+
+def _strip_comment(line: str) -> str:
+    quote = None
+    for i, ch in enumerate(line):
+        if quote:
+            if ch == quote:
+                quote = None
+        elif ch in "'\"":
+            quote = ch
+        elif ch == "#" and (i == 0 or line[i - 1] in " \t"):
+            return line[:i].rstrip()
+    return line.rstrip()
+
+
+def _split_flow(body: str) -> List[str]:
+    parts, depth, cur, quote = [], 0, [], None
+    for ch in body:
+        if quote:
+            quote = None if ch == quote else quote
+        elif ch in "'\"":
+            quote = ch
+        elif ch in "[{(":
+            depth += 1
+        elif ch in "]})":
+            depth -= 1
+        elif ch == "," and depth == 0:
+            parts.append("".join(cur).strip())
+            cur = []
+            continue
+        cur.append(ch)
+    if "".join(cur).strip():
+        parts.append("".join(cur).strip())
+    return parts
+
+
+def _scalar(text: str) -> Any:
+    t = text.strip()
+    if t.startswith("[") and t.endswith("]"):
+        return [_scalar(p) for p in _split_flow(t[1:-1])]
+    if t.startswith('"') and t.endswith('"') and len(t) >= 2:
+        return json.loads(t)
+    if t.startswith("'") and t.endswith("'") and len(t) >= 2:
+        return t[1:-1].replace("''", "'")
+    low = t.lower()
+    if low in ("true", "false"):
+        return low == "true"
+    if low in ("null", "~", ""):
+        return None
+    if re.fullmatch(r"-?\d+", t):
+        return int(t)
+    return t
+
+
+def _key_value(text: str) -> Optional[Tuple[str, str]]:
+    m = re.match(r"""(?:"([^"]*)"|'([^']*)'|([^\s:'"][^:]*?))\s*:(?:\s+(.*)|$)""", text)
+    if not m:
+        return None
+    key = next(g for g in m.groups()[:3] if g is not None)
+    return key, (m.group(4) or "")
+
+
+def _block_scalar(lines: List[Tuple[int, str, str]], i: int, indent: int, folded: bool) -> Tuple[str, int]:
+    body: List[str] = []
+    base = None
+    while i < len(lines) and lines[i][0] > indent:
+        raw = lines[i][2]
+        if base is None:
+            base = len(raw) - len(raw.lstrip())
+        body.append(raw[base:].rstrip())
+        i += 1
+    return (" " if folded else "\n").join(body) + "\n", i
+
+
+def _parse_block(lines: List[Tuple[int, str, str]], i: int, indent: int) -> Tuple[Any, int]:
+    if lines[i][1].startswith("- ") or lines[i][1] == "-":
+        out: List[Any] = []
+        while i < len(lines) and lines[i][0] == indent and (lines[i][1].startswith("- ") or lines[i][1] == "-"):
+            rest = lines[i][1][1:].strip()
+            if not rest:
+                value, i = _parse_block(lines, i + 1, lines[i + 1][0]) if i + 1 < len(lines) and lines[i + 1][0] > indent else (None, i + 1)
+            elif _key_value(rest) and not rest.startswith(("[", '"', "'")):
+                # "- key: value" opens a mapping indented past the dash.
+                inner = indent + (len(lines[i][1]) - len(rest))
+                lines[i] = (inner, rest, " " * inner + rest)
+                value, i = _parse_block(lines, i, inner)
+            else:
+                value, i = _scalar(rest), i + 1
+            out.append(value)
+        return out, i
+    obj: Dict[str, Any] = {}
+    while i < len(lines) and lines[i][0] == indent:
+        kv = _key_value(lines[i][1])
+        if kv is None:
+            raise RuleError(f"cannot parse YAML line: {lines[i][2]!r}")
+        key, rest = kv
+        i += 1
+        if rest in ("|", "|-", ">", ">-"):
+            obj[key], i = _block_scalar(lines, i, indent, folded=rest.startswith(">"))
+            if rest.endswith("-"):
+                obj[key] = obj[key].rstrip("\n")
+        elif rest:
+            obj[key] = _scalar(rest)
+        elif i < len(lines) and (lines[i][0] > indent or (lines[i][0] == indent and lines[i][1].startswith("-"))):
+            obj[key], i = _parse_block(lines, i, lines[i][0])
+        else:
+            obj[key] = None
+    return obj, i
+
+
+def parse_yaml_subset(text: str) -> Any:
+    """Parse the YAML subset used by Semgrep rule files (block maps/lists, flow lists, scalars).
+
+    Used when PyYAML is not installed. Anchors, multi-document streams and blank
+    lines inside block scalars are not supported.
+    """
+    lines: List[Tuple[int, str, str]] = []
+    for raw in text.splitlines():
+        clean = _strip_comment(raw)
+        if clean.strip() and clean not in ("---", "..."):  # document markers sit in column 0
+            lines.append((len(clean) - len(clean.lstrip()), clean.strip(), raw))
+    if not lines:
+        return None
+    value, _ = _parse_block(lines, 0, lines[0][0])
+    return value
+
+
+def load_rules(path: str | Path) -> List[Dict[str, Any]]:
+    text = Path(path).read_text()
+    try:
+        import yaml  # type: ignore
+
+        data = yaml.safe_load(text)
+    except ImportError:
+        data = parse_yaml_subset(text)
+    rules = (data or {}).get("rules", []) if isinstance(data, dict) else []
+    return [r for r in rules if isinstance(r, dict) and r.get("id")]
+
+
+# --- Pattern matching -----------------------------------------------------
+
+def compile_python_pattern(src: str) -> ast.AST:
+    text = _MV.sub(lambda m: _MV_PREFIX + m.group(1), src.strip())
+    for candidate in (text, text.replace("...", "*" + _DOTS)):
+        for mode in ("eval", "exec"):
+            try:
+                tree = ast.parse(candidate, mode=mode)
+            except SyntaxError:
+                continue
+            if mode == "eval":
+                return tree.body  # type: ignore[attr-defined]
+            body = tree.body  # type: ignore[attr-defined]
+            if len(body) != 1:
+                raise RuleError(f"multi-statement patterns are not supported: {src!r}")
+            node = body[0]
+            return node.value if isinstance(node, ast.Expr) else node
+    raise RuleError(f"cannot parse pattern: {src!r}")
+
+
+def _is_dots(n: Any) -> bool:
+    if isinstance(n, ast.Expr):
+        n = n.value
+    if isinstance(n, ast.Constant) and n.value is Ellipsis:
+        return True
+    return isinstance(n, ast.Starred) and isinstance(n.value, ast.Name) and n.value.id == _DOTS
+
+
+def _mv_name(n: Any) -> Optional[str]:
+    if isinstance(n, ast.Expr):
+        n = n.value
+    if isinstance(n, ast.Name) and n.id.startswith(_MV_PREFIX):
+        return n.id[len(_MV_PREFIX):]
+    return None
+
+
+Env = Dict[str, Tuple[str, str]]  # metavariable -> (structural key, source text)
+
+
+class _Matcher:
+    def __init__(self, source: str):
+        self.source = source
+
+    def _bind(self, env: Env, name: str, key: str, text: str) -> Optional[Env]:
+        if name in env:
+            return env if env[name][0] == key else None
+        return {**env, name: (key, text)}
+
+    def match(self, p: Any, t: Any, env: Env) -> Optional[Env]:
+        name = _mv_name(p)
+        if name is not None:
+            if isinstance(t, ast.Expr):
+                t = t.value
+            if not isinstance(t, ast.expr):
+                return None
+            return self._bind(env, name, ast.dump(t), ast.get_source_segment(self.source, t) or "")
+        if _is_dots(p):
+            return env
+        if type(p) is not type(t):
+            return None
+        if isinstance(p, ast.Call):
+            return self._match_call(p, t, env)
+        for field, pv in ast.iter_fields(p):
+            if field in _IGNORED_FIELDS:
+                continue
+            env = self._match_value(pv, getattr(t, field, None), env)
+            if env is None:
+                return None
+        return env
+
+    def _match_value(self, pv: Any, tv: Any, env: Env) -> Optional[Env]:
+        if isinstance(pv, list):
+            return self._match_list(pv, tv if isinstance(tv, list) else [], env)
+        if isinstance(pv, ast.AST):
+            return self.match(pv, tv, env) if isinstance(tv, ast.AST) else None
+        if isinstance(pv, str) and pv.startswith(_MV_PREFIX) and isinstance(tv, str):
+            return self._bind(env, pv[len(_MV_PREFIX):], tv, tv)  # e.g. the attribute in `mod.$FUNC`
+        return env if pv == tv else None
+
+    def _match_list(self, ps: List[Any], ts: List[Any], env: Env) -> Optional[Env]:
+        if not ps:
+            return env if not ts else None
+        if _is_dots(ps[0]):
+            for k in range(len(ts) + 1):
+                found = self._match_list(ps[1:], ts[k:], env)
+                if found is not None:
+                    return found
+            return None
+        if not ts:
+            return None
+        head = self.match(ps[0], ts[0], env)
+        return self._match_list(ps[1:], ts[1:], head) if head is not None else None
+
+    def _match_call(self, p: ast.Call, t: ast.Call, env: Env) -> Optional[Env]:
+        found = self.match(p.func, t.func, env)
+        if found is None:
+            return None
+        found = self._match_list(p.args, t.args, found)
+        if found is None:
+            return None
+        # Keywords match by name in any order; `...` in the pattern allows extras.
+        open_ended = any(_is_dots(a) for a in p.args)
+        if not open_ended and len(p.keywords) != len(t.keywords):
+            return None
+        for pk in p.keywords:
+            candidates = [tk for tk in t.keywords if tk.arg == pk.arg]
+            if not candidates:
+                return None
+            found = self.match(pk.value, candidates[0].value, found)
+            if found is None:
+                return None
+        return found
+
+
+Match = Tuple[Tuple[int, int, int, int], Env]  # (start line, start col, end line, end col), env
+
+
+class _FileContext:
+    def __init__(self, source: str, tree: Optional[ast.AST]):
+        self.source = source
+        self.tree = tree
+        self.matcher = _Matcher(source)
+        self._nodes: Optional[List[ast.AST]] = None
+        self._line_starts: Optional[List[int]] = None
+
+    def nodes(self) -> List[ast.AST]:
+        if self._nodes is None:
+            self._nodes = [n for n in ast.walk(self.tree) if hasattr(n, "lineno")] if self.tree else []
+        return self._nodes
+
+    def find(self, pattern: ast.AST) -> List[Match]:
+        out: List[Match] = []
+        any_expr = _mv_name(pattern) is not None or _is_dots(pattern)
+        for n in self.nodes():
+            if not (isinstance(n, ast.expr) if any_expr else type(n) is type(pattern)):
+                continue
+            env = self.matcher.match(pattern, n, {})
+            if env is not None:
+                out.append(((n.lineno, n.col_offset, n.end_lineno or n.lineno, n.end_col_offset or 0), env))
+        return out
+
+    def find_regex(self, regex: str) -> List[Match]:
+        if self._line_starts is None:
+            self._line_starts = [0] + [m.end() for m in re.finditer("\n", self.source)]
+        starts = self._line_starts
+
+        def pos(off: int) -> Tuple[int, int]:
+            lo, hi = 0, len(starts) - 1
+            while lo < hi:
+                mid = (lo + hi + 1) // 2
+                if starts[mid] <= off:
+                    lo = mid
+                else:
+                    hi = mid - 1
+            return lo + 1, off - starts[lo]
+
+        return [((*pos(m.start()), *pos(m.end())), {}) for m in re.finditer(regex, self.source, re.M)]
+
+
+def _contains(outer: Tuple[int, int, int, int], inner: Tuple[int, int, int, int]) -> bool:
+    return outer[:2] <= inner[:2] and inner[2:] <= outer[2:]
+
+
+def _evaluate(formula: Dict[str, Any], ctx: _FileContext, compiled: Dict[str, ast.AST]) -> List[Match]:
+    if "pattern" in formula:
+        return ctx.find(compiled[formula["pattern"]])
+    if "pattern-regex" in formula:
+        return ctx.find_regex(formula["pattern-regex"])
+    if "pattern-either" in formula:
+        seen: Dict[Tuple[int, int, int, int], Match] = {}
+        for item in formula["pattern-either"]:
+            for m in _evaluate(item, ctx, compiled):
+                seen.setdefault(m[0], m)
+        return list(seen.values())
+    if "patterns" in formula:
+        return _conjunction(formula["patterns"], ctx, compiled)
+    return []
+
+
+def _conjunction(items: List[Dict[str, Any]], ctx: _FileContext, compiled: Dict[str, ast.AST]) -> List[Match]:
+    positives = [i for i in items if {"pattern", "pattern-either", "patterns", "pattern-regex"} & set(i)]
+    if not positives:
+        return []
+    matches = _evaluate(positives[0], ctx, compiled)
+    for item in positives[1:]:
+        other = _evaluate(item, ctx, compiled)
+        merged: List[Match] = []
+        for rng, env in matches:
+            for orng, oenv in other:
+                if orng == rng and all(env[k][0] == v[0] for k, v in oenv.items() if k in env):
+                    merged.append((rng, {**oenv, **env}))
+                    break
+        matches = merged
+    for item in items:
+        if not matches:
+            break
+        if "pattern-inside" in item:
+            outer = ctx.find(compiled[item["pattern-inside"]])
+            matches = [m for m in matches if any(_contains(o[0], m[0]) for o in outer)]
+        elif "pattern-not-inside" in item:
+            outer = ctx.find(compiled[item["pattern-not-inside"]])
+            matches = [m for m in matches if not any(_contains(o[0], m[0]) for o in outer)]
+        elif "pattern-not" in item:
+            excluded = {r for r, _ in ctx.find(compiled[item["pattern-not"]])}
+            matches = [m for m in matches if m[0] not in excluded]
+        elif "pattern-not-regex" in item:
+            hits = ctx.find_regex(item["pattern-not-regex"])
+            matches = [m for m in matches if not any(_contains(h[0], m[0]) or _contains(m[0], h[0]) for h in hits)]
+        elif "metavariable-regex" in item:
+            spec = item["metavariable-regex"] or {}
+            name = str(spec.get("metavariable", "")).lstrip("$")
+            rx = re.compile(str(spec.get("regex", "")))
+            matches = [m for m in matches if name in m[1] and rx.match(m[1][name][1])]
+    return matches
+
+
+def _pattern_strings(formula: Any) -> List[str]:
+    """Every Python pattern string in a rule formula (for compilation up front)."""
+    out: List[str] = []
+    if isinstance(formula, dict):
+        for key, value in formula.items():
+            if key in ("pattern", "pattern-not", "pattern-inside", "pattern-not-inside") and isinstance(value, str):
+                out.append(value)
+            elif key in ("pattern-either", "patterns") and isinstance(value, list):
+                for item in value:
+                    out.extend(_pattern_strings(item))
+    return out
+
+
+def _unsupported(formula: Any) -> List[str]:
+    bad: List[str] = []
+    if isinstance(formula, dict):
+        for key, value in formula.items():
+            if key not in _SUPPORTED_KEYS:
+                bad.append(key)
+            elif key in ("pattern-either", "patterns"):
+                for item in value or []:
+                    bad.extend(_unsupported(item))
+    return bad
+
+
+class CompiledRule:
+    def __init__(self, rule: Dict[str, Any]):
+        self.id = str(rule["id"])
+        self.message = str(rule.get("message", "")).strip()
+        self.severity = str(rule.get("severity", "WARNING")).upper()
+        self.metadata = rule.get("metadata") or {}
+        langs = {str(x).lower() for x in rule.get("languages") or []}
+        self.langs = {_LANG_ALIASES.get(x, x) for x in langs}
+        self.formula = {k: v for k, v in rule.items() if k in _SUPPORTED_KEYS or k.startswith("pattern")}
+        paths = rule.get("paths") or {}
+        self.include = list(paths.get("include") or [])
+        self.exclude = list(paths.get("exclude") or [])
+        bad = _unsupported(self.formula)
+        if bad:
+            raise RuleError(f"unsupported rule keys: {', '.join(sorted(set(bad)))}")
+        self.python = bool(self.langs & _PY_LANGS)
+        self.compiled: Dict[str, ast.AST] = {}
+        if self.python:
+            for p in _pattern_strings(self.formula):
+                self.compiled[p] = compile_python_pattern(p)
+        elif _pattern_strings(self.formula):
+            raise RuleError(f"structural patterns are only supported for Python (languages: {sorted(langs)})")
+
+    def applies_to(self, rel: str, lang: Optional[str]) -> bool:
+        if self.include and not any(fnmatch(rel, g) or fnmatch(Path(rel).name, g) for g in self.include):
+            return False
+        if any(fnmatch(rel, g) or fnmatch(Path(rel).name, g) for g in self.exclude):
+            return False
+        return (lang in self.langs) or ("generic" in self.langs) or ("regex" in self.langs)
+
+    def message_for(self, env: Env) -> str:
+        return _MV.sub(lambda m: env[m.group(1)][1] if m.group(1) in env else m.group(0), self.message)
+
+
+def compile_rules(rules: List[Dict[str, Any]]) -> Tuple[List[CompiledRule], List[Dict[str, Any]]]:
+    compiled: List[CompiledRule] = []
+    errors: List[Dict[str, Any]] = []
+    for r in rules:
+        try:
+            compiled.append(CompiledRule(r))
+        except (RuleError, SyntaxError) as e:
+            errors.append({"type": "RuleError", "rule_id": r.get("id"), "message": str(e), "level": "warn"})
+    return compiled, errors
+
+
+def scan_source(source: str, path: str, rules: List[CompiledRule], lang: Optional[str] = None) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Run compiled rules over one file's text; returns (semgrep-style results, errors)."""
+    if lang is None:
+        from .inventory import _lang_for
+
+        lang = _lang_for(path)
+    active = [r for r in rules if r.applies_to(path, lang)]
+    if not active:
+        return [], []
+    tree = None
+    errors: List[Dict[str, Any]] = []
+    if lang == "python" and any(r.python for r in active):
+        try:
+            tree = ast.parse(source)
+        except (SyntaxError, ValueError) as e:
+            errors.append({"type": "ParseError", "path": path, "message": str(e), "level": "warn"})
+    ctx = _FileContext(source, tree)
+    lines = source.splitlines()
+    results: List[Dict[str, Any]] = []
+    for rule in active:
+        if rule.python and tree is None:
+            continue
+        for (sl, sc, el, ec), env in sorted(_evaluate(rule.formula, ctx, rule.compiled), key=lambda m: m[0]):
+            results.append({
+                "check_id": rule.id,
+                "path": path,
+                "start": {"line": sl, "col": sc + 1},
+                "end": {"line": el, "col": ec + 1},
+                "extra": {
+                    "message": rule.message_for(env),
+                    "severity": rule.severity,
+                    "metadata": rule.metadata,
+                    "metavars": {f"${k}": {"abstract_content": v[1]} for k, v in env.items()},
+                    "lines": "\n".join(lines[sl - 1:el]),
+                    "engine": "a2dev",
+                },
+            })
+    return results, errors
+
+
+def _scan_chunk(rules: List[Dict[str, Any]], items: List[Tuple[str, str, str]]) -> List[Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]]:
+    compiled, _ = compile_rules(rules)
+    out = []
+    for abs_path, rel, lang in items:
+        try:
+            source = Path(abs_path).read_text(encoding="utf-8", errors="replace")
+        except OSError as e:
+            out.append(([], [{"type": "ReadError", "path": rel, "message": str(e), "level": "warn"}]))
+            continue
+        out.append(scan_source(source, rel, compiled, lang))
+    return out
+
+
+def scan(root: str | Path = ".", config: str | Path = ".a2dev/semgrep/rules.yml", workers: Optional[int] = None) -> Dict[str, Any]:
+    """Run a Semgrep rule file with the built-in engine; output mirrors `semgrep --json`."""
+    from .inventory import iter_source_files
+
+    rules = load_rules(config)
+    compiled, errors = compile_rules(rules)
+    ok_ids = {c.id for c in compiled}
+    usable = [r for r in rules if str(r["id"]) in ok_ids]
+    langs = set().union(*(c.langs for c in compiled)) if compiled else set()
+    root_path = Path(root)
+    files = [(str(root_path / rel), rel, lang) for rel, lang in iter_source_files(str(root_path))
+             if lang in langs or {"generic", "regex"} & langs]
+    results: List[Dict[str, Any]] = []
+    for res, errs in map_chunked(partial(_scan_chunk, usable), files, workers=workers):
+        results.extend(res)
+        errors.extend(errs)
+    results.sort(key=lambda r: (r["path"], r["start"]["line"], r["check_id"]))
+    return {
+        "version": ENGINE_VERSION,
+        "results": results,
+        "errors": errors,
+        "paths": {"scanned": [f[1] for f in files]},
+    }
@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple
+
+from .cache import CACHE_DIR, cache_dir, file_digest, tool_version, tree_fingerprint
+
+DB_NAME = "runcache.sqlite3"
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    tool TEXT NOT NULL,
+    argv TEXT NOT NULL,
+    code INTEGER NOT NULL,
+    payload BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_results_lru ON results (last_used);
+CREATE INDEX IF NOT EXISTS idx_results_tool ON results (tool);
+"""
+
+
+def enabled() -> bool:
+    return os.getenv("A2DEV_RUN_CACHE", "1").lower() not in ("0", "false", "no", "off")
+
+
+def max_bytes() -> int:
+    try:
+        return int(float(os.getenv("A2DEV_RUN_CACHE_MB", "")) * 1024 * 1024)
+    except ValueError:
+        return DEFAULT_MAX_BYTES
+
+
+def env_for(tool: str) -> Dict[str, str]:
+    """Environment variables that can change a tool's output: its own `TOOL_*` settings."""
+    prefix = os.path.basename(tool).upper().replace("-", "_") + "_"
+    return {k: v for k, v in sorted(os.environ.items()) if k.startswith(prefix)}
+
+
+def run_key(cmd: Sequence[str], tree: str, version: Optional[str],
+            inputs: Iterable[str | Path] = (), env: Optional[Dict[str, str]] = None) -> str:
+    """Cache key for one invocation: argv, tool version, tree fingerprint, input digests, env."""
+    parts = {
+        "argv": list(cmd),
+        "version": version,
+        "tree": tree,
+        "inputs": {str(p): file_digest(p) for p in inputs},
+        "env": env if env is not None else env_for(cmd[0]),
+    }
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode()).hexdigest()
+
+
+class RunCache:
+    """Size-bounded LRU store of external tool results (exit code, stdout, stderr).
+
+    Entries are keyed by `run_key`, so a changed tree, tool upgrade or relevant env
+    var simply misses; `invalidate` drops entries explicitly. Payloads are
+    zlib-compressed and the least recently used rows are evicted past `limit` bytes.
+    """
+
+    def __init__(self, root: str | Path = ".", limit: Optional[int] = None):
+        self.root = Path(root)
+        self.path = self.root / CACHE_DIR / DB_NAME
+        self.limit = max_bytes() if limit is None else limit
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def __enter__(self) -> "RunCache":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            cache_dir(self.root)
+            self._conn = sqlite3.connect(str(self.path), timeout=10)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+        return self._conn
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def get(self, key: str) -> Optional[Tuple[int, str, str]]:
+        row = self.conn.execute("SELECT code, payload FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        with self.conn:
+            self.conn.execute("UPDATE results SET last_used = ?, hits = hits + 1 WHERE key = ?", (time.time(), key))
+        out, err = json.loads(zlib.decompress(row[1]))
+        return int(row[0]), out, err
+
+    def put(self, key: str, cmd: Sequence[str], result: Tuple[int, str, str]) -> None:
+        code, out, err = result
+        payload = zlib.compress(json.dumps([out, err]).encode(), 6)
+        if len(payload) > self.limit:
+            return
+        now = time.time()
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO results (key, tool, argv, code, payload, size, created_at, last_used)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, os.path.basename(cmd[0]), json.dumps(list(cmd)), code, payload, len(payload), now, now),
+            )
+        self.evict()
+
+    def evict(self) -> int:
+        """Drop least recently used entries until the store fits within `limit`."""
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self.limit:
+            return 0
+        dropped = 0
+        with self.conn:
+            for key, size in self.conn.execute("SELECT key, size FROM results ORDER BY last_used").fetchall():
+                if total <= self.limit:
+                    break
+                self.conn.execute("DELETE FROM results WHERE key = ?", (key,))
+                total -= size
+                dropped += 1
+        return dropped
+
+    def invalidate(self, tool: Optional[str] = None) -> int:
+        """Remove cached results for one tool (or all); returns the number removed."""
+        with self.conn:
+            if tool:
+                return self.conn.execute("DELETE FROM results WHERE tool = ?", (tool,)).rowcount
+            return self.conn.execute("DELETE FROM results").rowcount
+
+    def stats(self) -> Dict[str, Any]:
+        tools = {
+            tool: {"entries": n, "bytes": size, "hits": hits}
+            for tool, n, size, hits in self.conn.execute(
+                "SELECT tool, COUNT(*), SUM(size), SUM(hits) FROM results GROUP BY tool ORDER BY tool")
+        }
+        return {
+            "path": str(self.path),
+            "entries": sum(t["entries"] for t in tools.values()),
+            "bytes": sum(t["bytes"] for t in tools.values()),
+            "limit": self.limit,
+            "tools": tools,
+        }
+
+
+def cached_run(run: Any, cmd: Sequence[str], cwd: Optional[str] = None, timeout: int = 120,
+               tree_root: str | Path = ".", inputs: Iterable[str | Path] = (),
+               ok_codes: Sequence[int] = (0,), ignored: bool = False) -> Tuple[int, str, str]:
+    """Call `run(cmd, cwd, timeout)` through the result cache.
+
+    `tree_root` is the directory whose content the tool reads; `inputs` are extra
+    files (configs outside the tree) folded into the key. Set `ignored` for tools
+    that also read git-ignored files. Only exit codes in `ok_codes` are stored, so
+    failures and timeouts are retried next time.
+    """
+    if not enabled():
+        return run(list(cmd), cwd=cwd, timeout=timeout)
+    store = RunCache(tree_root)
+    try:
+        try:
+            key = run_key(cmd, tree_fingerprint(tree_root, ignored=ignored), tool_version(os.path.basename(cmd[0]), tree_root), inputs)
+            hit = store.get(key)
+        except (sqlite3.Error, OSError, zlib.error, ValueError):
+            return run(list(cmd), cwd=cwd, timeout=timeout)
+        if hit is not None:
+            return hit
+        result = run(list(cmd), cwd=cwd, timeout=timeout)
+        if result[0] in ok_codes:
+            try:
+                store.put(key, cmd, result)
+            except sqlite3.Error:
+                pass  # a locked/readonly cache must not fail the scan
+        return result
+    finally:
+        store.close()
+
+
+def invalidate(root: str | Path = ".", *tools: str) -> int:
+    """Explicit invalidation hook: drop cached results for `tools` (all when none given)."""
+    try:
+        with RunCache(root) as store:
+            return sum(store.invalidate(t) for t in tools) if tools else store.invalidate()
+    except sqlite3.Error:
+        return 0
@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import math
+import mmap
+import os
+import re
+from collections import Counter
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .parallel import map_chunked
+
+ENGINE_VERSION = "a2dev-secrets 1"
+MAX_FILE_BYTES = 8 * 1024 * 1024
+SAMPLE_BYTES = 8192
+ALLOW_MARKER = b"gitleaks:allow"
+REDACTED = "REDACTED"
+
+# Files that legitimately hold long random-looking strings (hashes, integrity fields).
+ALLOW_PATHS = (
+    "*.lock", "package-lock.json", "pnpm-lock.yaml", "go.sum", "*.min.js", "*.map", "*.svg",
+)
+# Placeholder values that the generic rules would otherwise flag.
+_STOPWORDS = (b"example", b"changeme", b"placeholder", b"dummy", b"sample", b"your_", b"your-", b"xxxx", b"<", b"${")
+
+
+class SecretRule:
+    __slots__ = ("id", "description", "regex", "group", "keywords", "min_entropy")
+
+    def __init__(self, id: str, description: str, regex: bytes, keywords: Sequence[str] = (),
+                 group: int = 0, min_entropy: float = 0.0):
+        self.id = id
+        self.description = description
+        self.regex = re.compile(regex)
+        self.group = group
+        self.keywords = frozenset(k.lower().encode() for k in keywords)
+        self.min_entropy = min_entropy
+
+
+# Rule ids follow gitleaks' default config where one exists.
+RULES: List[SecretRule] = [
+    SecretRule("aws-access-token", "AWS access key id",
+               rb"\b((?:A3T[A-Z0-9]|AKIA|ASIA|ABIA|ACCA)[A-Z2-7]{16})\b", ["akia", "asia", "abia", "acca", "a3t"], 1),
+    SecretRule("github-pat", "GitHub personal access token", rb"\bghp_[0-9a-zA-Z]{36}\b", ["ghp_"]),
+    SecretRule("github-fine-grained-pat", "GitHub fine-grained token", rb"\bgithub_pat_\w{82}\b", ["github_pat_"]),
+    SecretRule("github-oauth", "GitHub OAuth/app token", rb"\bgh[ousr]_[0-9a-zA-Z]{36}\b", ["gho_", "ghu_", "ghs_", "ghr_"]),
+    SecretRule("gitlab-pat", "GitLab personal access token", rb"\bglpat-[0-9a-zA-Z_\-]{20}\b", ["glpat-"]),
+    SecretRule("slack-token", "Slack token", rb"\bxox[baprs]-[0-9a-zA-Z-]{10,72}", ["xoxb-", "xoxa-", "xoxp-", "xoxr-", "xoxs-"]),
+    SecretRule("slack-webhook-url", "Slack webhook",
+               rb"https://hooks\.slack\.com/(?:services|workflows)/[A-Za-z0-9+/]{43,56}", ["hooks.slack.com"]),
+    SecretRule("stripe-access-token", "Stripe secret key", rb"\b(?:sk|rk)_(?:test|live|prod)_[0-9a-zA-Z]{10,99}\b",
+               ["sk_test_", "sk_live_", "sk_prod_", "rk_test_", "rk_live_", "rk_prod_"]),
+    SecretRule("gcp-api-key", "Google API key", rb"\bAIza[0-9A-Za-z\-_]{35}\b", ["aiza"]),
+    SecretRule("openai-api-key", "OpenAI API key",
+               rb"\bsk-(?:proj-|svcacct-|admin-)?[A-Za-z0-9_-]{20,}T3BlbkFJ[A-Za-z0-9_-]{20,}\b", ["t3blbkfj"]),
+    SecretRule("anthropic-api-key", "Anthropic API key", rb"\bsk-ant-(?:api03|admin01)-[A-Za-z0-9_\-]{80,120}", ["sk-ant-"]),
+    SecretRule("npm-access-token", "npm access token", rb"\bnpm_[A-Za-z0-9]{36}\b", ["npm_"]),
+    SecretRule("private-key", "Private key", rb"-----BEGIN[ A-Z0-9_-]{0,100}PRIVATE KEY(?: BLOCK)?-----", ["-----begin"]),
+    SecretRule("jwt", "JSON Web Token",
+               rb"\beyJ[A-Za-z0-9_-]{10,}\.eyJ[A-Za-z0-9_-]{10,}\.[A-Za-z0-9_-]{10,}", ["eyj"], min_entropy=3.0),
+    SecretRule("generic-api-key", "Generic secret assignment",
+               rb"(?i)(?:key|api|token|secret|passw(?:or)?d|pwd|auth|credential)s?[\w.\-]{0,20}['\"]?[ \t]*(?::|=>|:=|=)[ \t]*"
+               rb"['\"]?([A-Za-z0-9/+_=\-.]{16,128})['\"]?",
+               ["key", "api", "token", "secret", "passw", "pwd", "auth", "credential"], 1, min_entropy=3.5),
+    SecretRule("high-entropy-string", "High-entropy string literal",
+               rb"['\"]([A-Za-z0-9+/_\-]{32,}={0,2})['\"]", group=1, min_entropy=4.5),
+]
+
+_DOTTED_NAME = re.compile(rb"[A-Za-z_]\w*(?:\.[A-Za-z_]\w*)+")
+_KEYWORD_RX = re.compile(
+    b"(?i)(" + b"|".join(re.escape(k) for k in sorted({k for r in RULES for k in r.keywords}, key=len, reverse=True)) + b")"
+)
+
+
+def shannon_entropy(data: bytes) -> float:
+    if not data:
+        return 0.0
+    n = len(data)
+    return -sum(c / n * math.log2(c / n) for c in Counter(data).values())
+
+
+def is_binary(sample: bytes) -> bool:
+    """NUL bytes or a high share of control characters in the sample mean binary."""
+    if not sample:
+        return False
+    if b"\x00" in sample:
+        return True
+    text = bytes(range(32, 127)) + b"\n\r\t\f\b"
+    nontext = sample.translate(None, text)
+    # Allow UTF-8 multibyte text: only count bytes below 0x80 that are not printable.
+    control = sum(1 for b in nontext if b < 0x80)
+    return control / len(sample) > 0.1
+
+
+def _redact(line: str, secret: str) -> str:
+    return line.replace(secret, REDACTED) if secret else line
+
+
+def scan_buffer(buf: Any, path: str) -> List[Dict[str, Any]]:
+    """Findings for one in-memory or mmap'd buffer (gitleaks JSON shape, secrets redacted)."""
+    hits = {m.group().lower() for m in _KEYWORD_RX.finditer(buf)}
+    findings: List[Dict[str, Any]] = []
+    seen: set = set()
+    for rule in RULES:
+        if rule.keywords and not rule.keywords & hits:
+            continue
+        for m in rule.regex.finditer(buf):
+            secret = m.group(rule.group)
+            start, end = m.span(rule.group)
+            if rule.min_entropy:
+                if shannon_entropy(secret) < rule.min_entropy:
+                    continue
+                if rule.id.startswith(("generic", "high-entropy")) and any(w in secret.lower() for w in _STOPWORDS):
+                    continue
+                # Code, not a literal: `token = self.read_token()`, `key = settings.API_KEY`.
+                if rule.id == "generic-api-key" and (buf[end:end + 1] == b"(" or _DOTTED_NAME.fullmatch(secret)):
+                    continue
+            line_start = buf.rfind(b"\n", 0, start) + 1
+            line_end = buf.find(b"\n", end)
+            line_end = len(buf) if line_end == -1 else line_end
+            line = bytes(buf[line_start:line_end])
+            if ALLOW_MARKER in line:
+                continue
+            line_no = buf.count(b"\n", 0, start) + 1 if isinstance(buf, bytes) else buf[:start].count(b"\n") + 1
+            key = (line_no, start, end)
+            if key in seen:
+                continue  # a specific rule already reported this span
+            seen.add(key)
+            secret_s = secret.decode("utf-8", "replace")
+            findings.append({
+                "Description": rule.description,
+                "StartLine": line_no,
+                "EndLine": line_no + secret.count(b"\n"),
+                "StartColumn": start - line_start + 1,
+                "EndColumn": end - line_start,
+                "Match": _redact(line.decode("utf-8", "replace").strip(), secret_s)[:200],
+                "Secret": REDACTED,
+                "File": path,
+                "SymlinkFile": "",
+                "Commit": "",
+                "Entropy": round(shannon_entropy(secret), 4),
+                "Author": "",
+                "Email": "",
+                "Date": "",
+                "Message": "",
+                "Tags": ["a2dev"],
+                "RuleID": rule.id,
+                "Fingerprint": f"{path}:{rule.id}:{line_no}",
+            })
+    return findings
+
+
+def scan_file(abs_path: str, rel: str) -> List[Dict[str, Any]]:
+    try:
+        with open(abs_path, "rb") as fh:
+            size = os.fstat(fh.fileno()).st_size
+            if size == 0 or size > MAX_FILE_BYTES or is_binary(fh.read(SAMPLE_BYTES)):
+                return []
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return scan_buffer(mm, rel)
+    except (OSError, ValueError):
+        return []
+
+
+def _scan_chunk(items: List[Tuple[str, str]]) -> List[List[Dict[str, Any]]]:
+    return [scan_file(abs_path, rel) for abs_path, rel in items]
+
+
+def _allowed_path(rel: str) -> bool:
+    name = os.path.basename(rel)
+    return any(fnmatch(name, pat) for pat in ALLOW_PATHS)
+
+
+def iter_scan_targets(root: str | Path) -> List[str]:
+    from .inventory import walk_tree
+
+    out: List[str] = []
+    for dirpath, dirnames, filenames in walk_tree(root):
+        for f in filenames:
+            rel = os.path.relpath(os.path.join(dirpath, f), root)
+            if not _allowed_path(rel):
+                out.append(rel)
+    return out
+
+
+def scan(root: str | Path = ".", files: Optional[Sequence[str]] = None, workers: Optional[int] = None) -> Dict[str, Any]:
+    """Scan a tree (or the given relative paths) for secrets; mirrors GitleaksAdapter.scan output."""
+    root_path = Path(root)
+    targets = [f for f in files if not _allowed_path(f)] if files is not None else iter_scan_targets(root_path)
+    items = [(str(root_path / rel), rel) for rel in targets]
+    findings: List[Dict[str, Any]] = []
+    for part in map_chunked(_scan_chunk, items, workers=workers):
+        findings.extend(part)
+    findings.sort(key=lambda f: (f["File"], f["StartLine"], f["RuleID"]))
+    return {"status": "ok", "engine": ENGINE_VERSION, "findings": findings}
@@ -1,10 +1,88 @@
 import json
+import os
+import stat
+import tempfile
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
 
 from .schema import Backlog, State, UXDoc
 
 
+# While `deferred_writes()` is active (`a2dev batch`), backlog/state reads come from
+# memory and backlog/state/board writes are held, keyed by absolute path, until it exits.
+# A held write keeps the serialized text, so later in-place mutations do not leak into it.
+_HELD: Optional[Dict[str, Any]] = None
+_PENDING: Dict[str, Tuple[str, Callable[[str], object], Optional[Callable[[str], Any]]]] = {}
+
+
+@contextmanager
+def deferred_writes() -> Iterator[None]:
+    """Share backlog/state in memory across commands and write them once at the end."""
+    global _HELD
+    if _HELD is not None:
+        yield
+        return
+    _HELD = {}
+    try:
+        yield
+    finally:
+        pending = list(_PENDING.values())
+        _HELD = None
+        _PENDING.clear()
+        for text, write, _ in pending:
+            write(text)
+
+
+def defer_write(path: str | Path, text: str, write: Callable[[str], object], obj: Any = None,
+                parse: Optional[Callable[[str], Any]] = None) -> bool:
+    """Hold `write(text)` (the last one per path wins) when writes are deferred; False otherwise.
+
+    `obj`, when given, is what later reads of `path` return in the meantime; `parse`
+    rebuilds it from `text` (see `reload_held`).
+    """
+    if _HELD is None:
+        return False
+    key = os.path.abspath(path)
+    _PENDING.pop(key, None)  # re-insert so the flush follows the order of last writes
+    _PENDING[key] = (text, write, parse)
+    if obj is not None:
+        _HELD[key] = obj
+    return True
+
+
+def reload_held() -> None:
+    """Forget in-memory objects a failed command may have mutated without writing.
+
+    Objects with a held write are rebuilt from its text; the rest are re-read from disk.
+    """
+    if _HELD is None:
+        return
+    for key in list(_HELD):
+        text, _, parse = _PENDING.get(key, ("", None, None))
+        if parse is not None:
+            _HELD[key] = parse(text)
+        else:
+            del _HELD[key]
+
+
+def exists(path: str | Path) -> bool:
+    """Whether `path` exists, counting a held (not yet flushed) write in batch mode."""
+    return (_HELD is not None and os.path.abspath(path) in _PENDING) or Path(path).exists()
+
+
+def _held(path: str | Path, load: Callable[[], Any]) -> Any:
+    if _HELD is None:
+        return load()
+    key = os.path.abspath(path)
+    if key not in _HELD:
+        obj = load()
+        if obj is None:
+            return None  # absent files may be created behind our back; read again next time
+        _HELD[key] = obj
+    return _HELD[key]
+
+
 def ensure_dirs():
     Path(".a2dev").mkdir(parents=True, exist_ok=True)
     Path("docs").mkdir(parents=True, exist_ok=True)
@@ -12,18 +90,82 @@ def ensure_dirs():
     Path("features").mkdir(parents=True, exist_ok=True)
 
 
-def write_backlog(backlog: Backlog, path: str = "docs/backlog.json") -> None:
+_UMASK: Optional[int] = None
+
+
+def _file_mode(path: Path) -> int:
+    """Mode for a replacement file: the existing file's, else what open() would give (0o666 & ~umask)."""
+    global _UMASK
+    try:
+        return stat.S_IMODE(path.stat().st_mode)
+    except OSError:
+        pass
+    if _UMASK is None:
+        _UMASK = os.umask(0o022)  # reading the umask means setting it; put it straight back
+        os.umask(_UMASK)
+    return 0o666 & ~_UMASK
+
+
+def stream_to_file(path: str | Path, chunks: Iterable[str], echo: Optional[Callable[[str], object]] = None) -> str:
+    """Write text chunks to `path` as they arrive, then atomically rename into place.
+
+    Chunks go to a temp file in the same directory, so readers never see a partial
+    artifact and a failed generation leaves the previous version untouched. `echo`
+    receives each chunk too (e.g. to show progress on stdout).
+    """
+    p = Path(path)
+    if os.getenv("A2DEV_DRY_RUN") == "1":
+        for chunk in chunks:
+            if echo:
+                echo(chunk)
+        print(f"[DRY-RUN] Would write file: {p}")
+        return str(p)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=f".{p.name}.", suffix=".tmp", dir=str(p.parent))
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            for chunk in chunks:
+                fh.write(chunk)
+                if echo:
+                    echo(chunk)
+        os.chmod(tmp, _file_mode(p))
+        os.replace(tmp, p)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    return str(p)
+
+
+def write_text_atomic(path: str | Path, text: str) -> str:
+    return stream_to_file(path, [text])
+
+
+def _write_backlog_text(text: str, path: str) -> None:
     ensure_dirs()
-    Path(path).write_text(backlog.to_json())
+    Path(path).write_text(text)
 
 
-def read_backlog(path: str = "docs/backlog.json") -> Optional[Backlog]:
+def write_backlog(backlog: Backlog, path: str = "docs/backlog.json") -> None:
+    text = backlog.to_json()
+    if defer_write(path, text, lambda t: _write_backlog_text(t, path), backlog, Backlog.from_json):
+        return
+    _write_backlog_text(text, path)
+
+
+def _load_backlog(path: str) -> Optional[Backlog]:
     p = Path(path)
     if not p.exists():
         return None
     return Backlog.from_json(p.read_text())
 
 
+def read_backlog(path: str = "docs/backlog.json") -> Optional[Backlog]:
+    return _held(path, lambda: _load_backlog(path))
+
+
 def write_epics_md(backlog: Backlog, path: str = "docs/epics.md") -> None:
     lines = ["# Epics and Stories\n"]
     for epic in backlog.epics:
@@ -64,7 +206,7 @@ def write_ux_doc(doc: UXDoc, dir_path: str = "docs/ux") -> str:
     return str(p)
 
 
-def read_state(path: str = ".a2dev/state.json") -> State:
+def _load_state(path: str) -> State:
     p = Path(path)
     if not p.exists():
         s = State()
@@ -74,5 +216,12 @@ def read_state(path: str = ".a2dev/state.json") -> State:
     return State(**data)
 
 
+def read_state(path: str = ".a2dev/state.json") -> State:
+    return _held(path, lambda: _load_state(path))
+
+
 def write_state(state: State, path: str = ".a2dev/state.json") -> None:
-    Path(path).write_text(json.dumps(state.__dict__, indent=2))
+    text = json.dumps(state.__dict__, indent=2)
+    if defer_write(path, text, Path(path).write_text, state, lambda t: State(**json.loads(t))):
+        return
+    Path(path).write_text(text)
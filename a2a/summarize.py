@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+import hashlib
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+from .cache import read_json, write_json
+from .parallel import worker_count
+from .tokens import count_tokens
+
+if TYPE_CHECKING:
+    from .llm import LLMClient
+
+ENGINE_VERSION = "a2dev-summary 1"
+CACHE_NAME = "summaries.json"
+MAX_CACHE_ENTRIES = 2000
+CHUNK_TOKENS = 1500      # sections larger than this are split on paragraph boundaries
+SUMMARY_RATIO = 0.25     # per-chunk summary budget, as a share of the chunk
+MIN_SUMMARY_TOKENS = 40
+MAX_SUMMARY_TOKENS = 400
+REDUCE_GROUP_TOKENS = 3000
+MAX_LEVELS = 4
+
+_HEADING = re.compile(r"^(#{1,6})[ \t]+(.+?)[ \t#]*$", re.M)
+_SENTENCE = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9\"'(\[])")
+_WORD = re.compile(r"[a-z][a-z0-9'-]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be been but by can for from has have if in into is it its of on or so such that the their "
+    "then there these this to was were will with without we our you your they them not no should must may".split()
+)
+
+
+@dataclass
+class Chunk:
+    path: str   # heading breadcrumb, e.g. "Goals > KPIs"
+    text: str
+    tokens: int
+
+
+@dataclass
+class Summary:
+    text: str
+    chunks: int = 0
+    summarized: int = 0   # chunks/groups summarized in this run (the rest came from cache)
+    reused: int = 0
+    levels: int = 0
+    backend: str = "extractive"
+    sections: List[str] = field(default_factory=list)
+
+
+def _split_paragraphs(text: str, limit: int) -> List[str]:
+    parts: List[str] = []
+    buf: List[str] = []
+    size = 0
+    for para in re.split(r"\n\s*\n", text):
+        n = count_tokens(para)
+        if buf and size + n > limit:
+            parts.append("\n\n".join(buf))
+            buf, size = [], 0
+        buf.append(para)
+        size += n
+    if buf:
+        parts.append("\n\n".join(buf))
+    return parts
+
+
+def split_sections(text: str, max_tokens: int = CHUNK_TOKENS) -> List[Chunk]:
+    """Split Markdown on heading boundaries; oversized sections are split by paragraph.
+
+    Each chunk keeps its heading breadcrumb, so chunks stay stable (and cacheable)
+    when unrelated sections of the document change.
+    """
+    chunks: List[Chunk] = []
+    stack: List[Tuple[int, str]] = []
+    marks = list(_HEADING.finditer(text))
+    bounds = [(0, None)] + [(m.start(), m) for m in marks]
+    for i, (start, m) in enumerate(bounds):
+        end = bounds[i + 1][0] if i + 1 < len(bounds) else len(text)
+        if m is not None:
+            level = len(m.group(1))
+            while stack and stack[-1][0] >= level:
+                stack.pop()
+            stack.append((level, m.group(2).strip()))
+            body = text[m.end():end].strip()
+        else:
+            body = text[start:end].strip()
+        path = " > ".join(t for _, t in stack) or "Preamble"
+        if not body:
+            continue
+        n = count_tokens(body)
+        if n <= max_tokens:
+            chunks.append(Chunk(path, body, n))
+        else:
+            parts = _split_paragraphs(body, max_tokens)
+            for j, part in enumerate(parts, 1):
+                chunks.append(Chunk(f"{path} ({j}/{len(parts)})", part, count_tokens(part)))
+    return chunks
+
+
+def extractive_summary(text: str, budget: int) -> str:
+    """Offline summary: list items kept first, then the highest-scoring sentences in order."""
+    if count_tokens(text) <= budget:
+        return text.strip()
+    lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
+    bullets = [ln for ln in lines if re.match(r"^([-*+]|\d+[.)])\s+", ln)]
+    prose = " ".join(ln for ln in lines if ln not in bullets and not ln.startswith("|"))
+    sentences = [s.strip() for s in _SENTENCE.split(prose) if len(s.strip()) > 20]
+    freq: Dict[str, int] = {}
+    for w in _WORD.findall(text.lower()):
+        if w not in _STOPWORDS:
+            freq[w] = freq.get(w, 0) + 1
+
+    def score(s: str, pos: int) -> float:
+        words = [w for w in _WORD.findall(s.lower()) if w not in _STOPWORDS]
+        base = sum(freq.get(w, 0) for w in words) / (len(words) or 1)
+        return base * (1.5 if pos == 0 else 1.0)  # lead sentence usually states the point
+
+    ranked = sorted(range(len(sentences)), key=lambda i: score(sentences[i], i), reverse=True)
+    chosen: List[str] = []
+    used = 0
+    for b in bullets:
+        n = count_tokens(b)
+        if used + n > budget * 0.6:  # leave room for prose
+            break
+        chosen.append(b)
+        used += n
+    picked: List[int] = []
+    for i in ranked:
+        n = count_tokens(sentences[i])
+        if used + n > budget:
+            continue
+        picked.append(i)
+        used += n
+    out = list(chosen)
+    if picked:
+        out.append(" ".join(sentences[i] for i in sorted(picked)))
+    if not out and lines:
+        out = [lines[0][: budget * 4]]
+    return "\n".join(out)
+
+
+class Summarizer:
+    """Map-reduce summaries of long Markdown documents (PRDs).
+
+    Map: each heading section is summarized concurrently (through LLMClient when a
+    live provider is configured, otherwise extractively). Reduce: LLM summaries are
+    grouped and summarized again until the result fits `target_tokens`; extractive
+    ones are cut to an equal per-section share so every section survives. Every step
+    is cached by content hash in `.a2dev/cache/summaries.json`, so re-assessing an
+    edited PRD only reprocesses the sections that changed.
+    """
+
+    def __init__(self, llm: Optional["LLMClient"] = None, root: str | Path = ".", workers: Optional[int] = None):
+        self.llm = llm
+        self.root = Path(root)
+        self.workers = worker_count(workers)
+        self.backend = "extractive"
+        if llm is not None and llm.is_live("docs"):
+            self.backend = "llm"
+        self._cache: Dict[str, str] = {}
+        self._dirty = False
+
+    def _key(self, text: str, budget: int) -> str:
+        raw = f"{ENGINE_VERSION}\x00{self.backend}\x00{budget}\x00{text}"
+        return hashlib.sha256(raw.encode("utf-8", "surrogatepass")).hexdigest()
+
+    def _summarize(self, label: str, text: str, budget: int) -> Tuple[str, bool]:
+        """(summary, cacheable); an extractive fallback after a provider error is not cached."""
+        if self.backend == "llm" and self.llm is not None:
+            prompt = (f"Summarize this section of a product requirements document ({label}) in at most "
+                      f"{budget} tokens. Keep requirements, numbers, constraints and names; drop filler.\n\n{text}")
+            try:
+                return self.llm.complete(prompt, task="docs", max_tokens=budget).strip(), True
+            except Exception:
+                # Provider trouble must not block the assessment.
+                return extractive_summary(text, budget), False
+        return extractive_summary(text, budget), True
+
+    def _run(self, jobs: Sequence[Tuple[str, str, int]]) -> Tuple[List[str], int]:
+        """Summaries for (label, text, budget) jobs, computing cache misses in a thread pool."""
+        keys = [self._key(text, budget) for _, text, budget in jobs]
+        found: Dict[str, str] = {}
+        for k in keys:
+            if k in self._cache:
+                found[k] = self._cache.pop(k)
+                self._cache[k] = found[k]  # most recently used entries are kept on trim
+        todo = {k: job for k, job in zip(keys, jobs) if k not in found}
+        if todo:
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(todo))) as ex:
+                for k, (result, cacheable) in zip(todo, ex.map(lambda job: self._summarize(*job), todo.values())):
+                    found[k] = result
+                    if cacheable:
+                        self._cache[k] = result
+            self._dirty = True
+        return [found[k] for k in keys], len(todo)
+
+    def summarize(self, text: str, target_tokens: int = 1200) -> Summary:
+        if count_tokens(text) <= target_tokens:
+            return Summary(text=text.strip(), backend="none")
+        # The cache is best-effort: an unusable .a2dev/cache (read-only, a plain file) just means no reuse.
+        try:
+            self._cache = dict((read_json(CACHE_NAME, self.root) or {}).get("entries", {}))
+        except OSError:
+            self._cache = {}
+        chunks = split_sections(text)
+        jobs = [(c.path, c.text, max(MIN_SUMMARY_TOKENS, min(MAX_SUMMARY_TOKENS, int(c.tokens * SUMMARY_RATIO))))
+                for c in chunks]
+        parts, done = self._run(jobs)
+        result = Summary(text="", chunks=len(chunks), summarized=done, reused=len(chunks) - done,
+                         backend=self.backend, sections=[c.path for c in chunks])
+        if self.backend != "llm" and sum(count_tokens(p) for p in parts) > target_tokens:
+            # Extractive reduce: shrink every section to an equal share instead of merging
+            # groups, which would keep the leading sections and drop the rest.
+            labels = sum(count_tokens(f"**{c.path}** — ") for c in chunks)
+            share = max(15, (target_tokens - labels) // len(chunks))
+            parts, done = self._run([(c.path, p, share) for c, p in zip(chunks, parts)])
+            result.summarized += done
+            result.levels = 1
+        items = [f"**{c.path}** — {p}" if "\n" not in p else f"**{c.path}**\n{p}" for c, p in zip(chunks, parts)]
+        while self.backend == "llm" and sum(count_tokens(i) for i in items) > target_tokens and len(items) > 1 and result.levels < MAX_LEVELS:
+            groups: List[List[str]] = [[]]
+            size = 0
+            for item in items:
+                n = count_tokens(item)
+                if groups[-1] and size + n > REDUCE_GROUP_TOKENS:
+                    groups.append([])
+                    size = 0
+                groups[-1].append(item)
+                size += n
+            if len(groups) == len(items):
+                break  # every item is already as large as a group; nothing left to merge
+            share = max(MIN_SUMMARY_TOKENS, target_tokens // len(groups))
+            items, done = self._run([(f"part {i + 1}", "\n".join(g), share) for i, g in enumerate(groups)])
+            result.summarized += done
+            result.levels += 1
+        result.text = "\n".join(items)
+        if self._dirty:
+            entries = self._cache
+            if len(entries) > MAX_CACHE_ENTRIES:
+                entries = dict(list(entries.items())[-MAX_CACHE_ENTRIES:])
+            try:
+                write_json(CACHE_NAME, {"engine": ENGINE_VERSION, "entries": entries}, self.root)
+            except OSError:
+                pass
+        return result
+
+
+def summarize_prd(prd_path: str, target_tokens: int = 1200, llm: Optional["LLMClient"] = None) -> str:
+    """The PRD itself when it is short, otherwise a map-reduce summary covering every section."""
+    p = Path(prd_path)
+    if not p.exists():
+        return ""
+    if llm is None:
+        from .llm import LLMClient
+
+        llm = LLMClient()
+    return Summarizer(llm).summarize(p.read_text(encoding="utf-8", errors="replace"), target_tokens).text
@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+import ast
+import gzip
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .cache import cache_dir, CACHE_DIR
+from .parallel import map_chunked
+
+INDEX_NAME = "symbols.json.gz"
+FORMAT_VERSION = 1
+INDEXED_LANGS = ("python", "typescript", "javascript", "go")
+MAX_FILE_BYTES = 2 * 1024 * 1024
+
+# A definition is [name, kind, line, scope]; scope is the dotted enclosing class/function.
+Definition = List[Any]
+
+_IDENT = re.compile(r"[A-Za-z_$][\w$]*")
+_JS_DEFS: List[Tuple[re.Pattern, str]] = [
+    (re.compile(r"\s*(?:export\s+)?(?:default\s+)?(?:async\s+)?function\s*\*?\s*([A-Za-z_$][\w$]*)"), "function"),
+    (re.compile(r"\s*(?:export\s+)?(?:default\s+)?(?:abstract\s+)?class\s+([A-Za-z_$][\w$]*)"), "class"),
+    (re.compile(r"\s*(?:export\s+)?interface\s+([A-Za-z_$][\w$]*)"), "interface"),
+    (re.compile(r"\s*(?:export\s+)?type\s+([A-Za-z_$][\w$]*)\s*(?:<[^=]*>)?\s*="), "type"),
+    (re.compile(r"\s*(?:export\s+)?(?:const|let|var)\s+([A-Za-z_$][\w$]*)\s*(?::[^=]+)?=\s*(?:async\s+)?(?:\([^)]*\)|[A-Za-z_$][\w$]*)\s*=>"), "function"),
+    # Module-level bindings only; indented const/let are locals.
+    (re.compile(r"(?:export\s+)?(?:const|let|var)\s+([A-Za-z_$][\w$]*)"), "variable"),
+]
+_GO_DEFS: List[Tuple[re.Pattern, str]] = [
+    (re.compile(r"func\s+\([^)]*\)\s*([A-Za-z_]\w*)"), "method"),
+    (re.compile(r"func\s+([A-Za-z_]\w*)"), "function"),
+    (re.compile(r"type\s+([A-Za-z_]\w*)\s+struct\b"), "struct"),
+    (re.compile(r"type\s+([A-Za-z_]\w*)\s+interface\b"), "interface"),
+    (re.compile(r"type\s+([A-Za-z_]\w*)"), "type"),
+    (re.compile(r"(?:var|const)\s+([A-Za-z_]\w*)"), "variable"),
+]
+_KEYWORDS = frozenset(
+    "abstract as async await break case catch class const continue default defer delete do else enum export "
+    "extends false finally for from func function go if implements import in instanceof interface let map "
+    "new nil null package private protected public range return select static struct super switch this "
+    "throw true try type typeof var void while yield".split()
+)
+
+
+def _python_symbols(source: bytes) -> Tuple[List[Definition], Dict[str, List[int]]]:
+    tree = ast.parse(source)
+    defs: List[Definition] = []
+    # (statements, scope, inside a class body)
+    stack: List[Tuple[List[ast.stmt], str, bool]] = [(tree.body, "", False)]
+    while stack:
+        body, scope, in_class = stack.pop()
+        for node in body:
+            if isinstance(node, ast.ClassDef):
+                defs.append([node.name, "class", node.lineno, scope])
+                stack.append((node.body, f"{scope}.{node.name}" if scope else node.name, True))
+            elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                defs.append([node.name, "method" if in_class else "function", node.lineno, scope])
+                stack.append((node.body, f"{scope}.{node.name}" if scope else node.name, False))
+            elif isinstance(node, (ast.Assign, ast.AnnAssign)) and (in_class or not scope):
+                targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+                for t in targets:
+                    for n in ast.walk(t):
+                        if isinstance(n, ast.Name):
+                            defs.append([n.id, "variable", node.lineno, scope])
+            elif isinstance(node, (ast.If, ast.Try)) and not scope:
+                blocks = [node.body, node.orelse]
+                if isinstance(node, ast.Try):
+                    blocks += [node.finalbody, *(h.body for h in node.handlers)]
+                stack.extend((b, scope, in_class) for b in blocks)
+    refs: Dict[str, List[int]] = {}
+    for n in ast.walk(tree):
+        if isinstance(n, ast.Name) and not isinstance(n.ctx, ast.Store):
+            name, line = n.id, n.lineno
+        elif isinstance(n, ast.Attribute):
+            name, line = n.attr, n.lineno
+        elif isinstance(n, ast.ImportFrom):
+            for a in n.names:
+                refs.setdefault(a.name, []).append(n.lineno)
+            continue
+        else:
+            continue
+        refs.setdefault(name, []).append(line)
+    return defs, refs
+
+
+def _regex_symbols(text: str, patterns: List[Tuple[re.Pattern, str]]) -> Tuple[List[Definition], Dict[str, List[int]]]:
+    defs: List[Definition] = []
+    refs: Dict[str, List[int]] = {}
+    for lno, line in enumerate(text.splitlines(), start=1):
+        defined = None
+        for rx, kind in patterns:
+            m = rx.match(line)
+            if m:
+                defined = m.group(1)
+                defs.append([defined, kind, lno, ""])
+                break
+        for ident in set(_IDENT.findall(line)):
+            if ident != defined and len(ident) > 1 and ident not in _KEYWORDS:
+                refs.setdefault(ident, []).append(lno)
+    return defs, refs
+
+
+def extract_symbols(source: bytes, lang: str) -> Tuple[List[Definition], Dict[str, List[int]]]:
+    """(definitions, references by name -> line numbers) for one file."""
+    if lang == "python":
+        return _python_symbols(source)
+    text = source.decode("utf-8", "replace")
+    return _regex_symbols(text, _GO_DEFS if lang == "go" else _JS_DEFS)
+
+
+def _symbols_chunk(items: List[Tuple[str, str, str, Optional[str]]]) -> List[Tuple[str, Optional[Dict[str, Any]]]]:
+    out: List[Tuple[str, Optional[Dict[str, Any]]]] = []
+    for abs_path, rel, lang, known_sha in items:
+        try:
+            data = Path(abs_path).read_bytes()
+        except OSError:
+            out.append((rel, None))
+            continue
+        sha = hashlib.sha1(data).hexdigest()
+        if sha == known_sha:
+            out.append((rel, {"sha": sha, "unchanged": True}))
+            continue
+        try:
+            defs, refs = extract_symbols(data, lang)
+            rec: Dict[str, Any] = {"sha": sha, "lang": lang, "defs": defs, "refs": refs}
+        except (SyntaxError, ValueError):
+            rec = {"sha": sha, "lang": lang, "defs": [], "refs": {}, "error": "parse"}
+        out.append((rel, rec))
+    return out
+
+
+class SymbolIndex:
+    """Definitions and references for Python/TS/JS/Go, stored gzip'd under .a2dev/cache.
+
+    Files are re-read when their size/mtime changes and re-parsed only when their
+    content hash differs, so updates after small edits are cheap.
+    """
+
+    def __init__(self, root: str | Path = "."):
+        self.root = Path(root).resolve()
+        self.path = self.root / CACHE_DIR / INDEX_NAME
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self._by_name: Optional[Dict[str, List[Tuple[str, Definition]]]] = None
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def load(self) -> bool:
+        self._by_name = None
+        try:
+            with gzip.open(self.path, "rt", encoding="utf-8") as fh:
+                data = json.load(fh)
+        except (OSError, ValueError):
+            self.files = {}
+            return False
+        if data.get("version") != FORMAT_VERSION:
+            self.files = {}
+            return False
+        self.files = data.get("files", {})
+        return True
+
+    def _save(self) -> None:
+        cache_dir(self.root)
+        tmp = self.path.with_suffix(".tmp")
+        with gzip.open(tmp, "wt", encoding="utf-8", compresslevel=6) as fh:
+            json.dump({"version": FORMAT_VERSION, "files": self.files}, fh, separators=(",", ":"))
+        tmp.replace(self.path)
+
+    def update(self, rebuild: bool = False, workers: Optional[int] = None) -> Dict[str, int]:
+        from .inventory import iter_source_files
+
+        if rebuild or not self.load():
+            self.files = {}
+        current: Dict[str, Tuple[str, int, int]] = {}
+        for rel, lang in iter_source_files(str(self.root)):
+            if lang not in INDEXED_LANGS:
+                continue
+            try:
+                st = os.stat(self.root / rel)
+            except OSError:
+                continue
+            if st.st_size <= MAX_FILE_BYTES:
+                current[rel] = (lang, st.st_mtime_ns, st.st_size)
+        removed = [rel for rel in self.files if rel not in current]
+        for rel in removed:
+            del self.files[rel]
+        todo = []
+        for rel, (lang, mtime, size) in current.items():
+            rec = self.files.get(rel)
+            if rec and rec.get("mtime") == mtime and rec.get("size") == size:
+                continue
+            todo.append((str(self.root / rel), rel, lang, rec.get("sha") if rec else None))
+        parsed = 0
+        for rel, rec in map_chunked(_symbols_chunk, todo, workers=workers):
+            if rec is None:
+                self.files.pop(rel, None)
+                continue
+            _, mtime, size = current[rel]
+            if rec.pop("unchanged", False):
+                self.files[rel].update(mtime=mtime, size=size)
+                continue
+            rec.update(mtime=mtime, size=size)
+            self.files[rel] = rec
+            parsed += 1
+        if todo or removed:
+            self._save()
+        self._by_name = None
+        return {
+            "files": len(self.files),
+            "parsed": parsed,
+            "removed": len(removed),
+            "symbols": sum(len(r.get("defs", [])) for r in self.files.values()),
+        }
+
+    def _definitions(self) -> Dict[str, List[Tuple[str, Definition]]]:
+        if self._by_name is None:
+            self._by_name = {}
+            for rel, rec in self.files.items():
+                for d in rec.get("defs", []):
+                    self._by_name.setdefault(d[0], []).append((rel, d))
+        return self._by_name
+
+    @staticmethod
+    def _row(rel: str, d: Definition) -> Dict[str, Any]:
+        return {"name": d[0], "kind": d[1], "path": rel, "line": d[2], "scope": d[3]}
+
+    def find_definition(self, name: str) -> List[Dict[str, Any]]:
+        """Definitions of `name`; a dotted name (`Class.method`) also matches on scope."""
+        scope, _, short = name.rpartition(".")
+        rows = [
+            self._row(rel, d) for rel, d in self._definitions().get(short, [])
+            if not scope or d[3] == scope or d[3].endswith("." + scope)
+        ]
+        return sorted(rows, key=lambda r: (r["path"], r["line"]))
+
+    def find_references(self, name: str) -> List[Dict[str, Any]]:
+        """Uses of `name` (by identifier, not resolved through imports), excluding definition sites."""
+        short = name.rpartition(".")[2]
+        def_sites = {(rel, d[2]) for rel, d in self._definitions().get(short, [])}
+        rows = []
+        for rel in sorted(self.files):
+            for line in sorted(set(self.files[rel].get("refs", {}).get(short, []))):
+                if (rel, line) not in def_sites:
+                    rows.append({"name": short, "path": rel, "line": line})
+        return rows
+
+    def symbols_in(self, path: str) -> List[Dict[str, Any]]:
+        rel = os.path.relpath(Path(path).resolve(), self.root) if os.path.isabs(path) else os.path.normpath(path)
+        rec = self.files.get(rel, {})
+        return sorted((self._row(rel, d) for d in rec.get("defs", [])), key=lambda r: r["line"])
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .cache import CACHE_DIR, cache_dir
+
+DB_NAME = "telemetry.sqlite3"
+MAX_ROWS = 50000          # oldest calls are pruned past this
+WINDOW_DAYS = 14.0        # routing looks at this much history
+SUMMARY_TTL = 30.0        # seconds a routing summary is reused within a process
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS calls (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts REAL NOT NULL,
+    model TEXT NOT NULL,
+    provider TEXT NOT NULL,
+    task TEXT NOT NULL,
+    ok INTEGER NOT NULL,
+    latency REAL,
+    prompt_tokens INTEGER NOT NULL DEFAULT 0,
+    output_tokens INTEGER NOT NULL DEFAULT 0,
+    cost REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_calls_model_task ON calls (model, task, ts);
+"""
+
+
+def enabled() -> bool:
+    return os.getenv("A2DEV_TELEMETRY", "1").lower() not in ("0", "false", "no", "off")
+
+
+@dataclass
+class CallStats:
+    model: str
+    task: str             # "*" aggregates every task
+    calls: int
+    errors: int
+    mean_latency: Optional[float]
+    mean_prompt_tokens: Optional[float]
+    mean_output_tokens: Optional[float]
+    cost: float
+
+    @property
+    def error_rate(self) -> float:
+        return self.errors / self.calls if self.calls else 0.0
+
+
+class TelemetryStore:
+    """SQLite log of live LLM calls: latency, token counts and cost per model and task.
+
+    Written by LLMClient after every live attempt (successful or not) and read by
+    the cost/latency routing policies in `a2a.models` and `a2dev models stats`.
+    Token counts are `a2a.tokens` estimates, so they are comparable across providers.
+    """
+
+    def __init__(self, root: str | Path = "."):
+        self.root = Path(root)
+        self.path = self.root / CACHE_DIR / DB_NAME
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._summary: Optional[Tuple[float, Dict[Tuple[str, str], CallStats]]] = None
+        self._inserts = 0
+
+    def __enter__(self) -> "TelemetryStore":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            cache_dir(self.root)
+            # Hedged attempts record from worker threads; writes are serialised by `_lock`.
+            self._conn = sqlite3.connect(str(self.path), timeout=10, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+        return self._conn
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def record(self, model: str, provider: str, task: str, ok: bool, latency: Optional[float],
+               prompt_tokens: int = 0, output_tokens: int = 0, cost: float = 0.0) -> None:
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT INTO calls (ts, model, provider, task, ok, latency, prompt_tokens, output_tokens, cost)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (time.time(), model, provider, task, int(ok), latency, prompt_tokens, output_tokens, cost),
+            )
+            self._inserts += 1
+            if self._inserts % 500 == 0:
+                self.conn.execute("DELETE FROM calls WHERE id <= (SELECT MAX(id) FROM calls) - ?", (MAX_ROWS,))
+
+    def summary(self, days: float = WINDOW_DAYS, fresh: bool = False) -> Dict[Tuple[str, str], CallStats]:
+        """Per (model, task) and per (model, "*") aggregates over the last `days`."""
+        now = time.monotonic()
+        if not fresh and self._summary is not None and now - self._summary[0] < SUMMARY_TTL:
+            return self._summary[1]
+        since = time.time() - days * 86400
+        out: Dict[Tuple[str, str], CallStats] = {}
+        select = ("SELECT model, {task}, COUNT(*), SUM(1 - ok), AVG(CASE WHEN ok THEN latency END),"
+                  " AVG(CASE WHEN ok THEN prompt_tokens END), AVG(CASE WHEN ok THEN output_tokens END),"
+                  " COALESCE(SUM(cost), 0) FROM calls WHERE ts >= ? GROUP BY model{group}")
+        with self._lock:
+            rows = self.conn.execute(select.format(task="task", group=", task"), (since,)).fetchall()
+            rows += self.conn.execute(select.format(task="'*'", group=""), (since,)).fetchall()
+        for model, task, calls, errors, lat, pin, pout, cost in rows:
+            out[(model, task)] = CallStats(model, task, calls, errors or 0, lat, pin, pout, cost)
+        self._summary = (now, out)
+        return out
+
+    def latency_quantile(self, model: str, task: str, q: float, days: float = WINDOW_DAYS) -> Optional[float]:
+        since = time.time() - days * 86400
+        where = "model = ? AND ok = 1 AND latency IS NOT NULL AND ts >= ?" + ("" if task == "*" else " AND task = ?")
+        params: List[Any] = [model, since] + ([] if task == "*" else [task])
+        with self._lock:
+            n = self.conn.execute(f"SELECT COUNT(*) FROM calls WHERE {where}", params).fetchone()[0]
+            if not n:
+                return None
+            row = self.conn.execute(f"SELECT latency FROM calls WHERE {where} ORDER BY latency LIMIT 1 OFFSET ?",
+                                    params + [min(n - 1, int(q * n))]).fetchone()
+        return row[0] if row else None
+
+    def clear(self) -> int:
+        with self._lock, self.conn:
+            return self.conn.execute("DELETE FROM calls").rowcount
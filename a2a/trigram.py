@@ -0,0 +1,305 @@
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import re
+import struct
+import time
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from .cache import cache_dir, CACHE_DIR
+from .parallel import map_chunked
+
+try:  # Python 3.11+
+    import re._parser as _sre_parse  # type: ignore
+    from re._constants import LITERAL, SUBPATTERN, MAX_REPEAT, MIN_REPEAT, POSSESSIVE_REPEAT  # type: ignore
+except ImportError:  # pragma: no cover - Python 3.10
+    import sre_parse as _sre_parse  # type: ignore
+    from sre_constants import LITERAL, SUBPATTERN, MAX_REPEAT, MIN_REPEAT  # type: ignore
+    POSSESSIVE_REPEAT = None
+
+INDEX_NAME = "trigram.idx"
+FORMAT_VERSION = 1
+MAX_FILE_BYTES = 1 << 20
+_HEADER = struct.Struct("<4sII")  # magic, version, header json length
+_MAGIC = b"A2TG"
+# Rebuild postings from scratch once this share of file slots is stale.
+_COMPACT_RATIO = 0.3
+
+
+def walk_files(root: Path) -> Dict[str, Tuple[int, int]]:
+    """rel path -> (mtime_ns, size) for candidate text files under root."""
+    from .inventory import walk_tree
+
+    out: Dict[str, Tuple[int, int]] = {}
+    for dirpath, dirnames, filenames in walk_tree(root):
+        for f in filenames:
+            p = os.path.join(dirpath, f)
+            try:
+                st = os.stat(p)
+            except OSError:
+                continue
+            if 0 < st.st_size <= MAX_FILE_BYTES:
+                out[os.path.relpath(p, root)] = (st.st_mtime_ns, st.st_size)
+    return out
+
+
+def trigrams_of(data: bytes) -> Set[int]:
+    data = data.lower()
+    return {int.from_bytes(data[i:i + 3], "big") for i in range(len(data) - 2)}
+
+
+def _trigram_chunk(items: List[Tuple[str, str]]) -> List[Tuple[str, Optional[array]]]:
+    out: List[Tuple[str, Optional[array]]] = []
+    for abs_path, rel in items:
+        try:
+            data = Path(abs_path).read_bytes()
+        except OSError:
+            out.append((rel, None))
+            continue
+        if b"\x00" in data[:8192]:
+            out.append((rel, None))  # binary
+            continue
+        out.append((rel, array("I", sorted(trigrams_of(data)))))
+    return out
+
+
+# Characters whose case-insensitive matches are all ASCII: the index folds ASCII case
+# only, and under re.IGNORECASE "k", "s" and "i" also match K, ſ and İ/ı.
+_FOLD_SAFE = frozenset(c for c in map(chr, range(128)) if c.lower() not in "iks")
+
+
+def required_literals(pattern: str, literal: bool = False) -> List[str]:
+    """Literal substrings every match of `pattern` must contain (conservative).
+
+    Only literal runs in the top-level concatenation are used; alternations,
+    classes and optional parts end a run, so the result may be empty (no filter).
+    Under IGNORECASE, global or scoped, letters the index cannot fold end a run too.
+    """
+    if literal:
+        return [pattern]
+    try:
+        parsed = _sre_parse.parse(pattern)
+    except Exception:
+        return []
+    runs: List[str] = []
+    cur: List[str] = []
+
+    def flush() -> None:
+        if cur:
+            runs.append("".join(cur))
+            cur.clear()
+
+    def walk(seq, icase: bool) -> None:
+        for op, av in seq:
+            if op is LITERAL:
+                ch = chr(av)
+                if icase and ch not in _FOLD_SAFE:
+                    flush()  # may match a letter the ASCII-folded index stores differently
+                else:
+                    cur.append(ch)
+            elif op is SUBPATTERN:
+                # (group, add_flags, del_flags, pattern): scoped flags such as (?i:...) or (?-i:...)
+                _, add, remove, body = av
+                walk(body, bool(add & re.IGNORECASE) or (icase and not remove & re.IGNORECASE))
+            elif op in (MAX_REPEAT, MIN_REPEAT, POSSESSIVE_REPEAT) and av[0] >= 1:
+                # The body occurs at least once, but its repeats break adjacency.
+                flush()
+                walk(av[2], icase)
+                flush()
+            else:
+                flush()
+
+    walk(parsed, bool(parsed.state.flags & re.IGNORECASE))
+    flush()
+    return [r for r in runs if len(r) >= 3]
+
+
+class TrigramIndex:
+    """Persistent trigram index under .a2dev/cache, refreshed from file mtimes.
+
+    On disk: a small header (file table), a sorted trigram table (trigram, offset,
+    count as uint32 arrays) and a postings blob of file ids. Queries mmap the file
+    and only touch the posting lists they need.
+    """
+
+    def __init__(self, root: str | Path = "."):
+        self.root = Path(root).resolve()
+        self.path = self.root / CACHE_DIR / INDEX_NAME
+        self.files: List[Optional[List]] = []  # [rel, mtime_ns, size] or None (stale slot)
+        self.skipped: Dict[str, List[int]] = {}  # binary/unreadable files: rel -> [mtime_ns, size]
+        self._keys = array("I")
+        self._offsets = array("I")
+        self._counts = array("I")
+        self._postings_at = 0
+        self._mm: Optional[mmap.mmap] = None
+        self._fh = None
+
+    # Persistence
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def load(self) -> bool:
+        self.close()
+        if not self.path.exists():
+            return False
+        try:
+            self._fh = self.path.open("rb")
+            self._mm = mmap.mmap(self._fh.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, hlen = _HEADER.unpack_from(self._mm, 0)
+            if magic != _MAGIC or version != FORMAT_VERSION:
+                self.close()
+                return False
+            pos = _HEADER.size
+            header = json.loads(self._mm[pos:pos + hlen])
+            pos += hlen
+            self.files = header["files"]
+            self.skipped = header.get("skipped", {})
+            n = header["trigrams"]
+            for arr in (self._keys, self._offsets, self._counts):
+                del arr[:]
+                arr.frombytes(self._mm[pos:pos + 4 * n])
+                pos += 4 * n
+            self._postings_at = pos
+            return True
+        except Exception:
+            self.close()
+            return False
+
+    def close(self) -> None:
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+    def _postings(self, tri: int) -> array:
+        i = bisect_left(self._keys, tri)
+        out = array("I")
+        if i < len(self._keys) and self._keys[i] == tri and self._mm is not None:
+            start = self._postings_at + 4 * self._offsets[i]
+            out.frombytes(self._mm[start:start + 4 * self._counts[i]])
+        return out
+
+    def _all_postings(self) -> Dict[int, array]:
+        return {k: self._postings(k) for k in self._keys}
+
+    def _write(self, postings: Dict[int, array]) -> None:
+        keys = array("I", sorted(postings))
+        offsets, counts, blob = array("I"), array("I"), array("I")
+        for k in keys:
+            lst = postings[k]
+            offsets.append(len(blob))
+            counts.append(len(lst))
+            blob.extend(lst)
+        header = json.dumps({"files": self.files, "skipped": self.skipped, "trigrams": len(keys)}).encode()
+        self.close()
+        cache_dir(self.root)
+        tmp = self.path.with_suffix(".tmp")
+        with tmp.open("wb") as fh:
+            fh.write(_HEADER.pack(_MAGIC, FORMAT_VERSION, len(header)))
+            fh.write(header)
+            for arr in (keys, offsets, counts, blob):
+                arr.tofile(fh)
+        tmp.replace(self.path)
+
+    # Maintenance
+    def update(self, rebuild: bool = False) -> Dict[str, int]:
+        """Re-index files whose mtime/size changed since the last update."""
+        current = walk_files(self.root)
+        loaded = not rebuild and self.load()
+        if not loaded:
+            self.files, self.skipped = [], {}
+        live = {f[0]: i for i, f in enumerate(self.files) if f}
+        stale = 0
+        for rel, i in live.items():
+            f = self.files[i]
+            if rel not in current or (f[1], f[2]) != current[rel]:
+                self.files[i] = None
+                stale += 1
+        skipped = {rel: v for rel, v in self.skipped.items() if tuple(v) == current.get(rel)}
+        fresh = [
+            rel for rel in current
+            if rel not in skipped and (rel not in live or self.files[live[rel]] is None)
+        ]
+        if loaded and not stale and not fresh and len(skipped) == len(self.skipped):
+            # Nothing changed: keep the mapped index as is (no postings load, no rewrite).
+            return {"files": len(live), "updated": 0, "removed": 0, "trigrams": len(self._keys)}
+        self.skipped = skipped
+        postings = self._all_postings() if loaded else {}
+        results = map_chunked(_trigram_chunk, [(str(self.root / rel), rel) for rel in fresh])
+        for rel, tris in results:
+            if tris is None:
+                self.skipped[rel] = list(current[rel])
+                continue
+            fid = len(self.files)
+            self.files.append([rel, *current[rel]])
+            for t in tris:
+                lst = postings.get(t)
+                if lst is None:
+                    postings[t] = lst = array("I")
+                lst.append(fid)
+        dead = sum(1 for f in self.files if f is None)
+        if self.files and dead / len(self.files) > _COMPACT_RATIO:
+            postings = self._compact(postings)
+        self._write(postings)
+        self.load()
+        return {"files": sum(1 for f in self.files if f), "updated": len(fresh), "removed": stale, "trigrams": len(self._keys)}
+
+    def _compact(self, postings: Dict[int, array]) -> Dict[int, array]:
+        remap: Dict[int, int] = {}
+        files: List[Optional[List]] = []
+        for i, f in enumerate(self.files):
+            if f:
+                remap[i] = len(files)
+                files.append(f)
+        self.files = files
+        out: Dict[int, array] = {}
+        for t, lst in postings.items():
+            kept = array("I", (remap[i] for i in lst if i in remap))
+            if kept:
+                out[t] = kept
+        return out
+
+    # Queries
+    def candidates(self, literals: Sequence[str]) -> List[str]:
+        """Files that contain every trigram of every required literal."""
+        ids: Optional[Set[int]] = None
+        tris = sorted({t for lit in literals for t in trigrams_of(lit.encode("utf-8"))},
+                      key=lambda t: self._count(t))
+        for t in tris:
+            lst = self._postings(t)
+            ids = set(lst) if ids is None else ids.intersection(lst)
+            if not ids:
+                return []
+        if ids is None:
+            return [f[0] for f in self.files if f]
+        return [self.files[i][0] for i in sorted(ids) if self.files[i]]
+
+    def _count(self, tri: int) -> int:
+        i = bisect_left(self._keys, tri)
+        return self._counts[i] if i < len(self._keys) and self._keys[i] == tri else 0
+
+    def search(self, pattern: str, literal: bool = False, deadline: Optional[float] = None) -> Iterator[Tuple[str, int, str]]:
+        """Yield (path, line number, line) matches, verifying index candidates with `re`.
+
+        Stops quietly once `time.monotonic()` passes `deadline`, even between matches.
+        """
+        rx = re.compile(re.escape(pattern) if literal else pattern)
+        for rel in self.candidates(required_literals(pattern, literal)):
+            if deadline and time.monotonic() > deadline:
+                return
+            try:
+                with (self.root / rel).open("r", encoding="utf-8", errors="replace") as fh:
+                    for lno, line in enumerate(fh, start=1):
+                        if rx.search(line):
+                            yield rel, lno, line.rstrip("\n")
+                        elif deadline and not lno % 4096 and time.monotonic() > deadline:
+                            return
+            except OSError:
+                continue
@@ -87,6 +87,13 @@ def _load_env_local():
 _load_env_local()
 _ensure_a2a_on_path()
 
+if __name__ == "__main__":
+    from a2a.client import run_via_daemon
+
+    _code = run_via_daemon(sys.argv[1:])
+    if _code is not None:
+        sys.exit(_code)
+
 from a2a.cli import main as _main
 
 # Temporary shim to maintain compatibility after rename to A2Dev
@@ -106,6 +106,14 @@ def _load_env_local():
 _load_env_local()
 _ensure_a2a_on_path()
 
+if __name__ == "__main__":
+    # A running `a2dev serve` answers without importing the CLI; otherwise run in-process.
+    from a2a.client import run_via_daemon
+
+    _code = run_via_daemon(sys.argv[1:])
+    if _code is not None:
+        sys.exit(_code)
+
 from a2a.cli import main
 
 if __name__ == "__main__":
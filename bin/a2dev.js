@@ -1,7 +1,9 @@
 #!/usr/bin/env node
 const { spawnSync } = require('node:child_process');
 const { existsSync, readFileSync } = require('node:fs');
+const net = require('node:net');
 const { join, resolve } = require('node:path');
+const { findPython, which, WORKER_LOST } = require('./pool');
 
 function loadEnvLocal() {
   try {
@@ -28,17 +30,79 @@ function loadEnvLocal() {
 
 loadEnvLocal();
 
-function which(cmd) {
-  const sep = process.platform === 'win32' ? ';' : ':';
-  const exts = process.platform === 'win32' ? (process.env.PATHEXT || '.EXE').split(';') : [''];
-  for (const p of (process.env.PATH || '').split(sep)) {
-    const base = join(p, cmd);
-    for (const ext of exts) {
-      const f = base + ext.toLowerCase();
-      try { require('node:fs').accessSync(f); return f; } catch {}
+// Keep in sync with a2a/client.py: what a running `a2dev serve` may answer, and which env it gets.
+const DAEMON_SOCKET = join('.a2dev', 'run', 'a2dev.sock');
+const NOT_SERVED = new Set(['serve', 'batch', 'install', 'init', 'uninstall', 'setup', 'quickstart', 'bootstrap']);
+const LOCAL_FLAGS = new Set(['--dry-run', '--fix']);
+const ENV_PREFIXES = ['A2DEV_', 'A2A_', 'CODEX_', 'OPENAI_', 'ANTHROPIC_', 'OLLAMA_'];
+
+function served(args) {
+  const cmd = args.find((a) => !a.startsWith('-'));
+  return Boolean(cmd) && !NOT_SERVED.has(cmd) && !args.some((a) => LOCAL_FLAGS.has(a));
+}
+
+// Resolves to the exit code of a command run behind `socketPath` (daemon or pool), or null to run it locally.
+function runVia(socketPath, args) {
+  return new Promise((resolveCode) => {
+    let settled = false;
+    const done = (code) => { if (!settled) { settled = true; resolveCode(code); } };
+    const env = {};
+    for (const [k, v] of Object.entries(process.env)) {
+      if (k === 'MODEL_TIER' || ENV_PREFIXES.some((p) => k.startsWith(p))) env[k] = v;
     }
-  }
-  return null;
+    const timeout = (Number(process.env.A2DEV_DAEMON_TIMEOUT) || 600) * 1000;
+    let sent = false;
+    let buf = '';
+    const fail = (why) => {
+      sock.destroy();
+      if (settled) return;
+      if (!sent) return done(null);
+      // The command may already have written files: report instead of running it again.
+      process.stderr.write(`[A2Dev] daemon request failed: ${why}\n`);
+      done(1);
+    };
+    const sock = net.createConnection(socketPath);
+    sock.setEncoding('utf8');
+    sock.setTimeout(500);
+    sock.on('connect', () => {
+      sock.setTimeout(timeout);
+      const req = { jsonrpc: '2.0', id: 1, method: 'run', params: { argv: args, cwd: process.cwd(), env } };
+      sock.write(JSON.stringify(req) + '\n');
+      sent = true;
+    });
+    sock.on('data', (chunk) => {
+      buf += chunk;
+      const nl = buf.indexOf('\n');
+      if (nl < 0) return;
+      sock.end();
+      let reply;
+      try { reply = JSON.parse(buf.slice(0, nl)); } catch { return fail('invalid reply'); }
+      if (reply.error) {
+        if (reply.error.code === WORKER_LOST) return fail(reply.error.message);
+        return done(null); // refused (stale code, other project): not run
+      }
+      const result = reply.result || {};
+      if (result.stdout) process.stdout.write(result.stdout);
+      if (result.stderr) process.stderr.write(result.stderr);
+      done(Number(result.code) || 0);
+    });
+    sock.on('timeout', () => fail('timed out'));
+    sock.on('error', (e) => fail(e.message));
+    sock.on('close', () => fail('connection closed'));
+  });
+}
+
+async function tryDaemon(args) {
+  if (/^(0|false|no|off)$/i.test(process.env.A2DEV_DAEMON || '')) return null;
+  if (!served(args) || !existsSync(DAEMON_SOCKET)) return null;
+  return runVia(DAEMON_SOCKET, args);
+}
+
+// Opt-in warm workers kept by bin/pool.js, started on first use (no separate `a2dev serve`).
+async function tryPool(args) {
+  if (!/^(1|true|yes|on)$/i.test(process.env.A2DEV_NODE_POOL || '') || !served(args)) return null;
+  const socketPath = await require('./pool').ensurePool();
+  return socketPath ? runVia(socketPath, args) : null;
 }
 
 function run(cmd, args) {
@@ -46,7 +110,7 @@ function run(cmd, args) {
   process.exit(res.status ?? 1);
 }
 
-(function main() {
+(async function main() {
   const cwd = process.cwd();
   const args = process.argv.slice(2);
   const pkgRoot = resolve(__dirname, '..');
@@ -54,13 +118,19 @@ function run(cmd, args) {
   // Always use the packaged CLI for install to avoid missing deps (e.g., local a2dev_cli.py without a2a/).
   if (args[0] === 'install') {
     const cliPkg = join(pkgRoot, 'a2dev_cli.py');
-    const py = which('python3') || which('python') || process.env.PYTHON || 'python3';
+    const py = findPython();
     return run(py, [cliPkg, 'install', '--dest', cwd]);
   }
+  let code = await tryDaemon(args);
+  if (code === null) code = await tryPool(args);
+  if (code !== null) {
+    process.exitCode = code;
+    return;
+  }
   // Prefer pyz if present for portability
   const pyzLocal = join(cwd, 'a2dev.pyz');
   const pyzPkg = join(pkgRoot, 'a2dev.pyz');
-  const py = which('python3') || which('python') || process.env.PYTHON || 'python3';
+  const py = findPython();
   function tryRun(cmd, args) {
     const r = spawnSync(cmd, args, { stdio: 'pipe' });
     if ((r.status ?? 1) === 0) {
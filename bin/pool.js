@@ -0,0 +1,230 @@
+// Warm Python worker pool for the Node shim (opt-in: A2DEV_NODE_POOL=1).
+//
+// The first `a2dev` call in a project starts `node bin/pool.js` in the background. It listens on
+// .a2dev/run/a2dev-pool.sock (a named pipe on Windows) with the same line-delimited JSON-RPC `run`
+// requests as `a2dev serve`. Requests from concurrent clients are handed to up to
+// A2DEV_NODE_POOL_SIZE workers (`a2dev_cli.py serve --stdio`), started lazily. Idle workers are
+// stopped after A2DEV_NODE_POOL_IDLE seconds, and the pool exits once it has no workers left.
+const { spawn } = require('node:child_process');
+const { accessSync, existsSync, mkdirSync, openSync, unlinkSync } = require('node:fs');
+const { createHash } = require('node:crypto');
+const net = require('node:net');
+const { join, resolve } = require('node:path');
+
+const RUN_DIR = join('.a2dev', 'run');
+const POOL_LOG = join(RUN_DIR, 'pool.log');
+const PKG_ROOT = resolve(__dirname, '..');
+
+// JSON-RPC error codes shared with a2a/daemon.py; WORKER_LOST means the command may have run.
+const INVALID_PARAMS = -32602;
+const METHOD_NOT_FOUND = -32601;
+const REFUSED = -32001;
+const WORKER_LOST = -32002;
+
+function which(cmd) {
+  const sep = process.platform === 'win32' ? ';' : ':';
+  const exts = process.platform === 'win32' ? (process.env.PATHEXT || '.EXE').split(';') : [''];
+  for (const p of (process.env.PATH || '').split(sep)) {
+    const base = join(p, cmd);
+    for (const ext of exts) {
+      const f = base + ext.toLowerCase();
+      try { accessSync(f); return f; } catch {}
+    }
+  }
+  return null;
+}
+
+function findPython() {
+  return which('python3') || which('python') || process.env.PYTHON || 'python3';
+}
+
+// Relative on POSIX (absolute socket paths can exceed the ~108 byte limit); per-root pipe on Windows.
+function poolSocket(root = process.cwd()) {
+  if (process.platform === 'win32') {
+    return '\\\\.\\pipe\\a2dev-pool-' + createHash('sha1').update(resolve(root)).digest('hex').slice(0, 12);
+  }
+  return join(RUN_DIR, 'a2dev-pool.sock');
+}
+
+function connectable(path, timeout = 500) {
+  return new Promise((resolveOk) => {
+    const sock = net.createConnection(path);
+    const done = (ok) => { sock.destroy(); resolveOk(ok); };
+    sock.setTimeout(timeout, () => done(false));
+    sock.on('connect', () => done(true));
+    sock.on('error', () => done(false));
+  });
+}
+
+// Socket path of this project's pool, starting the pool if needed; null when it does not come up.
+async function ensurePool(wait = 5000) {
+  const path = poolSocket();
+  if (await connectable(path)) return path;
+  mkdirSync(RUN_DIR, { recursive: true });
+  const log = openSync(POOL_LOG, 'a');
+  const child = spawn(process.execPath, [__filename], { cwd: process.cwd(), detached: true, stdio: ['ignore', log, log] });
+  child.unref();
+  const deadline = Date.now() + wait;
+  while (Date.now() < deadline) {
+    await new Promise((r) => setTimeout(r, 50));
+    if (await connectable(path)) return path;
+  }
+  return null;
+}
+
+function workerCommand(root) {
+  // Source CLI first: a bundled a2dev.pyz may predate `serve --stdio`.
+  for (const p of [join(root, 'a2dev_cli.py'), join(PKG_ROOT, 'a2dev_cli.py'), join(root, 'a2dev.pyz'), join(PKG_ROOT, 'a2dev.pyz')]) {
+    if (existsSync(p)) return [findPython(), [p, 'serve', '--stdio']];
+  }
+  return null;
+}
+
+function servePool() {
+  const root = process.cwd();
+  const path = poolSocket(root);
+  const size = Math.max(1, Number(process.env.A2DEV_NODE_POOL_SIZE) || 2);
+  const idleMs = (Number(process.env.A2DEV_NODE_POOL_IDLE) || 600) * 1000;
+  const command = workerCommand(root); // resolved once, not per request
+  const workers = new Set();
+  const queue = [];
+  let connections = 0;
+  let lastActive = Date.now();
+  let seq = 0;
+  const log = (msg) => process.stdout.write(`[A2Dev pool ${new Date().toISOString()}] ${msg}\n`);
+
+  function startWorker() {
+    const [py, args] = command;
+    const proc = spawn(py, args, { cwd: root, stdio: ['pipe', 'pipe', 'inherit'] });
+    const w = { proc, ready: false, job: null, idleSince: Date.now(), buf: '' };
+    workers.add(w);
+    proc.stdout.setEncoding('utf8');
+    proc.stdout.on('data', (chunk) => {
+      w.buf += chunk;
+      let nl;
+      while ((nl = w.buf.indexOf('\n')) >= 0) {
+        const line = w.buf.slice(0, nl);
+        w.buf = w.buf.slice(nl + 1);
+        let msg;
+        try { msg = JSON.parse(line); } catch { continue; }
+        if (msg.method === 'ready') {
+          w.ready = true;
+          log(`worker ${proc.pid} ready`);
+        } else if (w.job && msg.id === w.job.id) {
+          const job = w.job;
+          w.job = null;
+          w.idleSince = Date.now();
+          job.reply(msg);
+        }
+        pump();
+      }
+    });
+    const gone = (why) => {
+      if (!workers.delete(w)) return;
+      log(`worker ${proc.pid} exited (${why})`);
+      const job = w.job;
+      w.job = null;
+      if (job) job.reply({ error: { code: WORKER_LOST, message: `worker exited (${why}) while running the command` } });
+      if (!w.ready) {
+        // Could not start (no Python, an old a2dev.pyz): let the clients run their commands locally.
+        for (const j of queue.splice(0)) j.reply({ error: { code: REFUSED, message: `pool worker failed to start (${why})` } });
+      }
+      pump();
+    };
+    proc.on('exit', (code, signal) => gone(signal || `code ${code}`));
+    proc.on('error', (e) => gone(e.message));
+    proc.stdin.on('error', () => {});
+  }
+
+  function pump() {
+    lastActive = Date.now();
+    while (queue.length) {
+      const w = [...workers].find((x) => x.ready && !x.job);
+      if (!w) break;
+      const job = queue.shift();
+      w.job = job;
+      w.proc.stdin.write(JSON.stringify({ jsonrpc: '2.0', id: job.id, method: 'run', params: job.params }) + '\n');
+    }
+    const starting = [...workers].filter((x) => !x.ready).length;
+    if (queue.length > starting && workers.size < size) startWorker();
+  }
+
+  function shutdown() {
+    log('shutting down');
+    for (const w of workers) w.proc.stdin.end();
+    server.close();
+    if (process.platform !== 'win32') { try { unlinkSync(path); } catch {} }
+    setTimeout(() => process.exit(0), 1000).unref();
+  }
+
+  const server = net.createServer((conn) => {
+    connections++;
+    const mine = new Set();
+    let buf = '';
+    conn.setEncoding('utf8');
+    const send = (obj) => { if (!conn.destroyed) conn.write(JSON.stringify(obj) + '\n'); };
+    conn.on('data', (chunk) => {
+      buf += chunk;
+      let nl;
+      while ((nl = buf.indexOf('\n')) >= 0) {
+        const line = buf.slice(0, nl);
+        buf = buf.slice(nl + 1);
+        let req;
+        try { req = JSON.parse(line); } catch { send({ jsonrpc: '2.0', id: null, error: { code: -32700, message: 'invalid JSON' } }); continue; }
+        const reply = (msg) => { mine.delete(job); send({ jsonrpc: '2.0', id: req.id, ...(msg.error ? { error: msg.error } : { result: msg.result }) }); };
+        const job = { id: ++seq, params: req.params || {}, reply };
+        if (req.method === 'ping') {
+          send({ jsonrpc: '2.0', id: req.id, result: { pid: process.pid, root, workers: workers.size, busy: [...workers].filter((w) => w.job).length, queued: queue.length } });
+        } else if (req.method === 'shutdown') {
+          send({ jsonrpc: '2.0', id: req.id, result: { ok: true } });
+          shutdown();
+        } else if (req.method !== 'run') {
+          send({ jsonrpc: '2.0', id: req.id, error: { code: METHOD_NOT_FOUND, message: `unknown method: ${req.method}` } });
+        } else if (!Array.isArray(job.params.argv) || !job.params.argv.every((a) => typeof a === 'string')) {
+          send({ jsonrpc: '2.0', id: req.id, error: { code: INVALID_PARAMS, message: 'argv must be a list of strings' } });
+        } else if (!command) {
+          send({ jsonrpc: '2.0', id: req.id, error: { code: REFUSED, message: 'no a2dev_cli.py or a2dev.pyz to run' } });
+        } else {
+          mine.add(job);
+          queue.push(job);
+          pump();
+        }
+      }
+    });
+    conn.on('error', () => {});
+    conn.on('close', () => {
+      connections--;
+      // Queued requests of a client that went away are dropped; running ones finish.
+      for (const job of mine) {
+        const i = queue.indexOf(job);
+        if (i >= 0) queue.splice(i, 1);
+      }
+    });
+  });
+
+  server.on('error', async (e) => {
+    if (e.code === 'EADDRINUSE' && process.platform !== 'win32' && !(await connectable(path))) {
+      try { unlinkSync(path); } catch {}
+      server.listen(path);
+      return;
+    }
+    log(e.code === 'EADDRINUSE' ? 'another pool is already serving this project' : `error: ${e.message}`);
+    process.exit(0);
+  });
+  server.listen(path, () => log(`serving ${root} on ${path} (pid ${process.pid}, up to ${size} workers)`));
+
+  setInterval(() => {
+    const now = Date.now();
+    for (const w of workers) {
+      if (w.ready && !w.job && now - w.idleSince > idleMs) {
+        log(`stopping idle worker ${w.proc.pid}`);
+        w.proc.stdin.end(); // the worker exits at EOF
+      }
+    }
+    if (!workers.size && !queue.length && !connections && now - lastActive > idleMs) shutdown();
+  }, Math.min(30000, Math.max(1000, idleMs / 10)));
+}
+
+module.exports = { which, findPython, poolSocket, ensurePool, WORKER_LOST };
+
+if (require.main === module) servePool();
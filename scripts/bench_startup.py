@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""Measure CLI startup: wall-clock per subcommand and the heaviest imports.
+
+Usage: python scripts/bench_startup.py [--runs N] [--top N]
+
+Runs each command in a fresh interpreter with the daemon bypassed (A2DEV_DAEMON=0),
+so the numbers are cold-process costs, then prints `python -X importtime`'s
+slowest cumulative imports for `route`.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+CLI = ROOT / "a2dev_cli.py"
+
+COMMANDS = [
+    ["--help"],
+    ["route", "-h"],
+    ["phase", "status"],
+    ["cache", "stats"],
+    ["gate", "-h"],
+    ["search", "-h"],
+]
+
+
+def _env() -> dict:
+    env = dict(os.environ)
+    env["A2DEV_DAEMON"] = "0"
+    env.pop("PYTHONPROFILEIMPORTTIME", None)
+    return env
+
+
+def time_command(argv, runs):
+    samples = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        subprocess.run([sys.executable, str(CLI), *argv], env=_env(), cwd=str(ROOT),
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples)
+
+
+def top_imports(argv, top):
+    proc = subprocess.run([sys.executable, "-X", "importtime", str(CLI), *argv], env=_env(), cwd=str(ROOT),
+                          stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=False)
+    rows = []
+    for line in proc.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        rows.append((int(parts[1]), parts[2].strip()))
+    rows.sort(reverse=True)
+    return rows[:top]
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--runs", type=int, default=5)
+    ap.add_argument("--top", type=int, default=15)
+    args = ap.parse_args()
+    samples = []
+    for _ in range(args.runs):
+        t0 = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "pass"], env=_env(), check=False)
+        samples.append((time.perf_counter() - t0) * 1000)
+    print(f"{'interpreter (python -c pass)':<26} {statistics.median(samples):7.1f} ms")
+    for argv in COMMANDS:
+        print(f"{'a2dev ' + ' '.join(argv):<26} {time_command(argv, args.runs):7.1f} ms")
+    print("\nslowest imports for `a2dev route -h` (cumulative):")
+    for us, name in top_imports(["route", "-h"], args.top):
+        print(f"  {us / 1000:7.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
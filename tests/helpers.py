@@ -0,0 +1,16 @@
+"""Fixtures shared by several test modules."""
+from pathlib import Path
+
+AWS_KEY = "AKIA" + "ABCDEFGHIJKLMNOP"
+
+
+def make_project(base: str) -> Path:
+    # An absolute root containing "build" and "dist" components.
+    root = Path(base, "build", "dist", "proj").resolve()
+    (root / "src").mkdir(parents=True)
+    (root / "src" / "app.py").write_text(f'def bar():\n    return "bar"\n\nKEY = "{AWS_KEY}"\n')
+    (root / "node_modules" / "dep").mkdir(parents=True)
+    (root / "node_modules" / "dep" / "index.js").write_text(f'const bar = "{AWS_KEY}";\n')
+    (root / "build").mkdir()
+    (root / "build" / "out.py").write_text("bar = 1\n")
+    return root
@@ -0,0 +1,76 @@
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from a2a import storage
+from a2a.board import write_board
+from a2a.commands.batch import run_batch
+from a2a.schema import Backlog, Epic, Story
+
+REPO = Path(__file__).resolve().parents[1]
+
+
+def _backlog() -> Backlog:
+    return Backlog(epics=[Epic(id=1, title="E", description="d", stories=[Story(id=1, epic_id=1, title="S", description="d")])])
+
+
+class _InTempDir(unittest.TestCase):
+    def setUp(self):
+        self._cwd = os.getcwd()
+        self._tmp = tempfile.TemporaryDirectory()
+        os.chdir(self._tmp.name)
+
+    def tearDown(self):
+        os.chdir(self._cwd)
+        self._tmp.cleanup()
+
+
+class DeferredWritesTest(_InTempDir):
+    def test_writes_are_held_then_flushed_once(self):
+        with storage.deferred_writes():
+            storage.write_backlog(_backlog())
+            write_board(_backlog())
+            self.assertFalse(Path("docs/backlog.json").exists())
+            self.assertTrue(storage.exists("docs/backlog.json"))
+            self.assertTrue(storage.exists("docs/status/board.md"))
+            self.assertEqual(storage.read_backlog().epics[0].stories[0].title, "S")
+        self.assertEqual(json.loads(Path("docs/backlog.json").read_text())["epics"][0]["stories"][0]["title"], "S")
+        self.assertIn("| 1 | S |", Path("docs/status/board.md").read_text())
+
+    def test_reload_drops_unwritten_mutations(self):
+        storage.write_backlog(_backlog())
+        with storage.deferred_writes():
+            bl = storage.read_backlog()
+            bl.epics[0].stories[0].title = "written"
+            storage.write_backlog(bl)
+            bl.epics[0].stories[0].title = "mutated, then the command failed"
+            storage.reload_held()
+            self.assertEqual(storage.read_backlog().epics[0].stories[0].title, "written")
+            st = storage.read_state()
+            st.active_role = "qa"  # never written
+            storage.reload_held()
+            self.assertEqual(storage.read_state().active_role, "pm")
+        self.assertEqual(storage.read_backlog().epics[0].stories[0].title, "written")
+
+
+class BatchTest(_InTempDir):
+    def test_later_commands_see_deferred_backlog(self):
+        Path("docs").mkdir()
+        shutil.copy(REPO / "docs" / "PRD_SAMPLE.md", "docs/PRD.md")
+        out = io.StringIO()
+        lines = [json.dumps(["plan", "docs/PRD.md"]), json.dumps({"id": "dr", "argv": ["doctor"]}), json.dumps(["serve"]), "not json"]
+        ran, failed = run_batch(lines, out)
+        results = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual((ran, failed), (4, 2))
+        self.assertEqual([r["code"] for r in results], [0, 0, 2, 2])
+        self.assertEqual(results[1]["id"], "dr")
+        self.assertIn("Backlog present: yes", results[1]["stdout"])
+        self.assertTrue(Path("docs/backlog.json").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
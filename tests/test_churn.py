@@ -0,0 +1,47 @@
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from a2a import churn
+from a2a.cache import CACHE_DIR, read_json, write_json
+
+
+def _git(root, *args):
+    subprocess.run(["git", *args], cwd=root, check=True, capture_output=True)
+
+
+def _commit(root, name, text):
+    Path(root, name).write_text(text)
+    _git(root, "add", name)
+    _git(root, "-c", "user.name=dev", "-c", "user.email=dev@example.com", "commit", "-q", "-m", name)
+
+
+class CollectChurnTest(unittest.TestCase):
+    def test_failed_log_keeps_cached_head(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            _git(tmp, "init", "-q")
+            _commit(tmp, "a.py", "a = 1\n")
+            files = churn.collect_churn(tmp)
+            self.assertEqual(files["a.py"]["commits"], 1)
+            old_head = read_json(churn.CACHE_NAME, tmp)["head"]
+            _commit(tmp, "a.py", "a = 2\n")
+            real = churn._accumulate
+            with mock.patch.object(churn, "_accumulate", lambda f, cwd, _rng: real(f, cwd, "no-such-rev")):
+                self.assertEqual(churn.collect_churn(tmp)["a.py"]["commits"], 1)
+            self.assertEqual(read_json(churn.CACHE_NAME, tmp)["head"], old_head)
+            self.assertEqual(churn.collect_churn(tmp)["a.py"]["commits"], 2)
+            self.assertNotEqual(read_json(churn.CACHE_NAME, tmp)["head"], old_head)
+
+
+class WriteJsonTest(unittest.TestCase):
+    def test_failed_replace_removes_temp_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with mock.patch.object(Path, "replace", side_effect=OSError("read-only")):
+                write_json("x.json", {"a": 1}, tmp)
+            self.assertEqual(sorted(p.name for p in Path(tmp, CACHE_DIR).iterdir()), [".gitignore"])
+
+
+if __name__ == "__main__":
+    unittest.main()
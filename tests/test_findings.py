@@ -0,0 +1,36 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from a2a import findings
+
+
+def _semgrep_report(path: Path) -> Path:
+    results = [
+        {"check_id": f"r{i}", "path": "app.py", "start": {"line": i}, "extra": {"severity": sev, "lines": sev}}
+        for i, sev in enumerate(["ERROR", "WARNING", "INFO", "EXPERIMENT", ""], 1)
+    ]
+    path.write_text(json.dumps({"results": results}))
+    return path
+
+
+class ReportCountsTest(unittest.TestCase):
+    def test_unknown_severities_are_not_counted(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            report = _semgrep_report(Path(tmp, "semgrep.json"))
+            counts = findings.report_counts("semgrep", report, "story-1", root=tmp)
+            self.assertEqual(counts, {"high": 1, "medium": 1, "low": 1, "total": 3})
+
+    def test_unusable_cache_dir_falls_back_to_report(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            report = _semgrep_report(Path(tmp, "semgrep.json"))
+            with mock.patch.object(findings, "cache_dir", side_effect=PermissionError("read-only")):
+                counts = findings.report_counts("semgrep", report, "story-1", root=tmp)
+                self.assertEqual(counts["total"], 3)
+                self.assertEqual(findings.record_scan("gitleaks", "audit", [{"RuleID": "aws"}], root=tmp)["high"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
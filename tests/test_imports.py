@@ -0,0 +1,53 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from a2a.imports import build_import_graph, module_names
+
+FILES = {
+    "app/__init__.py": "",
+    "app/core.py": "import json\nfrom . import util\n",
+    "app/util.py": "",
+    "run.py": "import app.core\n",
+    "scripts/run.py": "import helper\n",
+    "scripts/helper.py": "from run import main\n",
+    "tools/run.py": "import app\n",
+}
+
+
+class ModuleNamesTest(unittest.TestCase):
+    def test_same_named_scripts_stay_distinct(self):
+        names = module_names([str(Path(p)) for p in FILES])
+        self.assertEqual(names[str(Path("app/core.py"))], ("app.core", False))
+        self.assertEqual(names[str(Path("app/__init__.py"))], ("app", True))
+        self.assertEqual(names["run.py"], ("run", False))
+        self.assertEqual(names[str(Path("scripts/run.py"))], ("scripts/run", False))
+        self.assertEqual(names[str(Path("tools/run.py"))], ("tools/run", False))
+        self.assertEqual(names[str(Path("scripts/helper.py"))], ("helper", False))
+
+
+class ImportGraphTest(unittest.TestCase):
+    def test_scripts_resolve_siblings_first(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            for rel, text in FILES.items():
+                Path(tmp, rel).parent.mkdir(parents=True, exist_ok=True)
+                Path(tmp, rel).write_text(text)
+            g = build_import_graph(tmp, [str(Path(p)) for p in FILES], workers=1)
+            edges = {(g.names[i], g.names[t]) for i in range(len(g.names)) for t in g.successors(i)}
+            self.assertEqual(
+                edges,
+                {
+                    ("app.core", "app"),
+                    ("app.core", "app.util"),
+                    ("run", "app.core"),
+                    ("scripts/run", "helper"),
+                    ("helper", "scripts/run"),
+                    ("tools/run", "app"),
+                },
+            )
+            self.assertEqual(g.cycles(), [["helper", "scripts/run"]])
+            self.assertEqual(g.external, {"json": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
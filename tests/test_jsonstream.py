@@ -0,0 +1,32 @@
+import io
+import json
+import unittest
+from unittest import mock
+
+from a2a import jsonstream
+from a2a.jsonstream import iter_items
+
+SARIF = '{"runs": [{"tool": {}, "results": [1]}, {"tool": 34116.065161938, "results": [1]}]}'
+DOC = '{"results": [1.5e-3, -20, 34116.065161938, true, null, "x\\"y", {"a": [1, 2]}, [3e10]], "tail": 0}'
+
+
+class IterItemsTest(unittest.TestCase):
+    def test_number_split_at_chunk_boundary(self):
+        with mock.patch.object(jsonstream, "CHUNK", 5):
+            got = [v for _, v in iter_items(io.StringIO(SARIF), ("runs", "*", "results"))]
+        self.assertEqual(got, [1, 1])
+
+    def test_every_chunk_size_matches_json_loads(self):
+        expected = json.loads(DOC)["results"]
+        for chunk in range(1, len(DOC) + 2):
+            with self.subTest(chunk=chunk), mock.patch.object(jsonstream, "CHUNK", chunk):
+                got = [v for _, v in iter_items(io.StringIO(DOC), ("results",))]
+                self.assertEqual(got, expected)
+
+    def test_truncated_input_raises(self):
+        with self.assertRaises(ValueError):
+            list(iter_items(io.StringIO(DOC[:40]), ("results",)))
+
+
+if __name__ == "__main__":
+    unittest.main()
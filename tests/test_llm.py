@@ -0,0 +1,288 @@
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest import mock
+
+from a2a import health, llm, llmcache
+from a2a.llm import LLMClient, request_priority, scheduler_for
+
+ENV = {"A2DEV_LLM_LIVE": "", "A2DEV_LLM_CACHE": "on", "A2DEV_CASSETTE": "", "A2DEV_DRY_RUN": ""}
+
+
+class ResponseCacheUseTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.db = Path(self._tmp.name, llmcache.CACHE_DIR, llmcache.DB_NAME)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_stub_output_is_cached(self):
+        with mock.patch.dict(os.environ, ENV):
+            text = LLMClient(self._tmp.name).complete("hello", task="prd")
+            self.assertIn("(Stubbed LLM output)", text)
+            self.assertTrue(self.db.exists())
+
+    def test_dry_run_leaves_cache_alone(self):
+        with mock.patch.dict(os.environ, {**ENV, "A2DEV_DRY_RUN": "1"}):
+            self.assertIn("(Stubbed LLM output)", LLMClient(self._tmp.name).complete("hello", task="prd"))
+        self.assertFalse(self.db.parent.exists())
+
+    def test_unwritable_cache_dir_is_ignored(self):
+        with mock.patch.dict(os.environ, ENV), mock.patch.object(llmcache, "cache_dir", side_effect=PermissionError("ro")):
+            self.assertIn("(Stubbed LLM output)", LLMClient(self._tmp.name).complete("hello", task="prd"))
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers["content-length"])))
+        prompt = payload["messages"][-1]["content"]
+        srv = self.server
+        with srv.lock:
+            srv.seen.append((time.monotonic(), prompt))
+            srv.active += 1
+            srv.peak = max(srv.peak, srv.active)
+        try:
+            status, headers, text = srv.reply(prompt)
+        finally:
+            with srv.lock:
+                srv.active -= 1
+        if status != 200:
+            body = {"error": text}
+        elif self.path.endswith("/chat/completions"):
+            body = {"choices": [{"message": {"content": text}}], "usage": {"total_tokens": 10}}
+        else:
+            body = {"message": {"content": text}, "prompt_eval_count": 5, "eval_count": 5}
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        for k, v in headers.items():
+            self.send_header(k, v)
+        self.send_header("content-length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class StubProvider(ThreadingHTTPServer):
+    """Local OpenAI/Ollama-shaped endpoint; `reply(prompt)` returns (status, headers, text)."""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.reply = lambda prompt: (200, {}, f"echo {prompt}")
+        self.seen = []
+        self.lock = threading.Lock()
+        self.active = self.peak = 0
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def prompts(self):
+        with self.lock:
+            return [p for _, p in self.seen]
+
+
+def _wait_for(cond, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not cond():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not reached")
+        time.sleep(0.005)
+
+
+class _LiveTest(unittest.TestCase):
+    """Live-mode client against stub servers, with fresh process-wide schedulers and breakers."""
+
+    env = {}
+
+    def setUp(self):
+        self.openai, self.ollama = StubProvider(), StubProvider()
+        for srv in (self.openai, self.ollama):
+            self.addCleanup(srv.server_close)
+            self.addCleanup(srv.shutdown)
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        env = {**ENV, "A2DEV_LLM_LIVE": "1", "A2DEV_LLM_CACHE": "off", "A2DEV_TELEMETRY": "0",
+               "A2DEV_LLM_HEDGE": "off", "A2DEV_ROUTING": "static", "A2A_MODEL_TIER": "high",
+               "OPENAI_API_KEY": "test", "OPENAI_BASE_URL": self.openai.url + "/v1",
+               "OLLAMA_HOST": self.ollama.url, "ANTHROPIC_API_KEY": "", **self.env}
+        for patcher in (mock.patch.dict(os.environ, env), mock.patch.dict(llm._SCHEDULERS, clear=True),
+                        mock.patch.dict(health._BREAKERS, clear=True), mock.patch.dict(health._MODELS, clear=True)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.client = LLMClient(tmp.name)
+
+    def run_async(self, prompt, priority="normal", task="prd"):
+        out = {}
+
+        def target():
+            with request_priority(priority):
+                try:
+                    out["text"] = self.client.complete(prompt, task=task)
+                except Exception as e:  # surfaced by the assertions
+                    out["error"] = e
+
+        t = threading.Thread(target=target, daemon=True)
+        t.start()
+        return t, out
+
+
+class SchedulerTest(_LiveTest):
+    env = {"A2DEV_LLM_LIMITS_OPENAI": "concurrency=2"}
+
+    def test_429_retry_after_pauses_the_provider_queue(self):
+        throttled = threading.Event()
+
+        def reply(prompt):
+            if not throttled.is_set():
+                throttled.set()
+                return 429, {"Retry-After": "0.3"}, "slow down"
+            return 200, {}, f"ok {prompt}"
+
+        self.openai.reply = reply
+        a, out_a = self.run_async("a")
+        _wait_for(lambda: scheduler_for("openai").stats()["paused_for"] > 0)
+        b, out_b = self.run_async("b")  # a different caller, not the one that was throttled
+        a.join(5)
+        b.join(5)
+        self.assertEqual((out_a, out_b), ({"text": "ok a"}, {"text": "ok b"}))
+        (t429, first), *rest = self.openai.seen
+        self.assertEqual((first, sorted(p for _, p in rest)), ("a", ["a", "b"]))
+        self.assertTrue(all(t - t429 >= 0.29 for t, _ in rest), [t - t429 for t, _ in rest])
+
+    def test_concurrency_cap(self):
+        def reply(prompt):
+            time.sleep(0.1)
+            return 200, {}, prompt
+
+        self.openai.reply = reply
+        runs = [self.run_async(str(i)) for i in range(6)]
+        for t, _ in runs:
+            t.join(5)
+        self.assertEqual(sorted(out["text"] for _, out in runs), [str(i) for i in range(6)])
+        self.assertEqual(self.openai.peak, 2)
+
+
+class PriorityTest(_LiveTest):
+    env = {"A2DEV_LLM_LIMITS_OPENAI": "concurrency=1"}
+
+    def test_interactive_jumps_queued_batch_work(self):
+        gate = threading.Event()
+
+        def reply(prompt):
+            if prompt == "blocker":
+                gate.wait(5)
+            return 200, {}, prompt
+
+        self.openai.reply = reply
+        runs = [self.run_async("blocker")]
+        _wait_for(lambda: self.openai.prompts() == ["blocker"])
+        for i, (prompt, priority) in enumerate([("b1", "batch"), ("n1", "normal"), ("b2", "batch"), ("i1", "interactive")]):
+            runs.append(self.run_async(prompt, priority))
+            _wait_for(lambda: scheduler_for("openai").stats()["queued"] == i + 1)
+        gate.set()
+        for t, _ in runs:
+            t.join(5)
+        self.assertEqual(self.openai.prompts(), ["blocker", "i1", "n1", "b1", "b2"])
+
+
+class RateLimitTest(_LiveTest):
+    env = {"A2DEV_LLM_LIMITS_OPENAI": "concurrency=8,rpm=3,tpm=3000"}
+
+    def test_request_and_token_budgets(self):
+        sched = scheduler_for("openai")
+        self.assertEqual((sched.limits.rpm, sched.limits.tpm), (3, 3000))
+        # Each call reserves prompt + max_tokens; the unused part is refunded from the reported usage.
+        for i in range(2):
+            self.assertEqual(self.client.complete(f"p{i}", task="prd", max_tokens=1200), f"echo p{i}")
+        self.assertGreater(sched.tokens.level, 2900)
+        with self.assertRaises(TimeoutError):
+            sched.acquire(3000, timeout=0.1)  # tokens spent by the two calls have not refilled
+        sched.acquire(1, timeout=0.1)  # the third request of the minute
+        sched.release()
+        with self.assertRaises(TimeoutError):
+            sched.acquire(1, timeout=0.2)  # rpm=3 is used up
+        self.assertEqual(len(self.openai.seen), 2)
+
+
+class FailoverTest(_LiveTest):
+    env = {"A2DEV_LLM_BREAKER_FAILURES": "3", "A2DEV_LLM_BREAKER_COOLDOWN": "0.3"}
+
+    def setUp(self):
+        super().setUp()
+        backoff = mock.patch.object(llm, "BACKOFF_BASE", 0.01)
+        backoff.start()
+        self.addCleanup(backoff.stop)
+
+    def test_fails_over_in_candidate_order(self):
+        self.openai.reply = lambda prompt: (500, {}, "openai is down")
+        self.ollama.reply = lambda prompt: (200, {}, "from ollama")
+        self.assertEqual(self.client.complete("fix it", task="code"), "from ollama")  # gpt-4o, then llama
+        self.assertEqual(len(self.openai.seen), 3)  # retried until the breaker opened
+        self.assertEqual(self.ollama.prompts(), ["fix it"])
+        self.assertEqual("".join(self.client.stream("again", task="code")), "from ollama")
+        self.assertEqual(len(self.openai.seen), 3)  # breaker open: openai skipped
+
+    def test_error_names_every_failed_candidate(self):
+        self.openai.reply = lambda prompt: (500, {}, "openai is down")
+        self.ollama.reply = lambda prompt: (400, {}, "bad model")
+        t0 = time.monotonic()
+        with self.assertRaises(llm.LLMError) as ctx:
+            self.client.complete("fix it", task="code")
+        self.assertLess(time.monotonic() - t0, 3)
+        msg = str(ctx.exception)
+        self.assertIn("gpt-4o (openai): HTTP 500", msg)
+        self.assertIn("openai is down", msg)
+        self.assertIn("llama3.1-70b (ollama): HTTP 400", msg)
+
+    def test_breaker_trips_and_cools_down(self):
+        self.openai.reply = lambda prompt: (503, {}, "overloaded")
+        with self.assertRaisesRegex(llm.LLMError, "HTTP 503"):
+            self.client.complete("one", task="prd")
+        self.assertEqual(len(self.openai.seen), 3)
+        self.assertEqual(health.breaker_for("openai").state, "open")
+        with self.assertRaises(llm.CircuitOpen):
+            self.client.complete("two", task="prd")
+        self.assertEqual(len(self.openai.seen), 3)  # not attempted while open
+        self.openai.reply = lambda prompt: (200, {}, "back")
+        time.sleep(0.35)
+        self.assertEqual(health.breaker_for("openai").state, "half-open")
+        self.assertEqual(self.client.complete("three", task="prd"), "back")  # the probe closes it
+        self.assertEqual(health.breaker_for("openai").state, "closed")
+
+
+class HedgeTest(_LiveTest):
+    env = {"A2DEV_LLM_HEDGE": "all", "A2DEV_LLM_HEDGE_DELAY": "0.2"}
+
+    def test_slow_first_model_is_hedged(self):
+        def slow(prompt):
+            time.sleep(1.5)
+            return 200, {}, "from openai"
+
+        self.openai.reply = slow
+        self.ollama.reply = lambda prompt: (200, {}, "from ollama")
+        t0 = time.monotonic()
+        self.assertEqual(self.client.complete("fix it", task="code"), "from ollama")
+        self.assertLess(time.monotonic() - t0, 1.0)
+        self.assertEqual((self.openai.prompts(), self.ollama.prompts()), (["fix it"], ["fix it"]))
+        self.assertAlmostEqual(self.ollama.seen[0][0] - self.openai.seen[0][0], 0.2, delta=0.15)
+
+    def test_fast_first_model_is_not_hedged(self):
+        self.ollama.reply = lambda prompt: (200, {}, "from ollama")
+        self.assertEqual(self.client.complete("fix it", task="code"), "echo fix it")
+        time.sleep(0.3)
+        self.assertEqual(self.ollama.seen, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,35 @@
+import os
+import unittest
+from unittest import mock
+
+from a2a import parallel
+
+
+def _double(chunk):
+    return [x * 2 for x in chunk]
+
+
+def _fail_on_13(chunk):
+    if 13 in chunk:
+        raise ValueError(f"bad item 13 in pid {os.getpid()}")
+    return chunk
+
+
+class MapChunkedTest(unittest.TestCase):
+    def test_pool_preserves_order(self):
+        items = list(range(500))
+        self.assertEqual(parallel.map_chunked(_double, items, workers=2), [x * 2 for x in items])
+
+    def test_worker_errors_propagate(self):
+        with self.assertRaisesRegex(ValueError, "bad item 13") as ctx:
+            parallel.map_chunked(_fail_on_13, list(range(500)), workers=2)
+        # Raised by a worker, not by an in-process rerun of the whole input.
+        self.assertNotIn(f"pid {os.getpid()}", str(ctx.exception))
+
+    def test_pool_start_failure_runs_in_process(self):
+        with mock.patch.object(parallel, "ProcessPoolExecutor", side_effect=PermissionError("sandbox")):
+            self.assertEqual(parallel.map_chunked(_double, list(range(100)), workers=4), list(range(0, 200, 2)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import os
+import subprocess
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from a2a.precommit import read_blobs, run_precommit, staged_blobs, staged_paths
+
+
+def _git(root, *args):
+    subprocess.run(["git", *args], cwd=root, check=True, capture_output=True)
+
+
+class ReadBlobsTest(unittest.TestCase):
+    def test_many_staged_blobs_do_not_deadlock(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            _git(tmp, "init", "-q")
+            for i in range(3000):
+                Path(tmp, f"f{i}.txt").write_text(f"content {i}\n" * 20)
+            _git(tmp, "add", ".")
+            blobs = staged_blobs(staged_paths(tmp), tmp)
+            self.assertEqual(len(blobs), 3000)
+            got = {}
+            worker = threading.Thread(target=lambda: got.update(read_blobs(list(blobs.values()), tmp)), daemon=True)
+            worker.start()
+            worker.join(60)
+            self.assertFalse(worker.is_alive(), "git cat-file --batch deadlocked")
+            self.assertEqual(len(got), 3000)
+            self.assertEqual(got[blobs["f7.txt"]], b"content 7\n" * 20)
+
+    def test_early_stop_does_not_hang(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            _git(tmp, "init", "-q")
+            for i in range(2000):
+                Path(tmp, f"f{i}.txt").write_text("x" * 1000)
+            _git(tmp, "add", ".")
+            shas = list(staged_blobs(staged_paths(tmp), tmp).values())
+            gen = read_blobs(shas, tmp)
+            next(gen)
+            gen.close()  # must reap git without blocking
+
+
+class RunPrecommitTest(unittest.TestCase):
+    def test_staged_secret_is_reported(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            _git(tmp, "init", "-q")
+            Path(tmp, "config.py").write_text('AWS_KEY = "AKIA' + "ABCDEFGHIJKLMNOP" + '"\n')
+            _git(tmp, "add", ".")
+            out = run_precommit(tmp, use_cache=False)
+            self.assertTrue(out["secrets"], out)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+
+from a2a.cache import tree_fingerprint
+from a2a.runcache import cached_run
+
+
+def _git(root, *args):
+    subprocess.run(["git", *args], cwd=root, check=True, capture_output=True)
+
+
+class IgnoredFilesKeyTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = self._tmp.name
+        _git(self.root, "init", "-q")
+        Path(self.root, ".gitignore").write_text(".env\n")
+        Path(self.root, ".env").write_text("TOKEN=1\n")
+        _git(self.root, "add", ".gitignore")
+        _git(self.root, "-c", "user.name=dev", "-c", "user.email=dev@example.com", "commit", "-q", "-m", "init")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_fingerprint_tracks_ignored_files_on_request(self):
+        before = tree_fingerprint(self.root), tree_fingerprint(self.root, ignored=True)
+        Path(self.root, ".env").write_text("TOKEN=a-much-longer-secret\n")
+        self.assertEqual(tree_fingerprint(self.root), before[0])
+        self.assertNotEqual(tree_fingerprint(self.root, ignored=True), before[1])
+
+    def test_directory_scan_reruns_when_ignored_file_changes(self):
+        calls = []
+
+        def run(cmd, cwd=None, timeout=120):
+            calls.append(cmd)
+            return 0, Path(self.root, ".env").read_text(), ""
+
+        cmd = ["gitleaks", "detect", "--no-git", "--source", self.root]
+        self.assertEqual(cached_run(run, cmd, tree_root=self.root, ignored=True)[1], "TOKEN=1\n")
+        self.assertEqual(cached_run(run, cmd, tree_root=self.root, ignored=True)[1], "TOKEN=1\n")
+        self.assertEqual(len(calls), 1)  # second call hit the cache, whose own files are not in the key
+        Path(self.root, ".env").write_text("TOKEN=22\n")
+        self.assertEqual(cached_run(run, cmd, tree_root=self.root, ignored=True)[1], "TOKEN=22\n")
+        self.assertEqual(len(calls), 2)
+
+
+class SubdirectoryFingerprintTest(unittest.TestCase):
+    def test_excludes_are_relative_to_root_inside_a_repo(self):
+        from a2a.commands.audit import AUDIT_OUTPUTS
+
+        with tempfile.TemporaryDirectory() as tmp:
+            _git(tmp, "init", "-q")
+            proj = Path(tmp, "proj")
+            (proj / "docs" / "analyst").mkdir(parents=True)
+            Path(proj, "app.py").write_text("x = 1\n")
+            _git(tmp, "add", ".")
+            _git(tmp, "-c", "user.name=dev", "-c", "user.email=dev@example.com", "commit", "-q", "-m", "init")
+            Path(proj, "new.py").write_text("y = 1\n")
+            before = tree_fingerprint(proj, exclude=AUDIT_OUTPUTS)
+            for out in AUDIT_OUTPUTS:
+                Path(proj, out).write_text("report")
+            self.assertEqual(tree_fingerprint(proj, exclude=AUDIT_OUTPUTS), before)
+            Path(proj, "new.py").write_text("y = 22\n")
+            self.assertNotEqual(tree_fingerprint(proj, exclude=AUDIT_OUTPUTS), before)
+
+
+if __name__ == "__main__":
+    unittest.main()
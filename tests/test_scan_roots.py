@@ -0,0 +1,30 @@
+"""Walkers must skip vendored/build directories inside the tree, not trees that live under one."""
+import tempfile
+import unittest
+from pathlib import Path
+
+from a2a.inventory import iter_source_files, scan_repository
+from a2a.secretscan import scan as scan_secrets
+
+from helpers import make_project
+
+
+class InventoryRootTest(unittest.TestCase):
+    def test_absolute_root_under_build_dir(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = make_project(tmp)
+            files = dict(iter_source_files(str(root)))
+            self.assertEqual(files, {str(Path("src", "app.py")): "python"})
+            self.assertEqual(scan_repository(str(root), metrics=False)["languages"].get("python"), 1)
+
+
+class SecretScanRootTest(unittest.TestCase):
+    def test_absolute_root_under_build_dir(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = make_project(tmp)
+            findings = scan_secrets(root)["findings"]
+            self.assertEqual({f["File"] for f in findings}, {str(Path("src", "app.py"))})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,39 @@
+import os
+import stat
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from a2a import storage
+
+
+def _mode(p: Path) -> int:
+    return stat.S_IMODE(p.stat().st_mode)
+
+
+@unittest.skipIf(os.name == "nt", "POSIX permissions")
+class StreamToFileTest(unittest.TestCase):
+    def test_new_file_follows_umask(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            old = os.umask(0o027)
+            try:
+                with mock.patch.object(storage, "_UMASK", None):
+                    out = Path(storage.stream_to_file(Path(tmp, "docs", "a.md"), ["a", "b"]))
+            finally:
+                os.umask(old)
+            self.assertEqual(out.read_text(), "ab")
+            self.assertEqual(_mode(out), 0o640)
+
+    def test_replacement_keeps_existing_mode(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            p = Path(tmp, "b.md")
+            p.write_text("old")
+            p.chmod(0o600)
+            storage.write_text_atomic(p, "new")
+            self.assertEqual((p.read_text(), _mode(p)), ("new", 0o600))
+            self.assertEqual(sorted(os.listdir(tmp)), ["b.md"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from a2a.summarize import Summarizer, split_sections
+from a2a.tokens import count_tokens
+
+
+def _section(i: int, sentences: int = 30) -> str:
+    body = " ".join(f"Requirement {i}.{j} covers the checkout flow for region {j} with audit logging." for j in range(sentences))
+    return f"## Feature {i}\n\n{body}\n"
+
+
+def _prd(n: int = 8) -> str:
+    return "# Product\n\nIntro paragraph for the product.\n\n" + "\n".join(_section(i) for i in range(n))
+
+
+class SplitSectionsTest(unittest.TestCase):
+    def test_breadcrumbs_and_paragraph_split(self):
+        text = "Lead text.\n\n# Goals\n\n## KPIs\n\nConversion up.\n\n# Scope\n\n" + "\n\n".join(["Para " + "x " * 40] * 6)
+        chunks = split_sections(text, max_tokens=60)
+        paths = [c.path for c in chunks]
+        self.assertEqual(paths[:2], ["Preamble", "Goals > KPIs"])
+        self.assertTrue(all(p.startswith("Scope (") for p in paths[2:]), paths)
+        self.assertGreater(len(paths), 3)
+        self.assertTrue(all(c.tokens <= 60 or "\n\n" not in c.text for c in chunks))
+
+
+class SummarizerTest(unittest.TestCase):
+    def test_extractive_reduce_keeps_every_section(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            summary = Summarizer(root=tmp).summarize(_prd(), target_tokens=400)
+            self.assertEqual(summary.levels, 1)
+            self.assertLessEqual(count_tokens(summary.text), 400 * 1.2)
+            for i in range(8):
+                self.assertIn(f"**Product > Feature {i}**", summary.text)
+
+    def test_unchanged_chunks_are_reused(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            first = Summarizer(root=tmp).summarize(_prd(), target_tokens=2000)
+            self.assertEqual((first.reused, first.summarized), (0, first.chunks))
+            edited = _prd().replace("Requirement 3.0 covers", "Requirement 3.0 now covers")
+            second = Summarizer(root=tmp).summarize(edited, target_tokens=2000)
+            self.assertEqual((second.reused, second.summarized), (second.chunks - 1, 1))
+
+    def test_unusable_cache_dir_is_ignored(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            Path(tmp, ".a2dev").write_text("not a directory")
+            summary = Summarizer(root=tmp).summarize(_prd(), target_tokens=400)
+            self.assertIn("Feature 7", summary.text)
+
+
+if __name__ == "__main__":
+    unittest.main()
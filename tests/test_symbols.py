@@ -0,0 +1,54 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from a2a import mcp
+from a2a.symbols import SymbolIndex
+
+from helpers import make_project
+
+
+class SymbolIndexRootTest(unittest.TestCase):
+    def test_absolute_root_under_build_dir(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = make_project(tmp)
+            stats = SymbolIndex(root).update(workers=1)
+            self.assertEqual(stats["files"], 1)
+            idx = SymbolIndex(root)
+            idx.load()
+            self.assertEqual([d["path"] for d in idx.find_definition("bar")], [str(Path("src", "app.py"))])
+
+
+class RefAdapterTest(unittest.TestCase):
+    def test_native_index_only_without_ctags(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = make_project(tmp)
+            ref = mcp.RefAdapter()
+            with mock.patch.object(mcp.shutil, "which", return_value="/usr/bin/ctags"), mock.patch.object(
+                mcp, "_run", return_value=(0, "", "")
+            ):
+                self.assertEqual(ref.build_index(str(root)), "built (ctags)")
+            self.assertFalse(SymbolIndex(root).exists())
+            # Queries build the native index on first use.
+            self.assertEqual(len(ref.find_definition("bar", str(root))), 1)
+            self.assertTrue(SymbolIndex(root).exists())
+
+            with mock.patch.object(mcp.shutil, "which", return_value=None):
+                self.assertIn("native index: 1 files", ref.build_index(str(root)))
+
+    def test_queries_see_edits_after_indexing(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = make_project(tmp)
+            ref = mcp.RefAdapter()
+            self.assertEqual(len(ref.find_definition("bar", str(root))), 1)
+            app = root / "src" / "app.py"
+            app.write_text('def baz():\n    return "baz"\n\n\ndef qux():\n    return baz()\n')
+            self.assertEqual(ref.find_definition("bar", str(root)), [])
+            self.assertEqual([d["line"] for d in ref.find_definition("qux", str(root))], [5])
+            (root / "src" / "extra.py").write_text("def bar():\n    pass\n")
+            self.assertEqual([d["path"] for d in ref.find_definition("bar", str(root))], [str(Path("src", "extra.py"))])
+
+
+if __name__ == "__main__":
+    unittest.main()
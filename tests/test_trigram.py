@@ -0,0 +1,81 @@
+import re
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from a2a.mcp import CodeSearchAdapter
+from a2a.trigram import TrigramIndex, required_literals
+
+
+class TrigramIndexTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        # Absolute root containing a skip-dir name: must still be indexed.
+        self.root = Path(self._tmp.name, "build", "proj").resolve()
+        (self.root / "src").mkdir(parents=True)
+        (self.root / "src" / "a.py").write_text("def foo():\n    return bar()\n")
+        (self.root / "node_modules").mkdir()
+        (self.root / "node_modules" / "x.js").write_text("bar()\n")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_indexes_and_searches_under_build_path(self):
+        idx = TrigramIndex(self.root)
+        self.assertEqual(idx.update()["files"], 1)
+        self.assertEqual(list(idx.search("bar")), [(str(Path("src", "a.py")), 2, "    return bar()")])
+        idx.close()
+
+    def test_noop_update_does_not_rewrite(self):
+        idx = TrigramIndex(self.root)
+        idx.update()
+        before = idx.path.stat().st_mtime_ns
+        stats = idx.update()
+        self.assertEqual(stats["updated"] + stats["removed"], 0)
+        self.assertEqual(idx.path.stat().st_mtime_ns, before)
+        (self.root / "src" / "b.py").write_text("baz = 1\n")
+        self.assertEqual(idx.update()["updated"], 1)
+        self.assertEqual([p for p, _, _ in idx.search("baz")], [str(Path("src", "b.py"))])
+        idx.close()
+
+    def test_deadline_checked_between_candidates(self):
+        for i in range(50):
+            (self.root / "src" / f"m{i}.py").write_text("bar = 1\n" if i == 49 else "barn_owl = 0\n")
+        idx = TrigramIndex(self.root)
+        idx.update()
+        self.assertEqual(list(idx.search("bar =", deadline=time.monotonic() - 1)), [])
+        self.assertEqual([p for p, _, _ in idx.search("bar =", deadline=time.monotonic() + 60)], [str(Path("src", "m49.py"))])
+        idx.close()
+        self.assertEqual(CodeSearchAdapter().search("bar =", str(self.root), use_index=True, timeout=1e-9), [])
+
+    def test_empty_index_falls_back(self):
+        empty = self.root / "empty"
+        empty.mkdir()
+        self.assertIsNone(CodeSearchAdapter()._index_matches("bar", str(empty)))
+
+    def test_required_literals(self):
+        self.assertEqual(required_literals("foo.*bar"), ["foo", "bar"])
+        self.assertEqual(required_literals("a|b"), [])
+        self.assertEqual(required_literals("(?i:élan)vital"), ["lanvital"])
+        self.assertEqual(required_literals("(?i)ABC(?-i:ÉLAN)"), ["ABCÉLAN"])
+        self.assertEqual(required_literals("(?i:task)"), [])  # "k" also matches the Kelvin sign
+
+    def test_scoped_ignorecase_matches_brute_force(self):
+        words = ["élan", "ÉLAN", "Élan", "àbc", "ÀBC", "xàbc", "TASK", "tas\u212a", "\u017ftop", "Stop"]
+        for i, w in enumerate(words):
+            (self.root / "src" / f"w{i}.txt").write_text(f"line {i}\n{w} here\n", encoding="utf-8")
+        idx = TrigramIndex(self.root)
+        idx.update()
+        files = [p for p in self.root.rglob("*") if p.is_file() and not {"node_modules", ".a2dev"} & set(p.parts)]
+        for pattern in ["(?i:élan)", "(?i:ÀBC)", "x(?i:ÀBC)", "(?i)élan", "(?i:task)", "(?i:stop)", "É(?i:lan)"]:
+            with self.subTest(pattern=pattern):
+                rx = re.compile(pattern)
+                expected = {str(p.relative_to(self.root)) for p in files if rx.search(p.read_text(encoding="utf-8"))}
+                self.assertTrue(expected)
+                self.assertEqual({p for p, _, _ in idx.search(pattern)}, expected)
+        idx.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
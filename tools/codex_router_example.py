@@ -5,13 +5,66 @@ Usage: integrate this script as a message preprocessor in your Codex harness.
 If a message starts with @analyst/@pm/@dev/@spm or *command, route it to
 `python3 a2dev_cli.py route "<message>"` and surface the CLI output.
 Otherwise, pass the message through unchanged.
+
+When `a2dev serve` is running in the project, the route request goes straight
+to its socket (.a2dev/run/a2dev.sock) instead of spawning a new CLI process.
 """
 
+import json
 import os
+import socket
 import subprocess
 import sys
 
 
+def route_via_daemon(message):
+    """Return (stdout, stderr) from a running `a2dev serve`, or None if there is none."""
+    path = os.path.join('.a2dev', 'run', 'a2dev.sock')
+    if not os.path.exists(path) or os.getenv('A2DEV_DAEMON', '1').lower() in ('0', 'false', 'no', 'off'):
+        return None
+    env = {k: v for k, v in os.environ.items() if k.startswith(('A2DEV_', 'A2A_', 'CODEX_', 'OPENAI_', 'ANTHROPIC_', 'OLLAMA_'))}
+    req = {"jsonrpc": "2.0", "id": 1, "method": "run",
+           "params": {"argv": ["route", message], "cwd": os.getcwd(), "env": env}}
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(0.5)
+            sock.connect(path)
+            sock.settimeout(600)
+            sock.sendall(json.dumps(req).encode() + b"\n")
+            buf = b""
+            while not buf.endswith(b"\n"):
+                chunk = sock.recv(65536)
+                if not chunk:
+                    break
+                buf += chunk
+        reply = json.loads(buf)
+    except (OSError, ValueError):
+        return None
+    if "error" in reply:
+        return None
+    result = reply.get("result") or {}
+    return result.get("stdout", ""), result.get("stderr", "")
+
+
+def route(message):
+    served = route_via_daemon(message)
+    if served is not None:
+        sys.stdout.write(served[0])
+        sys.stderr.write(served[1])
+        return
+    # Prefer Node wrapper (a2dev); fallback to Python shim if unavailable
+    try:
+        cmd = ["a2dev", "route", message]
+        proc = subprocess.run(cmd, capture_output=True, text=True)
+        if proc.returncode != 0:
+            raise RuntimeError("a2dev returned non-zero")
+    except Exception:
+        cmd = [sys.executable or "python3", "a2dev_cli.py", "route", message]
+        proc = subprocess.run(cmd, capture_output=True, text=True)
+    sys.stdout.write(proc.stdout)
+    sys.stderr.write(proc.stderr)
+
+
 def main():
     msg = sys.stdin.read().strip()
     if not msg:
@@ -21,39 +74,18 @@ def main():
     # Active role memory: read from .a2dev/state.json
     active_role = None
     try:
-        import json as _json
         st_path = os.path.join('.a2dev', 'state.json')
         if os.path.exists(st_path):
-            active_role = (_json.loads(open(st_path).read()).get('active_role') or '').strip() or None
+            active_role = (json.loads(open(st_path).read()).get('active_role') or '').strip() or None
     except Exception:
         active_role = None
 
     if msg.lower().startswith(triggers):
-        # Prefer Node wrapper (a2dev); fallback to Python shim if unavailable
-        try:
-            cmd = ["a2dev", "route", msg]
-            proc = subprocess.run(cmd, capture_output=True, text=True)
-            if proc.returncode != 0:
-                raise RuntimeError("a2dev returned non-zero")
-        except Exception:
-            cmd = [sys.executable or "python3", "a2dev_cli.py", "route", msg]
-            proc = subprocess.run(cmd, capture_output=True, text=True)
-        sys.stdout.write(proc.stdout)
-        sys.stderr.write(proc.stderr)
+        route(msg)
         return
     # If not prefixed and an active role exists, forward to that role
     if active_role:
-        routed = f"@{active_role} {msg}"
-        try:
-            cmd = ["a2dev", "route", routed]
-            proc = subprocess.run(cmd, capture_output=True, text=True)
-            if proc.returncode != 0:
-                raise RuntimeError("a2dev returned non-zero")
-        except Exception:
-            cmd = [sys.executable or "python3", "a2dev_cli.py", "route", routed]
-            proc = subprocess.run(cmd, capture_output=True, text=True)
-        sys.stdout.write(proc.stdout)
-        sys.stderr.write(proc.stderr)
+        route(f"@{active_role} {msg}")
         return
     # default: echo the original message (no routing)
     print(msg)